@@ -0,0 +1,208 @@
+"""Synthetic project-fleet generator for benchmarks.
+
+A fleet is a directory of projects, each holding a canonical ``ai/context``
+plus the artifacts of one IDE. Rule files are padded to configurable sizes,
+and Continue/Windsurf configs can carry thousands of unrelated entries to
+mimic large real-world configs. Generation is deterministic for a given
+seed; ``fleet.json`` records which IDE each project was given.
+"""
+
+import json
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import yaml
+
+FLEET_MANIFEST = "fleet.json"
+FLEET_IDES = ("cursor", "vscode", "continue", "windsurf")
+
+_SIZE_UNITS = {"B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3}
+_WORDS = (
+    "always prefer explicit types keep functions small write tests first avoid global "
+    "state document public interfaces handle errors at the boundary log with context"
+).split()
+
+
+@dataclass
+class FleetSpec:
+    """Shape of a synthetic fleet."""
+
+    projects: int = 20
+    mix: dict[str, int] = field(default_factory=lambda: dict.fromkeys(FLEET_IDES, 1))
+    rule_sizes: list[int] = field(default_factory=lambda: [1024])
+    config_entries: int = 0
+    seed: int = 0
+
+
+def parse_size(value: str) -> int:
+    """Parse a human-readable size such as ``64KB`` or ``50MB``.
+
+    Args:
+        value: Size with an optional B/KB/MB/GB suffix
+
+    Returns:
+        Size in bytes
+
+    Raises:
+        ValueError: If the size cannot be parsed
+    """
+    text = value.strip().upper()
+    for unit in sorted(_SIZE_UNITS, key=len, reverse=True):
+        if text.endswith(unit):
+            number = text[: -len(unit)].strip()
+            break
+    else:
+        unit, number = "B", text
+    try:
+        return int(float(number) * _SIZE_UNITS[unit])
+    except ValueError:
+        raise ValueError(f"Invalid size: {value}") from None
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    """Parse an IDE mix such as ``cursor=3,vscode=1``.
+
+    Args:
+        value: Comma-separated ide=weight pairs
+
+    Returns:
+        Mapping of IDE name to weight
+
+    Raises:
+        ValueError: If an IDE is unknown or a weight is invalid
+    """
+    mix: dict[str, int] = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in FLEET_IDES:
+            raise ValueError(f"Unknown IDE in mix: {name} (choose from {', '.join(FLEET_IDES)})")
+        mix[name] = int(weight or 1)
+    if not any(mix.values()):
+        raise ValueError("Mix must give at least one IDE a positive weight")
+    return mix
+
+
+def make_rules(size: int, rng: random.Random) -> str:
+    """Build markdown rules of roughly the requested size.
+
+    Args:
+        size: Target size in bytes
+        rng: Random source
+
+    Returns:
+        Markdown text at least ``size`` bytes long
+    """
+    # Build one section and repeat it; joining millions of random words is slow
+    section_lines = ["## Section", ""]
+    for _ in range(16):
+        section_lines.append("- " + " ".join(rng.choices(_WORDS, k=12)))
+    section = "\n".join(section_lines) + "\n\n"
+
+    header = "# AI Project Rules\n\n"
+    repeat = max(1, -(-(size - len(header)) // len(section)))
+    return header + section * repeat
+
+
+def generate_fleet(root: Path, spec: FleetSpec) -> list[Path]:
+    """Create a synthetic fleet of projects.
+
+    Args:
+        root: Directory to create the projects in
+        spec: Fleet shape
+
+    Returns:
+        Project paths, in creation order
+    """
+    rng = random.Random(spec.seed)
+    root.mkdir(parents=True, exist_ok=True)
+
+    ides = [name for name, weight in spec.mix.items() for _ in range(weight)]
+    rules_by_size = {size: make_rules(size, rng) for size in set(spec.rule_sizes)}
+
+    projects: list[Path] = []
+    layout: dict[str, str] = {}
+    for index in range(spec.projects):
+        ide = ides[index % len(ides)]
+        rules = rules_by_size[spec.rule_sizes[index % len(spec.rule_sizes)]]
+        project = root / f"project-{index:05d}"
+        _write_canonical(project, rules)
+        _write_ide(project, ide, rules, spec.config_entries)
+        projects.append(project)
+        layout[project.name] = ide
+
+    (root / FLEET_MANIFEST).write_text(json.dumps(layout, indent=2), encoding="utf-8")
+    return projects
+
+
+def load_fleet(root: Path) -> dict[Path, str]:
+    """Read a generated fleet's layout.
+
+    Args:
+        root: Fleet directory
+
+    Returns:
+        Mapping of project path to the IDE its artifacts belong to
+    """
+    layout = json.loads((root / FLEET_MANIFEST).read_text(encoding="utf-8"))
+    return {root / name: ide for name, ide in layout.items()}
+
+
+def _write_canonical(project: Path, rules: str) -> None:
+    """Write a project's canonical context.
+
+    Args:
+        project: Project root
+        rules: rules.md content
+    """
+    context_dir = project / "ai" / "context"
+    context_dir.mkdir(parents=True, exist_ok=True)
+    (context_dir / "rules.md").write_text(rules, encoding="utf-8")
+    (context_dir / "context.md").write_text("# Project Context\n\nSynthetic.\n", encoding="utf-8")
+    (context_dir / "ignore.txt").write_text("node_modules/\ndist/\n*.log\n", encoding="utf-8")
+    (context_dir / "extensions.json").write_text(
+        json.dumps({"recommendations": ["ms-python.python"]}, indent=2), encoding="utf-8"
+    )
+    (context_dir / "manifest.yaml").write_text(
+        yaml.safe_dump({"version": "1.0", "adapters_used": []}), encoding="utf-8"
+    )
+
+
+def _write_ide(project: Path, ide: str, rules: str, config_entries: int) -> None:
+    """Write one IDE's artifacts into a project.
+
+    Args:
+        project: Project root
+        ide: IDE name
+        rules: Rules content to embed
+        config_entries: Filler entries for Continue/Windsurf configs
+    """
+    if ide == "cursor":
+        (project / ".cursorrules").write_text(rules, encoding="utf-8")
+        (project / ".cursorignore").write_text("node_modules/\n", encoding="utf-8")
+    elif ide == "vscode":
+        vscode_dir = project / ".vscode"
+        vscode_dir.mkdir(exist_ok=True)
+        (vscode_dir / "AI_RULES.md").write_text(rules, encoding="utf-8")
+        (vscode_dir / "extensions.json").write_text(
+            json.dumps({"recommendations": ["ms-python.python"]}), encoding="utf-8"
+        )
+    elif ide == "continue":
+        continue_dir = project / ".continue"
+        continue_dir.mkdir(exist_ok=True)
+        continue_config = {
+            "models": [
+                {"title": f"model-{i}", "provider": "openai"} for i in range(config_entries)
+            ],
+            "projectPrompts": [{"name": "Rules", "content": rules}],
+        }
+        (continue_dir / "config.json").write_text(json.dumps(continue_config), encoding="utf-8")
+    elif ide == "windsurf":
+        windsurf_dir = project / ".windsurf"
+        windsurf_dir.mkdir(exist_ok=True)
+        windsurf_config = {
+            "settings": {f"setting_{i}": i for i in range(config_entries)},
+            "ai_rules": rules,
+        }
+        (windsurf_dir / "config.yaml").write_text(yaml.safe_dump(windsurf_config), encoding="utf-8")
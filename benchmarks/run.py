@@ -0,0 +1,362 @@
+"""Benchmark runner for the detect, import, export and convert commands.
+
+Each command runs over the whole fleet in its own worker process, so that
+peak RSS is measured per command. The worker times every project through
+the real CLI entry point; the parent aggregates latency percentiles and
+projects per second, and can save a baseline or compare against one::
+
+    python -m benchmarks.run run --preset small --save-baseline small
+    python -m benchmarks.run run --preset small --compare small
+"""
+
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Any
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks.fleet import FleetSpec, generate_fleet, load_fleet, parse_mix, parse_size
+
+COMMANDS = ("detect", "import", "export", "convert")
+BASELINE_DIR = Path(__file__).parent / "baselines"
+
+# Latency deltas below this are treated as noise when comparing
+MIN_LATENCY_DELTA_MS = 1.0
+
+PRESETS = {
+    "small": FleetSpec(projects=20, rule_sizes=[parse_size("1KB"), parse_size("16KB")]),
+    "medium": FleetSpec(
+        projects=200,
+        rule_sizes=[parse_size("1KB"), parse_size("64KB"), parse_size("1MB")],
+        config_entries=500,
+    ),
+    # Few projects: one 50 MB Windsurf project alone takes minutes to round-trip YAML
+    "large": FleetSpec(
+        projects=12,
+        rule_sizes=[parse_size("1KB"), parse_size("1MB"), parse_size("50MB")],
+        config_entries=5000,
+    ),
+}
+
+app = typer.Typer(help="Benchmark IDE Context Porter over a synthetic fleet", add_completion=False)
+console = Console()
+
+
+@dataclass
+class CommandResult:
+    """Measurements for one command over a fleet."""
+
+    command: str
+    projects: int
+    wall_s: float
+    latencies_ms: list[float] = field(default_factory=list)
+    failures: int = 0
+    peak_rss_mb: float | None = None
+
+    @property
+    def p50_ms(self) -> float:
+        """Median per-project latency."""
+        return statistics.median(self.latencies_ms) if self.latencies_ms else 0.0
+
+    @property
+    def p95_ms(self) -> float:
+        """95th percentile per-project latency."""
+        if len(self.latencies_ms) < 2:
+            return self.p50_ms
+        return statistics.quantiles(self.latencies_ms, n=20, method="inclusive")[-1]
+
+    @property
+    def projects_per_second(self) -> float:
+        """Throughput over the whole fleet."""
+        return self.projects / self.wall_s if self.wall_s else 0.0
+
+    def summary(self) -> dict[str, Any]:
+        """Summarize the result for reports and baselines.
+
+        Returns:
+            Aggregated metrics
+        """
+        return {
+            "projects": self.projects,
+            "failures": self.failures,
+            "p50_ms": round(self.p50_ms, 3),
+            "p95_ms": round(self.p95_ms, 3),
+            "max_ms": round(max(self.latencies_ms, default=0.0), 3),
+            "projects_per_second": round(self.projects_per_second, 2),
+            "peak_rss_mb": self.peak_rss_mb,
+        }
+
+
+def command_args(command: str, project: Path, ide: str) -> list[str]:
+    """Build the CLI arguments for one project.
+
+    Args:
+        command: Benchmarked command
+        project: Project root
+        ide: IDE whose artifacts the project holds
+
+    Returns:
+        Arguments for the ide-context-porter CLI
+    """
+    if command == "detect":
+        return ["detect", str(project)]
+    if command == "import":
+        return ["import", "--from", ide, "--path", str(project), "--force"]
+    if command == "export":
+        return ["export", "--to", "all", "--path", str(project), "--force"]
+    if command == "convert":
+        target = "cursor" if ide == "vscode" else "vscode"
+        return ["convert", "--from", ide, "--to", target, "--path", str(project), "--force"]
+    raise ValueError(f"Unknown command: {command}")
+
+
+def run_in_process(command: str, fleet_root: Path) -> CommandResult:
+    """Run a command over every project of a fleet in this process.
+
+    Args:
+        command: Benchmarked command
+        fleet_root: Fleet directory
+
+    Returns:
+        Result without peak RSS
+    """
+    from ideporter.cli import app as cli_app
+
+    fleet = load_fleet(fleet_root)
+    result = CommandResult(command=command, projects=len(fleet), wall_s=0.0)
+
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for project, ide in fleet.items():
+            t0 = time.perf_counter()
+            try:
+                code = cli_app(command_args(command, project, ide), standalone_mode=False)
+            except SystemExit as e:
+                code = e.code
+            except Exception:
+                code = 1
+            result.latencies_ms.append((time.perf_counter() - t0) * 1000)
+            if code:
+                result.failures += 1
+    result.wall_s = time.perf_counter() - start
+    return result
+
+
+def measure(command: str, fleet_root: Path) -> CommandResult:
+    """Run a command over a fleet in a worker process and record its peak RSS.
+
+    Args:
+        command: Benchmarked command
+        fleet_root: Fleet directory
+
+    Returns:
+        Full result
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / "result.json"
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.run", "worker", command, str(fleet_root), str(out)],
+            cwd=Path(__file__).parent.parent,
+        )
+        peak_rss_mb = None
+        if hasattr(os, "wait4"):
+            _, status, rusage = os.wait4(proc.pid, 0)
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            # ru_maxrss is in kilobytes on Linux and bytes on macOS
+            scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+            peak_rss_mb = round(rusage.ru_maxrss / scale, 1)
+        else:
+            proc.wait()
+        if proc.returncode != 0:
+            raise RuntimeError(f"Benchmark worker for '{command}' exited with {proc.returncode}")
+
+        data = json.loads(out.read_text(encoding="utf-8"))
+
+    return CommandResult(peak_rss_mb=peak_rss_mb, **data)
+
+
+def compare(
+    current: dict[str, dict[str, Any]], baseline: dict[str, dict[str, Any]], threshold: float
+) -> list[str]:
+    """Find regressions against a baseline.
+
+    Args:
+        current: Per-command summaries of this run
+        baseline: Per-command summaries of the baseline
+        threshold: Allowed relative slowdown (0.25 = 25%)
+
+    Returns:
+        Human-readable regression descriptions (empty if none)
+    """
+    regressions = []
+    for command, now in current.items():
+        before = baseline.get(command)
+        if before is None:
+            continue
+
+        for metric in ("p50_ms", "p95_ms"):
+            limit = before[metric] * (1 + threshold)
+            if now[metric] > limit and now[metric] - before[metric] > MIN_LATENCY_DELTA_MS:
+                regressions.append(
+                    f"{command}: {metric} {now[metric]:.2f} > {before[metric]:.2f} (+{threshold:.0%})"
+                )
+
+        if now["projects_per_second"] < before["projects_per_second"] / (1 + threshold):
+            regressions.append(
+                f"{command}: projects/s {now['projects_per_second']:.1f} < "
+                f"{before['projects_per_second']:.1f} (-{threshold:.0%})"
+            )
+
+        if now.get("peak_rss_mb") and before.get("peak_rss_mb"):
+            if now["peak_rss_mb"] > before["peak_rss_mb"] * (1 + threshold):
+                regressions.append(
+                    f"{command}: peak RSS {now['peak_rss_mb']:.1f} MB > "
+                    f"{before['peak_rss_mb']:.1f} MB (+{threshold:.0%})"
+                )
+    return regressions
+
+
+@app.command()
+def run(
+    preset: str = typer.Option("small", "--preset", help=f"Fleet preset ({', '.join(PRESETS)})"),
+    projects: int | None = typer.Option(None, "--projects", help="Number of projects"),
+    mix: str | None = typer.Option(None, "--mix", help="IDE mix, e.g. cursor=3,vscode=1"),
+    rule_sizes: str | None = typer.Option(
+        None, "--rule-sizes", help="Comma-separated rule sizes, e.g. 1KB,1MB,50MB"
+    ),
+    config_entries: int | None = typer.Option(
+        None, "--config-entries", help="Filler entries in Continue/Windsurf configs"
+    ),
+    commands: list[str] | None = typer.Option(
+        None, "--command", help="Command to benchmark (repeatable; defaults to all)"
+    ),
+    fleet_dir: Path | None = typer.Option(
+        None, "--fleet-dir", help="Generate the fleet here and keep it (default: temporary)"
+    ),
+    save_baseline: str | None = typer.Option(None, "--save-baseline", help="Save as baseline"),
+    compare_to: str | None = typer.Option(None, "--compare", help="Compare against a baseline"),
+    threshold: float = typer.Option(0.25, "--threshold", help="Allowed relative regression"),
+    output: Path | None = typer.Option(None, "--output", help="Write results as JSON"),
+) -> None:
+    """Generate a fleet and benchmark the CLI commands over it."""
+    if preset not in PRESETS:
+        console.print(f"[red]✗[/red] Unknown preset: {preset}")
+        raise typer.Exit(1)
+
+    try:
+        spec = replace(PRESETS[preset])
+        if projects is not None:
+            spec.projects = projects
+        if mix is not None:
+            spec.mix = parse_mix(mix)
+        if rule_sizes is not None:
+            spec.rule_sizes = [parse_size(size) for size in rule_sizes.split(",")]
+        if config_entries is not None:
+            spec.config_entries = config_entries
+        selected = commands or list(COMMANDS)
+        for command in selected:
+            if command not in COMMANDS:
+                raise ValueError(f"Unknown command: {command}")
+    except ValueError as e:
+        console.print(f"[red]✗[/red] {e}")
+        raise typer.Exit(1) from None
+
+    with contextlib.ExitStack() as stack:
+        if fleet_dir is None:
+            fleet_dir = Path(stack.enter_context(tempfile.TemporaryDirectory())) / "fleet"
+
+        t0 = time.perf_counter()
+        generate_fleet(fleet_dir, spec)
+        console.print(
+            f"[dim]Generated {spec.projects} projects in {time.perf_counter() - t0:.1f}s[/dim]"
+        )
+
+        results = {command: measure(command, fleet_dir).summary() for command in selected}
+
+    _print_results(results)
+    report = {
+        "preset": preset,
+        "spec": asdict(spec),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    if output:
+        output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if save_baseline:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        baseline_file = BASELINE_DIR / f"{save_baseline}.json"
+        baseline_file.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        console.print(f"[green]✓[/green] Saved baseline {baseline_file}")
+
+    if compare_to:
+        baseline_file = BASELINE_DIR / f"{compare_to}.json"
+        if not baseline_file.exists():
+            console.print(f"[yellow]⊘[/yellow] No baseline at {baseline_file}, skipping compare")
+            return
+        baseline = json.loads(baseline_file.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline["results"], threshold)
+        if regressions:
+            console.print("[red]✗ Regressions:[/red]")
+            for regression in regressions:
+                console.print(f"  • {regression}")
+            raise typer.Exit(1)
+        console.print(f"[green]✓[/green] No regressions against {compare_to}")
+
+
+@app.command(hidden=True)
+def worker(command: str, fleet_root: Path, out: Path) -> None:
+    """Run one command over a fleet and write raw timings (internal)."""
+    result = run_in_process(command, fleet_root)
+    data = asdict(result)
+    data.pop("peak_rss_mb")
+    out.write_text(json.dumps(data), encoding="utf-8")
+
+
+def _print_results(results: dict[str, dict[str, Any]]) -> None:
+    """Print a results table.
+
+    Args:
+        results: Per-command summaries
+    """
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Command", style="cyan")
+    for column in (
+        "Projects",
+        "Failures",
+        "p50 ms",
+        "p95 ms",
+        "Max ms",
+        "Projects/s",
+        "Peak RSS MB",
+    ):
+        table.add_column(column, justify="right")
+    for command, summary in results.items():
+        table.add_row(
+            command,
+            str(summary["projects"]),
+            str(summary["failures"]),
+            f"{summary['p50_ms']:.2f}",
+            f"{summary['p95_ms']:.2f}",
+            f"{summary['max_ms']:.2f}",
+            f"{summary['projects_per_second']:.1f}",
+            "-" if summary["peak_rss_mb"] is None else f"{summary['peak_rss_mb']:.1f}",
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,249 @@
+"""Count filesystem syscalls per CLI command, without strace.
+
+``SyscallCounter`` temporarily wraps the ``os`` and ``io`` functions that map
+one-to-one onto filesystem syscalls (``stat``, ``lstat``, ``open``,
+``scandir``, ``mkdir``, ...), so every call made through ``pathlib``,
+``shutil`` or directly is counted. Each command runs once per project of a
+synthetic fleet after a warm-up run, and the average count per project is
+reported::
+
+    python -m benchmarks.syscalls --projects 10
+    python -m benchmarks.syscalls --save-baseline syscalls
+    python -m benchmarks.syscalls --compare syscalls
+
+On network filesystems each of these calls is a round-trip, so the counts
+are a proxy for latency there.
+"""
+
+import builtins
+import contextlib
+import io
+import json
+import os
+import tempfile
+from collections import Counter
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks.fleet import FleetSpec, generate_fleet, load_fleet
+
+# Functions of the os module that issue exactly one filesystem syscall
+OS_CALLS = (
+    "stat",
+    "lstat",
+    "open",
+    "scandir",
+    "listdir",
+    "mkdir",
+    "unlink",
+    "rename",
+    "replace",
+    "link",
+    "symlink",
+    "readlink",
+    "chmod",
+    "utime",
+    "access",
+)
+COMMANDS = ("detect", "validate", "import", "export", "check")
+BASELINE_DIR = Path(__file__).parent / "baselines"
+
+app = typer.Typer(help="Count filesystem syscalls per command", add_completion=False)
+console = Console()
+
+
+class SyscallCounter:
+    """Count calls to filesystem functions while active."""
+
+    def __init__(self) -> None:
+        """Initialize an inactive counter."""
+        self.counts: Counter[str] = Counter()
+        self._saved: list[tuple[Any, str, Callable[..., Any]]] = []
+
+    def __enter__(self) -> "SyscallCounter":
+        for name in OS_CALLS:
+            self._patch(os, name, name)
+        # Path.read_text/open and shutil go through io.open / builtins.open
+        self._patch(io, "open", "open")
+        self._patch(builtins, "open", "open")
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        for module, name, original in reversed(self._saved):
+            setattr(module, name, original)
+        self._saved.clear()
+
+    @property
+    def total(self) -> int:
+        """Total calls counted."""
+        return sum(self.counts.values())
+
+    def _patch(self, module: Any, name: str, label: str) -> None:
+        """Replace a module function with a counting wrapper.
+
+        Args:
+            module: Module holding the function
+            name: Function name
+            label: Name to count calls under
+        """
+        original = getattr(module, name, None)
+        if original is None:
+            return
+        counts = self.counts
+
+        def counting(*args: Any, **kwargs: Any) -> Any:
+            counts[label] += 1
+            return original(*args, **kwargs)
+
+        self._saved.append((module, name, original))
+        setattr(module, name, counting)
+
+
+def command_args(command: str, project: Path, ide: str) -> list[str]:
+    """Build the CLI arguments for one project.
+
+    Args:
+        command: Measured command
+        project: Project root
+        ide: IDE whose artifacts the project holds
+
+    Returns:
+        Arguments for the ide-context-porter CLI
+    """
+    if command == "detect":
+        return ["detect", str(project)]
+    if command == "validate":
+        return ["validate", str(project)]
+    if command == "import":
+        return ["import", "--from", ide, "--path", str(project), "--force"]
+    if command == "export":
+        return ["export", "--to", "all", "--path", str(project), "--force"]
+    if command == "check":
+        return ["check", str(project), "--json"]
+    raise ValueError(f"Unknown command: {command}")
+
+
+def count_command(command: str, fleet: dict[Path, str]) -> dict[str, float]:
+    """Count the syscalls of one command, averaged over the fleet.
+
+    Args:
+        command: Measured command
+        fleet: Mapping of project path to IDE
+
+    Returns:
+        Average calls per project, by syscall and in total
+    """
+    from ideporter.cli import app as cli_app
+
+    def invoke(project: Path, ide: str) -> None:
+        with contextlib.suppress(SystemExit):
+            cli_app(command_args(command, project, ide), standalone_mode=False)
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        # Warm up imports and lazily created state outside the measurement
+        invoke(*next(iter(fleet.items())))
+        with SyscallCounter() as counter:
+            for project, ide in fleet.items():
+                invoke(project, ide)
+
+    averages = {
+        name: round(count / len(fleet), 2) for name, count in sorted(counter.counts.items())
+    }
+    averages["total"] = round(counter.total / len(fleet), 2)
+    return averages
+
+
+@contextlib.contextmanager
+def _fleet(projects: int) -> Iterator[dict[Path, str]]:
+    """Generate a temporary fleet with small rules.
+
+    Args:
+        projects: Number of projects
+
+    Yields:
+        Mapping of project path to IDE
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "fleet"
+        generate_fleet(root, FleetSpec(projects=projects, config_entries=10))
+        yield load_fleet(root)
+
+
+@app.command()
+def run(
+    projects: int = typer.Option(8, "--projects", min=1, help="Number of projects"),
+    commands: list[str] | None = typer.Option(
+        None, "--command", help="Command to measure (repeatable; defaults to all)"
+    ),
+    save_baseline: str | None = typer.Option(None, "--save-baseline", help="Save as baseline"),
+    compare_to: str | None = typer.Option(None, "--compare", help="Compare against a baseline"),
+) -> None:
+    """Count filesystem syscalls per project for each command."""
+    selected = commands or list(COMMANDS)
+    for command in selected:
+        if command not in COMMANDS:
+            console.print(f"[red]✗[/red] Unknown command: {command}")
+            raise typer.Exit(1)
+
+    results: dict[str, dict[str, float]] = {}
+    for command in selected:
+        # A fresh fleet per command, so earlier commands' writes do not leak in
+        with _fleet(projects) as fleet:
+            results[command] = count_command(command, fleet)
+
+    _print_results(results)
+
+    if save_baseline:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        baseline_file = BASELINE_DIR / f"{save_baseline}.json"
+        baseline_file.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        console.print(f"[green]✓[/green] Saved baseline {baseline_file}")
+
+    if compare_to:
+        baseline_file = BASELINE_DIR / f"{compare_to}.json"
+        if not baseline_file.exists():
+            console.print(f"[yellow]⊘[/yellow] No baseline at {baseline_file}, skipping compare")
+            return
+        baseline = json.loads(baseline_file.read_text(encoding="utf-8"))
+        regressions = [
+            f"{command}: {counts['total']:.1f} > {baseline[command]['total']:.1f} calls/project"
+            for command, counts in results.items()
+            if command in baseline and counts["total"] > baseline[command]["total"]
+        ]
+        if regressions:
+            console.print("[red]✗ Regressions:[/red]")
+            for regression in regressions:
+                console.print(f"  • {regression}")
+            raise typer.Exit(1)
+        console.print(f"[green]✓[/green] No regressions against {compare_to}")
+
+
+def _print_results(results: dict[str, dict[str, float]]) -> None:
+    """Print a table of calls per project.
+
+    Args:
+        results: Per-command averages
+    """
+    names = sorted({name for counts in results.values() for name in counts} - {"total"})
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Command", style="cyan")
+    for name in [*names, "total"]:
+        table.add_column(name, justify="right")
+    for command, counts in results.items():
+        table.add_row(command, *(f"{counts.get(name, 0):g}" for name in [*names, "total"]))
+    console.print(table)
+
+
+if __name__ == "__main__":
+    app()
@@ -1,9 +1,13 @@
 """IDE adapters for context import/export."""
 
+import threading
+from pathlib import Path
+
 from ideporter.adapters.base import BaseAdapter
 from ideporter.adapters.claude import ClaudeAdapter
 from ideporter.adapters.continue_adapter import ContinueAdapter
 from ideporter.adapters.cursor import CursorAdapter
+from ideporter.adapters.spec import AdapterSpecError, SpecAdapter, load_specs, spec_dirs
 from ideporter.adapters.vscode import VSCodeAdapter
 from ideporter.adapters.windsurf import WindsurfAdapter
 
@@ -15,6 +19,40 @@ ADAPTERS: dict[str, type[BaseAdapter]] = {
     "claude": ClaudeAdapter,
     "windsurf": WindsurfAdapter,
 }
+BUILTIN_ADAPTERS = frozenset(ADAPTERS)
+
+_specs_lock = threading.Lock()
+_specs_loaded = False
+_spec_errors: list[str] = []
+
+
+def available_adapters() -> dict[str, type[BaseAdapter]]:
+    """Get every adapter, registering spec adapters the first time one is needed.
+
+    Specs are read once per process, so commands that never look up an
+    adapter do not touch the spec or cache directories. Specs that cannot be
+    loaded are skipped and listed by :func:`spec_errors`.
+
+    Returns:
+        The adapter registry (``ADAPTERS``), built-in adapters first
+    """
+    if not _specs_loaded:
+        with _specs_lock:
+            if not _specs_loaded:
+                register_spec_adapters()
+    return ADAPTERS
+
+
+def spec_errors() -> list[str]:
+    """Get the specs skipped by the last spec load.
+
+    Specs are not loaded by this call, so it is empty until an adapter has
+    been looked up.
+
+    Returns:
+        One message per spec that could not be loaded
+    """
+    return list(_spec_errors)
 
 
 def get_adapter(name: str) -> type[BaseAdapter]:
@@ -29,10 +67,51 @@ def get_adapter(name: str) -> type[BaseAdapter]:
     Raises:
         ValueError: If adapter not found
     """
-    if name not in ADAPTERS:
-        available = ", ".join(ADAPTERS.keys())
+    adapters = available_adapters()
+    if name not in adapters:
+        available = ", ".join(adapters.keys())
         raise ValueError(f"Unknown adapter '{name}'. Available: {available}")
-    return ADAPTERS[name]
+    return adapters[name]
+
+
+def register_spec_adapters(directories: list[Path] | None = None) -> list[str]:
+    """Register the adapters described by YAML specs.
+
+    Spec adapters registered earlier are replaced, so removed specs disappear.
+
+    Args:
+        directories: Directories to load specs from (defaults to spec_dirs())
+
+    Returns:
+        One message per spec that could not be loaded
+    """
+    global _specs_loaded, _spec_errors
+    adapters, errors = load_specs(
+        spec_dirs() if directories is None else directories, reserved=set(BUILTIN_ADAPTERS)
+    )
+    for name in [name for name in ADAPTERS if name not in BUILTIN_ADAPTERS]:
+        if issubclass(ADAPTERS[name], SpecAdapter):
+            del ADAPTERS[name]
+    ADAPTERS.update(adapters)
+    _spec_errors = errors
+    _specs_loaded = True
+    return errors
+
+
+def link_targets(project_path: Path, canonical_dir: Path) -> dict[Path, Path]:
+    """Collect every adapter's link targets for a project.
+
+    Args:
+        project_path: Path to the project root
+        canonical_dir: Path to canonical context directory
+
+    Returns:
+        Mapping of IDE file path to the canonical file it mirrors
+    """
+    links: dict[Path, Path] = {}
+    for adapter_class in available_adapters().values():
+        links.update(adapter_class(project_path).link_targets(canonical_dir))
+    return links
 
 
 __all__ = [
@@ -42,6 +121,13 @@ __all__ = [
     "ContinueAdapter",
     "ClaudeAdapter",
     "WindsurfAdapter",
+    "SpecAdapter",
+    "AdapterSpecError",
     "ADAPTERS",
+    "BUILTIN_ADAPTERS",
+    "available_adapters",
     "get_adapter",
+    "register_spec_adapters",
+    "spec_errors",
+    "link_targets",
 ]
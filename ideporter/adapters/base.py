@@ -1,30 +1,75 @@
-"""Base adapter interface for IDE context import/export."""
+"""Base adapter interface for IDE context import/export.
 
+Adapters are split into a pure half and an engine-driven half: ``plan()``
+renders the files an import or export should produce as a list of
+``ideporter.plan.Operation`` objects without writing anything, and
+``apply()`` hands them to ``ideporter.plan.apply_plan``, which skips files
+that are already current and writes the rest. ``import_context`` and
+``export_context`` default to ``apply(plan(...))``; adapters written before
+the split that override them and call ``write_output`` keep working.
+"""
+
+import asyncio
+import copy
 from abc import ABC, abstractmethod
+from dataclasses import replace
 from pathlib import Path
+from typing import Any, Literal
+
+from rich.console import Console
+
+from ideporter import fsio
+from ideporter.plan import Applied, Operation, apply_plan, write_operations
+from ideporter.profiling import profiled
+from ideporter.sources import FileSource, RecordingSource
+
+console = Console()
+
+# Adapter methods timed under --profile, labelled "<adapter>.<method>"
+PROFILED_METHODS = ("detect", "import_context", "export_context", "render_export", "render_import")
 
 
 class BaseAdapter(ABC):
     """Base class for IDE adapters."""
 
-    def __init__(self, project_path: Path):
+    # Bump when rendered output changes for the same inputs, so cached renders
+    # (see ideporter.rendercache) are not reused
+    version: str = "1"
+
+    # Files relative to the project root that export writes for this IDE; the
+    # pre-commit hook (see ideporter.hook) checks the adapter when one is staged
+    artifact_paths: tuple[str, ...] = ()
+
+    def __init__(self, project_path: Path, source: FileSource | None = None):
         """Initialize adapter.
 
         Args:
             project_path: Path to the project root
+            source: Read files under project_path from this source instead of disk
         """
         self.project_path = project_path
+        self.source = source
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Wrap concrete adapter operations with profiling timers."""
+        super().__init_subclass__(**kwargs)
+        label = cls.__name__.removesuffix("Adapter").lower()
+        for method in PROFILED_METHODS:
+            func = cls.__dict__.get(method)
+            if func is not None:
+                setattr(cls, method, profiled(f"{label}.{method}", "adapter")(func))
 
     @abstractmethod
     def detect(self) -> bool:
         """Detect if this IDE's artifacts exist in the project.
 
+        Probe with ``path_exists`` so detection sees the adapter's source.
+
         Returns:
             True if IDE artifacts are detected
         """
         pass
 
-    @abstractmethod
     def import_context(
         self, canonical_dir: Path, force: bool = False, dry_run: bool = False
     ) -> None:
@@ -35,9 +80,8 @@ class BaseAdapter(ABC):
             force: Skip backups if True
             dry_run: Only preview operations if True
         """
-        pass
+        self.apply(self.plan(canonical_dir, "import"), force=force, dry_run=dry_run)
 
-    @abstractmethod
     def export_context(
         self, canonical_dir: Path, force: bool = False, dry_run: bool = False
     ) -> None:
@@ -48,7 +92,256 @@ class BaseAdapter(ABC):
             force: Skip backups if True
             dry_run: Only preview operations if True
         """
-        pass
+        self.apply(self.plan(canonical_dir, "export"), force=force, dry_run=dry_run)
+
+    def plan(
+        self, canonical_dir: Path, direction: Literal["import", "export"] = "export"
+    ) -> list[Operation]:
+        """Plan the files an import or export would produce, without writing them.
+
+        Operations carry fingerprints of every project file read while
+        rendering, so callers can tell when a plan has gone stale.
+
+        Args:
+            canonical_dir: Path to canonical context directory
+            direction: "export" for IDE files, "import" for canonical files
+
+        Returns:
+            One write operation per rendered file
+
+        Raises:
+            NotImplementedError: If the adapter cannot render in memory
+        """
+        try:
+            canonical_dir.relative_to(self.project_path)
+            recorder: RecordingSource | None = RecordingSource(self.project_path, self.source)
+        except ValueError:
+            # Files outside the project cannot be read through a source
+            recorder = None
+
+        adapter = self if recorder is None else self.with_source(recorder)
+        if direction == "export":
+            outputs = adapter.render_export(canonical_dir)
+        else:
+            outputs = adapter.render_import(canonical_dir)
+        sources = recorder.fingerprints() if recorder is not None else None
+        return write_operations(outputs, adapter=self.name, sources=sources)
+
+    def plan_linked(self, canonical_dir: Path, mode: str) -> list[Operation]:
+        """Plan an export that links outputs to canonical files instead of copying them.
+
+        Outputs that differ from the canonical file on disk (e.g. because
+        layers are merged in) stay plain writes.
+
+        Args:
+            canonical_dir: Path to canonical context directory
+            mode: One of ideporter.linking.LINK_MODES
+
+        Returns:
+            Planned operations
+        """
+        links = self.link_targets(canonical_dir)
+        return [
+            (
+                replace(operation, mode=mode, target=links[operation.path])
+                if operation.path in links and _mirrors(links[operation.path], operation.content)
+                else operation
+            )
+            for operation in self.plan(canonical_dir, "export")
+        ]
+
+    def apply(
+        self, operations: list[Operation], force: bool = False, dry_run: bool = False
+    ) -> list[Applied]:
+        """Apply planned operations, skipping files that are already current.
+
+        Args:
+            operations: Operations from plan() or plan_linked()
+            force: Skip backups if True
+            dry_run: Only preview operations if True
+
+        Returns:
+            Outcome of each operation
+        """
+        return apply_plan(operations, force=force, dry_run=dry_run)
+
+    def with_source(self, source: FileSource | None) -> "BaseAdapter":
+        """Get a copy of this adapter that reads project files from another source.
+
+        Args:
+            source: Source to read through, or None for the disk
+
+        Returns:
+            Adapter copy; this adapter is left unchanged
+        """
+        clone = copy.copy(self)
+        clone.source = source
+        return clone
+
+    def render_export(self, canonical_dir: Path) -> dict[Path, str]:
+        """Render the IDE-specific files an export would write, without writing them.
+
+        Adapters that support read-only checks override this. It must not print
+        or touch the filesystem beyond reading.
+
+        Args:
+            canonical_dir: Path to canonical context directory
+
+        Returns:
+            Mapping of output file path to expected content
+
+        Raises:
+            NotImplementedError: If the adapter cannot render in memory
+        """
+        raise NotImplementedError(f"Adapter '{self.name}' does not support rendering")
+
+    def render_import(self, canonical_dir: Path) -> dict[Path, str]:
+        """Render the canonical files an import would write, without writing them.
+
+        Args:
+            canonical_dir: Path to canonical context directory
+
+        Returns:
+            Mapping of canonical file path to content
+
+        Raises:
+            NotImplementedError: If the adapter cannot render in memory
+        """
+        raise NotImplementedError(f"Adapter '{self.name}' does not support rendering")
+
+    def link_targets(self, canonical_dir: Path) -> dict[Path, Path]:
+        """Map outputs that are verbatim copies of a canonical file to that file.
+
+        Adapters override this to support ``export --link``.
+
+        Args:
+            canonical_dir: Path to canonical context directory
+
+        Returns:
+            Mapping of output file path to canonical file path
+        """
+        return {}
+
+    def export_linked(
+        self, canonical_dir: Path, mode: str, force: bool = False, dry_run: bool = False
+    ) -> None:
+        """Export, linking outputs to canonical files instead of copying them.
+
+        Outputs that differ from the canonical file on disk (e.g. because
+        layers are merged in) and adapters without link targets are written
+        as usual.
+
+        Args:
+            canonical_dir: Path to canonical context directory
+            mode: One of ideporter.linking.LINK_MODES
+            force: Skip backups if True
+            dry_run: Only preview operations if True
+        """
+        if not self.link_targets(canonical_dir):
+            console.print(f"[yellow]⊘[/yellow] {self.name} files cannot be linked, writing copies")
+            self.export_context(canonical_dir, force=force, dry_run=dry_run)
+            return
+
+        self.apply(self.plan_linked(canonical_dir, mode), force=force, dry_run=dry_run)
+
+    async def async_import_context(
+        self, canonical_dir: Path, force: bool = False, dry_run: bool = False
+    ) -> None:
+        """Run import_context in a worker thread.
+
+        Args:
+            canonical_dir: Path to canonical context directory
+            force: Skip backups if True
+            dry_run: Only preview operations if True
+        """
+        await asyncio.to_thread(self.import_context, canonical_dir, force, dry_run)
+
+    async def async_export_context(
+        self, canonical_dir: Path, force: bool = False, dry_run: bool = False
+    ) -> None:
+        """Run export_context in a worker thread.
+
+        Args:
+            canonical_dir: Path to canonical context directory
+            force: Skip backups if True
+            dry_run: Only preview operations if True
+        """
+        await asyncio.to_thread(self.export_context, canonical_dir, force, dry_run)
+
+    async def async_render_export(self, canonical_dir: Path) -> dict[Path, str]:
+        """Run render_export in a worker thread.
+
+        Args:
+            canonical_dir: Path to canonical context directory
+
+        Returns:
+            Mapping of output file path to expected content
+        """
+        return await asyncio.to_thread(self.render_export, canonical_dir)
+
+    async def async_render_import(self, canonical_dir: Path) -> dict[Path, str]:
+        """Run render_import in a worker thread.
+
+        Args:
+            canonical_dir: Path to canonical context directory
+
+        Returns:
+            Mapping of canonical file path to content
+        """
+        return await asyncio.to_thread(self.render_import, canonical_dir)
+
+    def write_output(
+        self, file_path: Path, content: str, force: bool = False, dry_run: bool = False
+    ) -> bool:
+        """Write one rendered file unless it is already up to date.
+
+        Args:
+            file_path: Path to write to
+            content: Rendered content
+            force: Skip backups if True
+            dry_run: Only preview operations if True
+
+        Returns:
+            True if the file was (or would be) written
+        """
+        return write_output(file_path, content, force=force, dry_run=dry_run)
+
+    @profiled("adapter.read_file", "adapter")
+    def read_file(self, file_path: Path) -> str | None:
+        """Read a file the adapter depends on.
+
+        Args:
+            file_path: Path to read from
+
+        Returns:
+            File contents, or None if the file does not exist
+        """
+        if self.source is not None:
+            try:
+                relpath = file_path.relative_to(self.project_path).as_posix()
+            except ValueError:
+                return None
+            return self.source.read_text(relpath)
+
+        return fsio.read_text(file_path)
+
+    def path_exists(self, path: Path) -> bool:
+        """Check whether a file or directory the adapter probes exists.
+
+        Args:
+            path: Path to check
+
+        Returns:
+            True if the path exists in the adapter's source (or on disk)
+        """
+        if self.source is not None:
+            try:
+                relpath = path.relative_to(self.project_path).as_posix()
+            except ValueError:
+                return False
+            return self.source.exists(relpath)
+
+        return fsio.exists(path)
 
     @property
     @abstractmethod
@@ -59,3 +352,37 @@ class BaseAdapter(ABC):
             Adapter name
         """
         pass
+
+
+def _mirrors(target: Path, content: str) -> bool:
+    """Check whether a canonical file on disk holds exactly the rendered content.
+
+    Args:
+        target: Canonical file
+        content: Rendered output
+
+    Returns:
+        True if linking to the file is equivalent to writing the content
+    """
+    try:
+        return target.read_text(encoding="utf-8") == content
+    except (OSError, UnicodeDecodeError):
+        return False
+
+
+def write_output(file_path: Path, content: str, force: bool = False, dry_run: bool = False) -> bool:
+    """Write one rendered file unless it is already up to date.
+
+    Markdown files report how many of their sections changed.
+
+    Args:
+        file_path: Path to write to
+        content: Rendered content
+        force: Skip backups if True
+        dry_run: Only preview operations if True
+
+    Returns:
+        True if the file was (or would be) written
+    """
+    (applied,) = apply_plan([Operation(file_path, content)], force=force, dry_run=dry_run)
+    return applied.changed
@@ -5,7 +5,6 @@ from pathlib import Path
 from rich.console import Console
 
 from ideporter.adapters.base import BaseAdapter
-from ideporter.utils import safe_read, safe_write
 
 console = Console()
 
@@ -25,7 +24,7 @@ class ClaudeAdapter(BaseAdapter):
     def detect(self) -> bool:
         """Detect if Claude artifacts exist."""
         claude_dir = self.project_path / ".claude"
-        return claude_dir.exists()
+        return self.path_exists(claude_dir)
 
     def import_context(
         self, canonical_dir: Path, force: bool = False, dry_run: bool = False
@@ -39,35 +38,39 @@ class ClaudeAdapter(BaseAdapter):
             "[dim]Tip: Copy your Claude project instructions manually to ai/context/rules.md[/dim]"
         )
 
+    def render_import(self, canonical_dir: Path) -> dict[Path, str]:
+        """Claude's format is opaque, so there is nothing to import automatically."""
+        return {}
+
     def export_context(
         self, canonical_dir: Path, force: bool = False, dry_run: bool = False
     ) -> None:
         """Export to Claude by generating a CLAUDE_IMPORT.md instruction file."""
-        rules_file = canonical_dir / "rules.md"
-        context_file = canonical_dir / "context.md"
+        operations = self.plan(canonical_dir, "export")
+        import_file = canonical_dir / "CLAUDE_IMPORT.md"
 
-        if not rules_file.exists():
+        if not operations:
             console.print("[yellow]⊘[/yellow] No rules.md to export")
             return
 
-        # Read canonical content
-        rules_content = safe_read(rules_file)
-        context_content = ""
-        if context_file.exists():
-            context_content = safe_read(context_file)
-
-        # Generate import instructions
-        import_instructions = self._generate_import_instructions(rules_content, context_content)
-
         # Write to ai/context/CLAUDE_IMPORT.md
-        import_file = canonical_dir / "CLAUDE_IMPORT.md"
-        safe_write(import_file, import_instructions, force=force, dry_run=dry_run)
+        self.apply(operations, force=force, dry_run=dry_run)
 
         console.print("[green]✓[/green] Generated CLAUDE_IMPORT.md with manual import instructions")
         console.print(
             f"[dim]→ Open {import_file} and copy the content to Claude Code's project settings[/dim]"
         )
 
+    def render_export(self, canonical_dir: Path) -> dict[Path, str]:
+        """Render ai/context/CLAUDE_IMPORT.md from canonical format."""
+        rules_content = self.read_file(canonical_dir / "rules.md")
+        if rules_content is None:
+            return {}
+
+        context_content = self.read_file(canonical_dir / "context.md") or ""
+        import_instructions = self._generate_import_instructions(rules_content, context_content)
+        return {canonical_dir / "CLAUDE_IMPORT.md": import_instructions}
+
     def _generate_import_instructions(self, rules: str, context: str) -> str:
         """Generate import instructions for Claude Code.
 
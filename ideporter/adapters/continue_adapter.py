@@ -2,18 +2,27 @@
 
 import json
 from pathlib import Path
+from typing import Any
 
 from rich.console import Console
 
 from ideporter.adapters.base import BaseAdapter
-from ideporter.utils import load_json, safe_read, save_json
+from ideporter.sections import parse_sections
+from ideporter.utils import dump_json
 
 console = Console()
 
+# Prompts generated from rules.md carry this source so they can be told apart
+# from prompts the user wrote
+RULES_SOURCE = "ai/context/rules.md"
+LEGACY_PROMPT_NAME = "AI Context (Canonical)"
+
 
 class ContinueAdapter(BaseAdapter):
     """Adapter for Continue.dev (.continue/config.json)."""
 
+    artifact_paths = (".continue/config.json",)
+
     @property
     def name(self) -> str:
         """Get the adapter name."""
@@ -23,96 +32,151 @@ class ContinueAdapter(BaseAdapter):
         """Detect if Continue artifacts exist."""
         continue_dir = self.project_path / ".continue"
         config_file = continue_dir / "config.json"
-        return config_file.exists()
+        return self.path_exists(config_file)
 
     def import_context(
         self, canonical_dir: Path, force: bool = False, dry_run: bool = False
     ) -> None:
         """Import from .continue/config.json to canonical format."""
-        continue_dir = self.project_path / ".continue"
-        config_file = continue_dir / "config.json"
+        try:
+            operations = self.plan(canonical_dir, "import")
+        except json.JSONDecodeError as e:
+            console.print(f"[red]✗[/red] Failed to parse config.json: {e}")
+            return
 
-        if not config_file.exists():
-            console.print("[yellow]⊘[/yellow] No .continue/config.json found")
+        if not operations:
+            console.print("[yellow]⊘[/yellow] No project prompts found in .continue/config.json")
             return
 
-        try:
-            config = load_json(config_file)
-            console.print(f"[green]✓[/green] Read {config_file}")
+        self.apply(operations, force=force, dry_run=dry_run)
 
-            # Extract project prompts if they exist
-            project_prompts = config.get("projectPrompts", [])
+        console.print("[green]✓[/green] Imported Continue context to canonical format")
 
-            if project_prompts:
-                # Combine all prompts into rules
-                rules_content = "# AI Project Rules\n\n"
-                rules_content += "## Continue.dev Project Prompts\n\n"
+    def render_import(self, canonical_dir: Path) -> dict[Path, str]:
+        """Render canonical rules.md from the project prompts in .continue/config.json."""
+        existing = self.read_file(self.project_path / ".continue" / "config.json")
+        if existing is None:
+            return {}
 
-                for prompt in project_prompts:
-                    if isinstance(prompt, str):
-                        rules_content += f"{prompt}\n\n"
-                    elif isinstance(prompt, dict):
-                        name = prompt.get("name", "Unnamed")
-                        content = prompt.get("content", "")
-                        rules_content += f"### {name}\n\n{content}\n\n"
+        config = json.loads(existing)
+        if not isinstance(config, dict):
+            return {}
 
-                from ideporter.utils import safe_write
+        # Extract project prompts if they exist
+        project_prompts = config.get("projectPrompts", [])
+        if not project_prompts:
+            return {}
 
-                rules_file = canonical_dir / "rules.md"
-                safe_write(rules_file, rules_content, force=force, dry_run=dry_run)
+        managed = [prompt for prompt in project_prompts if _is_managed(prompt)]
+        others = [
+            prompt
+            for prompt in project_prompts
+            if not _is_managed(prompt) and not _is_legacy(prompt)
+        ]
 
-            console.print("[green]✓[/green] Imported Continue context to canonical format")
+        if not managed and not others:
+            return {}
 
-        except json.JSONDecodeError as e:
-            console.print(f"[red]✗[/red] Failed to parse config.json: {e}")
+        # Section prompts reassemble rules.md exactly; other prompts are appended
+        if managed:
+            rules_content = "".join(str(prompt.get("content", "")) for prompt in managed)
+            if others:
+                rules_content = rules_content.rstrip("\n") + "\n\n"
+        else:
+            rules_content = "# AI Project Rules\n\n"
+        if others:
+            rules_content += "## Continue.dev Project Prompts\n\n"
+
+        for prompt in others:
+            if isinstance(prompt, str):
+                rules_content += f"{prompt}\n\n"
+            elif isinstance(prompt, dict):
+                name = prompt.get("name", "Unnamed")
+                content = prompt.get("content", "")
+                rules_content += f"### {name}\n\n{content}\n\n"
+
+        return {canonical_dir / "rules.md": rules_content}
 
     def export_context(
         self, canonical_dir: Path, force: bool = False, dry_run: bool = False
     ) -> None:
         """Export from canonical format to .continue/config.json."""
-        continue_dir = self.project_path / ".continue"
-        config_file = continue_dir / "config.json"
+        operations = self.plan(canonical_dir, "export")
+        if operations:
+            self.apply(operations, force=force, dry_run=dry_run)
+            console.print("[green]✓[/green] Exported canonical context to Continue format")
+        else:
+            console.print("[yellow]⊘[/yellow] No rules.md to export")
+
+    def render_export(self, canonical_dir: Path) -> dict[Path, str]:
+        """Render .continue/config.json, merging into any existing config."""
+        config_file = self.project_path / ".continue" / "config.json"
 
-        # Create .continue directory if it doesn't exist
-        if not dry_run:
-            continue_dir.mkdir(exist_ok=True)
+        rules_content = self.read_file(canonical_dir / "rules.md")
+        if rules_content is None:
+            return {}
 
-        # Load existing config or create new one
-        if config_file.exists():
+        # Load existing config or start a new one
+        config: dict[str, Any] = {}
+        existing = self.read_file(config_file)
+        if existing is not None:
             try:
-                config = load_json(config_file)
+                config = json.loads(existing)
             except json.JSONDecodeError:
-                console.print("[yellow]⊘[/yellow] Invalid config.json, creating new one")
                 config = {}
-        else:
-            config = {}
-
-        # Read canonical rules
-        rules_file = canonical_dir / "rules.md"
-        if rules_file.exists():
-            rules_content = safe_read(rules_file)
-
-            # Create a reference to the canonical context
-            project_prompts = config.get("projectPrompts", [])
-
-            # Add a reference prompt pointing to canonical location
-            reference_prompt = {
-                "name": "AI Context (Canonical)",
-                "content": f"See project AI context at: ai/context/rules.md\n\n{rules_content[:500]}...",
-            }
-
-            # Check if we already have this reference
-            has_reference = any(
-                isinstance(p, dict) and p.get("name") == "AI Context (Canonical)"
-                for p in project_prompts
+            if not isinstance(config, dict):
+                config = {}
+
+        # One prompt per top-level section; prompts of unchanged sections are kept as-is
+        existing_prompts = config.get("projectPrompts", [])
+        if not isinstance(existing_prompts, list):
+            existing_prompts = []
+        previous = {
+            (prompt.get("section"), prompt.get("hash")): prompt
+            for prompt in existing_prompts
+            if _is_managed(prompt)
+        }
+
+        project_prompts = [
+            prompt
+            for prompt in existing_prompts
+            if not _is_managed(prompt) and not _is_legacy(prompt)
+        ]
+        for block in parse_sections(rules_content).blocks():
+            project_prompts.append(
+                previous.get((block.id, block.hash))
+                or {
+                    "name": f"AI Context: {block.title}",
+                    "content": block.text,
+                    "source": RULES_SOURCE,
+                    "section": block.id,
+                    "hash": block.hash,
+                }
             )
 
-            if not has_reference:
-                project_prompts.append(reference_prompt)
+        config["projectPrompts"] = project_prompts
+        return {config_file: dump_json(config)}
 
-            config["projectPrompts"] = project_prompts
 
-            save_json(config_file, config, force=force, dry_run=dry_run)
-            console.print("[green]✓[/green] Exported canonical context to Continue format")
-        else:
-            console.print("[yellow]⊘[/yellow] No rules.md to export")
+def _is_managed(prompt: Any) -> bool:
+    """Check whether a project prompt was generated from a rules.md section.
+
+    Args:
+        prompt: Entry of projectPrompts
+
+    Returns:
+        True for section prompts written by export
+    """
+    return isinstance(prompt, dict) and prompt.get("source") == RULES_SOURCE
+
+
+def _is_legacy(prompt: Any) -> bool:
+    """Check whether a project prompt is the old truncated canonical reference.
+
+    Args:
+        prompt: Entry of projectPrompts
+
+    Returns:
+        True for the reference prompt written by earlier versions
+    """
+    return isinstance(prompt, dict) and prompt.get("name") == LEGACY_PROMPT_NAME
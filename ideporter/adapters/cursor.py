@@ -5,7 +5,6 @@ from pathlib import Path
 from rich.console import Console
 
 from ideporter.adapters.base import BaseAdapter
-from ideporter.utils import safe_read, safe_write
 
 console = Console()
 
@@ -13,6 +12,8 @@ console = Console()
 class CursorAdapter(BaseAdapter):
     """Adapter for Cursor IDE (.cursorrules, .cursorignore)."""
 
+    artifact_paths = (".cursorrules", ".cursorignore")
+
     @property
     def name(self) -> str:
         """Get the adapter name."""
@@ -22,67 +23,75 @@ class CursorAdapter(BaseAdapter):
         """Detect if Cursor artifacts exist."""
         cursorrules = self.project_path / ".cursorrules"
         cursorignore = self.project_path / ".cursorignore"
-        return cursorrules.exists() or cursorignore.exists()
+        return self.path_exists(cursorrules) or self.path_exists(cursorignore)
 
     def import_context(
         self, canonical_dir: Path, force: bool = False, dry_run: bool = False
     ) -> None:
         """Import from .cursorrules and .cursorignore to canonical format."""
-        cursorrules = self.project_path / ".cursorrules"
-        cursorignore = self.project_path / ".cursorignore"
+        operations = self.plan(canonical_dir, "import")
+        planned = {operation.path for operation in operations}
 
-        rules_content = ""
-        ignore_content = ""
-
-        # Read .cursorrules
-        if cursorrules.exists():
-            rules_content = safe_read(cursorrules)
-            console.print(f"[green]✓[/green] Read {cursorrules}")
-        else:
+        if canonical_dir / "rules.md" not in planned:
             console.print("[yellow]⊘[/yellow] No .cursorrules found")
-
-        # Read .cursorignore
-        if cursorignore.exists():
-            ignore_content = safe_read(cursorignore)
-            console.print(f"[green]✓[/green] Read {cursorignore}")
-        else:
+        if canonical_dir / "ignore.txt" not in planned:
             console.print("[yellow]⊘[/yellow] No .cursorignore found")
 
         # Write to canonical format
+        self.apply(operations, force=force, dry_run=dry_run)
+
+        console.print("[green]✓[/green] Imported Cursor context to canonical format")
+
+    def render_import(self, canonical_dir: Path) -> dict[Path, str]:
+        """Render canonical rules.md and ignore.txt from Cursor files."""
+        outputs: dict[Path, str] = {}
+
+        rules_content = self.read_file(self.project_path / ".cursorrules")
         if rules_content:
-            rules_file = canonical_dir / "rules.md"
             # Wrap in markdown if not already formatted
             if not rules_content.startswith("#"):
                 rules_content = f"# AI Project Rules\n\n{rules_content}"
-            safe_write(rules_file, rules_content, force=force, dry_run=dry_run)
+            outputs[canonical_dir / "rules.md"] = rules_content
 
+        ignore_content = self.read_file(self.project_path / ".cursorignore")
         if ignore_content:
-            ignore_file = canonical_dir / "ignore.txt"
-            safe_write(ignore_file, ignore_content, force=force, dry_run=dry_run)
+            outputs[canonical_dir / "ignore.txt"] = ignore_content
 
-        console.print("[green]✓[/green] Imported Cursor context to canonical format")
+        return outputs
 
     def export_context(
         self, canonical_dir: Path, force: bool = False, dry_run: bool = False
     ) -> None:
         """Export from canonical format to .cursorrules and .cursorignore."""
-        rules_file = canonical_dir / "rules.md"
-        ignore_file = canonical_dir / "ignore.txt"
-
-        # Export rules
-        if rules_file.exists():
-            rules_content = safe_read(rules_file)
-            cursorrules = self.project_path / ".cursorrules"
-            safe_write(cursorrules, rules_content, force=force, dry_run=dry_run)
-        else:
-            console.print("[yellow]⊘[/yellow] No rules.md to export")
+        operations = self.plan(canonical_dir, "export")
+        planned = {operation.path for operation in operations}
 
-        # Export ignore patterns
-        if ignore_file.exists():
-            ignore_content = safe_read(ignore_file)
-            cursorignore = self.project_path / ".cursorignore"
-            safe_write(cursorignore, ignore_content, force=force, dry_run=dry_run)
-        else:
+        if self.project_path / ".cursorrules" not in planned:
+            console.print("[yellow]⊘[/yellow] No rules.md to export")
+        if self.project_path / ".cursorignore" not in planned:
             console.print("[yellow]⊘[/yellow] No ignore.txt to export")
 
+        self.apply(operations, force=force, dry_run=dry_run)
+
         console.print("[green]✓[/green] Exported canonical context to Cursor format")
+
+    def render_export(self, canonical_dir: Path) -> dict[Path, str]:
+        """Render .cursorrules and .cursorignore from canonical format."""
+        outputs: dict[Path, str] = {}
+
+        rules_content = self.read_file(canonical_dir / "rules.md")
+        if rules_content is not None:
+            outputs[self.project_path / ".cursorrules"] = rules_content
+
+        ignore_content = self.read_file(canonical_dir / "ignore.txt")
+        if ignore_content is not None:
+            outputs[self.project_path / ".cursorignore"] = ignore_content
+
+        return outputs
+
+    def link_targets(self, canonical_dir: Path) -> dict[Path, Path]:
+        """Map .cursorrules and .cursorignore to the canonical files they mirror."""
+        return {
+            self.project_path / ".cursorrules": canonical_dir / "rules.md",
+            self.project_path / ".cursorignore": canonical_dir / "ignore.txt",
+        }
@@ -0,0 +1,574 @@
+"""Declarative adapters compiled from YAML specs.
+
+Most adapters copy canonical files to IDE files and back, or move a canonical
+file in and out of one key of a JSON or YAML config. A spec describes that
+without Python::
+
+    name: zed
+    description: Zed (.rules, .zed/settings.json)
+    detect: [.rules, .zed]          # any existing path means the IDE is used
+    files:                          # verbatim copies
+      - canonical: rules.md
+        path: .rules
+        title: "# AI Project Rules" # import: heading added if the file has none
+    keys:                           # one key of a structured file
+      - canonical: context.md
+        path: .zed/settings.json    # format from the suffix, or format: json|yaml
+        key: assistant.context      # dotted path, created on export
+        strip_title: true           # export without the leading "# Title" line
+        title: "# Project Context"  # import: heading put back
+
+Specs are loaded from the directories in ``IDEPORTER_ADAPTERS`` and from
+``~/.config/ideporter/adapters`` (``$XDG_CONFIG_HOME``) the first time an
+adapter is looked up, and registered next to the built-in adapters, so every
+command, the batch engine, the render cache and the pre-commit hook use them
+like any other adapter.
+
+Loading a spec hashes its bytes. Parsing and validating it is done once per
+distinct content: the normalized spec is stored as JSON under
+``~/.cache/ideporter/specs/<hash>.json`` and the compiled adapter class is
+kept per process. The spec hash is the adapter's ``version``, so renders
+cached for an older spec are not reused.
+"""
+
+import json
+import os
+import re
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Any, ClassVar
+
+import yaml
+from rich.console import Console
+
+from ideporter.adapters.base import BaseAdapter
+from ideporter.sections import strip_title
+from ideporter.utils import content_hash, dump_json, dump_yaml
+
+console = Console()
+
+SPEC_VERSION = 1
+SPEC_SUFFIXES = (".yaml", ".yml")
+FORMATS = ("json", "yaml")
+# Canonical files a spec may map (the manifest is managed by ideporter)
+MAPPABLE_FILES = ("rules.md", "context.md", "ignore.txt", "extensions.json")
+
+_NAME = re.compile(r"^[a-z][a-z0-9_-]*$")
+_COMPILED: dict[str, type["SpecAdapter"]] = {}
+
+
+class AdapterSpecError(ValueError):
+    """Raised when an adapter spec is malformed."""
+
+
+@dataclass(frozen=True)
+class FileMapping:
+    """A canonical file copied verbatim to an IDE file."""
+
+    canonical: str
+    path: str
+    title: str | None = None
+
+
+@dataclass(frozen=True)
+class KeyMapping:
+    """A canonical file stored under one key of a JSON or YAML file."""
+
+    canonical: str
+    path: str
+    key: list[str]
+    format: str
+    title: str | None = None
+    strip_title: bool = False
+
+
+@dataclass(frozen=True)
+class AdapterSpec:
+    """A validated adapter spec."""
+
+    name: str
+    digest: str
+    description: str = ""
+    detect: list[str] = field(default_factory=list)
+    files: list[FileMapping] = field(default_factory=list)
+    keys: list[KeyMapping] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "AdapterSpec":
+        """Rebuild a spec stored with asdict().
+
+        Args:
+            data: Normalized spec
+
+        Returns:
+            The spec
+        """
+        return cls(
+            name=data["name"],
+            digest=data["digest"],
+            description=data["description"],
+            detect=list(data["detect"]),
+            files=[FileMapping(**mapping) for mapping in data["files"]],
+            keys=[KeyMapping(**mapping) for mapping in data["keys"]],
+        )
+
+
+class SpecAdapter(BaseAdapter):
+    """Adapter driven by a compiled spec; see compile_spec()."""
+
+    spec: ClassVar[AdapterSpec]
+    # Compiled from the spec: key mappings grouped by the file they share
+    _key_files: ClassVar[dict[str, tuple[str, list[KeyMapping]]]]
+
+    @property
+    def name(self) -> str:
+        """Get the adapter name."""
+        return self.spec.name
+
+    def detect(self) -> bool:
+        """Detect if any of the spec's probe paths exist."""
+        return any(self.path_exists(self.project_path / relpath) for relpath in self.spec.detect)
+
+    def import_context(
+        self, canonical_dir: Path, force: bool = False, dry_run: bool = False
+    ) -> None:
+        """Import the spec's IDE files and keys to canonical format."""
+        operations = self.plan(canonical_dir, "import")
+        if not operations:
+            console.print(f"[yellow]⊘[/yellow] No {self.name} context found")
+            return
+        self.apply(operations, force=force, dry_run=dry_run)
+        console.print(f"[green]✓[/green] Imported {self.name} context to canonical format")
+
+    def export_context(
+        self, canonical_dir: Path, force: bool = False, dry_run: bool = False
+    ) -> None:
+        """Export canonical files to the spec's IDE files and keys."""
+        operations = self.plan(canonical_dir, "export")
+        if not operations:
+            console.print("[yellow]⊘[/yellow] No content to export")
+            return
+        self.apply(operations, force=force, dry_run=dry_run)
+        console.print(f"[green]✓[/green] Exported canonical context to {self.name} format")
+
+    def render_import(self, canonical_dir: Path) -> dict[Path, str]:
+        """Render canonical files from the spec's IDE files and keys."""
+        outputs: dict[Path, str] = {}
+        for file_mapping in self.spec.files:
+            target = canonical_dir / file_mapping.canonical
+            content = self.read_file(self.project_path / file_mapping.path)
+            if content and target not in outputs:
+                if file_mapping.title and not content.startswith("#"):
+                    content = f"{file_mapping.title}\n\n{content}"
+                outputs[target] = content
+
+        for relpath, (file_format, mappings) in self._key_files.items():
+            config = self._load(relpath, file_format)
+            for mapping in mappings:
+                target = canonical_dir / mapping.canonical
+                value = _get(config, mapping.key)
+                if isinstance(value, str) and value and target not in outputs:
+                    outputs[target] = f"{mapping.title}\n\n{value}" if mapping.title else value
+        return outputs
+
+    def render_export(self, canonical_dir: Path) -> dict[Path, str]:
+        """Render the spec's IDE files, merging keys into any existing configs."""
+        outputs: dict[Path, str] = {}
+        for file_mapping in self.spec.files:
+            content = self.read_file(canonical_dir / file_mapping.canonical)
+            if content is not None:
+                outputs[self.project_path / file_mapping.path] = content
+
+        for relpath, (file_format, mappings) in self._key_files.items():
+            config = self._load(relpath, file_format)
+            updated = False
+            for mapping in mappings:
+                content = self.read_file(canonical_dir / mapping.canonical)
+                if content is None:
+                    continue
+                _set(config, mapping.key, strip_title(content) if mapping.strip_title else content)
+                updated = True
+            if updated:
+                dump = dump_json(config) + "\n" if file_format == "json" else dump_yaml(config)
+                outputs[self.project_path / relpath] = dump
+        return outputs
+
+    def link_targets(self, canonical_dir: Path) -> dict[Path, Path]:
+        """Map verbatim copies to the canonical files they mirror."""
+        return {
+            self.project_path / mapping.path: canonical_dir / mapping.canonical
+            for mapping in self.spec.files
+        }
+
+    def _load(self, relpath: str, file_format: str) -> dict[str, Any]:
+        """Read a structured IDE file, treating a missing or malformed one as empty.
+
+        Args:
+            relpath: File relative to the project
+            file_format: "json" or "yaml"
+
+        Returns:
+            Parsed mapping
+        """
+        existing = self.read_file(self.project_path / relpath)
+        if existing is None:
+            return {}
+        try:
+            config = json.loads(existing) if file_format == "json" else yaml.safe_load(existing)
+        except (json.JSONDecodeError, yaml.YAMLError):
+            return {}
+        return config if isinstance(config, dict) else {}
+
+
+def parse_spec(content: str, origin: str = "<spec>") -> AdapterSpec:
+    """Parse and validate a YAML adapter spec.
+
+    Args:
+        content: Spec document
+        origin: Where the spec came from, for error messages
+
+    Returns:
+        The validated spec
+
+    Raises:
+        AdapterSpecError: If the spec is malformed
+    """
+
+    def fail(message: str) -> AdapterSpecError:
+        return AdapterSpecError(f"{origin}: {message}")
+
+    try:
+        data = yaml.safe_load(content)
+    except yaml.YAMLError as e:
+        raise fail(f"invalid YAML: {' '.join(str(e).split())}") from None
+    if not isinstance(data, dict):
+        raise fail("spec must be a mapping")
+    unknown = set(data) - {"spec", "name", "description", "detect", "files", "keys"}
+    if unknown:
+        raise fail(f"unknown fields: {', '.join(sorted(unknown))}")
+    if data.get("spec", SPEC_VERSION) != SPEC_VERSION:
+        raise fail(f"unsupported spec version {data['spec']!r} (expected {SPEC_VERSION})")
+
+    name = data.get("name")
+    if not isinstance(name, str) or not _NAME.match(name) or name == "all":
+        raise fail("name must be lowercase letters, digits, '-' or '_'")
+    description = data.get("description", "")
+    if not isinstance(description, str):
+        raise fail("description must be a string")
+
+    detect = data.get("detect", [])
+    if not isinstance(detect, list):
+        raise fail("detect must be a list of paths")
+    detect = [_relpath(probe, "detect", fail) for probe in detect]
+
+    files = [
+        FileMapping(
+            canonical=_canonical(entry, fail),
+            path=_relpath(entry.get("path"), "files[].path", fail),
+            title=_optional_str(entry, "title", fail),
+        )
+        for entry in _entries(data, "files", {"canonical", "path", "title"}, fail)
+    ]
+    keys = []
+    for entry in _entries(
+        data, "keys", {"canonical", "path", "key", "format", "title", "strip_title"}, fail
+    ):
+        path = _relpath(entry.get("path"), "keys[].path", fail)
+        file_format = entry.get("format") or _format_of(path)
+        if file_format not in FORMATS:
+            raise fail(f"cannot tell the format of {path}; set format to json or yaml")
+        key = entry.get("key")
+        if not isinstance(key, str) or not all(key.split(".")):
+            raise fail("keys[].key must be a dotted path such as assistant.rules")
+        strip = entry.get("strip_title", False)
+        if not isinstance(strip, bool):
+            raise fail("keys[].strip_title must be true or false")
+        keys.append(
+            KeyMapping(
+                canonical=_canonical(entry, fail),
+                path=path,
+                key=key.split("."),
+                format=file_format,
+                title=_optional_str(entry, "title", fail),
+                strip_title=strip,
+            )
+        )
+    if not files and not keys:
+        raise fail("spec maps no files or keys")
+    file_paths = [mapping.path for mapping in files]
+    key_paths = [mapping.path for mapping in keys]
+    if set(file_paths) & set(key_paths):
+        raise fail("a path cannot be both a verbatim copy and a keyed file")
+
+    return AdapterSpec(
+        name=name,
+        digest=content_hash(content),
+        description=description,
+        detect=detect or sorted({*file_paths, *key_paths}),
+        files=files,
+        keys=keys,
+    )
+
+
+def compile_spec(spec: AdapterSpec) -> type[SpecAdapter]:
+    """Build the adapter class for a spec.
+
+    Args:
+        spec: Validated spec
+
+    Returns:
+        Adapter class, shared by every spec with the same content
+    """
+    compiled = _COMPILED.get(spec.digest)
+    if compiled is not None:
+        return compiled
+
+    key_files: dict[str, tuple[str, list[KeyMapping]]] = {}
+    for mapping in spec.keys:
+        key_files.setdefault(mapping.path, (mapping.format, []))[1].append(mapping)
+    artifacts = dict.fromkeys([*(m.path for m in spec.files), *key_files])
+
+    class_name = "".join(part.capitalize() for part in re.split(r"[-_]", spec.name)) + "Adapter"
+    compiled = type(
+        class_name,
+        (SpecAdapter,),
+        {
+            "__doc__": spec.description or f"Adapter compiled from the {spec.name} spec.",
+            "spec": spec,
+            "version": spec.digest[:12],
+            "artifact_paths": tuple(artifacts),
+            "_key_files": key_files,
+        },
+    )
+    _COMPILED[spec.digest] = compiled
+    return compiled
+
+
+def load_spec(path: Path, cache_dir: Path | None = None) -> type[SpecAdapter]:
+    """Load a spec file, reusing its compiled form while its content is unchanged.
+
+    Args:
+        path: YAML spec file
+        cache_dir: Directory of normalized specs keyed by hash (defaults to the user cache)
+
+    Returns:
+        Adapter class
+
+    Raises:
+        AdapterSpecError: If the spec cannot be read or is malformed
+    """
+    try:
+        content = path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as e:
+        raise AdapterSpecError(f"{path}: {e}") from None
+    digest = content_hash(content)
+    compiled = _COMPILED.get(digest)
+    if compiled is not None:
+        return compiled
+
+    cache_file = (cache_dir or default_cache_dir()) / f"{digest}.json"
+    try:
+        spec = AdapterSpec.from_dict(json.loads(cache_file.read_text(encoding="utf-8")))
+    except (OSError, ValueError, KeyError, TypeError):
+        spec = parse_spec(content, origin=str(path))
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(json.dumps(asdict(spec)), encoding="utf-8")
+        except OSError:
+            pass  # only costs a parse next time
+    return compile_spec(spec)
+
+
+def load_specs(
+    directories: list[Path], reserved: set[str] | None = None
+) -> tuple[dict[str, type[SpecAdapter]], list[str]]:
+    """Load every spec in some directories.
+
+    Args:
+        directories: Directories to scan for ``*.yaml`` / ``*.yml`` specs
+        reserved: Adapter names specs may not use
+
+    Returns:
+        Adapters by name, and one message per spec that could not be loaded
+    """
+    adapters: dict[str, type[SpecAdapter]] = {}
+    errors: list[str] = []
+    for directory in directories:
+        try:
+            paths = sorted(entry for entry in directory.iterdir() if entry.suffix in SPEC_SUFFIXES)
+        except OSError:
+            continue
+        for path in paths:
+            try:
+                adapter_class = load_spec(path)
+            except AdapterSpecError as e:
+                errors.append(str(e))
+                continue
+            name = adapter_class.spec.name
+            if name in adapters or (reserved and name in reserved):
+                errors.append(f"{path}: adapter '{name}' is already defined")
+                continue
+            adapters[name] = adapter_class
+    return adapters, errors
+
+
+def spec_dirs() -> list[Path]:
+    """Get the directories adapter specs are loaded from.
+
+    Returns:
+        Directories from ``IDEPORTER_ADAPTERS``, then the per-user config directory
+    """
+    dirs = [Path(entry) for entry in os.environ.get("IDEPORTER_ADAPTERS", "").split(os.pathsep)]
+    base = os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config"
+    return [*(d for d in dirs if str(d) not in ("", ".")), Path(base) / "ideporter" / "adapters"]
+
+
+def default_cache_dir() -> Path:
+    """Get the per-user directory of normalized specs.
+
+    Returns:
+        ``$XDG_CACHE_HOME/ideporter/specs``, or ``~/.cache/ideporter/specs``
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "ideporter" / "specs"
+
+
+def _entries(
+    data: Mapping[str, Any], field_name: str, allowed: set[str], fail: Any
+) -> list[dict[str, Any]]:
+    """Get a list of mapping entries from a spec.
+
+    Args:
+        data: Spec document
+        field_name: "files" or "keys"
+        allowed: Fields an entry may have
+        fail: Error factory
+
+    Returns:
+        The entries
+
+    Raises:
+        AdapterSpecError: If the field or an entry is malformed
+    """
+    entries = data.get(field_name, [])
+    if not isinstance(entries, list) or not all(isinstance(entry, dict) for entry in entries):
+        raise fail(f"{field_name} must be a list of mappings")
+    for entry in entries:
+        unknown = set(entry) - allowed
+        if unknown:
+            raise fail(f"unknown fields in {field_name}: {', '.join(sorted(unknown))}")
+    return entries
+
+
+def _canonical(entry: Mapping[str, Any], fail: Any) -> str:
+    """Validate the canonical file of a mapping.
+
+    Args:
+        entry: Mapping entry
+        fail: Error factory
+
+    Returns:
+        Canonical file name
+
+    Raises:
+        AdapterSpecError: If it is not a mappable canonical file
+    """
+    canonical = entry.get("canonical")
+    if canonical not in MAPPABLE_FILES:
+        raise fail(f"canonical must be one of {', '.join(MAPPABLE_FILES)}, got {canonical!r}")
+    return str(canonical)
+
+
+def _relpath(value: Any, field_name: str, fail: Any) -> str:
+    """Validate a path relative to the project root.
+
+    Args:
+        value: Path from the spec
+        field_name: Field it came from
+        fail: Error factory
+
+    Returns:
+        Normalized POSIX relative path
+
+    Raises:
+        AdapterSpecError: If the path is missing, absolute or leaves the project
+    """
+    if not isinstance(value, str) or not value.strip():
+        raise fail(f"{field_name} must be a path")
+    path = PurePosixPath(value)
+    if path.is_absolute() or ".." in path.parts or "\\" in value:
+        raise fail(f"{field_name} must stay inside the project: {value}")
+    return path.as_posix()
+
+
+def _optional_str(entry: Mapping[str, Any], field_name: str, fail: Any) -> str | None:
+    """Validate an optional string field.
+
+    Args:
+        entry: Mapping entry
+        field_name: Field to read
+        fail: Error factory
+
+    Returns:
+        The string, or None if absent
+
+    Raises:
+        AdapterSpecError: If present but not a string
+    """
+    value = entry.get(field_name)
+    if value is not None and not isinstance(value, str):
+        raise fail(f"{field_name} must be a string")
+    return value
+
+
+def _format_of(path: str) -> str | None:
+    """Infer a structured file's format from its suffix.
+
+    Args:
+        path: File path
+
+    Returns:
+        "json", "yaml", or None if unknown
+    """
+    suffix = PurePosixPath(path).suffix
+    if suffix == ".json":
+        return "json"
+    if suffix in SPEC_SUFFIXES:
+        return "yaml"
+    return None
+
+
+def _get(config: Mapping[str, Any], key: list[str]) -> Any:
+    """Look up a dotted key path.
+
+    Args:
+        config: Parsed file
+        key: Key path segments
+
+    Returns:
+        The value, or None if any segment is missing
+    """
+    value: Any = config
+    for part in key:
+        if not isinstance(value, Mapping):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _set(config: dict[str, Any], key: list[str], value: str) -> None:
+    """Set a dotted key path, creating (or replacing non-mapping) parents.
+
+    Args:
+        config: Parsed file
+        key: Key path segments
+        value: Value to store
+    """
+    node = config
+    for part in key[:-1]:
+        child = node.get(part)
+        if not isinstance(child, dict):
+            child = node[part] = {}
+        node = child
+    node[key[-1]] = value
@@ -1,11 +1,14 @@
 """Windsurf IDE adapter."""
 
 from pathlib import Path
+from typing import Any
 
+import yaml
 from rich.console import Console
 
 from ideporter.adapters.base import BaseAdapter
-from ideporter.utils import load_yaml, safe_read, safe_write, save_yaml
+from ideporter.sections import strip_title
+from ideporter.utils import dump_yaml
 
 console = Console()
 
@@ -13,6 +16,8 @@ console = Console()
 class WindsurfAdapter(BaseAdapter):
     """Adapter for Windsurf IDE (.windsurf/config.yaml)."""
 
+    artifact_paths = (".windsurf/config.yaml",)
+
     @property
     def name(self) -> str:
         """Get the adapter name."""
@@ -22,93 +27,85 @@ class WindsurfAdapter(BaseAdapter):
         """Detect if Windsurf artifacts exist."""
         windsurf_dir = self.project_path / ".windsurf"
         config_file = windsurf_dir / "config.yaml"
-        return config_file.exists() or windsurf_dir.exists()
+        return self.path_exists(config_file) or self.path_exists(windsurf_dir)
 
     def import_context(
         self, canonical_dir: Path, force: bool = False, dry_run: bool = False
     ) -> None:
         """Import from .windsurf/config.yaml to canonical format."""
-        windsurf_dir = self.project_path / ".windsurf"
-        config_file = windsurf_dir / "config.yaml"
+        try:
+            operations = self.plan(canonical_dir, "import")
+        except yaml.YAMLError as e:
+            console.print(f"[red]✗[/red] Failed to parse config.yaml: {e}")
+            return
 
-        if not config_file.exists():
-            console.print("[yellow]⊘[/yellow] No .windsurf/config.yaml found")
+        if not operations:
+            console.print(
+                "[yellow]⊘[/yellow] No AI rules or context found in .windsurf/config.yaml"
+            )
             return
 
-        try:
-            config = load_yaml(config_file)
-            console.print(f"[green]✓[/green] Read {config_file}")
+        self.apply(operations, force=force, dry_run=dry_run)
 
-            # Extract AI rules if they exist
-            ai_rules = config.get("ai_rules", "")
-            ai_context = config.get("ai_context", "")
+        console.print("[green]✓[/green] Imported Windsurf context to canonical format")
 
-            if ai_rules:
-                rules_content = "# AI Project Rules\n\n"
-                rules_content += ai_rules
+    def render_import(self, canonical_dir: Path) -> dict[Path, str]:
+        """Render canonical rules.md and context.md from .windsurf/config.yaml."""
+        existing = self.read_file(self.project_path / ".windsurf" / "config.yaml")
+        if existing is None:
+            return {}
 
-                rules_file = canonical_dir / "rules.md"
-                safe_write(rules_file, rules_content, force=force, dry_run=dry_run)
+        config = yaml.safe_load(existing) or {}
+        if not isinstance(config, dict):
+            config = {}
 
-            if ai_context:
-                context_content = "# Project Context\n\n"
-                context_content += ai_context
+        outputs: dict[Path, str] = {}
 
-                context_file = canonical_dir / "context.md"
-                safe_write(context_file, context_content, force=force, dry_run=dry_run)
+        # Extract AI rules if they exist
+        ai_rules = config.get("ai_rules", "")
+        if ai_rules:
+            outputs[canonical_dir / "rules.md"] = f"# AI Project Rules\n\n{ai_rules}"
 
-            console.print("[green]✓[/green] Imported Windsurf context to canonical format")
+        ai_context = config.get("ai_context", "")
+        if ai_context:
+            outputs[canonical_dir / "context.md"] = f"# Project Context\n\n{ai_context}"
 
-        except Exception as e:
-            console.print(f"[red]✗[/red] Failed to parse config.yaml: {e}")
+        return outputs
 
     def export_context(
         self, canonical_dir: Path, force: bool = False, dry_run: bool = False
     ) -> None:
         """Export from canonical format to .windsurf/config.yaml."""
-        windsurf_dir = self.project_path / ".windsurf"
-        config_file = windsurf_dir / "config.yaml"
+        operations = self.plan(canonical_dir, "export")
+        if operations:
+            self.apply(operations, force=force, dry_run=dry_run)
+            console.print("[green]✓[/green] Exported canonical context to Windsurf format")
+        else:
+            console.print("[yellow]⊘[/yellow] No content to export")
 
-        # Create .windsurf directory if it doesn't exist
-        if not dry_run:
-            windsurf_dir.mkdir(exist_ok=True)
+    def render_export(self, canonical_dir: Path) -> dict[Path, str]:
+        """Render .windsurf/config.yaml, merging into any existing config."""
+        config_file = self.project_path / ".windsurf" / "config.yaml"
 
-        # Load existing config or create new one
-        if config_file.exists():
+        # Load existing config or start a new one
+        config: dict[str, Any] = {}
+        existing = self.read_file(config_file)
+        if existing is not None:
             try:
-                config = load_yaml(config_file)
-            except Exception:
-                console.print("[yellow]⊘[/yellow] Invalid config.yaml, creating new one")
+                config = yaml.safe_load(existing) or {}
+            except yaml.YAMLError:
+                config = {}
+            if not isinstance(config, dict):
                 config = {}
-        else:
-            config = {}
-
-        # Read canonical content
-        rules_file = canonical_dir / "rules.md"
-        context_file = canonical_dir / "context.md"
-
-        if rules_file.exists():
-            rules_content = safe_read(rules_file)
-            # Strip markdown header if present
-            if rules_content.startswith("# "):
-                lines = rules_content.split("\n", 1)
-                if len(lines) > 1:
-                    rules_content = lines[1].strip()
-
-            config["ai_rules"] = rules_content
 
-        if context_file.exists():
-            context_content = safe_read(context_file)
-            # Strip markdown header if present
-            if context_content.startswith("# "):
-                lines = context_content.split("\n", 1)
-                if len(lines) > 1:
-                    context_content = lines[1].strip()
+        rules_content = self.read_file(canonical_dir / "rules.md")
+        if rules_content is not None:
+            config["ai_rules"] = strip_title(rules_content)
 
-            config["ai_context"] = context_content
+        context_content = self.read_file(canonical_dir / "context.md")
+        if context_content is not None:
+            config["ai_context"] = strip_title(context_content)
 
-        if config:
-            save_yaml(config_file, config, force=force, dry_run=dry_run)
-            console.print("[green]✓[/green] Exported canonical context to Windsurf format")
-        else:
-            console.print("[yellow]⊘[/yellow] No content to export")
+        if not config:
+            return {}
+        return {config_file: dump_yaml(config)}
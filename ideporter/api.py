@@ -0,0 +1,412 @@
+"""Programmatic API returning structured results.
+
+These functions mirror the CLI commands but never print: every outcome,
+including validation issues and per-adapter errors, is reported through the
+returned dataclasses. They are safe to call in-process in a loop::
+
+    from ideporter import api
+
+    result = api.export("path/to/project", ["cursor", "vscode"])
+    if not result.ok:
+        print(result.errors)
+    for file in result.files:
+        print(file.action, file.path, file.bytes)
+
+Unknown adapter names raise ``ValueError``; everything else is reported.
+Adapter specs that could not be loaded are listed in
+``OperationResult.warnings`` (and by ``ideporter.adapters.spec_errors()``).
+"""
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any, Literal, cast
+
+import yaml
+
+from ideporter import fsio
+from ideporter.adapters import (
+    ADAPTERS,
+    available_adapters,
+    get_adapter,
+    link_targets,
+    spec_errors,
+)
+from ideporter.canonical import CanonicalContext
+from ideporter.check import check_project
+from ideporter.layers import LayerError
+from ideporter.linking import link_issues
+from ideporter.locking import LockTimeoutError
+from ideporter.merge import render_import_all
+from ideporter.plan import Applied, Operation, PlanError, apply_plan, write_operations
+from ideporter.utils import dump_yaml, write_file
+
+FileAction = Literal["written", "unchanged", "would_write"]
+
+
+@dataclass
+class FileResult:
+    """One file an operation wrote, skipped or would write."""
+
+    path: Path
+    action: FileAction
+    bytes: int
+    backup: Path | None = None
+
+
+@dataclass
+class ValidationResult:
+    """Outcome of validating a canonical context."""
+
+    valid: bool
+    issues: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+
+
+@dataclass
+class AdapterResult:
+    """Outcome of one adapter within an operation."""
+
+    adapter: str
+    files: list[FileResult] = field(default_factory=list)
+    duration_s: float = 0.0
+    error: str | None = None
+
+
+@dataclass
+class OperationResult:
+    """Outcome of an import or export."""
+
+    project_path: Path
+    operation: Literal["import", "export"]
+    adapters: list[AdapterResult] = field(default_factory=list)
+    validation: ValidationResult | None = None
+    errors: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+    duration_s: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether the operation completed without errors."""
+        return not self.errors and all(adapter.error is None for adapter in self.adapters)
+
+    @property
+    def files(self) -> list[FileResult]:
+        """Every file across all adapters (the manifest is not included)."""
+        return [file for adapter in self.adapters for file in adapter.files]
+
+    @property
+    def written(self) -> list[FileResult]:
+        """Files that were actually written."""
+        return [file for file in self.files if file.action == "written"]
+
+    @property
+    def bytes_written(self) -> int:
+        """Total bytes written."""
+        return sum(file.bytes for file in self.written)
+
+
+@fsio.operation()
+def detect(project: str | Path) -> dict[str, bool]:
+    """Detect which IDEs have artifacts in a project.
+
+    Args:
+        project: Path to the project root
+
+    Returns:
+        Mapping of adapter name to whether its artifacts were found
+    """
+    project_path = Path(project)
+    return {
+        name: adapter_class(project_path).detect()
+        for name, adapter_class in available_adapters().items()
+    }
+
+
+@fsio.operation()
+def validate(project: str | Path) -> ValidationResult:
+    """Validate a project's canonical context.
+
+    Args:
+        project: Path to the project root
+
+    Returns:
+        Validation result
+    """
+    project_path = Path(project)
+    canonical = CanonicalContext(project_path)
+    validation = canonical.validate()
+    issues, warnings = link_issues(link_targets(project_path, canonical.context_dir))
+    return ValidationResult(
+        valid=validation["valid"] and not issues,
+        issues=validation["issues"] + issues,
+        warnings=validation["warnings"] + warnings,
+    )
+
+
+@fsio.operation()
+def check(
+    project: str | Path, targets: list[str] | None = None, include_diff: bool = True
+) -> dict[str, Any]:
+    """Check whether IDE artifacts are in sync with the canonical context.
+
+    Args:
+        project: Path to the project root
+        targets: Adapter names to check (defaults to manifest or detected adapters)
+        include_diff: Attach a unified diff to each out-of-sync file
+
+    Returns:
+        The same report ``check --json`` prints
+    """
+    return check_project(Path(project), targets=targets, include_diff=include_diff)
+
+
+@fsio.operation()
+def export(
+    project: str | Path,
+    targets: list[str],
+    force: bool = False,
+    dry_run: bool = False,
+    update_manifest: bool = True,
+) -> OperationResult:
+    """Export the canonical context to IDE-specific files.
+
+    Files whose content already matches are left untouched and reported as
+    ``unchanged``.
+
+    Args:
+        project: Path to the project root
+        targets: Adapter names to export to ("all" selects every adapter)
+        force: Skip backups if True
+        dry_run: Report what would be written without writing
+        update_manifest: Record the targets in manifest.yaml
+
+    Returns:
+        Operation result
+
+    Raises:
+        ValueError: If an adapter name is unknown
+    """
+    project_path = Path(project)
+    names = _resolve(targets)
+    start = time.perf_counter()
+    result = OperationResult(project_path=project_path, operation="export")
+
+    canonical = CanonicalContext(project_path)
+    if not canonical.exists():
+        result.errors.append(f"Canonical context not found at {canonical.context_dir}")
+        return _finish(result, start)
+
+    try:
+        with canonical.locked():
+            result.validation = validate(project_path)
+            if not result.validation.valid:
+                result.errors.extend(result.validation.issues)
+                return _finish(result, start)
+
+            try:
+                source = canonical.file_source()
+            except LayerError as e:
+                result.errors.append(str(e))
+                return _finish(result, start)
+
+            for name in names:
+                adapter = ADAPTERS[name](project_path, source=source)
+                plan = partial(adapter.plan, canonical.context_dir, "export")
+                result.adapters.append(_apply(name, plan, force, dry_run))
+    except LockTimeoutError as e:
+        result.errors.append(str(e))
+        return _finish(result, start)
+
+    if update_manifest and not dry_run:
+        _write_manifest(canonical, names, force, result)
+    return _finish(result, start)
+
+
+@fsio.operation()
+def import_(
+    project: str | Path,
+    source: str,
+    force: bool = False,
+    dry_run: bool = False,
+    update_manifest: bool = True,
+) -> OperationResult:
+    """Import IDE-specific files into the canonical context.
+
+    When the canonical directory does not exist yet, files the import does
+    not provide are created from the starter templates and reported
+    alongside the imported files.
+
+    Args:
+        project: Path to the project root
+        source: Adapter name to import from ("all" merges every detected adapter)
+        force: Skip backups if True
+        dry_run: Report what would be written without writing
+        update_manifest: Record the source in manifest.yaml
+
+    Returns:
+        Operation result
+
+    Raises:
+        ValueError: If the adapter name is unknown
+    """
+    project_path = Path(project)
+    adapter = None if source == "all" else get_adapter(source)(project_path)
+    start = time.perf_counter()
+    result = OperationResult(project_path=project_path, operation="import")
+    canonical = CanonicalContext(project_path)
+    sources = [source]
+
+    def plan() -> list[Operation]:
+        if adapter is not None:
+            imported = adapter.render_import(canonical.context_dir)
+        else:
+            merged = render_import_all(project_path, canonical.context_dir)
+            result.errors.extend(f"{name}: {error}" for name, error in merged.errors.items())
+            sources[:] = merged.sources
+            imported = merged.outputs
+        # Starter files only fill gaps the import itself does not cover
+        starters = {} if canonical.exists() else canonical.render_initialize()
+        return write_operations({**starters, **imported}, adapter=source)
+
+    try:
+        with canonical.locked(exclusive=not dry_run):
+            rendered = _apply(source, plan, force, dry_run)
+            result.adapters.append(rendered)
+
+            if update_manifest and not dry_run and rendered.error is None and sources:
+                _write_manifest(canonical, sources, force, result)
+    except LockTimeoutError as e:
+        result.errors.append(str(e))
+    return _finish(result, start)
+
+
+@fsio.operation()
+def convert(
+    project: str | Path,
+    source: str,
+    target: str,
+    force: bool = False,
+    dry_run: bool = False,
+) -> tuple[OperationResult, OperationResult | None]:
+    """Import from one IDE and export to another.
+
+    Args:
+        project: Path to the project root
+        source: Adapter name to import from
+        target: Adapter name to export to
+        force: Skip backups if True
+        dry_run: Report what would be written without writing
+
+    Returns:
+        The import result and the export result (None if the import failed)
+
+    Raises:
+        ValueError: If an adapter name is unknown
+    """
+    get_adapter(target)
+    imported = import_(project, source, force=force, dry_run=dry_run)
+    if not imported.ok:
+        return imported, None
+    return imported, export(project, [target], force=force, dry_run=dry_run)
+
+
+def _resolve(targets: list[str]) -> list[str]:
+    """Expand "all" and validate adapter names.
+
+    Args:
+        targets: Adapter names
+
+    Returns:
+        Unique adapter names in the order given
+
+    Raises:
+        ValueError: If an adapter is unknown
+    """
+    names: list[str] = []
+    for target in targets:
+        for name in available_adapters() if target == "all" else [target]:
+            get_adapter(name)
+            if name not in names:
+                names.append(name)
+    return names
+
+
+def _apply(
+    name: str, plan: Callable[[], list[Operation]], force: bool, dry_run: bool
+) -> AdapterResult:
+    """Plan one adapter's outputs and write those that changed.
+
+    Args:
+        name: Adapter name for the result
+        plan: Callable returning the planned operations
+        force: Skip backups if True
+        dry_run: Report what would be written without writing
+
+    Returns:
+        Adapter result (errors are captured, not raised)
+    """
+    start = time.perf_counter()
+    result = AdapterResult(adapter=name)
+    try:
+        applied = apply_plan(plan(), force=force, dry_run=dry_run, report=False)
+        result.files.extend(_file_result(outcome) for outcome in applied)
+    except NotImplementedError as e:
+        result.error = str(e)
+    except (OSError, ValueError, yaml.YAMLError, LayerError, PlanError) as e:
+        result.error = f"{type(e).__name__}: {e}"
+    result.duration_s = time.perf_counter() - start
+    return result
+
+
+def _file_result(applied: Applied) -> FileResult:
+    """Describe one applied write operation.
+
+    Args:
+        applied: Outcome from apply_plan
+
+    Returns:
+        File result
+    """
+    # The API only plans writes, so link outcomes never occur here
+    action = cast(FileAction, applied.outcome)
+    return FileResult(applied.operation.path, action, applied.operation.size, applied.backup)
+
+
+def _write_manifest(
+    canonical: CanonicalContext, names: list[str], force: bool, result: OperationResult
+) -> None:
+    """Record adapter usage in the manifest.
+
+    Args:
+        canonical: Canonical context
+        names: Adapters that were used
+        force: Skip backups if True
+        result: Result to report errors on
+    """
+    try:
+        with canonical.locked(exclusive=True):
+            write_file(
+                canonical.context_dir / "manifest.yaml",
+                dump_yaml(canonical.updated_manifest(names)),
+                force=force,
+            )
+    except (OSError, yaml.YAMLError, LockTimeoutError) as e:
+        result.errors.append(f"Failed to update manifest: {e}")
+
+
+def _finish(result: OperationResult, start: float) -> OperationResult:
+    """Stamp an operation's total duration and note skipped adapter specs.
+
+    Args:
+        result: Operation result
+        start: perf_counter() at the start of the operation
+
+    Returns:
+        The same result
+    """
+    result.warnings.extend(f"Skipped adapter spec {error}" for error in spec_errors())
+    result.duration_s = time.perf_counter() - start
+    return result
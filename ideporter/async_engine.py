@@ -0,0 +1,594 @@
+"""Asynchronous execution engine for multi-target and multi-project runs.
+
+Adapter code stays synchronous; the engine runs its blocking reads, renders
+and writes in a thread pool so that file latencies overlap instead of adding
+up. An ``IOScheduler`` caps how many operations are in flight on each
+filesystem (keyed by ``st_dev``), so a slow network mount cannot starve a
+local disk and a local disk cannot flood a network mount.
+
+A batch run stops cleanly on SIGINT or SIGTERM: projects that are already
+writing finish (and are journaled), the others are reported as interrupted.
+A second signal aborts immediately.
+"""
+
+import asyncio
+import os
+import signal
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from types import TracebackType
+from typing import Any, TypeVar
+
+import yaml
+
+from ideporter.adapters import get_adapter
+from ideporter.adapters.base import BaseAdapter
+from ideporter.canonical import CanonicalContext
+from ideporter.journal import Journal
+from ideporter.layers import LayerError
+from ideporter.locking import LockTimeoutError
+from ideporter.plan import (
+    Applied,
+    Operation,
+    PlanError,
+    apply_plan,
+    dedupe_operations,
+    write_operations,
+)
+from ideporter.rendercache import CacheStats, RenderCache
+from ideporter.sources import RecordingSource
+from ideporter.utils import safe_read
+
+T = TypeVar("T")
+
+DEFAULT_PER_DEVICE = 16
+
+
+class IOScheduler:
+    """Run blocking file operations with a concurrency limit per filesystem."""
+
+    def __init__(self, per_device: int = DEFAULT_PER_DEVICE, max_workers: int | None = None):
+        """Initialize the scheduler.
+
+        Args:
+            per_device: Maximum concurrent operations on one filesystem
+            max_workers: Thread pool size (defaults to 4 x per_device)
+
+        Raises:
+            ValueError: If per_device is less than 1
+        """
+        if per_device < 1:
+            raise ValueError("per_device must be at least 1")
+        self.per_device = per_device
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or per_device * 4, thread_name_prefix="ideporter-io"
+        )
+        self._limits: dict[int, asyncio.Semaphore] = {}
+        self._devices: dict[Path, int] = {}
+
+    async def __aenter__(self) -> "IOScheduler":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the thread pool."""
+        self._executor.shutdown(wait=True)
+
+    def device(self, path: Path) -> int:
+        """Find the filesystem a path lives on.
+
+        Paths that do not exist yet are attributed to their nearest existing
+        ancestor. Results are cached per directory.
+
+        Args:
+            path: File or directory path
+
+        Returns:
+            Device number (``st_dev``)
+        """
+        directory = path.absolute().parent
+        cached = self._devices.get(directory)
+        if cached is not None:
+            return cached
+
+        probe = directory
+        while True:
+            try:
+                dev = os.stat(probe).st_dev
+                break
+            except (FileNotFoundError, NotADirectoryError):
+                if probe.parent == probe:
+                    dev = 0
+                    break
+                probe = probe.parent
+
+        self._devices[directory] = dev
+        return dev
+
+    def limit(self, path: Path) -> asyncio.Semaphore:
+        """Get the semaphore guarding the filesystem of a path.
+
+        Args:
+            path: File or directory path
+
+        Returns:
+            Semaphore shared by every path on the same filesystem
+        """
+        dev = self.device(path)
+        semaphore = self._limits.get(dev)
+        if semaphore is None:
+            semaphore = self._limits[dev] = asyncio.Semaphore(self.per_device)
+        return semaphore
+
+    async def run(self, path: Path, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking call against a path under its filesystem's limit.
+
+        Args:
+            path: Path the call reads or writes
+            func: Blocking callable
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            The callable's result
+        """
+        async with self.limit(path):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+
+async def async_safe_read(file_path: Path, scheduler: IOScheduler | None = None) -> str:
+    """Asynchronous variant of utils.safe_read.
+
+    Args:
+        file_path: Path to read from
+        scheduler: Scheduler to run under (defaults to the loop's thread pool)
+
+    Returns:
+        File contents as string
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+    """
+    if scheduler is not None:
+        return await scheduler.run(file_path, safe_read, file_path)
+    return await asyncio.to_thread(safe_read, file_path)
+
+
+async def async_apply_plan(
+    operations: list[Operation],
+    force: bool = False,
+    dry_run: bool = False,
+    scheduler: IOScheduler | None = None,
+    report: bool = True,
+) -> list[Applied]:
+    """Asynchronous variant of plan.apply_plan.
+
+    Each operation runs under the scheduler limit of the filesystem it
+    writes to. Operations are checked for conflicts up front, and links are
+    made after every write has landed, as apply_plan does.
+
+    Args:
+        operations: Operations to apply
+        force: Skip backups if True
+        dry_run: Only preview operations if True
+        scheduler: Scheduler to run under (defaults to the loop's thread pool)
+        report: Print what was done
+
+    Returns:
+        One result per distinct operation, in plan order
+
+    Raises:
+        PlanError: If two operations disagree about the same path
+    """
+
+    async def run(batch: list[Operation]) -> list[list[Applied]]:
+        calls = [
+            partial(apply_plan, [op], force=force, dry_run=dry_run, workers=1, report=report)
+            for op in batch
+        ]
+        if scheduler is not None:
+            return await asyncio.gather(
+                *(scheduler.run(op.path, call) for op, call in zip(batch, calls, strict=True))
+            )
+        return await asyncio.gather(*(asyncio.to_thread(call) for call in calls))
+
+    planned = dedupe_operations(operations)
+    written = await run([op for op in planned if not op.is_link])
+    linked = await run([op for op in planned if op.is_link])
+    return [applied for results in (*written, *linked) for applied in results]
+
+
+async def async_safe_write(
+    file_path: Path,
+    content: str,
+    force: bool = False,
+    dry_run: bool = False,
+    scheduler: IOScheduler | None = None,
+) -> None:
+    """Asynchronous variant of utils.safe_write.
+
+    Goes through the plan engine, so a file that already holds the content
+    is left alone.
+
+    Args:
+        file_path: Path to write to
+        content: Content to write
+        force: Skip backup creation if True
+        dry_run: Only preview the operation if True
+        scheduler: Scheduler to run under (defaults to the loop's thread pool)
+    """
+    await async_apply_plan(
+        write_operations({file_path: content}), force=force, dry_run=dry_run, scheduler=scheduler
+    )
+
+
+@dataclass
+class ProjectResult:
+    """Outcome of exporting one project."""
+
+    project_path: Path
+    targets: list[str]
+    # Files written (or that would be), not counting those already current
+    files: int = 0
+    unchanged: int = 0
+    backups: list[Path] = field(default_factory=list)
+    error: str | None = None
+    skipped: bool = False
+    interrupted: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """Whether the export succeeded (or was not needed)."""
+        return self.error is None and not self.interrupted
+
+
+@dataclass
+class BatchSummary:
+    """Outcome of a batch export."""
+
+    results: list[ProjectResult] = field(default_factory=list)
+    cache: CacheStats | None = None
+
+    @property
+    def failed(self) -> list[ProjectResult]:
+        """Projects whose export failed."""
+        return [result for result in self.results if result.error is not None]
+
+    @property
+    def skipped(self) -> list[ProjectResult]:
+        """Projects skipped because the journal shows them up to date."""
+        return [result for result in self.results if result.skipped]
+
+    @property
+    def interrupted(self) -> list[ProjectResult]:
+        """Projects not exported because the run was interrupted."""
+        return [result for result in self.results if result.interrupted]
+
+    @property
+    def files(self) -> int:
+        """Total files written (or previewed)."""
+        return sum(result.files for result in self.results)
+
+
+async def export_project(
+    project_path: Path,
+    targets: list[str],
+    scheduler: IOScheduler,
+    force: bool = False,
+    dry_run: bool = False,
+    render_cache: RenderCache | None = None,
+    journal: Journal | None = None,
+    resume: bool = False,
+    stop: asyncio.Event | None = None,
+) -> ProjectResult:
+    """Export one project to several targets with overlapping I/O.
+
+    The project is validated, rendered and written under its shared lock, in
+    one scheduler slot; projects overlap with each other. The outputs are
+    applied as one plan, so files that are already current are skipped. If
+    anything changed, the manifest is updated once afterwards, with every
+    target, under the exclusive lock.
+
+    Args:
+        project_path: Path to the project root
+        targets: Adapter names to export to
+        scheduler: Scheduler that runs the blocking work
+        force: Skip backups if True
+        dry_run: Only preview operations if True
+        render_cache: Reuse renders of identical inputs from this cache
+        journal: Journal to record the outcome in (not written on dry runs)
+        resume: Skip the project if the journal shows it up to date
+        stop: Once set, the project is abandoned unless it is already writing
+
+    Returns:
+        Result for the project (errors are reported, not raised)
+    """
+    result = ProjectResult(project_path=project_path, targets=targets)
+    canonical = CanonicalContext(project_path)
+    context_dir = canonical.context_dir
+
+    def stopped() -> bool:
+        result.interrupted = stop is not None and stop.is_set()
+        return result.interrupted
+
+    if stopped():
+        return result
+    if resume and journal is not None:
+        if await scheduler.run(context_dir, journal.completed, project_path, targets):
+            result.skipped = True
+            return result
+
+    recorder = None
+    outputs: dict[Path, str] = {}
+    try:
+        adapters = [get_adapter(target) for target in targets]
+        exported = await scheduler.run(
+            context_dir, _export_locked, canonical, adapters, render_cache, stopped, force, dry_run
+        )
+        if exported is None:
+            return result
+        recorder, outputs, applied = exported
+        result.files = sum(operation.changed for operation in applied)
+        result.unchanged = len(applied) - result.files
+        result.backups = [operation.backup for operation in applied if operation.backup]
+
+        if not dry_run and result.files:
+            backup = await scheduler.run(
+                context_dir,
+                canonical.update_manifest,
+                targets,
+                dry_run=dry_run,
+                force=force,
+                report=False,
+            )
+            if backup is not None:
+                result.backups.append(backup)
+    except (
+        OSError,
+        ValueError,
+        yaml.YAMLError,
+        LayerError,
+        LockTimeoutError,
+        PlanError,
+        NotImplementedError,
+    ) as e:
+        # One broken project (e.g. a rules.md that is not UTF-8) fails on its own
+        result.error = str(e) or type(e).__name__
+
+    return _journaled(result, journal, dry_run, recorder, outputs)
+
+
+def _export_locked(
+    canonical: CanonicalContext,
+    adapter_classes: list[type[BaseAdapter]],
+    render_cache: RenderCache | None,
+    stopped: Callable[[], bool],
+    force: bool,
+    dry_run: bool,
+) -> tuple[RecordingSource, dict[Path, str], list[Applied]] | None:
+    """Render and apply a project's export under its shared lock.
+
+    The lock belongs to the thread that takes it, so the whole export runs
+    in one scheduler slot, like the export command: other readers may run at
+    the same time, writers wait.
+
+    Args:
+        canonical: Project's canonical context
+        adapter_classes: Adapters to export with
+        render_cache: Reuse renders of identical inputs from this cache
+        stopped: Whether the run was interrupted before writing began
+        force: Skip backups if True
+        dry_run: Only work out what would be written if True
+
+    Returns:
+        Source the renders read through, the rendered files and what was done
+        with each, or None if the run was interrupted before writing
+
+    Raises:
+        ValueError: If the canonical context is missing or invalid
+        LockTimeoutError: If a writer holds the project for too long
+    """
+    context_dir = canonical.context_dir
+    with canonical.locked():
+        if not canonical.exists():
+            raise ValueError(f"Canonical context not found at {context_dir}")
+        validation = canonical.validate()
+        if not validation["valid"]:
+            raise ValueError(
+                "Canonical context validation failed: " + "; ".join(validation["issues"])
+            )
+        if stopped():
+            return None
+
+        recorder = RecordingSource(canonical.base_path, canonical.file_source())
+        outputs: dict[Path, str] = {}
+        operations: list[Operation] = []
+        for adapter_class in adapter_classes:
+            adapter = adapter_class(canonical.base_path, source=recorder)
+            target_outputs = _renderer(adapter, render_cache)(context_dir)
+            outputs.update(target_outputs)
+            operations.extend(write_operations(target_outputs, adapter=adapter.name))
+        if stopped():
+            return None
+
+        # One writer per scheduler slot, so --jobs bounds the files in flight
+        applied = apply_plan(operations, force=force, dry_run=dry_run, workers=1, report=False)
+    return recorder, outputs, applied
+
+
+def _journaled(
+    result: ProjectResult,
+    journal: Journal | None,
+    dry_run: bool,
+    recorder: RecordingSource | None = None,
+    outputs: dict[Path, str] | None = None,
+) -> ProjectResult:
+    """Record a finished project in the journal.
+
+    Args:
+        result: The project's outcome
+        journal: Journal to append to, if any
+        dry_run: Nothing is recorded for previews
+        recorder: Source the render read through
+        outputs: Files written
+
+    Returns:
+        The result, unchanged
+    """
+    if journal is not None and not dry_run:
+        journal.record(result.project_path, result.targets, recorder, outputs, result.error)
+    return result
+
+
+def _handle_signals(stop: asyncio.Event) -> Callable[[], None]:
+    """Set an event on the first SIGINT or SIGTERM instead of dying.
+
+    The handlers are removed as soon as one fires, so a second signal takes
+    its default effect. Where the loop cannot handle signals (Windows, or
+    outside the main thread) nothing is installed.
+
+    Args:
+        stop: Event to set
+
+    Returns:
+        Function removing the handlers
+    """
+    loop = asyncio.get_running_loop()
+    installed: list[signal.Signals] = []
+
+    def restore() -> None:
+        while installed:
+            loop.remove_signal_handler(installed.pop())
+
+    def interrupt() -> None:
+        stop.set()
+        restore()
+
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, interrupt)
+        except (NotImplementedError, RuntimeError, ValueError):
+            continue
+        installed.append(signum)
+    return restore
+
+
+def _renderer(
+    adapter: BaseAdapter, render_cache: RenderCache | None
+) -> Callable[[Path], dict[Path, str]]:
+    """Pick the function that renders an adapter's export.
+
+    Args:
+        adapter: Adapter to render with
+        render_cache: Cache to render through, if any
+
+    Returns:
+        Function taking the canonical directory
+    """
+    if render_cache is None:
+        return adapter.render_export
+    return partial(render_cache.render_export, adapter)
+
+
+async def export_projects(
+    projects: list[Path],
+    targets: list[str],
+    force: bool = False,
+    dry_run: bool = False,
+    per_device: int = DEFAULT_PER_DEVICE,
+    render_cache: RenderCache | None = None,
+    journal: Journal | None = None,
+    resume: bool = False,
+) -> BatchSummary:
+    """Export many projects concurrently.
+
+    Args:
+        projects: Project roots
+        targets: Adapter names to export every project to
+        force: Skip backups if True
+        dry_run: Only preview operations if True
+        per_device: Maximum concurrent operations on one filesystem
+        render_cache: Reuse renders of identical inputs from this cache
+        journal: Journal to record each finished project in
+        resume: Skip projects the journal shows up to date
+
+    Returns:
+        Summary with one result per project, in the order given
+    """
+    stop = asyncio.Event()
+    restore = _handle_signals(stop)
+    try:
+        async with IOScheduler(per_device=per_device) as scheduler:
+            results = await asyncio.gather(
+                *(
+                    export_project(
+                        project,
+                        targets,
+                        scheduler,
+                        force=force,
+                        dry_run=dry_run,
+                        render_cache=render_cache,
+                        journal=journal,
+                        resume=resume,
+                        stop=stop,
+                    )
+                    for project in projects
+                )
+            )
+    finally:
+        restore()
+    summary = BatchSummary(results=list(results))
+    if render_cache is not None:
+        render_cache.prune()
+        summary.cache = render_cache.stats
+    return summary
+
+
+def run_batch(
+    projects: list[Path],
+    targets: list[str],
+    force: bool = False,
+    dry_run: bool = False,
+    per_device: int = DEFAULT_PER_DEVICE,
+    render_cache: RenderCache | None = None,
+    journal: Journal | None = None,
+    resume: bool = False,
+) -> BatchSummary:
+    """Synchronous entry point for export_projects.
+
+    Args:
+        projects: Project roots
+        targets: Adapter names to export every project to
+        force: Skip backups if True
+        dry_run: Only preview operations if True
+        per_device: Maximum concurrent operations on one filesystem
+        render_cache: Reuse renders of identical inputs from this cache
+        journal: Journal to record each finished project in
+        resume: Skip projects the journal shows up to date
+
+    Returns:
+        Summary with one result per project, in the order given
+    """
+    return asyncio.run(
+        export_projects(
+            projects,
+            targets,
+            force=force,
+            dry_run=dry_run,
+            per_device=per_device,
+            render_cache=render_cache,
+            journal=journal,
+            resume=resume,
+        )
+    )
@@ -0,0 +1,278 @@
+"""Stream canonical contexts and generated artifacts through tar/zip bundles.
+
+Bundles hold project-relative paths (``ai/context/rules.md``,
+``.cursorrules``, ``.vscode/AI_RULES.md``...). Reading streams members one at
+a time and keeps only canonical and IDE files, subject to size caps; writing
+streams each file into the archive as soon as it is rendered. Nothing is
+extracted to a temporary directory.
+"""
+
+import io
+import tarfile
+import zipfile
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path, PurePosixPath
+from types import TracebackType
+from typing import IO, Any, Literal
+
+from ideporter.canonical import CANONICAL_DIR
+
+# Suffix -> compression ("zip" for zip archives, "" for plain tar)
+BUNDLE_FORMATS = {
+    ".tar": "",
+    ".tar.gz": "gz",
+    ".tgz": "gz",
+    ".tar.bz2": "bz2",
+    ".tar.xz": "xz",
+    ".tar.zst": "zst",
+    ".zip": "zip",
+}
+_TAR_WRITE_MODES: dict[str, Literal["w|", "w|gz", "w|bz2", "w|xz"]] = {
+    "": "w|",
+    "gz": "w|gz",
+    "bz2": "w|bz2",
+    "xz": "w|xz",
+}
+MAX_MEMBER_SIZE = 16 * 1024 * 1024
+MAX_TOTAL_SIZE = 256 * 1024 * 1024
+
+
+class BundleError(Exception):
+    """Raised for unsupported, malformed or oversized bundles."""
+
+
+def bundle_format(path: Path) -> str | None:
+    """Work out a bundle's format from its file name.
+
+    Args:
+        path: Bundle path
+
+    Returns:
+        Compression name ("" for plain tar, "zip" for zip), or None if unsupported
+    """
+    name = path.name.lower()
+    for suffix in sorted(BUNDLE_FORMATS, key=len, reverse=True):
+        if name.endswith(suffix):
+            return BUNDLE_FORMATS[suffix]
+    return None
+
+
+def is_bundle(path: Path) -> bool:
+    """Check whether a path names a supported bundle.
+
+    Args:
+        path: Bundle path
+
+    Returns:
+        True for .tar, .tar.gz/.tgz, .tar.bz2, .tar.xz, .tar.zst and .zip
+    """
+    return bundle_format(path) is not None
+
+
+def is_context_member(relpath: str) -> bool:
+    """Default filter for bundle members worth loading.
+
+    Keeps the canonical directory and dot-prefixed IDE artifacts, and skips
+    everything else a full project archive might contain.
+
+    Args:
+        relpath: Normalized member path
+
+    Returns:
+        True if the member should be read
+    """
+    return relpath.startswith(f"{CANONICAL_DIR}/") or relpath.startswith(".")
+
+
+def read_bundle(
+    path: Path,
+    include: Callable[[str], bool] = is_context_member,
+    max_member_size: int = MAX_MEMBER_SIZE,
+    max_total_size: int = MAX_TOTAL_SIZE,
+) -> dict[str, str]:
+    """Stream the relevant text files out of a bundle.
+
+    Args:
+        path: Bundle path
+        include: Predicate selecting which members to keep
+        max_member_size: Largest member (in bytes) that may be kept
+        max_total_size: Largest total size (in bytes) of kept members
+
+    Returns:
+        Mapping of project-relative POSIX path to content
+
+    Raises:
+        BundleError: If the bundle is unsupported, malformed or too large
+    """
+    fmt = bundle_format(path)
+    if fmt is None:
+        raise BundleError(f"Unsupported bundle format: {path.name}")
+
+    files: dict[str, str] = {}
+    total = 0
+
+    def keep(name: str, size: int, read: Callable[[], bytes]) -> None:
+        nonlocal total
+        relpath = _normalize_member(name)
+        if relpath is None or not include(relpath):
+            return
+        if size > max_member_size:
+            raise BundleError(f"Bundle member too large: {relpath} ({size} bytes)")
+        total += size
+        if total > max_total_size:
+            raise BundleError(f"Bundle content exceeds {max_total_size} bytes")
+        try:
+            files[relpath] = read().decode("utf-8")
+        except UnicodeDecodeError as e:
+            raise BundleError(f"Bundle member is not UTF-8 text: {relpath}") from e
+
+    try:
+        if fmt == "zip":
+            with zipfile.ZipFile(path) as zip_archive:
+                for info in zip_archive.infolist():
+                    if not info.is_dir():
+                        keep(info.filename, info.file_size, partial(zip_archive.read, info))
+        else:
+            with path.open("rb") as raw, _tar_reader(raw, fmt) as tar_archive:
+                for member in tar_archive:
+                    if member.isfile():
+                        extracted = tar_archive.extractfile(member)
+                        assert extracted is not None
+                        keep(member.name, member.size, extracted.read)
+    except (tarfile.TarError, zipfile.BadZipFile, EOFError, OSError) as e:
+        raise BundleError(f"Failed to read bundle {path}: {e}") from e
+
+    return files
+
+
+class BundleWriter:
+    """Stream files into a tar or zip bundle."""
+
+    def __init__(self, path: Path):
+        """Open a bundle for writing.
+
+        Args:
+            path: Bundle path; the format is taken from its suffix
+
+        Raises:
+            BundleError: If the format is unsupported
+        """
+        fmt = bundle_format(path)
+        if fmt is None:
+            raise BundleError(f"Unsupported bundle format: {path.name}")
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.files = 0
+        self.bytes = 0
+        self._raw: IO[bytes] | None = None
+        self._compressor: Any = None
+        self._tar: tarfile.TarFile | None = None
+        self._zip: zipfile.ZipFile | None = None
+
+        if fmt == "zip":
+            self._zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+        elif fmt == "zst":
+            zstandard = _require_zstandard()
+            self._raw = path.open("wb")
+            self._compressor = zstandard.ZstdCompressor().stream_writer(self._raw)
+            self._tar = tarfile.open(fileobj=self._compressor, mode="w|")
+        else:
+            self._raw = path.open("wb")
+            self._tar = tarfile.open(fileobj=self._raw, mode=_TAR_WRITE_MODES[fmt])
+
+    def __enter__(self) -> "BundleWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def write(self, relpath: str, content: str) -> None:
+        """Append a file to the bundle.
+
+        Args:
+            relpath: Project-relative POSIX path
+            content: File content
+        """
+        data = content.encode("utf-8")
+        if self._zip is not None:
+            self._zip.writestr(relpath, data)
+        else:
+            assert self._tar is not None
+            info = tarfile.TarInfo(relpath)
+            info.size = len(data)
+            info.mode = 0o644
+            self._tar.addfile(info, io.BytesIO(data))
+        self.files += 1
+        self.bytes += len(data)
+
+    def close(self) -> None:
+        """Finish the archive and close the file."""
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+        if self._tar is not None:
+            self._tar.close()
+            self._tar = None
+        if self._compressor is not None:
+            self._compressor.close()
+            self._compressor = None
+        if self._raw is not None:
+            self._raw.close()
+            self._raw = None
+
+
+def _tar_reader(raw: IO[bytes], fmt: str) -> tarfile.TarFile:
+    """Open a tar stream for sequential reading.
+
+    Args:
+        raw: Underlying binary file
+        fmt: Compression name
+
+    Returns:
+        Streaming TarFile
+    """
+    if fmt == "zst":
+        zstandard = _require_zstandard()
+        return tarfile.open(fileobj=zstandard.ZstdDecompressor().stream_reader(raw), mode="r|")
+    return tarfile.open(fileobj=raw, mode="r|*")
+
+
+def _require_zstandard() -> Any:
+    """Import the optional zstandard module.
+
+    Returns:
+        The zstandard module
+
+    Raises:
+        BundleError: If zstandard is not installed
+    """
+    try:
+        import zstandard
+    except ImportError:
+        raise BundleError(
+            "Zstandard bundles require the 'zstandard' package "
+            "(pip install 'ide-context-porter[zstd]')"
+        ) from None
+    return zstandard
+
+
+def _normalize_member(name: str) -> str | None:
+    """Normalize an archive member name to a safe relative path.
+
+    Args:
+        name: Member name as stored in the archive
+
+    Returns:
+        POSIX relative path, or None for unsafe names
+    """
+    parts = [part for part in PurePosixPath(name).parts if part not in ("", ".")]
+    if not parts or parts[0] == "/" or ".." in parts:
+        return None
+    return "/".join(parts)
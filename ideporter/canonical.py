@@ -1,15 +1,40 @@
 """Canonical context management for IDE Context Porter."""
 
+import contextlib
+import json
+import os
+from collections.abc import Callable, Iterator
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
+import yaml
 from rich.console import Console
 
-from ideporter.utils import ensure_directory, load_yaml, safe_write, save_yaml
+from ideporter import fingerprints, fsio
+from ideporter.layers import LAYER_RESOLVER, LAYERED_FILES, LayerError, declared_layers
+from ideporter.locking import project_lock
+from ideporter.pack import (
+    PACKED_FILES,
+    CanonicalPack,
+    PackSource,
+    load_pack,
+)
+from ideporter.profiling import profiled
+from ideporter.sources import FileSource, OverlaySource
+from ideporter.utils import (
+    dump_yaml,
+    ensure_directory,
+    load_yaml,
+    safe_write,
+    save_yaml,
+    write_file,
+)
 
 console = Console()
 
+T = TypeVar("T")
+
 # Default canonical directory structure
 CANONICAL_DIR = "ai/context"
 CANONICAL_FILES = {
@@ -24,14 +49,38 @@ CANONICAL_FILES = {
 class CanonicalContext:
     """Manages the canonical AI context representation."""
 
-    def __init__(self, base_path: Path):
+    def __init__(self, base_path: Path, source: FileSource | None = None):
         """Initialize canonical context manager.
 
         Args:
             base_path: Base path of the project
+            source: Read canonical files from this source instead of disk
         """
         self.base_path = base_path
         self.context_dir = base_path / CANONICAL_DIR
+        self.source = source
+        self._pack: CanonicalPack | None = None
+        self._pack_loaded = False
+        self._file_source: FileSource | None = None
+        self._file_source_loaded = False
+
+    @contextlib.contextmanager
+    def locked(self, exclusive: bool = False) -> Iterator[None]:
+        """Hold the project lock while reading or changing the canonical context.
+
+        Contexts read from another source (a bundle or a git ref) are not locked.
+
+        Args:
+            exclusive: Take the write lock instead of the shared read lock
+
+        Yields:
+            Nothing; the lock is held inside the block
+        """
+        if self.source is not None:
+            yield
+            return
+        with project_lock(self.base_path, exclusive=exclusive):
+            yield
 
     def exists(self) -> bool:
         """Check if canonical context directory exists.
@@ -39,8 +88,29 @@ class CanonicalContext:
         Returns:
             True if context directory exists
         """
-        return self.context_dir.exists()
+        if self.source is not None:
+            return self.source.exists(CANONICAL_DIR)
+        return fsio.exists(self.context_dir)
+
+    def read_file(self, filename: str) -> str | None:
+        """Read a canonical file.
 
+        Args:
+            filename: File name inside the canonical directory
+
+        Returns:
+            File contents, or None if the file does not exist
+        """
+        if self.source is not None:
+            return self.source.read_text(f"{CANONICAL_DIR}/{filename}")
+
+        pack = self.pack()
+        if pack is not None and filename in PACKED_FILES:
+            return pack.read(filename)
+
+        return fsio.read_text(self.context_dir / filename)
+
+    @profiled("canonical.validate")
     def validate(self) -> dict[str, Any]:
         """Validate the canonical context structure.
 
@@ -50,28 +120,149 @@ class CanonicalContext:
         issues = []
         warnings = []
 
-        if not self.exists():
-            return {
-                "valid": False,
-                "issues": ["Canonical context directory does not exist"],
-                "warnings": [],
-            }
+        if self.source is not None:
+            if not self.exists():
+                return _missing_report()
+            return self._validate_source()
 
-        # Check for required files
-        rules_file = self.context_dir / "rules.md"
-        manifest_file = self.context_dir / "manifest.yaml"
+        # One directory listing answers every existence and size question
+        entries = fsio.scan(self.context_dir)
+        if entries is None:
+            return _missing_report()
 
-        if not rules_file.exists():
+        rules_entry = entries.get("rules.md")
+        if rules_entry is None:
             issues.append("Missing required file: rules.md")
-        elif rules_file.stat().st_size == 0:
+        elif os.stat(rules_entry.path).st_size == 0:
             warnings.append("rules.md is empty")
 
-        if not manifest_file.exists():
+        if "manifest.yaml" not in entries:
             warnings.append("Missing manifest.yaml (will be auto-generated)")
+        else:
+            try:
+                for layer_dir in self.layers():
+                    LAYER_RESOLVER.load(layer_dir)
+            except LayerError as e:
+                issues.append(str(e))
 
         # Check for optional files
-        context_file = self.context_dir / "context.md"
-        if context_file.exists() and context_file.stat().st_size == 0:
+        context_entry = entries.get("context.md")
+        if context_entry is not None and os.stat(context_entry.path).st_size == 0:
+            warnings.append("context.md exists but is empty")
+
+        return {
+            "valid": len(issues) == 0,
+            "issues": issues,
+            "warnings": warnings,
+        }
+
+    def pack(self) -> CanonicalPack | None:
+        """Get the compiled pack for this context, if one exists and is fresh.
+
+        The pack is checked once and then reused for the life of this object.
+
+        Returns:
+            The pack, or None when reading from a source or no fresh pack exists
+        """
+        if self.source is not None:
+            return None
+        if not self._pack_loaded:
+            self._pack = load_pack(self.context_dir)
+            self._pack_loaded = True
+        return self._pack
+
+    def layers(self) -> list[Path]:
+        """Get the parent layer directories declared in the manifest.
+
+        Returns:
+            Layer directories, outermost first
+
+        Raises:
+            LayerError: If the manifest or its layer list is malformed
+        """
+        manifest = self.manifest_fields()
+        if not manifest:
+            return []
+        return declared_layers(manifest, self.base_path)
+
+    def manifest_fields(self) -> dict[str, Any] | None:
+        """Get the manifest fields read on every run (layers, adapters used).
+
+        On disk the parse goes through the fingerprint cache, so an unchanged
+        manifest is not read or parsed again when caching is on.
+
+        Returns:
+            The fields, or None if there is no manifest
+
+        Raises:
+            LayerError: If the manifest is not a YAML mapping
+        """
+        if self.source is not None:
+            content = self.source.read_text(f"{CANONICAL_DIR}/manifest.yaml")
+            return None if content is None else _manifest_fields(content)
+        return fingerprints.parsed(self.context_dir / "manifest.yaml", "manifest", _manifest_fields)
+
+    def file_source(self) -> FileSource | None:
+        """Get the source adapters should read this project through.
+
+        Layers declared in the manifest are merged into the canonical files;
+        reads otherwise come from the explicit source or a fresh pack.
+
+        Returns:
+            A file source, or None for plain disk reads
+
+        Raises:
+            LayerError: If a declared layer is missing or malformed
+        """
+        if self._file_source_loaded:
+            return self._file_source
+
+        source = self.source
+        if source is None:
+            pack = self.pack()
+            if pack is not None:
+                source = PackSource(pack, self.base_path, CANONICAL_DIR)
+
+            layer_dirs = self.layers()
+            if layer_dirs:
+                layers = [LAYER_RESOLVER.load(layer_dir) for layer_dir in layer_dirs]
+                project_files = {name: self.read_file(name) for name in LAYERED_FILES}
+                merged = LAYER_RESOLVER.merge(layers, project_files)
+                overlay = {f"{CANONICAL_DIR}/{name}": content for name, content in merged.items()}
+                source = OverlaySource(overlay, self.base_path, fallback=source)
+
+        self._file_source = source
+        self._file_source_loaded = True
+        return source
+
+    def _reset_cache(self) -> None:
+        """Forget the loaded pack and file source after canonical files change."""
+        if self._pack is not None:
+            self._pack.close()
+        self._pack = None
+        self._pack_loaded = False
+        self._file_source = None
+        self._file_source_loaded = False
+
+    def _validate_source(self) -> dict[str, Any]:
+        """Validate a canonical context read from a file source.
+
+        Returns:
+            Validation report with status and issues
+        """
+        issues = []
+        warnings = []
+
+        rules = self.read_file("rules.md")
+        if rules is None:
+            issues.append("Missing required file: rules.md")
+        elif not rules:
+            warnings.append("rules.md is empty")
+
+        if self.read_file("manifest.yaml") is None:
+            warnings.append("Missing manifest.yaml (will be auto-generated)")
+
+        if self.read_file("context.md") == "":
             warnings.append("context.md exists but is empty")
 
         return {
@@ -92,26 +283,41 @@ class CanonicalContext:
                 console.print(f"  [dim]Would create: {filename}[/dim]")
             return
 
-        # Create directory
-        ensure_directory(self.context_dir, dry_run=dry_run)
+        with self.locked(exclusive=True):
+            # Create directory
+            ensure_directory(self.context_dir, dry_run=dry_run)
+
+            # Create files, skipping any that already exist
+            missing = self.render_initialize()
+            for filename in CANONICAL_FILES:
+                file_path = self.context_dir / filename
+                if file_path not in missing:
+                    console.print(f"[yellow]⊘[/yellow] Skipped {filename} (already exists)")
+                elif filename == "manifest.yaml":
+                    save_yaml(file_path, self._create_manifest(), dry_run=dry_run)
+                else:
+                    safe_write(file_path, missing[file_path], dry_run=dry_run)
+
+        self._reset_cache()
+        console.print(f"[green]✓[/green] Initialized canonical context at {self.context_dir}")
+
+    def render_initialize(self) -> dict[Path, str]:
+        """Render the starter files initialize would create, without writing them.
 
-        # Create files
+        Returns:
+            Mapping of canonical file path to content, for files that do not exist yet
+        """
+        existing = fsio.scan(self.context_dir) or {}
+        outputs: dict[Path, str] = {}
         for filename, default_content in CANONICAL_FILES.items():
             file_path = self.context_dir / filename
-
-            # Skip if file already exists
-            if file_path.exists():
-                console.print(f"[yellow]⊘[/yellow] Skipped {filename} (already exists)")
+            if filename in existing:
                 continue
-
-            # Generate manifest dynamically
             if filename == "manifest.yaml":
-                manifest_data = self._create_manifest()
-                save_yaml(file_path, manifest_data, dry_run=dry_run)
+                outputs[file_path] = dump_yaml(self._create_manifest())
             else:
-                safe_write(file_path, default_content, dry_run=dry_run)
-
-        console.print(f"[green]✓[/green] Initialized canonical context at {self.context_dir}")
+                outputs[file_path] = default_content
+        return outputs
 
     def _create_manifest(self, adapters_used: list[str] | None = None) -> dict[str, Any]:
         """Create a manifest dictionary.
@@ -129,34 +335,64 @@ class CanonicalContext:
             "adapters_used": adapters_used or [],
         }
 
+    @profiled("canonical.update_manifest")
     def update_manifest(
-        self, adapter_name: str, dry_run: bool = False, force: bool = False
-    ) -> None:
+        self,
+        adapter_name: str | list[str],
+        dry_run: bool = False,
+        force: bool = False,
+        report: bool = True,
+    ) -> Path | None:
         """Update the manifest with adapter usage.
 
         Args:
-            adapter_name: Name of the adapter that was used
+            adapter_name: Name of the adapter that was used, or several names
             dry_run: Only preview the operation if True
             force: Skip backup creation if True
+            report: Print what was done; batch runs report through their results instead
+
+        Returns:
+            Path of the manifest backup, when one was made without reporting it
+        """
+        manifest_file = self.context_dir / "manifest.yaml"
+        names = [adapter_name] if isinstance(adapter_name, str) else adapter_name
+
+        # Read-modify-write under the write lock, so concurrent jobs don't lose updates
+        with self.locked(exclusive=not dry_run):
+            manifest = self.updated_manifest(names)
+            if report:
+                save_yaml(manifest_file, manifest, force=force, dry_run=dry_run)
+                return None
+            if dry_run:
+                return None
+            return write_file(manifest_file, dump_yaml(manifest), force=force)
+
+    def updated_manifest(self, adapter_names: list[str]) -> dict[str, Any]:
+        """Build the manifest as it should read after using some adapters.
+
+        Args:
+            adapter_names: Names of the adapters that were used
+
+        Returns:
+            Manifest data dictionary (nothing is written)
         """
         manifest_file = self.context_dir / "manifest.yaml"
 
         # Load existing manifest or create new one
-        if manifest_file.exists():
+        try:
             manifest = load_yaml(manifest_file)
-        else:
+        except FileNotFoundError:
             manifest = self._create_manifest()
 
         # Update fields
         manifest["last_updated"] = datetime.now().isoformat()
 
         adapters_used = manifest.get("adapters_used", [])
-        if adapter_name not in adapters_used:
-            adapters_used.append(adapter_name)
+        for adapter_name in adapter_names:
+            if adapter_name not in adapters_used:
+                adapters_used.append(adapter_name)
         manifest["adapters_used"] = adapters_used
-
-        # Save manifest
-        save_yaml(manifest_file, manifest, force=force, dry_run=dry_run)
+        return manifest
 
     def get_rules(self) -> str:
         """Get the content of rules.md.
@@ -164,10 +400,7 @@ class CanonicalContext:
         Returns:
             Rules content
         """
-        rules_file = self.context_dir / "rules.md"
-        if not rules_file.exists():
-            return ""
-        return rules_file.read_text(encoding="utf-8")
+        return self.read_file("rules.md") or ""
 
     def get_context(self) -> str:
         """Get the content of context.md.
@@ -175,42 +408,107 @@ class CanonicalContext:
         Returns:
             Context content
         """
-        context_file = self.context_dir / "context.md"
-        if not context_file.exists():
-            return ""
-        return context_file.read_text(encoding="utf-8")
+        return self.read_file("context.md") or ""
 
     def get_ignore_patterns(self) -> list[str]:
         """Get ignore patterns from ignore.txt.
 
+        On disk the parse goes through the fingerprint cache, like
+        :meth:`manifest_fields`.
+
         Returns:
             List of ignore patterns
         """
-        ignore_file = self.context_dir / "ignore.txt"
-        if not ignore_file.exists():
-            return []
-
-        content = ignore_file.read_text(encoding="utf-8")
-        patterns = []
-        for line in content.splitlines():
-            line = line.strip()
-            if line and not line.startswith("#"):
-                patterns.append(line)
-        return patterns
+        return self._parsed("ignore.txt", "ignore", _ignore_patterns) or []
 
     def get_extensions(self) -> list[str]:
         """Get recommended extensions from extensions.json.
 
+        On disk the parse goes through the fingerprint cache, like
+        :meth:`manifest_fields`.
+
         Returns:
             List of extension IDs
         """
-        import json
+        return self._parsed("extensions.json", "extensions", _recommendations) or []
 
-        extensions_file = self.context_dir / "extensions.json"
-        if not extensions_file.exists():
-            return []
+    def _parsed(self, filename: str, kind: str, parse: Callable[[str], T]) -> T | None:
+        """Parse a canonical file, through the fingerprint cache when read from disk.
+
+        Args:
+            filename: File name inside the canonical directory
+            kind: Name of the parse in the fingerprint cache
+            parse: Function from file content to a JSON-serializable value
 
-        content = extensions_file.read_text(encoding="utf-8")
-        data: dict[str, Any] = json.loads(content)
-        recommendations: list[str] = data.get("recommendations", [])
-        return recommendations
+        Returns:
+            Parsed value, or None if the file does not exist
+        """
+        if self.source is not None or self.pack() is not None:
+            content = self.read_file(filename)
+            return None if content is None else parse(content)
+        return fingerprints.parsed(self.context_dir / filename, kind, parse)
+
+
+def _manifest_fields(content: str) -> dict[str, Any]:
+    """Parse the manifest fields read on every run.
+
+    Args:
+        content: manifest.yaml content
+
+    Returns:
+        ``layers`` and ``adapters_used`` as written (None when absent)
+
+    Raises:
+        LayerError: If the content is not a YAML mapping
+    """
+    try:
+        manifest = yaml.safe_load(content) or {}
+    except yaml.YAMLError as e:
+        raise LayerError(f"Invalid manifest.yaml: {e}") from e
+    if not isinstance(manifest, dict):
+        raise LayerError("Invalid manifest.yaml: expected a mapping")
+    return {"layers": manifest.get("layers"), "adapters_used": manifest.get("adapters_used")}
+
+
+def _ignore_patterns(content: str) -> list[str]:
+    """Parse ignore.txt content.
+
+    Args:
+        content: ignore.txt content
+
+    Returns:
+        Non-empty, non-comment lines
+    """
+    patterns = []
+    for line in content.splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            patterns.append(line)
+    return patterns
+
+
+def _recommendations(content: str) -> list[str]:
+    """Parse the recommended extension IDs from extensions.json content.
+
+    Args:
+        content: extensions.json content
+
+    Returns:
+        Extension IDs
+    """
+    data: dict[str, Any] = json.loads(content)
+    recommendations: list[str] = data.get("recommendations", [])
+    return recommendations
+
+
+def _missing_report() -> dict[str, Any]:
+    """Build the validation report for a missing canonical directory.
+
+    Returns:
+        Validation report
+    """
+    return {
+        "valid": False,
+        "issues": ["Canonical context directory does not exist"],
+        "warnings": [],
+    }
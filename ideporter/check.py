@@ -0,0 +1,153 @@
+"""Read-only sync checks between the canonical context and IDE artifacts."""
+
+import difflib
+from pathlib import Path
+from typing import Any
+
+from ideporter import fingerprints
+from ideporter.adapters import available_adapters, get_adapter
+from ideporter.canonical import CanonicalContext
+from ideporter.layers import LayerError
+from ideporter.sections import diff_sections, is_markdown
+from ideporter.utils import content_hash
+
+
+def resolve_targets(canonical: CanonicalContext) -> list[str]:
+    """Pick the adapters whose artifacts should be checked.
+
+    Adapters recorded in the manifest are preferred; if the manifest lists
+    none, adapters whose artifacts are detected in the project are used.
+
+    Args:
+        canonical: Canonical context of the project
+
+    Returns:
+        List of adapter names
+
+    Raises:
+        LayerError: If the manifest is malformed
+    """
+    manifest = canonical.manifest_fields() or {}
+    used = manifest.get("adapters_used") or []
+    adapters = available_adapters()
+    targets = [name for name in used if isinstance(name, str) and name in adapters]
+    if targets:
+        return targets
+
+    return [
+        name
+        for name, adapter_class in adapters.items()
+        if adapter_class(canonical.base_path).detect()
+    ]
+
+
+def check_project(
+    project_path: Path, targets: list[str] | None = None, include_diff: bool = True
+) -> dict[str, Any]:
+    """Compare the artifacts an export would write with what is on disk.
+
+    Expected outputs are rendered in memory; files are compared by content
+    hash first and a unified diff is only computed on mismatch. Nothing is
+    written.
+
+    Args:
+        project_path: Path to the project root
+        targets: Adapter names to check (defaults to resolve_targets)
+        include_diff: Attach a unified diff to each out-of-sync file
+
+    Returns:
+        Report with sync status, checked files, drift and errors
+    """
+    canonical = CanonicalContext(project_path)
+    report: dict[str, Any] = {
+        "project_path": str(project_path.absolute()),
+        "in_sync": True,
+        "targets": [],
+        "checked": 0,
+        "drift": [],
+        "skipped": [],
+        "errors": [],
+    }
+
+    if not canonical.exists():
+        report["in_sync"] = False
+        report["errors"].append(f"Canonical context not found at {canonical.context_dir}")
+        return report
+
+    try:
+        if targets is None:
+            targets = resolve_targets(canonical)
+        report["targets"] = targets
+        source = canonical.file_source()
+    except LayerError as e:
+        report["in_sync"] = False
+        report["errors"].append(str(e))
+        return report
+
+    for target in targets:
+        try:
+            adapter = get_adapter(target)(project_path, source=source)
+        except ValueError as e:
+            report["in_sync"] = False
+            report["errors"].append(str(e))
+            continue
+
+        try:
+            outputs = adapter.render_export(canonical.context_dir)
+        except NotImplementedError:
+            report["skipped"].append(target)
+            continue
+
+        for file_path, expected in outputs.items():
+            report["checked"] += 1
+            expected_hash = content_hash(expected)
+            # An unchanged file's hash comes from the fingerprint cache unread
+            if fingerprints.cached_hash(file_path) == expected_hash:
+                continue
+
+            actual = adapter.read_file(file_path)
+            actual_hash = content_hash(actual) if actual is not None else None
+            if expected_hash == actual_hash:
+                continue
+
+            relative = _relative(file_path, project_path)
+            entry: dict[str, Any] = {
+                "adapter": target,
+                "path": relative,
+                "status": "missing" if actual is None else "modified",
+                "expected_hash": expected_hash,
+                "actual_hash": actual_hash,
+            }
+            if actual is not None and is_markdown(file_path):
+                sections = diff_sections(actual, expected)
+                entry["sections"] = [" > ".join(key) for key in sections.touched]
+            if include_diff:
+                entry["diff"] = "".join(
+                    difflib.unified_diff(
+                        (actual or "").splitlines(keepends=True),
+                        expected.splitlines(keepends=True),
+                        fromfile=f"a/{relative}",
+                        tofile=f"b/{relative}",
+                    )
+                )
+            report["drift"].append(entry)
+
+    if report["drift"]:
+        report["in_sync"] = False
+    return report
+
+
+def _relative(file_path: Path, project_path: Path) -> str:
+    """Express a path relative to the project root when possible.
+
+    Args:
+        file_path: Path to express
+        project_path: Path to the project root
+
+    Returns:
+        POSIX-style relative path, or the path unchanged if outside the project
+    """
+    try:
+        return file_path.relative_to(project_path).as_posix()
+    except ValueError:
+        return str(file_path)
@@ -1,14 +1,64 @@
 """CLI interface for IDE Context Porter."""
 
 import json
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
 import typer
 from rich.console import Console
 from rich.table import Table
 
-from ideporter.adapters import ADAPTERS, get_adapter
+from ideporter import fingerprints, fsio, writebehind
+from ideporter.adapters import (
+    ADAPTERS,
+    available_adapters,
+    get_adapter,
+    link_targets,
+    spec_errors,
+)
+from ideporter.async_engine import DEFAULT_PER_DEVICE, run_batch
+from ideporter.bundle import BundleError, BundleWriter, read_bundle
 from ideporter.canonical import CanonicalContext
+from ideporter.check import check_project
+from ideporter.fingerprints import FingerprintCache, FingerprintStats, default_cache_path
+from ideporter.gitsource import GitError, GitObjectStore, export_refs
+from ideporter.hook import check_staged
+from ideporter.journal import DEFAULT_JOURNAL, Journal
+from ideporter.linking import LINK_MODES, link_issues
+from ideporter.locking import (
+    DEFAULT_TIMEOUT,
+    LockTimeoutError,
+    default_timeout,
+    project_lock,
+)
+from ideporter.merge import render_import_all
+from ideporter.pack import PackError, build_pack
+from ideporter.plan import apply_plan, write_operations
+from ideporter.profiling import PROFILER
+from ideporter.rendercache import DEFAULT_MAX_BYTES, CacheStats, RenderCache
+from ideporter.server import DEFAULT_WORKERS, serve
+from ideporter.sharding import Shard, canonical_weight, select, shard_key
+from ideporter.similarity import (
+    DEFAULT_FILES,
+    DEFAULT_NUM_PERM,
+    DEFAULT_SHINGLE_SIZE,
+    DEFAULT_THRESHOLD,
+    SimilarityError,
+    analyze_documents,
+    read_documents,
+    read_template,
+)
+from ideporter.sources import MappingSource
+from ideporter.workspace import (
+    WORKSPACE_FILE,
+    WorkspaceError,
+    discover_projects,
+    load_workspace,
+    sync_workspace,
+)
+from ideporter.writebehind import WriteBehindError
 
 app = typer.Typer(
     name="ide-context-porter",
@@ -18,6 +68,13 @@ app = typer.Typer(
 
 console = Console()
 
+workspace_app = typer.Typer(help="Sync the projects listed in ideporter.workspace.yaml")
+app.add_typer(workspace_app, name="workspace")
+cache_app = typer.Typer(help="Inspect or clear the fingerprint cache")
+app.add_typer(cache_app, name="cache")
+analyze_app = typer.Typer(help="Analyze canonical contexts across many projects")
+app.add_typer(analyze_app, name="analyze")
+
 
 @app.command()
 def detect(
@@ -35,7 +92,7 @@ def detect(
 
     detections = {}
 
-    for adapter_name, adapter_class in ADAPTERS.items():
+    for adapter_name, adapter_class in available_adapters().items():
         adapter = adapter_class(project_path)
         detected = adapter.detect()
         detections[adapter_name] = detected
@@ -86,7 +143,8 @@ def init(
         )
         console.print("[dim]Existing files will be preserved[/dim]")
 
-    canonical.initialize(dry_run=dry_run)
+    with _locked(project_path, exclusive=True):
+        canonical.initialize(dry_run=dry_run)
 
     if not dry_run:
         console.print(
@@ -100,7 +158,9 @@ def init(
 @app.command(name="import")
 def import_context(
     from_ide: str = typer.Option(
-        ..., "--from", help="Source IDE (cursor, vscode, continue, claude, windsurf)"
+        ...,
+        "--from",
+        help="Source IDE (cursor, vscode, continue, claude, windsurf, or all to merge every detected IDE)",
     ),
     path: Path | None = typer.Option(
         None, "--path", help="Path to project (defaults to current directory)"
@@ -109,6 +169,9 @@ def import_context(
     dry_run: bool = typer.Option(
         False, "--dry-run", help="Preview operations without making changes"
     ),
+    bundle: Path | None = typer.Option(
+        None, "--bundle", help="Read IDE files from a .tar[.gz|.bz2|.xz|.zst] or .zip bundle"
+    ),
 ) -> None:
     """Import context from IDE-specific files to canonical format."""
     project_path = path or Path.cwd()
@@ -118,34 +181,78 @@ def import_context(
         raise typer.Exit(1)
 
     try:
-        adapter_class = get_adapter(from_ide)
-    except ValueError as e:
+        adapter_class = None if from_ide == "all" else get_adapter(from_ide)
+        source = MappingSource(read_bundle(bundle)) if bundle else None
+    except (ValueError, BundleError) as e:
         console.print(f"[red]✗[/red] {e}")
         raise typer.Exit(1) from None
 
-    # Initialize canonical context if it doesn't exist
-    canonical = CanonicalContext(project_path)
-    if not canonical.exists():
-        console.print("[yellow]⊘[/yellow] Canonical context not found, initializing...")
-        canonical.initialize(dry_run=dry_run)
+    with _locked(project_path, exclusive=True):
+        # Initialize canonical context if it doesn't exist
+        canonical = CanonicalContext(project_path)
+        if not canonical.exists():
+            console.print("[yellow]⊘[/yellow] Canonical context not found, initializing...")
+            canonical.initialize(dry_run=dry_run)
+
+        if adapter_class is None:
+            _import_all(project_path, canonical, source, force=force, dry_run=dry_run)
+            return
+
+        # Run import
+        adapter = adapter_class(project_path, source=source)
+        console.print(f"\n[bold]Importing from {from_ide.upper()}[/bold]")
 
-    # Run import
-    adapter = adapter_class(project_path)
-    console.print(f"\n[bold]Importing from {from_ide.upper()}[/bold]")
+        with _write_behind():
+            adapter.import_context(canonical.context_dir, force=force, dry_run=dry_run)
 
-    adapter.import_context(canonical.context_dir, force=force, dry_run=dry_run)
+        # Update manifest
+        if not dry_run:
+            canonical.update_manifest(from_ide, dry_run=dry_run, force=force)
+
+    console.print("\n[green]✓[/green] Import complete")
+
+
+def _import_all(
+    project_path: Path,
+    canonical: CanonicalContext,
+    source: MappingSource | None,
+    force: bool,
+    dry_run: bool,
+) -> None:
+    """Import from every detected IDE into one deduplicated canonical context.
+
+    Args:
+        project_path: Path to the project root
+        canonical: Canonical context to import into
+        source: Bundle contents to read IDE files from, if any
+        force: Overwrite existing files without backup
+        dry_run: Preview operations without making changes
+    """
+    merged = render_import_all(project_path, canonical.context_dir, source=source)
+    for name, error in merged.errors.items():
+        console.print(f"[red]✗[/red] {name}: {error}")
+    if not merged.sources:
+        console.print("[yellow]⊘[/yellow] No IDE artifacts found to import")
+        raise typer.Exit(1)
+
+    console.print(f"\n[bold]Importing from {', '.join(merged.sources).upper()}[/bold]")
+    with _write_behind():
+        apply_plan(write_operations(merged.outputs, adapter="all"), force=force, dry_run=dry_run)
+    if merged.duplicates:
+        console.print(f"[dim]Dropped {merged.duplicates} duplicate paragraphs[/dim]")
 
-    # Update manifest
     if not dry_run:
-        canonical.update_manifest(from_ide, dry_run=dry_run, force=force)
+        canonical.update_manifest(merged.sources, dry_run=dry_run, force=force)
 
     console.print("\n[green]✓[/green] Import complete")
 
 
 @app.command(name="export")
 def export_context(
-    to_ide: str = typer.Option(
-        ..., "--to", help="Target IDE (cursor, vscode, continue, claude, windsurf)"
+    to_ides: list[str] = typer.Option(
+        ...,
+        "--to",
+        help="Target IDE (cursor, vscode, continue, claude, windsurf, or all; repeatable)",
     ),
     path: Path | None = typer.Option(
         None, "--path", help="Path to project (defaults to current directory)"
@@ -154,6 +261,17 @@ def export_context(
     dry_run: bool = typer.Option(
         False, "--dry-run", help="Preview operations without making changes"
     ),
+    bundle: Path | None = typer.Option(
+        None, "--bundle", help="Write artifacts into a .tar[.gz|.bz2|.xz|.zst] or .zip bundle"
+    ),
+    from_bundle: Path | None = typer.Option(
+        None, "--from-bundle", help="Read the canonical context from a bundle"
+    ),
+    link: str | None = typer.Option(
+        None,
+        "--link",
+        help="Link IDE files to the canonical files instead of copying (symlink, hardlink, reflink)",
+    ),
 ) -> None:
     """Export context from canonical format to IDE-specific files."""
     project_path = path or Path.cwd()
@@ -162,40 +280,504 @@ def export_context(
         console.print(f"[red]✗[/red] Path does not exist: {project_path}")
         raise typer.Exit(1)
 
+    if link is not None and link not in LINK_MODES:
+        console.print(
+            f"[red]✗[/red] Unknown link mode: {link} (choose from {', '.join(LINK_MODES)})"
+        )
+        raise typer.Exit(1)
+    if link is not None and (bundle or from_bundle):
+        console.print("[red]✗[/red] --link cannot be combined with --bundle or --from-bundle")
+        raise typer.Exit(1)
+
     try:
-        adapter_class = get_adapter(to_ide)
-    except ValueError as e:
+        targets = _resolve_targets(to_ides)
+        source = MappingSource(read_bundle(from_bundle)) if from_bundle else None
+    except (ValueError, BundleError) as e:
         console.print(f"[red]✗[/red] {e}")
         raise typer.Exit(1) from None
 
     # Check canonical context exists
-    canonical = CanonicalContext(project_path)
+    canonical = CanonicalContext(project_path, source=source)
     if not canonical.exists():
         console.print(f"[red]✗[/red] Canonical context not found at {canonical.context_dir}")
         console.print("[dim]Run 'ide-context-porter init' first[/dim]")
         raise typer.Exit(1)
 
-    # Validate canonical context
-    validation = canonical.validate()
-    if not validation["valid"]:
-        console.print("[red]✗[/red] Canonical context validation failed:")
-        for issue in validation["issues"]:
-            console.print(f"  • {issue}")
-        raise typer.Exit(1)
+    # Other read-only jobs may export at the same time; writers wait
+    with _locked(project_path, enabled=from_bundle is None):
+        # Validate canonical context
+        validation = canonical.validate()
+        if not validation["valid"]:
+            console.print("[red]✗[/red] Canonical context validation failed:")
+            for issue in validation["issues"]:
+                console.print(f"  • {issue}")
+            raise typer.Exit(1)
 
-    # Run export
-    adapter = adapter_class(project_path)
-    console.print(f"\n[bold]Exporting to {to_ide.upper()}[/bold]")
+        if bundle:
+            _export_to_bundle(project_path, canonical, targets, bundle)
+            return
 
-    adapter.export_context(canonical.context_dir, force=force, dry_run=dry_run)
+        # With --write-behind, the next adapter renders while earlier files are written
+        with _write_behind():
+            for to_ide in targets:
+                # Run export
+                adapter = ADAPTERS[to_ide](project_path, source=canonical.file_source())
+                console.print(f"\n[bold]Exporting to {to_ide.upper()}[/bold]")
 
-    # Update manifest
-    if not dry_run:
-        canonical.update_manifest(to_ide, dry_run=dry_run, force=force)
+                if link is not None:
+                    adapter.export_linked(canonical.context_dir, link, force=force, dry_run=dry_run)
+                else:
+                    adapter.export_context(canonical.context_dir, force=force, dry_run=dry_run)
+
+    # Record every target with a single manifest write
+    if not dry_run and from_bundle is None:
+        with _locked(project_path, exclusive=True):
+            canonical.update_manifest(targets, dry_run=dry_run, force=force)
 
     console.print("\n[green]✓[/green] Export complete")
 
 
+@contextmanager
+def _locked(project_path: Path, exclusive: bool = False, enabled: bool = True) -> Iterator[None]:
+    """Hold the project lock, exiting with an error if it cannot be taken in time.
+
+    Args:
+        project_path: Path to the project root
+        exclusive: Take the write lock instead of the shared read lock
+        enabled: Skip locking if False (e.g. when reading from a bundle)
+
+    Yields:
+        Nothing; the lock is held inside the block
+    """
+    if not enabled:
+        yield
+        return
+    try:
+        with project_lock(project_path, exclusive=exclusive):
+            yield
+    except LockTimeoutError as e:
+        console.print(f"[red]✗[/red] {e}")
+        raise typer.Exit(1) from None
+
+
+@contextmanager
+def _write_behind() -> Iterator[None]:
+    """Queue file writes in the background for a block when --write-behind is on.
+
+    The queue is drained when the block exits; backups it made are reported
+    then, and failed writes end the command.
+
+    Yields:
+        Nothing; writes made inside the block may still be pending
+    """
+    try:
+        with writebehind.session() as writer:
+            yield
+    except WriteBehindError as e:
+        for failed, error in e.failures:
+            console.print(f"[red]✗[/red] Failed to write {failed}: {error}")
+        raise typer.Exit(1) from None
+    if writer is not None:
+        for backup in writer.stats.backups:
+            console.print(f"[dim]Created backup: {backup}[/dim]")
+
+
+def _resolve_targets(names: list[str]) -> list[str]:
+    """Expand and validate adapter names given on the command line.
+
+    Args:
+        names: Adapter names, possibly including "all"
+
+    Returns:
+        Unique adapter names in the order given
+
+    Raises:
+        ValueError: If an adapter is unknown
+    """
+    targets: list[str] = []
+    for name in names:
+        for target in available_adapters() if name == "all" else [name]:
+            get_adapter(target)
+            if target not in targets:
+                targets.append(target)
+    return targets
+
+
+def _export_to_bundle(
+    project_path: Path,
+    canonical: CanonicalContext,
+    targets: list[str],
+    bundle: Path,
+) -> None:
+    """Render every target's artifacts straight into a bundle.
+
+    Args:
+        project_path: Path to the project root
+        canonical: Canonical context to render from
+        targets: Adapter names to render
+        bundle: Bundle path to write
+    """
+    try:
+        with BundleWriter(bundle) as writer:
+            for to_ide in targets:
+                adapter = ADAPTERS[to_ide](project_path, source=canonical.file_source())
+                outputs = adapter.render_export(canonical.context_dir)
+                for file_path, content in outputs.items():
+                    writer.write(file_path.relative_to(project_path).as_posix(), content)
+                console.print(f"[green]✓[/green] Rendered {to_ide} ({len(outputs)} files)")
+    except (BundleError, NotImplementedError) as e:
+        console.print(f"[red]✗[/red] {e}")
+        raise typer.Exit(1) from None
+
+    console.print(
+        f"\n[green]✓[/green] Wrote {writer.files} files ({writer.bytes} bytes) to {bundle}"
+    )
+
+
+@app.command()
+def batch(
+    paths: list[Path] = typer.Argument(..., help="Project paths to export"),
+    to_ides: list[str] = typer.Option(
+        ..., "--to", help="Target IDE (cursor, vscode, continue, claude, windsurf, or all)"
+    ),
+    force: bool = typer.Option(False, "--force", help="Overwrite existing files without backup"),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Preview operations without making changes"
+    ),
+    jobs: int = typer.Option(
+        DEFAULT_PER_DEVICE, "--jobs", "-j", min=1, help="Concurrent file operations per filesystem"
+    ),
+    render_cache: Path | None = typer.Option(
+        None,
+        "--render-cache",
+        envvar="IDEPORTER_RENDER_CACHE",
+        help="Reuse rendered outputs across projects and runs from this directory",
+    ),
+    render_cache_mb: int = typer.Option(
+        DEFAULT_MAX_BYTES // (1024 * 1024),
+        "--render-cache-mb",
+        min=1,
+        help="Evict least recently used renders beyond this size",
+    ),
+    shard_index: int = typer.Option(
+        0,
+        "--shard-index",
+        min=0,
+        envvar="IDEPORTER_SHARD_INDEX",
+        help="This runner's shard of the projects, counting from 0",
+    ),
+    shard_count: int = typer.Option(
+        1,
+        "--shard-count",
+        min=1,
+        envvar="IDEPORTER_SHARD_COUNT",
+        help="Number of runners the projects are split across",
+    ),
+    shard_by_size: bool = typer.Option(
+        False,
+        "--shard-by-size",
+        help="Balance shards by canonical file sizes instead of project count",
+    ),
+    journal_path: Path | None = typer.Option(
+        None,
+        "--journal",
+        envvar="IDEPORTER_JOURNAL",
+        help="Append a completion record for every project to this JSON-lines file",
+    ),
+    resume: bool = typer.Option(
+        False,
+        "--resume",
+        help=f"Skip projects the journal (default {DEFAULT_JOURNAL}) shows as already exported",
+    ),
+) -> None:
+    """Export many projects at once, overlapping their file I/O.
+
+    On SIGINT or SIGTERM, projects already writing finish and are journaled;
+    rerun with --resume to continue where the run stopped.
+    """
+    try:
+        targets = _resolve_targets(to_ides)
+    except ValueError as e:
+        console.print(f"[red]✗[/red] {e}")
+        raise typer.Exit(1) from None
+    shard = _shard(shard_index, shard_count)
+
+    projects: list[Path] = []
+    for project_path in paths:
+        if not project_path.exists():
+            console.print(f"[red]✗[/red] Path does not exist: {project_path}")
+            raise typer.Exit(1)
+        if project_path.resolve() not in (p.resolve() for p in projects):
+            projects.append(project_path)
+
+    if shard is not None:
+        total = len(projects)
+        projects = select(
+            projects, shard, key=shard_key, weigh=canonical_weight if shard_by_size else None
+        )
+        console.print(f"[dim]Shard {shard}: {len(projects)} of {total} projects[/dim]")
+        if not projects:
+            console.print(f"[yellow]⊘[/yellow] No projects in shard {shard}")
+            return
+
+    if resume and journal_path is None:
+        journal_path = DEFAULT_JOURNAL
+    journal = Journal(journal_path) if journal_path is not None else None
+    if resume and journal is not None and not len(journal):
+        console.print(f"[yellow]⊘[/yellow] No journal entries in {journal_path}; exporting all")
+
+    cache = _render_cache(render_cache, render_cache_mb)
+    try:
+        summary = run_batch(
+            projects,
+            targets,
+            force=force,
+            dry_run=dry_run,
+            per_device=jobs,
+            render_cache=cache,
+            journal=journal,
+            resume=resume,
+        )
+    finally:
+        if journal is not None:
+            journal.close()
+
+    console.print("\n[bold]Batch Export Report[/bold]")
+    for result in summary.results:
+        if result.skipped:
+            console.print(f"[yellow]⊘[/yellow] {result.project_path} (unchanged since journaled)")
+        elif result.interrupted:
+            console.print(f"[yellow]⊘[/yellow] {result.project_path} (interrupted)")
+        elif result.ok:
+            unchanged = f", {result.unchanged} unchanged" if result.unchanged else ""
+            console.print(
+                f"[green]✓[/green] {result.project_path} ({result.files} files{unchanged})"
+            )
+            for backup in result.backups:
+                console.print(f"[dim]Created backup: {backup}[/dim]")
+        else:
+            console.print(f"[red]✗[/red] {result.project_path}: {result.error}")
+
+    _print_cache_stats(summary.cache)
+    if journal is not None and not dry_run:
+        console.print(f"[dim]Journal: {journal_path}[/dim]")
+    if summary.failed:
+        console.print(f"\n[red]✗[/red] {len(summary.failed)} of {len(summary.results)} failed")
+    if summary.interrupted:
+        console.print(
+            f"\n[yellow]⊘[/yellow] Interrupted: {len(summary.interrupted)} of "
+            f"{len(summary.results)} projects not exported; rerun with --resume to continue"
+        )
+        raise typer.Exit(130)
+    if summary.failed:
+        raise typer.Exit(1)
+
+    exported = len(summary.results) - len(summary.skipped)
+    skipped = f", {len(summary.skipped)} skipped" if summary.skipped else ""
+    console.print(
+        f"\n[green]✓[/green] Exported {exported} projects ({summary.files} files){skipped}"
+    )
+
+
+@workspace_app.command(name="sync")
+def workspace_sync(
+    workspace_file: Path = typer.Option(
+        Path(WORKSPACE_FILE), "--file", "-f", help="Workspace file"
+    ),
+    force: bool = typer.Option(False, "--force", help="Overwrite existing files without backup"),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Preview operations without making changes"
+    ),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Re-discover projects"),
+    render_workers: int | None = typer.Option(
+        None, "--render-workers", min=1, help="Threads rendering adapter outputs"
+    ),
+    io_workers: int | None = typer.Option(
+        None, "--io-workers", min=1, help="Concurrent file operations per filesystem"
+    ),
+    render_cache: Path | None = typer.Option(
+        None,
+        "--render-cache",
+        envvar="IDEPORTER_RENDER_CACHE",
+        help="Reuse rendered outputs across projects and runs from this directory",
+    ),
+    render_cache_mb: int = typer.Option(
+        DEFAULT_MAX_BYTES // (1024 * 1024),
+        "--render-cache-mb",
+        min=1,
+        help="Evict least recently used renders beyond this size",
+    ),
+    shard_index: int = typer.Option(
+        0,
+        "--shard-index",
+        min=0,
+        envvar="IDEPORTER_SHARD_INDEX",
+        help="This runner's shard of the projects, counting from 0",
+    ),
+    shard_count: int = typer.Option(
+        1,
+        "--shard-count",
+        min=1,
+        envvar="IDEPORTER_SHARD_COUNT",
+        help="Number of runners the projects are split across",
+    ),
+    shard_by_size: bool = typer.Option(
+        False,
+        "--shard-by-size",
+        help="Balance shards by canonical file sizes instead of project count",
+    ),
+) -> None:
+    """Export every workspace project to its targets, writing only changed files."""
+    shard = _shard(shard_index, shard_count)
+    try:
+        summary = sync_workspace(
+            workspace_file,
+            force=force,
+            dry_run=dry_run,
+            use_cache=not no_cache,
+            render_workers=render_workers,
+            io_workers=io_workers,
+            render_cache=_render_cache(render_cache, render_cache_mb),
+            shard=shard,
+            shard_by_size=shard_by_size,
+        )
+    except WorkspaceError as e:
+        console.print(f"[red]✗[/red] {e}")
+        raise typer.Exit(1) from None
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Project", style="cyan")
+    table.add_column("Targets")
+    table.add_column("Written", justify="right")
+    table.add_column("Unchanged", justify="right")
+    table.add_column("Render ms", justify="right")
+    table.add_column("Write ms", justify="right")
+    table.add_column("Total ms", justify="right")
+    for project in summary.projects:
+        if not project.ok:
+            table.add_row(str(project.path), f"[red]✗ {project.error}[/red]", *[""] * 5)
+            continue
+        table.add_row(
+            str(project.path),
+            ", ".join(project.targets),
+            str(project.written),
+            str(project.unchanged),
+            f"{project.render_s * 1000:.1f}",
+            f"{project.write_s * 1000:.1f}",
+            f"{project.total_s * 1000:.1f}",
+        )
+    console.print(table)
+
+    discovery = "cached" if summary.cached_discovery else "scanned"
+    console.print(
+        f"[dim]Discovery {discovery} in {summary.discovery_s * 1000:.1f} ms, "
+        f"total {summary.total_s:.2f} s[/dim]"
+    )
+    if shard is not None:
+        console.print(
+            f"[dim]Shard {shard}: {len(summary.projects)} of {summary.discovered} projects[/dim]"
+        )
+    _print_cache_stats(summary.cache)
+    if summary.failed:
+        console.print(
+            f"\n[red]✗[/red] {len(summary.failed)} of {len(summary.projects)} projects failed"
+        )
+        raise typer.Exit(1)
+    verb = "Would sync" if dry_run else "Synced"
+    console.print(f"\n[green]✓[/green] {verb} {len(summary.projects)} projects")
+
+
+def _shard(index: int, count: int) -> Shard | None:
+    """Validate the shard requested on the command line.
+
+    Args:
+        index: Shard index, counting from 0
+        count: Number of shards
+
+    Returns:
+        The shard, or None when the run is not sharded
+    """
+    try:
+        shard = Shard(index, count)
+    except ValueError as e:
+        console.print(f"[red]✗[/red] {e}")
+        raise typer.Exit(1) from None
+    return shard if count > 1 else None
+
+
+def _render_cache(directory: Path | None, max_mb: int) -> RenderCache | None:
+    """Open the render cache requested on the command line.
+
+    Args:
+        directory: Cache directory, or None to render without a cache
+        max_mb: Size limit in megabytes
+
+    Returns:
+        Render cache, or None
+    """
+    if directory is None:
+        return None
+    return RenderCache(directory, max_bytes=max_mb * 1024 * 1024)
+
+
+def _print_cache_stats(stats: CacheStats | None) -> None:
+    """Print render cache hits and misses for a run.
+
+    Args:
+        stats: Counters, or None when no cache was used
+    """
+    if stats is None:
+        return
+    console.print(
+        f"[dim]Render cache: {stats.hits} hits, {stats.misses} misses "
+        f"({stats.hit_rate:.0%} hit rate), {stats.evictions} evicted[/dim]"
+    )
+
+
+@app.command(name="export-refs")
+def export_refs_command(
+    to_ides: list[str] = typer.Option(..., "--to", help="Target IDE (repeatable)"),
+    refs: list[str] | None = typer.Option(None, "--ref", help="Git ref to export (repeatable)"),
+    patterns: list[str] | None = typer.Option(
+        None, "--pattern", help="for-each-ref pattern such as refs/tags/v* (repeatable)"
+    ),
+    out: Path = typer.Option(..., "--out", help="Output directory or bundle archive"),
+    path: Path | None = typer.Option(
+        None, "--path", help="Path to project (defaults to current directory)"
+    ),
+) -> None:
+    """Render IDE artifacts for many git refs without checking them out."""
+    project_path = path or Path.cwd()
+
+    if not project_path.exists():
+        console.print(f"[red]✗[/red] Path does not exist: {project_path}")
+        raise typer.Exit(1)
+
+    try:
+        for to_ide in to_ides:
+            get_adapter(to_ide)
+        ref_names = list(refs or [])
+        if patterns:
+            with GitObjectStore(project_path) as store:
+                for pattern in patterns:
+                    ref_names.extend(store.list_refs(pattern))
+        if not ref_names:
+            console.print("[red]✗[/red] No refs given (use --ref or --pattern)")
+            raise typer.Exit(1)
+        summary = export_refs(project_path, ref_names, to_ides, out)
+    except (ValueError, GitError) as e:
+        console.print(f"[red]✗[/red] {e}")
+        raise typer.Exit(1) from None
+
+    for ref, reason in summary.skipped.items():
+        console.print(f"[yellow]⊘[/yellow] Skipped {ref}: {reason}")
+
+    console.print(
+        f"\n[green]✓[/green] Exported {len(summary.refs)} refs to {out} "
+        f"({summary.files} files, {summary.rendered} rendered, {summary.reused} reused)"
+    )
+
+
 @app.command()
 def convert(
     from_ide: str = typer.Option(..., "--from", help="Source IDE"),
@@ -225,30 +807,35 @@ def convert(
         console.print(f"[red]✗[/red] {e}")
         raise typer.Exit(1) from None
 
-    canonical = CanonicalContext(project_path)
-    if not canonical.exists():
-        console.print("[dim]Initializing canonical context...[/dim]")
-        canonical.initialize(dry_run=dry_run)
-
-    adapter = adapter_class(project_path)
-    adapter.import_context(canonical.context_dir, force=force, dry_run=dry_run)
-
-    if not dry_run:
-        canonical.update_manifest(from_ide, dry_run=dry_run, force=force)
-
-    # Step 2: Export
-    console.print(f"\n[bold cyan]Step 2:[/bold cyan] Exporting to {to_ide.upper()}")
     try:
-        adapter_class = get_adapter(to_ide)
+        export_class = get_adapter(to_ide)
     except ValueError as e:
         console.print(f"[red]✗[/red] {e}")
         raise typer.Exit(1) from None
 
-    adapter = adapter_class(project_path)
-    adapter.export_context(canonical.context_dir, force=force, dry_run=dry_run)
+    with _locked(project_path, exclusive=True):
+        canonical = CanonicalContext(project_path)
+        if not canonical.exists():
+            console.print("[dim]Initializing canonical context...[/dim]")
+            canonical.initialize(dry_run=dry_run)
 
-    if not dry_run:
-        canonical.update_manifest(to_ide, dry_run=dry_run, force=force)
+        adapter = adapter_class(project_path)
+        # Imported files land before the export step reads them
+        with _write_behind():
+            adapter.import_context(canonical.context_dir, force=force, dry_run=dry_run)
+
+        if not dry_run:
+            canonical.update_manifest(from_ide, dry_run=dry_run, force=force)
+
+        # Step 2: Export
+        console.print(f"\n[bold cyan]Step 2:[/bold cyan] Exporting to {to_ide.upper()}")
+        with _write_behind():
+            export_class(project_path).export_context(
+                canonical.context_dir, force=force, dry_run=dry_run
+            )
+
+        if not dry_run:
+            canonical.update_manifest(to_ide, dry_run=dry_run, force=force)
 
     console.print(f"\n[green]✓[/green] Conversion complete: {from_ide.upper()} → {to_ide.upper()}")
 
@@ -268,7 +855,14 @@ def validate(
         raise typer.Exit(1)
 
     canonical = CanonicalContext(project_path)
-    validation = canonical.validate()
+    with _locked(project_path):
+        validation = canonical.validate()
+
+        # IDE files exported with --link must still point at the canonical files
+        issues, warnings = link_issues(link_targets(project_path, canonical.context_dir))
+    validation["issues"].extend(issues)
+    validation["warnings"].extend(warnings)
+    validation["valid"] = validation["valid"] and not issues
 
     if json_output:
         print(json.dumps(validation, indent=2))
@@ -296,10 +890,387 @@ def validate(
         raise typer.Exit(1)
 
 
+@app.command(name="pack")
+def pack_command(
+    path: Path | None = typer.Argument(
+        None, help="Path to project (defaults to current directory)"
+    ),
+) -> None:
+    """Compile ai/context into a single pack file for fast loading."""
+    project_path = path or Path.cwd()
+
+    if not project_path.exists():
+        console.print(f"[red]✗[/red] Path does not exist: {project_path}")
+        raise typer.Exit(1)
+
+    canonical = CanonicalContext(project_path)
+    if not canonical.exists():
+        console.print(f"[red]✗[/red] Canonical context not found at {canonical.context_dir}")
+        console.print("[dim]Run 'ide-context-porter init' first[/dim]")
+        raise typer.Exit(1)
+
+    try:
+        with _locked(project_path, exclusive=True):
+            pack_file = build_pack(canonical.context_dir)
+    except PackError as e:
+        console.print(f"[red]✗[/red] {e}")
+        raise typer.Exit(1) from None
+
+    console.print(f"[green]✓[/green] Wrote {pack_file} ({pack_file.stat().st_size} bytes)")
+    console.print("[dim]The pack is used automatically while it matches ai/context[/dim]")
+
+
+@app.command()
+def check(
+    path: Path | None = typer.Argument(
+        None, help="Path to project (defaults to current directory)"
+    ),
+    to_ides: list[str] | None = typer.Option(
+        None, "--to", help="IDE to check (repeatable; defaults to manifest or detected IDEs)"
+    ),
+    json_output: bool = typer.Option(False, "--json", help="Output as JSON"),
+    show_diff: bool = typer.Option(True, "--diff/--no-diff", help="Include diffs for drift"),
+) -> None:
+    """Check that IDE artifacts are in sync with the canonical context (no writes)."""
+    project_path = path or Path.cwd()
+
+    if not project_path.exists():
+        console.print(f"[red]✗[/red] Path does not exist: {project_path}")
+        raise typer.Exit(1)
+
+    with _locked(project_path):
+        report = check_project(project_path, targets=to_ides or None, include_diff=show_diff)
+
+    if json_output:
+        print(json.dumps(report, indent=2))
+    else:
+        console.print("\n[bold]Sync Check Report[/bold]")
+        console.print(f"Project: {report['project_path']}")
+        console.print(f"Targets: {', '.join(report['targets']) or 'none'}\n")
+
+        for error in report["errors"]:
+            console.print(f"[red]✗[/red] {error}")
+
+        for entry in report["drift"]:
+            console.print(f"[red]✗[/red] {entry['path']} ({entry['adapter']}): {entry['status']}")
+            if entry.get("diff"):
+                console.print(entry["diff"], markup=False, highlight=False)
+
+        for skipped in report["skipped"]:
+            console.print(f"[yellow]⊘[/yellow] {skipped}: rendering not supported, skipped")
+
+        if report["in_sync"]:
+            console.print(f"[green]✓ In sync[/green] ({report['checked']} files checked)")
+        else:
+            console.print("[red]✗ Out of sync[/red]")
+            console.print("[dim]Run 'ide-context-porter export --to <ide>' to update[/dim]")
+
+    if not report["in_sync"]:
+        raise typer.Exit(1)
+
+
+@app.command()
+def hook(
+    path: Path | None = typer.Argument(
+        None, help="Path to project (defaults to current directory)"
+    ),
+    json_output: bool = typer.Option(False, "--json", help="Output as JSON"),
+) -> None:
+    """Check staged IDE artifacts against the staged canonical context (pre-commit hook)."""
+    project_path = path or Path.cwd()
+
+    if not project_path.exists():
+        console.print(f"[red]✗[/red] Path does not exist: {project_path}")
+        raise typer.Exit(1)
+
+    report = check_staged(project_path)
+
+    if json_output:
+        print(json.dumps(report, indent=2))
+    elif not report["targets"] and not report["errors"]:
+        console.print(
+            f"[dim]No affected canonical or IDE files staged ({report['elapsed_ms']} ms)[/dim]"
+        )
+    else:
+        for error in report["errors"]:
+            console.print(f"[red]✗[/red] {error}")
+        for entry in report["drift"]:
+            console.print(
+                f"[red]✗[/red] {entry['path']} ({entry['adapter']}): {entry['status']} in the index"
+            )
+        for skipped in report["skipped"]:
+            console.print(f"[yellow]⊘[/yellow] {skipped}: rendering not supported, skipped")
+
+        if report["in_sync"]:
+            console.print(
+                f"[green]✓ Staged artifacts in sync[/green] ({report['checked']} files checked, "
+                f"{report['elapsed_ms']} ms)"
+            )
+        else:
+            drifted = dict.fromkeys(entry["adapter"] for entry in report["drift"])
+            targets = " ".join(f"--to {adapter}" for adapter in drifted)
+            console.print("[red]✗ Staged artifacts out of sync[/red]")
+            console.print(
+                f"[dim]Run 'ide-context-porter export {targets or '--to <ide>'}' "
+                "and stage the result[/dim]"
+            )
+
+    if not report["in_sync"]:
+        raise typer.Exit(1)
+
+
+@app.command(name="serve-stdio")
+def serve_stdio(
+    workers: int = typer.Option(
+        DEFAULT_WORKERS, "--workers", "-w", min=1, help="Requests executed concurrently"
+    ),
+) -> None:
+    """Serve JSON-lines requests on stdin, writing one JSON response per line to stdout."""
+    serve(sys.stdin, sys.stdout, workers=workers)
+
+
+@cache_app.command(name="stats")
+def cache_stats(
+    json_output: bool = typer.Option(False, "--json", help="Output as JSON"),
+) -> None:
+    """Show what the fingerprint cache holds."""
+    db_path = default_cache_path()
+    stats = FingerprintStats(path=db_path)
+    if db_path.exists():
+        cache = FingerprintCache(db_path)
+        try:
+            stats = cache.stats()
+        finally:
+            cache.close()
+
+    if json_output:
+        output = {
+            "path": str(stats.path),
+            "entries": stats.entries,
+            "total": stats.total,
+            "size_bytes": stats.size_bytes,
+        }
+        print(json.dumps(output, indent=2))
+        return
+
+    if not db_path.exists():
+        console.print(f"[yellow]⊘[/yellow] No fingerprint cache at {db_path}")
+        return
+
+    console.print(f"\n[bold]Fingerprint Cache[/bold] {db_path}")
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Kind", style="cyan")
+    table.add_column("Entries", justify="right")
+    for kind, count in stats.entries.items():
+        table.add_row(kind, str(count))
+    console.print(table)
+    console.print(f"[dim]{stats.total} entries, {stats.size_bytes / 1024:.1f} KiB on disk[/dim]")
+
+
+@cache_app.command(name="clear")
+def cache_clear() -> None:
+    """Delete every entry from the fingerprint cache."""
+    db_path = default_cache_path()
+    if not db_path.exists():
+        console.print(f"[yellow]⊘[/yellow] No fingerprint cache at {db_path}")
+        return
+
+    cache = FingerprintCache(db_path)
+    try:
+        removed = cache.clear()
+    finally:
+        cache.close()
+    console.print(f"[green]✓[/green] Cleared {removed} entries from {db_path}")
+
+
+@analyze_app.command(name="similarity")
+def analyze_similarity(
+    paths: list[Path] | None = typer.Argument(None, help="Project paths to compare"),
+    workspace_file: Path | None = typer.Option(
+        None, "--workspace", "-w", help="Also compare every project of this workspace file"
+    ),
+    template: Path | None = typer.Option(
+        None,
+        "--template",
+        help="Org template (a file, or a project) to score drift against",
+    ),
+    files: list[str] = typer.Option(
+        list(DEFAULT_FILES), "--file", help="Canonical files to compare (repeatable)"
+    ),
+    threshold: float = typer.Option(
+        DEFAULT_THRESHOLD,
+        "--threshold",
+        min=0.01,
+        max=1.0,
+        help="Estimated Jaccard similarity that puts two projects in one cluster",
+    ),
+    num_perm: int = typer.Option(
+        DEFAULT_NUM_PERM, "--num-perm", min=8, help="MinHash signature length"
+    ),
+    shingle_size: int = typer.Option(
+        DEFAULT_SHINGLE_SIZE, "--shingle-size", min=1, help="Words per shingle"
+    ),
+    top: int = typer.Option(10, "--top", min=1, help="Clusters and drifted projects to list"),
+    json_output: bool = typer.Option(False, "--json", help="Output the full report as JSON"),
+) -> None:
+    """Cluster near-duplicate rules with MinHash/LSH and score drift from a template."""
+    projects: list[Path] = []
+    for project_path in paths or []:
+        if not project_path.exists():
+            console.print(f"[red]✗[/red] Path does not exist: {project_path}")
+            raise typer.Exit(1)
+        projects.append(project_path)
+    if workspace_file is not None:
+        try:
+            entries, _ = discover_projects(load_workspace(workspace_file))
+        except WorkspaceError as e:
+            console.print(f"[red]✗[/red] {e}")
+            raise typer.Exit(1) from None
+        projects.extend(entry.path for entry in entries)
+    if not projects:
+        console.print("[red]✗[/red] No projects given (pass paths or --workspace)")
+        raise typer.Exit(1)
+
+    try:
+        report = analyze_documents(
+            read_documents(list(dict.fromkeys(projects)), tuple(files)),
+            template=read_template(template, tuple(files)) if template is not None else None,
+            threshold=threshold,
+            num_perm=num_perm,
+            shingle_size=shingle_size,
+        )
+    except SimilarityError as e:
+        console.print(f"[red]✗[/red] {e}")
+        raise typer.Exit(1) from None
+    report.template = str(template) if template is not None else None
+
+    if json_output:
+        print(json.dumps(report.to_dict(), indent=2))
+        return
+
+    duplicated = [cluster for cluster in report.clusters if cluster.size > 1]
+    console.print(f"\n[bold]Similarity Report[/bold] {report.projects} projects")
+    console.print(
+        f"[dim]Threshold {report.threshold}, {report.num_perm} permutations in "
+        f"{report.bands} bands of {report.rows}, {report.elapsed_ms:.0f} ms[/dim]\n"
+    )
+    if duplicated:
+        table = Table(show_header=True, header_style="bold magenta")
+        table.add_column("Cluster", justify="right")
+        table.add_column("Size", justify="right")
+        table.add_column("Representative", style="cyan")
+        table.add_column("Least similar", justify="right")
+        for cluster in duplicated[:top]:
+            table.add_row(
+                str(cluster.id),
+                str(cluster.size),
+                cluster.representative,
+                f"{cluster.members[-1].similarity:.2f}",
+            )
+        console.print(table)
+    console.print(
+        f"{len(duplicated)} clusters of near-duplicates, "
+        f"{len(report.clusters) - len(duplicated)} unique projects"
+    )
+
+    drift = report.to_dict()["drift"]
+    if drift:
+        against = str(template) if template is not None else "cluster"
+        table = Table(show_header=True, header_style="bold magenta")
+        table.add_column("Project", style="cyan")
+        table.add_column("Cluster", justify="right")
+        table.add_column(f"Drift from {against}", justify="right")
+        for entry in drift[:top]:
+            table.add_row(entry["path"], str(entry["cluster"]), f"{entry['drift']:.2f}")
+        console.print(table)
+    if report.empty:
+        console.print(
+            f"[yellow]⊘[/yellow] {len(report.empty)} projects have no {' or '.join(files)}"
+        )
+
+
 @app.callback()
-def main() -> None:
+def main(
+    ctx: typer.Context,
+    profile: bool = typer.Option(
+        False, "--profile", help="Print a per-phase timing breakdown to stderr"
+    ),
+    profile_trace: Path | None = typer.Option(
+        None, "--profile-trace", help="Write a Chrome trace-event JSON file (implies --profile)"
+    ),
+    lock_timeout: float = typer.Option(
+        DEFAULT_TIMEOUT,
+        "--lock-timeout",
+        min=0,
+        help="Seconds to wait for another job's lock on the project",
+    ),
+    write_behind: bool = typer.Option(
+        False,
+        "--write-behind",
+        envvar="IDEPORTER_WRITE_BEHIND",
+        help="Write files and backups on background threads while the next adapter renders",
+    ),
+    fingerprint_cache: bool = typer.Option(
+        False,
+        "--fingerprint-cache",
+        envvar="IDEPORTER_FINGERPRINT_CACHE",
+        help="Reuse file hashes and parsed manifests from earlier runs while files are unchanged",
+    ),
+) -> None:
     """IDE Context Porter - Move your project's AI prompts and context between IDEs."""
-    pass
+    ctx.call_on_close(_report_spec_errors)
+    ctx.with_resource(default_timeout(lock_timeout))
+    ctx.with_resource(writebehind.default_enabled(write_behind))
+    if profile or profile_trace:
+        PROFILER.enable()
+        ctx.call_on_close(lambda: _finish_profile(profile_trace))
+    # One command shares directory listings; the server scopes them per request
+    if ctx.invoked_subcommand != "serve-stdio":
+        ctx.with_resource(fsio.operation())
+    if fingerprint_cache and ctx.invoked_subcommand != "cache":
+        ctx.with_resource(fingerprints.enabled(FingerprintCache(default_cache_path())))
+
+
+def _report_spec_errors() -> None:
+    """Report adapter specs that could not be loaded.
+
+    Printed on stderr, so --json output stays parseable.
+    """
+    err_console = Console(stderr=True)
+    for error in spec_errors():
+        err_console.print(f"[yellow]⊘[/yellow] Skipped adapter spec {error}")
+
+
+def _finish_profile(trace_path: Path | None) -> None:
+    """Stop profiling and report what was collected.
+
+    Args:
+        trace_path: Where to write the Chrome trace, if requested
+    """
+    PROFILER.disable()
+    err_console = Console(stderr=True)
+
+    table = Table(title="Profile", show_header=True, header_style="bold magenta")
+    table.add_column("Phase", style="cyan")
+    table.add_column("Calls", justify="right")
+    table.add_column("Total ms", justify="right")
+    table.add_column("Mean ms", justify="right")
+    table.add_column("Max ms", justify="right")
+    for stats in PROFILER.report():
+        table.add_row(
+            stats.name,
+            str(stats.calls),
+            f"{stats.total_ns / 1e6:.2f}",
+            f"{stats.total_ns / stats.calls / 1e6:.3f}",
+            f"{stats.max_ns / 1e6:.3f}",
+        )
+    err_console.print(table)
+    for name, value in sorted(PROFILER.counters.items()):
+        err_console.print(f"[dim]{name}: {value}[/dim]")
+
+    if trace_path:
+        PROFILER.write_trace(trace_path)
+        err_console.print(f"[green]✓[/green] Wrote trace to {trace_path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,357 @@
+"""Persistent fingerprint cache for files read on every run.
+
+``validate`` and ``check`` parse the same manifest and hash the same IDE
+files on every run, although almost nothing changes between runs; the
+canonical ignore patterns and extension IDs are parsed through it too. With
+``--fingerprint-cache`` those results are kept in a per-user SQLite database
+keyed by path and stat signature (inode, size, ``mtime_ns``): a later run
+stats the file and, if the signature is unchanged, reuses the stored hash or
+parsed value instead of reading and parsing the file again.
+
+The database runs in WAL mode with one connection per thread, so batch
+workers and concurrent processes can read it while another writes. Files
+modified within the last couple of seconds are not stored, since a second
+write in the same timestamp tick would leave the signature unchanged (the
+"racy clean" problem git's index has too). Any database error only costs a
+cache miss.
+"""
+
+import json
+import os
+import sqlite3
+import stat
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, TypeVar, cast
+
+from ideporter import fsio
+from ideporter.profiling import PROFILER
+from ideporter.utils import content_hash
+
+SCHEMA_VERSION = 1
+DB_FILE = "fingerprints.sqlite3"
+
+# Files modified more recently than this are not cached
+_RACY_NS = 2_000_000_000
+_BUSY_TIMEOUT_S = 5.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+    path TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    inode INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (path, kind)
+) WITHOUT ROWID
+"""
+
+T = TypeVar("T")
+_MISS = object()
+
+_active: "FingerprintCache | None" = None
+
+
+def default_cache_path() -> Path:
+    """Get the per-user fingerprint database.
+
+    Returns:
+        ``$XDG_CACHE_HOME/ideporter/fingerprints.sqlite3``, or the same under ``~/.cache``
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "ideporter" / DB_FILE
+
+
+@dataclass
+class FingerprintStats:
+    """What the fingerprint database holds and how this run used it."""
+
+    path: Path
+    entries: dict[str, int] = field(default_factory=dict)
+    size_bytes: int = 0
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def total(self) -> int:
+        """Number of stored entries across all kinds."""
+        return sum(self.entries.values())
+
+
+class FingerprintCache:
+    """SQLite-backed map of (path, stat signature) to hashes and parsed values."""
+
+    def __init__(self, path: Path):
+        """Initialize the cache; the database is opened on first use.
+
+        Args:
+            path: Database file (created with its directory when missing)
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._unavailable = False
+
+    def parsed(self, path: Path, kind: str, parse: Callable[[str], T]) -> T | None:
+        """Parse a file, reusing the stored result while its stat signature is unchanged.
+
+        Args:
+            path: File to parse
+            kind: Name of the parse, so one file can hold several results
+            parse: Function from file content to a JSON-serializable value
+
+        Returns:
+            Parsed value, or None if the file does not exist
+        """
+        st = _stat(path)
+        if st is None:
+            return None
+        key = os.path.abspath(path)
+        signature = (st.st_ino, st.st_size, st.st_mtime_ns)
+
+        found = self._lookup(key, kind, signature)
+        if found is not _MISS:
+            self._count(hits=1)
+            return cast(T, found)
+        self._count(misses=1)
+
+        content = fsio.read_text(path)
+        if content is None:
+            return None
+        value = parse(content)
+        if time.time_ns() - st.st_mtime_ns > _RACY_NS:
+            self._store(key, kind, signature, value)
+        return value
+
+    def file_hash(self, path: Path) -> str | None:
+        """Hash a file's text, reusing the stored hash while it is unchanged.
+
+        Args:
+            path: File to hash
+
+        Returns:
+            Content hash, or None if the file does not exist
+        """
+        return self.parsed(path, "hash", content_hash)
+
+    def stats(self) -> FingerprintStats:
+        """Count stored entries and measure the database.
+
+        Returns:
+            Stats for the database and this run
+        """
+        stats = FingerprintStats(path=self.path, hits=self.hits, misses=self.misses)
+        connection = self._connection()
+        if connection is not None:
+            try:
+                rows = connection.execute(
+                    "SELECT kind, COUNT(*) FROM fingerprints GROUP BY kind ORDER BY kind"
+                ).fetchall()
+                stats.entries = dict(rows)
+            except sqlite3.Error:
+                pass
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                stats.size_bytes += os.stat(f"{self.path}{suffix}").st_size
+            except OSError:
+                pass
+        return stats
+
+    def clear(self) -> int:
+        """Delete every stored entry.
+
+        Returns:
+            Number of entries deleted
+        """
+        connection = self._connection()
+        if connection is None:
+            return 0
+        try:
+            removed = connection.execute("DELETE FROM fingerprints").rowcount
+            connection.execute("VACUUM")
+        except sqlite3.Error:
+            return 0
+        return removed
+
+    def close(self) -> None:
+        """Close every thread's connection."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+    def _lookup(self, key: str, kind: str, signature: tuple[int, int, int]) -> Any:
+        """Find a stored value for an unchanged file.
+
+        Args:
+            key: Absolute path
+            kind: Kind of value
+            signature: Current (inode, size, mtime_ns)
+
+        Returns:
+            The stored value, or _MISS
+        """
+        connection = self._connection()
+        if connection is None:
+            return _MISS
+        try:
+            row = connection.execute(
+                "SELECT value FROM fingerprints "
+                "WHERE path = ? AND kind = ? AND inode = ? AND size = ? AND mtime_ns = ?",
+                (key, kind, *signature),
+            ).fetchone()
+        except sqlite3.Error:
+            return _MISS
+        return _MISS if row is None else json.loads(row[0])
+
+    def _store(self, key: str, kind: str, signature: tuple[int, int, int], value: Any) -> None:
+        """Store a value; failures only cost a future miss.
+
+        Args:
+            key: Absolute path
+            kind: Kind of value
+            signature: (inode, size, mtime_ns) the value was computed for
+            value: JSON-serializable value
+        """
+        connection = self._connection()
+        if connection is None:
+            return
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?, ?, ?, ?)",
+                (key, kind, *signature, json.dumps(value)),
+            )
+        except (sqlite3.Error, TypeError, ValueError):
+            pass
+
+    def _connection(self) -> sqlite3.Connection | None:
+        """Get this thread's connection, opening the database on first use.
+
+        Returns:
+            Connection, or None if the database cannot be opened
+        """
+        connection: sqlite3.Connection | None = getattr(self._local, "connection", None)
+        if connection is not None or self._unavailable:
+            return connection
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(
+                self.path, timeout=_BUSY_TIMEOUT_S, isolation_level=None, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                connection.execute("DROP TABLE IF EXISTS fingerprints")
+                connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            connection.execute(_SCHEMA)
+        except (OSError, sqlite3.Error):
+            PROFILER.count("fingerprints.unavailable")
+            self._unavailable = True
+            return None
+
+        self._local.connection = connection
+        with self._lock:
+            self._connections.append(connection)
+        return connection
+
+    def _count(self, hits: int = 0, misses: int = 0) -> None:
+        """Add to this run's counters.
+
+        Args:
+            hits: Lookups served from the database
+            misses: Lookups that read the file
+        """
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+        if hits:
+            PROFILER.count("fingerprints.hits", hits)
+        if misses:
+            PROFILER.count("fingerprints.misses", misses)
+
+
+@contextmanager
+def enabled(cache: FingerprintCache) -> Iterator[FingerprintCache]:
+    """Use a fingerprint cache for every lookup made inside a block.
+
+    Args:
+        cache: Cache to use; it is closed when the block exits
+
+    Yields:
+        The cache
+    """
+    global _active
+    previous, _active = _active, cache
+    try:
+        yield cache
+    finally:
+        _active = previous
+        cache.close()
+
+
+def active() -> FingerprintCache | None:
+    """Get the fingerprint cache in use, if any.
+
+    Returns:
+        The active cache, or None when caching is off
+    """
+    return _active
+
+
+def parsed(path: Path, kind: str, parse: Callable[[str], T]) -> T | None:
+    """Parse a file through the active cache, or directly when caching is off.
+
+    Args:
+        path: File to parse
+        kind: Name of the parse
+        parse: Function from file content to a JSON-serializable value
+
+    Returns:
+        Parsed value, or None if the file does not exist
+    """
+    cache = _active
+    if cache is not None:
+        return cache.parsed(path, kind, parse)
+    content = fsio.read_text(path)
+    return None if content is None else parse(content)
+
+
+def cached_hash(path: Path) -> str | None:
+    """Hash a file through the active cache.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Content hash, or None when caching is off or the file does not exist
+    """
+    cache = _active
+    return cache.file_hash(path) if cache is not None else None
+
+
+def _stat(path: Path) -> os.stat_result | None:
+    """Stat a file, following symlinks.
+
+    Args:
+        path: File to stat
+
+    Returns:
+        Stat result, or None if the path is missing or not a regular file
+    """
+    if fsio.known_missing(path):
+        return None
+    try:
+        st = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
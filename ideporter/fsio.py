@@ -0,0 +1,307 @@
+"""Syscall-minimal filesystem access.
+
+On network filesystems every ``stat`` is a round-trip, so this module avoids
+look-before-you-leap patterns: files are opened directly and a missing file
+is handled as an error rather than checked for first.
+
+Inside an ``operation()`` (one CLI command or API call), lookups share a
+``Lookup``: the first question about a directory lists it once with
+``os.scandir``; later existence checks come from the listing (its entry types
+need no further syscall) and ``lstat`` of a missing entry is answered without
+one. Paths found missing are
+remembered, so they are not probed again. Writes made through
+``ideporter.utils`` call ``forget()`` so the cache never hides a new file.
+Outside an operation every helper falls back to a single direct syscall.
+
+Files queued for a deferred write (see ``ideporter.writebehind``) are
+*staged*: ``read_text`` and ``exists`` answer from the queued content until
+the write lands, so later steps of a command see their own writes.
+"""
+
+import os
+import stat as stat_module
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+_current: ContextVar["Lookup | None"] = ContextVar("ideporter_fsio_lookup", default=None)
+
+_staged: dict[Path, str] = {}
+_staged_lock = threading.Lock()
+
+
+class Lookup:
+    """Directory listings and negative lookups cached for one operation."""
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._listings: dict[Path, dict[str, os.DirEntry[str]] | None] = {}
+        self._missing: set[Path] = set()
+        self._lock = threading.Lock()
+
+    def listing(self, directory: Path) -> dict[str, os.DirEntry[str]] | None:
+        """List a directory once per operation.
+
+        Args:
+            directory: Directory to list
+
+        Returns:
+            Entries by name, or None if the directory does not exist
+        """
+        with self._lock:
+            if directory in self._listings:
+                return self._listings[directory]
+        entries = _scan(directory)
+        with self._lock:
+            self._listings[directory] = entries
+            if entries is None:
+                self._missing.add(directory)
+        return entries
+
+    def entry(self, path: Path) -> os.DirEntry[str] | None:
+        """Find a path's entry in its parent's listing.
+
+        Args:
+            path: Path to look up
+
+        Returns:
+            The directory entry, or None if the path does not exist
+        """
+        if path in self._missing:
+            return None
+        entries = self.listing(path.parent)
+        found = entries.get(path.name) if entries is not None else None
+        if found is None:
+            self.mark_missing(path)
+        return found
+
+    def mark_missing(self, path: Path) -> None:
+        """Remember that a path does not exist.
+
+        Args:
+            path: Missing path
+        """
+        with self._lock:
+            self._missing.add(path)
+
+    def known_missing(self, path: Path) -> bool:
+        """Check whether cached lookups already show a path missing.
+
+        Args:
+            path: Path to check
+
+        Returns:
+            True if the path was found missing or is absent from a cached listing
+        """
+        with self._lock:
+            if path in self._missing:
+                return True
+            if path.parent not in self._listings:
+                return False
+            entries = self._listings[path.parent]
+        return entries is None or path.name not in entries
+
+    def forget(self, path: Path) -> None:
+        """Drop everything cached about a path and its parent directory.
+
+        Args:
+            path: Path that was created, replaced or removed
+        """
+        with self._lock:
+            self._missing.discard(path)
+            self._listings.pop(path, None)
+            self._listings.pop(path.parent, None)
+            # Ancestors that were missing may have been created along with it
+            for parent in path.parents:
+                if parent not in self._missing:
+                    break
+                self._missing.discard(parent)
+                self._listings.pop(parent.parent, None)
+
+
+@contextmanager
+def operation() -> Iterator[Lookup]:
+    """Share directory listings and negative lookups for the duration of a block.
+
+    Yields:
+        The active lookup cache
+    """
+    existing = _current.get()
+    if existing is not None:
+        yield existing
+        return
+
+    lookup = Lookup()
+    token = _current.set(lookup)
+    try:
+        yield lookup
+    finally:
+        _current.reset(token)
+
+
+def scan(directory: Path) -> dict[str, os.DirEntry[str]] | None:
+    """List a directory, reusing the operation's listing when there is one.
+
+    Args:
+        directory: Directory to list
+
+    Returns:
+        Entries by name, or None if the directory does not exist
+    """
+    lookup = _current.get()
+    if lookup is not None:
+        return lookup.listing(directory)
+    return _scan(directory)
+
+
+def exists(path: Path) -> bool:
+    """Check whether a path exists.
+
+    Args:
+        path: Path to check
+
+    Returns:
+        True if the path exists (symlinks are followed)
+    """
+    if _staged and path in _staged:
+        return True
+    lookup = _current.get()
+    if lookup is not None:
+        found = lookup.entry(path)
+        if found is None:
+            return False
+        if not found.is_symlink():
+            return True
+    try:
+        os.stat(path)
+        return True
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+
+
+def lstat(path: Path) -> os.stat_result | None:
+    """Stat a path without following symlinks.
+
+    Args:
+        path: Path to stat
+
+    Returns:
+        Stat result, or None if the path does not exist
+    """
+    lookup = _current.get()
+    if lookup is not None:
+        found = lookup.entry(path)
+        if found is None:
+            return None
+    try:
+        return os.lstat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def known_missing(path: Path) -> bool:
+    """Check, without any syscall, whether the operation already knows a path is missing.
+
+    Args:
+        path: Path to check
+
+    Returns:
+        True only if an earlier lookup or listing showed the path missing
+    """
+    if _staged and path in _staged:
+        return False
+    lookup = _current.get()
+    return lookup is not None and lookup.known_missing(path)
+
+
+def read_text(path: Path) -> str | None:
+    """Read a UTF-8 file by opening it directly.
+
+    Args:
+        path: File to read
+
+    Returns:
+        File contents, or None if the file does not exist
+    """
+    if _staged:
+        with _staged_lock:
+            content = _staged.get(path)
+        if content is not None:
+            return content
+    lookup = _current.get()
+    if lookup is not None and lookup.known_missing(path):
+        return None
+    try:
+        return path.read_text(encoding="utf-8")
+    except (FileNotFoundError, NotADirectoryError):
+        if lookup is not None:
+            lookup.mark_missing(path)
+        return None
+
+
+def is_link(st: os.stat_result | None) -> bool:
+    """Check whether an lstat result describes a symlink or a hard-linked file.
+
+    Args:
+        st: Result of lstat(), or None for a missing path
+
+    Returns:
+        True if writing through the path would change another name too
+    """
+    if st is None:
+        return False
+    return stat_module.S_ISLNK(st.st_mode) or (stat_module.S_ISREG(st.st_mode) and st.st_nlink > 1)
+
+
+def forget(path: Path) -> None:
+    """Invalidate the operation's cache for a path that was just written.
+
+    Args:
+        path: Path that was created, replaced or removed
+    """
+    lookup = _current.get()
+    if lookup is not None:
+        lookup.forget(path)
+
+
+def stage(path: Path, content: str) -> None:
+    """Serve a file's pending content to readers until its write lands.
+
+    Args:
+        path: File queued for writing
+        content: Content it will hold
+    """
+    with _staged_lock:
+        _staged[path] = content
+
+
+def unstage(path: Path, content: str) -> None:
+    """Stop serving staged content once it is on disk.
+
+    Content staged again since is kept, so a newer pending write stays visible.
+
+    Args:
+        path: File that was written
+        content: Content that was written
+    """
+    with _staged_lock:
+        if _staged.get(path) is content:
+            del _staged[path]
+
+
+def _scan(directory: Path) -> dict[str, os.DirEntry[str]] | None:
+    """List a directory with os.scandir.
+
+    Args:
+        directory: Directory to list
+
+    Returns:
+        Entries by name, or None if the directory does not exist
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name: entry for entry in entries}
+    except (FileNotFoundError, NotADirectoryError):
+        return None
@@ -0,0 +1,497 @@
+"""Read canonical context and project files straight from git objects.
+
+A single long-lived ``git cat-file --batch`` process serves every object
+lookup, and trees and blobs are cached by object id, so many refs that share
+content are read and rendered once.
+"""
+
+import hashlib
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from types import TracebackType
+from typing import IO
+
+from ideporter import fsio
+from ideporter.adapters import get_adapter
+from ideporter.bundle import BundleWriter, is_bundle
+from ideporter.canonical import CANONICAL_DIR, CanonicalContext
+
+
+class GitError(RuntimeError):
+    """Raised when git cannot be run or returns malformed output."""
+
+
+@dataclass(frozen=True)
+class GitObject:
+    """A git object read from the object database."""
+
+    oid: str
+    type: str
+    data: bytes
+
+
+class GitObjectStore:
+    """Object reader backed by one ``git cat-file --batch`` process."""
+
+    def __init__(self, repo_path: Path):
+        """Initialize the store.
+
+        Args:
+            repo_path: Path inside the git repository
+        """
+        self.repo_path = repo_path
+        self._proc: subprocess.Popen[bytes] | None = None
+        self._objects: dict[str, GitObject] = {}
+        self._trees: dict[str, dict[str, tuple[str, str]]] = {}
+        self.requests = 0
+
+    def __enter__(self) -> "GitObjectStore":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the cat-file process."""
+        if self._proc is None:
+            return
+        assert self._proc.stdin is not None
+        self._proc.stdin.close()
+        self._proc.wait()
+        self._proc = None
+
+    def read_object(self, name: str) -> GitObject | None:
+        """Read an object by id or revision expression.
+
+        Args:
+            name: Object id or any expression git accepts (e.g. ``main:path``)
+
+        Returns:
+            The object, or None if it does not exist
+        """
+        cached = self._objects.get(name)
+        if cached is not None:
+            return cached
+
+        stdin, stdout = self._pipes()
+        stdin.write(name.encode("utf-8") + b"\n")
+        stdin.flush()
+        self.requests += 1
+
+        header = stdout.readline()
+        if not header:
+            raise GitError("git cat-file exited unexpectedly")
+        parts = header.split()
+        if len(parts) != 3:
+            # "<name> missing" or "<name> ambiguous"
+            return None
+
+        oid, obj_type, size = parts[0].decode(), parts[1].decode(), int(parts[2])
+        data = stdout.read(size)
+        stdout.read(1)  # trailing newline
+
+        obj = GitObject(oid=oid, type=obj_type, data=data)
+        self._objects[oid] = obj
+        return obj
+
+    def read_tree(self, oid: str) -> dict[str, tuple[str, str]]:
+        """Read and parse a tree object.
+
+        Args:
+            oid: Tree object id
+
+        Returns:
+            Mapping of entry name to (mode, object id)
+        """
+        cached = self._trees.get(oid)
+        if cached is not None:
+            return cached
+
+        obj = self.read_object(oid)
+        if obj is None or obj.type != "tree":
+            raise GitError(f"Not a tree object: {oid}")
+
+        entries = _parse_tree(obj.data, oid_size=len(oid) // 2)
+        self._trees[oid] = entries
+        return entries
+
+    def resolve_commit_tree(self, ref: str) -> str | None:
+        """Resolve a ref to the id of its root tree.
+
+        Args:
+            ref: Branch, tag or commit expression
+
+        Returns:
+            Root tree id, or None if the ref does not exist
+        """
+        obj = self.read_object(f"{ref}^{{tree}}")
+        if obj is None or obj.type != "tree":
+            return None
+        return obj.oid
+
+    def list_refs(self, pattern: str) -> list[str]:
+        """List refs matching a for-each-ref pattern.
+
+        Args:
+            pattern: Pattern such as ``refs/tags/v*`` or ``refs/heads``
+
+        Returns:
+            Short ref names
+        """
+        result = subprocess.run(
+            ["git", "for-each-ref", "--format=%(refname:short)", pattern],
+            cwd=self.repo_path,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise GitError(result.stderr.strip() or "git for-each-ref failed")
+        return [line for line in result.stdout.splitlines() if line]
+
+    def _pipes(self) -> tuple[IO[bytes], IO[bytes]]:
+        """Start the cat-file process on first use.
+
+        Returns:
+            The process stdin and stdout
+        """
+        if self._proc is None:
+            try:
+                self._proc = subprocess.Popen(
+                    ["git", "cat-file", "--batch"],
+                    cwd=self.repo_path,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                )
+            except OSError as e:
+                raise GitError(f"Failed to start git: {e}") from e
+        assert self._proc.stdin is not None and self._proc.stdout is not None
+        return self._proc.stdin, self._proc.stdout
+
+
+class GitRefSource:
+    """File source reading a project tree at a git ref."""
+
+    def __init__(self, store: GitObjectStore, ref: str, prefix: str = ""):
+        """Initialize the source.
+
+        Args:
+            store: Shared object store
+            ref: Branch, tag or commit expression
+            prefix: Project directory relative to the repository root
+
+        Raises:
+            GitError: If the ref does not exist
+        """
+        root = store.resolve_commit_tree(ref)
+        if root is None:
+            raise GitError(f"Unknown ref: {ref}")
+        self.store = store
+        self.ref = ref
+        self.root = root
+        self.prefix = PurePosixPath(prefix)
+        self.reads: dict[str, str | None] = {}
+
+    def object_id(self, relpath: str) -> str | None:
+        """Look up the object id at a path.
+
+        Args:
+            relpath: POSIX path relative to the project directory
+
+        Returns:
+            Object id, or None if the path does not exist
+        """
+        oid = self.root
+        is_tree = True
+        for part in (self.prefix / relpath).parts:
+            if not is_tree:
+                return None
+            entry = self.store.read_tree(oid).get(part)
+            if entry is None:
+                return None
+            mode, oid = entry
+            is_tree = mode == "40000"
+        return oid
+
+    def read_text(self, relpath: str) -> str | None:
+        """Read a blob as text, replacing bytes that are not UTF-8."""
+        oid = self.object_id(relpath)
+        self.reads[relpath] = oid
+        if oid is None:
+            return None
+        obj = self.store.read_object(oid)
+        if obj is None or obj.type != "blob":
+            return None
+        # Like reading a working tree file: bad bytes must not abort a whole run
+        return obj.data.decode("utf-8", errors="replace")
+
+    def exists(self, relpath: str) -> bool:
+        """Check whether a path exists at the ref."""
+        return self.object_id(relpath) is not None
+
+
+class GitIndexSource:
+    """File source reading a project tree as staged in the git index."""
+
+    def __init__(self, store: GitObjectStore, project_path: Path):
+        """List the index entries under the project directory.
+
+        Args:
+            store: Object store for the repository
+            project_path: Project directory inside the git repository
+
+        Raises:
+            GitError: If the index cannot be read
+        """
+        self.store = store
+        self.entries: dict[str, str] = {}
+        self.unmerged: set[str] = set()
+        result = subprocess.run(
+            ["git", "ls-files", "--stage", "-z"],
+            cwd=project_path,
+            capture_output=True,
+        )
+        if result.returncode != 0:
+            raise GitError(result.stderr.decode(errors="replace").strip() or "git ls-files failed")
+        for record in result.stdout.split(b"\0"):
+            if not record:
+                continue
+            info, _, path = record.partition(b"\t")
+            _mode, oid, stage = info.decode().split()
+            relpath = path.decode("utf-8")
+            if stage == "0":
+                self.entries[relpath] = oid
+            else:
+                self.unmerged.add(relpath)
+        self._dirs = {
+            parent.as_posix()
+            for relpath in self.entries
+            for parent in PurePosixPath(relpath).parents
+        }
+
+    def object_id(self, relpath: str) -> str | None:
+        """Look up the staged blob at a path.
+
+        Args:
+            relpath: POSIX path relative to the project directory
+
+        Returns:
+            Blob id, or None if the path is not in the index
+        """
+        return self.entries.get(relpath)
+
+    def read_text(self, relpath: str) -> str | None:
+        """Read a staged blob as text, replacing bytes that are not UTF-8."""
+        oid = self.entries.get(relpath)
+        if oid is None:
+            return None
+        obj = self.store.read_object(oid)
+        if obj is None or obj.type != "blob":
+            return None
+        # Like reading a working tree file: bad bytes must not abort a whole run
+        return obj.data.decode("utf-8", errors="replace")
+
+    def exists(self, relpath: str) -> bool:
+        """Check whether a file or directory is in the index."""
+        return relpath in self.entries or relpath in self._dirs
+
+
+@dataclass
+class RefExportSummary:
+    """Outcome of exporting many refs."""
+
+    refs: list[str] = field(default_factory=list)
+    skipped: dict[str, str] = field(default_factory=dict)
+    files: int = 0
+    rendered: int = 0
+    reused: int = 0
+
+
+class _OutputWriter:
+    """Write rendered files into a directory tree or a bundle."""
+
+    def __init__(self, out: Path):
+        self.out = out
+        self._bundle = BundleWriter(out) if is_bundle(out) else None
+
+    def write(self, relpath: str, content: str) -> None:
+        if self._bundle is not None:
+            self._bundle.write(relpath, content)
+        else:
+            target = self.out / relpath
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(content.encode("utf-8"))
+            fsio.forget(target)
+
+    def close(self) -> None:
+        if self._bundle is not None:
+            self._bundle.close()
+
+
+def export_refs(
+    project_path: Path, refs: list[str], targets: list[str], out: Path
+) -> RefExportSummary:
+    """Render IDE artifacts for many git refs without checking them out.
+
+    Each ref is written under ``<out>/<ref>/``, or under a ``<ref>/`` prefix
+    when ``out`` names a bundle archive. An adapter is rendered
+    once per distinct (canonical tree, extra inputs) combination; refs with
+    identical content reuse the earlier result.
+
+    Args:
+        project_path: Project directory inside the git repository
+        refs: Refs to export
+        targets: Adapter names to render
+        out: Output directory or bundle path
+
+    Returns:
+        Summary of refs exported, files written and render reuse
+    """
+    adapter_classes = {target: get_adapter(target) for target in targets}
+    summary = RefExportSummary()
+    # (adapter, canonical tree id) -> [(extra inputs, relative outputs)]
+    memo: dict[tuple[str, str], list[tuple[dict[str, str | None], dict[str, str]]]] = {}
+
+    project_prefix = _project_prefix(project_path)
+    writer = _OutputWriter(out)
+    try:
+        with GitObjectStore(project_path) as store:
+            for ref in refs:
+                out_prefix = _ref_prefix(ref)
+                try:
+                    source = GitRefSource(store, ref, prefix=project_prefix)
+                except GitError as e:
+                    summary.skipped[ref] = str(e)
+                    continue
+
+                context_tree = source.object_id(CANONICAL_DIR)
+                canonical = CanonicalContext(Path("."), source=source)
+                if context_tree is None or not canonical.validate()["valid"]:
+                    summary.skipped[ref] = "No valid canonical context"
+                    continue
+
+                for target, adapter_class in adapter_classes.items():
+                    outputs = _lookup(memo.get((target, context_tree), []), source)
+                    if outputs is None:
+                        source.reads.clear()
+                        adapter = adapter_class(Path("."), source=source)
+                        rendered = adapter.render_export(Path(CANONICAL_DIR))
+                        outputs = {path.as_posix(): content for path, content in rendered.items()}
+                        extra = {
+                            relpath: oid
+                            for relpath, oid in source.reads.items()
+                            if not relpath.startswith(f"{CANONICAL_DIR}/")
+                        }
+                        memo.setdefault((target, context_tree), []).append((extra, outputs))
+                        summary.rendered += 1
+                    else:
+                        summary.reused += 1
+
+                    for relpath, content in outputs.items():
+                        writer.write(f"{out_prefix}/{relpath}", content)
+                        summary.files += 1
+
+                summary.refs.append(ref)
+    finally:
+        writer.close()
+
+    return summary
+
+
+def _lookup(
+    candidates: list[tuple[dict[str, str | None], dict[str, str]]], source: GitRefSource
+) -> dict[str, str] | None:
+    """Find a memoized render whose extra inputs match this ref.
+
+    Args:
+        candidates: Earlier renders for the same adapter and canonical tree
+        source: Source for the ref being exported
+
+    Returns:
+        Relative outputs, or None if nothing matches
+    """
+    for extra, outputs in candidates:
+        if all(source.object_id(relpath) == oid for relpath, oid in extra.items()):
+            return outputs
+    return None
+
+
+def blob_id(data: bytes, oid_size: int = 20) -> str:
+    """Compute the object id git gives a blob, without running git.
+
+    Args:
+        data: Blob content
+        oid_size: Size of an object id in bytes (20 for SHA-1, 32 for SHA-256)
+
+    Returns:
+        Hex object id
+    """
+    digest = hashlib.sha256() if oid_size == 32 else hashlib.sha1()
+    digest.update(b"blob %d\0" % len(data))
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def _project_prefix(project_path: Path) -> str:
+    """Find the project directory relative to its repository root.
+
+    Args:
+        project_path: Project directory inside the git repository
+
+    Returns:
+        POSIX relative path ("" for the repository root)
+
+    Raises:
+        GitError: If the path is not inside a git repository
+    """
+    result = subprocess.run(
+        ["git", "rev-parse", "--show-prefix"],
+        cwd=project_path,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise GitError(result.stderr.strip() or f"Not a git repository: {project_path}")
+    return result.stdout.strip().rstrip("/")
+
+
+def _ref_prefix(ref: str) -> str:
+    """Turn a ref name into a safe relative output prefix.
+
+    Args:
+        ref: Ref name
+
+    Returns:
+        POSIX relative path for the ref's output
+    """
+    parts = [part for part in PurePosixPath(ref).parts if part not in ("", ".", "..", "/")]
+    return "/".join(parts).replace(":", "_").replace("~", "_").replace("^", "_") or "_"
+
+
+def _parse_tree(data: bytes, oid_size: int) -> dict[str, tuple[str, str]]:
+    """Parse the binary body of a tree object.
+
+    Args:
+        data: Raw tree object body
+        oid_size: Size of an object id in bytes (20 for SHA-1, 32 for SHA-256)
+
+    Returns:
+        Mapping of entry name to (mode, object id)
+    """
+    entries: dict[str, tuple[str, str]] = {}
+    pos = 0
+    while pos < len(data):
+        space = data.index(b" ", pos)
+        nul = data.index(b"\0", space)
+        mode = data[pos:space].decode()
+        name = data[space + 1 : nul].decode("utf-8", errors="surrogateescape")
+        oid = data[nul + 1 : nul + 1 + oid_size].hex()
+        entries[name] = (mode, oid)
+        pos = nul + 1 + oid_size
+    return entries
@@ -0,0 +1,242 @@
+"""Pre-commit fast path: check the staged snapshot instead of the working tree.
+
+A full ``check`` renders every adapter and reads every artifact from disk. As
+a pre-commit hook most commits touch neither the canonical context nor an IDE
+artifact, so ``check_staged`` first asks git which of those paths are staged
+(``git diff-index --cached``, limited to them by pathspec) and returns right
+away when none are. Otherwise it:
+
+- lists the index once (``git ls-files --stage``) and reads canonical files
+  from their staged blobs through the shared ``cat-file`` process
+- checks only the affected adapters: every adapter in use when a canonical
+  file is staged, else only the owners of the staged artifacts
+- compares each rendered artifact with the index by blob id, computed from
+  the rendered bytes, so artifacts are never read
+
+IDE files that are not tracked by git are not part of the commit and are not
+checked. Layers declared in the staged manifest are read from disk.
+"""
+
+import subprocess
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from ideporter.adapters import ADAPTERS, available_adapters
+from ideporter.canonical import CANONICAL_DIR, CanonicalContext
+from ideporter.check import resolve_targets
+from ideporter.gitsource import GitError, GitIndexSource, GitObjectStore, blob_id
+from ideporter.layers import LAYER_RESOLVER, LAYERED_FILES, LayerError
+from ideporter.sources import FileSource, OverlaySource
+
+
+@dataclass(frozen=True)
+class StagedFile:
+    """A path whose staged content differs from HEAD."""
+
+    path: str
+    status: str
+    oid: str | None
+
+
+def watched_paths() -> list[str]:
+    """Get the paths whose staged changes the hook reacts to.
+
+    Returns:
+        The canonical directory and every adapter's artifacts, relative to the project
+    """
+    paths = [CANONICAL_DIR]
+    for adapter_class in available_adapters().values():
+        paths.extend(adapter_class.artifact_paths)
+    return paths
+
+
+def staged_files(project_path: Path, pathspecs: list[str]) -> list[StagedFile]:
+    """List staged changes under a project, limited to some paths.
+
+    Args:
+        project_path: Project directory inside the git repository
+        pathspecs: Paths relative to the project to report
+
+    Returns:
+        Staged changes, with paths relative to the project
+
+    Raises:
+        GitError: If git cannot read the index
+    """
+
+    def diff(base: str) -> bytes:
+        args = ["diff-index", "--cached", "-z", "--no-renames", "--relative", base, "--"]
+        return _run_git(project_path, [*args, *pathspecs])
+
+    try:
+        output = diff("HEAD")
+    except GitError:
+        # Before the first commit there is no HEAD and everything staged is new
+        empty_tree = _run_git(project_path, ["hash-object", "-t", "tree", "--stdin"])
+        output = diff(empty_tree.decode().strip())
+
+    changes = []
+    fields = output.split(b"\0")
+    for info, path in zip(fields[0:-1:2], fields[1::2], strict=True):
+        _old_mode, _new_mode, _old_oid, new_oid, status = info.decode().lstrip(":").split()
+        deleted = status == "D" or set(new_oid) == {"0"}
+        changes.append(StagedFile(path.decode("utf-8"), status, None if deleted else new_oid))
+    return changes
+
+
+def check_staged(project_path: Path) -> dict[str, Any]:
+    """Check that staged IDE artifacts match what the staged canonical context renders.
+
+    Args:
+        project_path: Project directory inside the git repository
+
+    Returns:
+        Report with sync status, the staged paths considered, checked files,
+        drift, errors and the elapsed time
+    """
+    start = time.perf_counter()
+    report: dict[str, Any] = {
+        "project_path": str(project_path.absolute()),
+        "in_sync": True,
+        "staged": [],
+        "targets": [],
+        "checked": 0,
+        "drift": [],
+        "skipped": [],
+        "errors": [],
+    }
+
+    def finish() -> dict[str, Any]:
+        report["in_sync"] = not report["drift"] and not report["errors"]
+        report["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return report
+
+    try:
+        staged = staged_files(project_path, watched_paths())
+    except GitError as e:
+        report["errors"].append(str(e))
+        return finish()
+    report["staged"] = [change.path for change in staged]
+    if not staged:
+        return finish()
+
+    try:
+        with GitObjectStore(project_path) as store:
+            index = GitIndexSource(store, project_path)
+            _check_index(project_path, index, staged, report)
+    except (GitError, LayerError, UnicodeDecodeError) as e:
+        report["errors"].append(str(e))
+    return finish()
+
+
+def _check_index(
+    project_path: Path, index: GitIndexSource, staged: list[StagedFile], report: dict[str, Any]
+) -> None:
+    """Render the affected adapters from the index and compare blob ids.
+
+    Args:
+        project_path: Project directory inside the git repository
+        index: Source reading staged blobs
+        staged: Staged changes under watched paths
+        report: Report to fill in
+
+    Raises:
+        LayerError: If the staged manifest or a layer is malformed
+    """
+    canonical = CanonicalContext(project_path, source=index)
+    staged_paths = {change.path: change for change in staged}
+    canonical_staged = any(path.startswith(f"{CANONICAL_DIR}/") for path in staged_paths)
+
+    targets = [
+        target
+        for target in resolve_targets(canonical)
+        if canonical_staged or any(path in staged_paths for path in ADAPTERS[target].artifact_paths)
+    ]
+    report["targets"] = targets
+    if not targets:
+        return
+    conflicted = sorted(path for path in index.unmerged if path in staged_paths)
+    if conflicted:
+        report["errors"].append(f"Unmerged paths: {', '.join(conflicted)}")
+        return
+
+    source = _layered(canonical, index)
+    for target in targets:
+        adapter = ADAPTERS[target](project_path, source=source)
+        try:
+            outputs = adapter.render_export(canonical.context_dir)
+        except NotImplementedError:
+            report["skipped"].append(target)
+            continue
+
+        for file_path, expected in outputs.items():
+            relpath = file_path.relative_to(project_path).as_posix()
+            actual = index.object_id(relpath)
+            change = staged_paths.get(relpath)
+            if actual is None and (change is None or change.oid is not None):
+                continue  # not tracked, so not part of the commit
+            report["checked"] += 1
+            oid_size = len(actual) // 2 if actual is not None else 20
+            expected_id = blob_id(expected.encode("utf-8"), oid_size)
+            if actual == expected_id:
+                continue
+            report["drift"].append(
+                {
+                    "adapter": target,
+                    "path": relpath,
+                    "status": "missing" if actual is None else "modified",
+                    "expected_oid": expected_id,
+                    "staged_oid": actual,
+                }
+            )
+
+
+def _layered(canonical: CanonicalContext, index: GitIndexSource) -> FileSource:
+    """Merge the layers declared in the staged manifest over the staged files.
+
+    Args:
+        canonical: Canonical context reading from the index
+        index: Source reading staged blobs
+
+    Returns:
+        Source adapters should render from
+
+    Raises:
+        LayerError: If a declared layer is missing or malformed
+    """
+    layer_dirs = canonical.layers()
+    if not layer_dirs:
+        return index
+    layers = [LAYER_RESOLVER.load(layer_dir) for layer_dir in layer_dirs]
+    merged = LAYER_RESOLVER.merge(
+        layers, {name: canonical.read_file(name) for name in LAYERED_FILES}
+    )
+    overlay = {f"{CANONICAL_DIR}/{name}": content for name, content in merged.items()}
+    return OverlaySource(overlay, canonical.base_path, fallback=index)
+
+
+def _run_git(project_path: Path, args: list[str]) -> bytes:
+    """Run a git command in a project directory.
+
+    Args:
+        project_path: Directory to run in
+        args: Arguments after ``git``
+
+    Returns:
+        Standard output
+
+    Raises:
+        GitError: If git cannot be started or fails
+    """
+    try:
+        result = subprocess.run(
+            ["git", *args], cwd=project_path, capture_output=True, input=b"", check=False
+        )
+    except OSError as e:
+        raise GitError(f"Failed to start git: {e}") from e
+    if result.returncode != 0:
+        message = result.stderr.decode(errors="replace").strip()
+        raise GitError(message or f"git {args[0]} failed")
+    return result.stdout
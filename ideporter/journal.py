@@ -0,0 +1,183 @@
+"""Checkpoint journal for long batch runs.
+
+With ``--journal``, ``batch`` appends one JSON line per finished project:
+
+    {"v": 1, "project": "/abs/path", "adapters": ["cursor"], "status": "ok",
+     "error": null, "inputs": {"ai/context/rules.md": "<sha256>"},
+     "probes": {".continue": false}, "outputs": {".cursorrules": "<sha256>"},
+     "time": 1700000000.0}
+
+``inputs`` and ``probes`` are every file the render read and every path it
+checked for existence, as recorded by a ``RecordingSource``. ``outputs`` are
+the files written, relative to the project. With ``--resume`` a project is
+skipped when its latest record succeeded for the same adapters, its inputs
+(read through the same layered source) still hash the same and its outputs
+are still on disk unchanged. Anything else exports it again.
+
+Records are flushed as they are appended, so a run killed outright loses at
+most the line being written; a torn last line is ignored on load.
+"""
+
+import json
+import os
+import threading
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from types import TracebackType
+from typing import Any, TextIO
+
+from ideporter import fsio
+from ideporter.canonical import CanonicalContext
+from ideporter.layers import LayerError
+from ideporter.sources import RecordingSource
+from ideporter.utils import content_hash
+
+JOURNAL_VERSION = 1
+DEFAULT_JOURNAL = Path(".ideporter") / "batch-journal.jsonl"
+
+
+class Journal:
+    """Append-only JSON-lines record of finished batch projects."""
+
+    def __init__(self, path: Path):
+        """Open a journal, loading the records of earlier runs.
+
+        Args:
+            path: Journal file (created with its directory on first record)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._file: TextIO | None = None
+        self._latest: dict[str, dict[str, Any]] = {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn write from a killed run
+                    if isinstance(entry, dict) and entry.get("v") == JOURNAL_VERSION:
+                        self._latest[entry["project"]] = entry
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._latest)
+
+    def completed(self, project_path: Path, targets: list[str]) -> bool:
+        """Check whether a project was exported with inputs and outputs unchanged since.
+
+        Args:
+            project_path: Project root
+            targets: Adapters the project would be exported to
+
+        Returns:
+            True if the project can be skipped
+        """
+        entry = self._latest.get(project_key(project_path))
+        if entry is None or entry.get("status") != "ok":
+            return False
+        if sorted(entry.get("adapters", [])) != sorted(targets):
+            return False
+
+        try:
+            source = RecordingSource(project_path, CanonicalContext(project_path).file_source())
+        except LayerError:
+            return False
+        if any(
+            _digest(source.read_text(rel)) != digest
+            for rel, digest in entry.get("inputs", {}).items()
+        ):
+            return False
+        if any(source.exists(rel) != found for rel, found in entry.get("probes", {}).items()):
+            return False
+        return all(
+            _digest(fsio.read_text(project_path / rel)) == digest
+            for rel, digest in entry.get("outputs", {}).items()
+        )
+
+    def record(
+        self,
+        project_path: Path,
+        targets: list[str],
+        recorder: RecordingSource | None = None,
+        outputs: Mapping[Path, str] | None = None,
+        error: str | None = None,
+    ) -> None:
+        """Append a project's outcome and flush it.
+
+        Args:
+            project_path: Project root
+            targets: Adapters the project was exported to
+            recorder: Source the render read through, for its inputs
+            outputs: Files written and their content
+            error: Why the export failed, or None if it succeeded
+        """
+        key = project_key(project_path)
+        entry: dict[str, Any] = {
+            "v": JOURNAL_VERSION,
+            "project": key,
+            "adapters": list(targets),
+            "status": "ok" if error is None else "failed",
+            "error": error,
+            "inputs": recorder.fingerprints() if recorder is not None else {},
+            "probes": dict(recorder.probes) if recorder is not None else {},
+            "outputs": {
+                path.relative_to(project_path).as_posix(): content_hash(content)
+                for path, content in (outputs or {}).items()
+            },
+            "time": time.time(),
+        }
+        line = json.dumps(entry, sort_keys=True) + "\n"
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+            self._latest[key] = entry
+
+    def close(self) -> None:
+        """Sync the journal to disk and close it."""
+        with self._lock:
+            if self._file is None:
+                return
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+
+def project_key(project_path: Path) -> str:
+    """Get the key a project is journaled under.
+
+    Args:
+        project_path: Project root
+
+    Returns:
+        Resolved absolute path
+    """
+    return str(project_path.resolve())
+
+
+def _digest(content: str | None) -> str | None:
+    """Hash file content, keeping None for missing files.
+
+    Args:
+        content: File content or None
+
+    Returns:
+        Content hash or None
+    """
+    return None if content is None else content_hash(content)
@@ -0,0 +1,252 @@
+"""Layered org/team/project canonical context.
+
+A project's manifest may declare ordered parent layers, each a local
+directory in canonical format::
+
+    layers:
+      - ../org-rules/ai/context
+      - ../team-rules/ai/context
+
+At export time the layers are merged with the project's own files: markdown
+is concatenated in layer order (project last), ignore patterns and extension
+recommendations are unioned. Parsed layers are memoized by content hash, and
+layer directories by their stat signature, so a batch run over many projects
+reads and parses each shared layer once.
+"""
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from ideporter.utils import content_hash, dump_json
+
+LAYERED_FILES = ("rules.md", "context.md", "ignore.txt", "extensions.json")
+
+
+class LayerError(Exception):
+    """Raised when a declared layer is missing or malformed."""
+
+
+@dataclass(frozen=True)
+class Layer:
+    """A parsed canonical layer."""
+
+    path: Path
+    fingerprint: str
+    rules: str | None
+    context: str | None
+    ignore_patterns: tuple[str, ...]
+    extensions: tuple[str, ...]
+
+
+class LayerResolver:
+    """Loads, memoizes and merges canonical layers."""
+
+    def __init__(self) -> None:
+        """Initialize an empty resolver."""
+        self._by_fingerprint: dict[str, Layer] = {}
+        self._by_dir: dict[Path, tuple[tuple[tuple[str, int, int], ...], Layer]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def load(self, layer_dir: Path) -> Layer:
+        """Load a layer directory, reusing earlier parses where possible.
+
+        Args:
+            layer_dir: Directory holding the layer's canonical files
+
+        Returns:
+            Parsed layer
+
+        Raises:
+            LayerError: If the directory is missing or a file cannot be parsed
+        """
+        layer_dir = layer_dir.resolve()
+        signature = _signature(layer_dir)
+        with self._lock:
+            return self._load(layer_dir, signature)
+
+    def _load(self, layer_dir: Path, signature: tuple[tuple[str, int, int], ...]) -> Layer:
+        """Load a layer while holding the resolver lock."""
+
+        cached = self._by_dir.get(layer_dir)
+        if cached is not None and cached[0] == signature:
+            self.hits += 1
+            return cached[1]
+
+        files: dict[str, str] = {}
+        for name, _, _ in signature:
+            files[name] = (layer_dir / name).read_text(encoding="utf-8")
+
+        fingerprint = content_hash(
+            "\0".join(f"{name}\0{content_hash(content)}" for name, content in sorted(files.items()))
+        )
+        layer = self._by_fingerprint.get(fingerprint)
+        if layer is None:
+            self.misses += 1
+            layer = _parse_layer(layer_dir, fingerprint, files)
+            self._by_fingerprint[fingerprint] = layer
+        else:
+            self.hits += 1
+
+        self._by_dir[layer_dir] = (signature, layer)
+        return layer
+
+    def merge(self, layers: list[Layer], project_files: dict[str, str | None]) -> dict[str, str]:
+        """Merge layers with a project's own canonical files.
+
+        Args:
+            layers: Parent layers, outermost first
+            project_files: The project's canonical files (None when absent)
+
+        Returns:
+            Mapping of canonical file name to merged content
+        """
+        merged: dict[str, str] = {}
+
+        for name, attr in (("rules.md", "rules"), ("context.md", "context")):
+            parts = [getattr(layer, attr) for layer in layers]
+            parts.append(project_files.get(name))
+            text = "\n\n".join(part.strip("\n") for part in parts if part and part.strip())
+            if text:
+                merged[name] = text + "\n"
+
+        patterns: dict[str, None] = {}
+        for layer in layers:
+            patterns.update(dict.fromkeys(layer.ignore_patterns))
+        patterns.update(dict.fromkeys(_parse_ignore(project_files.get("ignore.txt") or "")))
+        if patterns:
+            merged["ignore.txt"] = "\n".join(patterns) + "\n"
+
+        project_extensions = _parse_extensions(project_files.get("extensions.json"), "project")
+        recommendations: dict[str, None] = {}
+        for layer in layers:
+            recommendations.update(dict.fromkeys(layer.extensions))
+        recommendations.update(dict.fromkeys(project_extensions.get("recommendations", [])))
+        if recommendations or project_files.get("extensions.json") is not None:
+            project_extensions["recommendations"] = list(recommendations)
+            merged["extensions.json"] = dump_json(project_extensions) + "\n"
+
+        return merged
+
+    def clear(self) -> None:
+        """Drop all memoized layers and reset statistics."""
+        with self._lock:
+            self._by_fingerprint.clear()
+            self._by_dir.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Shared by every project handled in this process
+LAYER_RESOLVER = LayerResolver()
+
+
+def declared_layers(manifest: dict[str, Any], base_path: Path) -> list[Path]:
+    """Read the layer directories declared in a manifest.
+
+    Args:
+        manifest: Parsed manifest
+        base_path: Project root that relative layer paths are resolved against
+
+    Returns:
+        Layer directories, outermost first
+
+    Raises:
+        LayerError: If ``layers`` is not a list of paths
+    """
+    layers = manifest.get("layers") or []
+    if not isinstance(layers, list) or not all(isinstance(item, str) for item in layers):
+        raise LayerError("manifest.yaml 'layers' must be a list of paths")
+    return [base_path / Path(item).expanduser() for item in layers]
+
+
+def _signature(layer_dir: Path) -> tuple[tuple[str, int, int], ...]:
+    """Stat the canonical files of a layer with one directory scan.
+
+    Args:
+        layer_dir: Layer directory
+
+    Returns:
+        Sorted (name, size, mtime_ns) tuples
+
+    Raises:
+        LayerError: If the directory does not exist
+    """
+    try:
+        with os.scandir(layer_dir) as it:
+            entries = [
+                (entry.name, entry.stat().st_size, entry.stat().st_mtime_ns)
+                for entry in it
+                if entry.name in LAYERED_FILES and entry.is_file()
+            ]
+    except (FileNotFoundError, NotADirectoryError):
+        raise LayerError(f"Layer not found: {layer_dir}") from None
+    return tuple(sorted(entries))
+
+
+def _parse_layer(layer_dir: Path, fingerprint: str, files: dict[str, str]) -> Layer:
+    """Parse a layer's canonical files.
+
+    Args:
+        layer_dir: Layer directory
+        fingerprint: Content fingerprint of the layer
+        files: Mapping of canonical file name to content
+
+    Returns:
+        Parsed layer
+    """
+    extensions = _parse_extensions(files.get("extensions.json"), str(layer_dir))
+    return Layer(
+        path=layer_dir,
+        fingerprint=fingerprint,
+        rules=files.get("rules.md"),
+        context=files.get("context.md"),
+        ignore_patterns=tuple(_parse_ignore(files.get("ignore.txt") or "")),
+        extensions=tuple(extensions.get("recommendations", [])),
+    )
+
+
+def _parse_ignore(content: str) -> list[str]:
+    """Extract patterns from ignore.txt content.
+
+    Args:
+        content: ignore.txt content
+
+    Returns:
+        Non-empty, non-comment lines
+    """
+    patterns = []
+    for line in content.splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            patterns.append(line)
+    return patterns
+
+
+def _parse_extensions(content: str | None, origin: str) -> dict[str, Any]:
+    """Parse extensions.json content.
+
+    Args:
+        content: extensions.json content, or None when absent
+        origin: Where the content came from, for error messages
+
+    Returns:
+        Parsed document (empty when absent)
+
+    Raises:
+        LayerError: If the content is not a JSON object
+    """
+    if content is None:
+        return {}
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError as e:
+        raise LayerError(f"Invalid extensions.json in {origin}: {e}") from e
+    if not isinstance(data, dict):
+        raise LayerError(f"Invalid extensions.json in {origin}: expected an object")
+    return data
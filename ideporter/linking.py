@@ -0,0 +1,210 @@
+"""Link-mode exports: IDE files that point at the canonical files.
+
+Adapters whose outputs are verbatim copies of canonical files (Cursor and
+VS Code) can link them instead of writing them:
+
+- ``symlink``: a relative symbolic link; canonical edits show up immediately
+- ``hardlink``: a second name for the same inode; edits show up immediately
+  as long as editors modify the canonical file in place
+- ``reflink``: a copy-on-write clone (``FICLONE`` on Btrfs, XFS and similar);
+  it shares storage but not later edits, and falls back to a plain copy where
+  the filesystem cannot clone
+"""
+
+import errno
+import os
+import shutil
+import stat
+from pathlib import Path
+
+from rich.console import Console
+
+from ideporter import fsio
+from ideporter.profiling import profiled
+from ideporter.utils import backup_file
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+
+console = Console()
+
+LINK_MODES = ("symlink", "hardlink", "reflink")
+
+# ioctl request number of FICLONE from <linux/fs.h>
+FICLONE = 0x40049409
+
+# Errors meaning "this filesystem or platform cannot do that kind of link"
+_UNSUPPORTED = {errno.EXDEV, errno.EOPNOTSUPP, errno.EINVAL, errno.ENOTTY, errno.EPERM}
+
+
+def is_linked(path: Path, target: Path, mode: str) -> bool:
+    """Check whether a path already links to a target in the given mode.
+
+    Args:
+        path: IDE file
+        target: Canonical file
+        mode: Link mode
+
+    Returns:
+        True if nothing needs to be done
+    """
+    try:
+        if mode == "symlink":
+            return path.is_symlink() and path.resolve() == target.resolve()
+        if mode == "hardlink":
+            return not path.is_symlink() and path.samefile(target)
+        return not path.is_symlink() and path.read_bytes() == target.read_bytes()
+    except OSError:
+        return False
+
+
+@profiled("linking.link_file")
+def link_file(path: Path, target: Path, mode: str, force: bool = False) -> tuple[str, Path | None]:
+    """Replace a file with a link to a canonical file, without printing.
+
+    The link is created next to the path and renamed over it, so the path
+    never disappears. Hard links across filesystems become symlinks, and
+    reflinks become copies where cloning is unsupported.
+
+    Args:
+        path: IDE file to create or replace
+        target: Canonical file to link to
+        mode: One of LINK_MODES
+        force: Skip backup creation if True
+
+    Returns:
+        The link mode actually used ("copy" for a reflink fallback), and the
+        backup that was created, if any
+
+    Raises:
+        ValueError: If the mode is unknown
+        OSError: If the link cannot be created
+    """
+    if mode not in LINK_MODES:
+        raise ValueError(f"Unknown link mode '{mode}'. Available: {', '.join(LINK_MODES)}")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    backup_path = None if force or path.is_symlink() else backup_file(path)
+
+    tmp = path.with_name(f".{path.name}.ideporter-link")
+    tmp.unlink(missing_ok=True)
+    try:
+        used = _create_link(tmp, target, mode)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+        fsio.forget(path)
+    return used, backup_path
+
+
+def safe_link(
+    path: Path, target: Path, mode: str, force: bool = False, dry_run: bool = False
+) -> None:
+    """Link an IDE file to a canonical file with backup and dry-run support.
+
+    Args:
+        path: IDE file to create or replace
+        target: Canonical file to link to
+        mode: One of LINK_MODES
+        force: Skip backup creation if True
+        dry_run: Only preview the operation if True
+    """
+    if is_linked(path, target, mode):
+        console.print(f"[dim]⊘ Unchanged {path}[/dim]")
+        return
+
+    if dry_run:
+        console.print(f"[yellow]DRY RUN:[/yellow] Would {mode} {path} → {target}")
+        return
+
+    used, backup_path = link_file(path, target, mode, force=force)
+    if backup_path is not None:
+        console.print(f"[dim]Created backup: {backup_path}[/dim]")
+    if used != mode:
+        console.print(f"[yellow]⊘[/yellow] {mode} not supported for {path}, used {used}")
+    console.print(f"[green]✓[/green] Linked {path} → {target} ({used})")
+
+
+def link_issues(links: dict[Path, Path]) -> tuple[list[str], list[str]]:
+    """Find broken or stale links among IDE files.
+
+    Args:
+        links: Mapping of IDE file to the canonical file it mirrors
+
+    Returns:
+        Issues (dangling symlinks) and warnings (symlinks pointing elsewhere,
+        hard links that no longer share the canonical file)
+    """
+    issues: list[str] = []
+    warnings: list[str] = []
+    for path, target in links.items():
+        st = fsio.lstat(path)
+        if st is None:
+            continue
+        if stat.S_ISLNK(st.st_mode):
+            if not path.exists():
+                issues.append(f"Broken link: {path} → {os.readlink(path)}")
+            elif fsio.exists(target) and not path.samefile(target):
+                warnings.append(f"{path} links to {path.resolve()}, not {target}")
+        elif st.st_nlink > 1 and fsio.exists(target):
+            if not path.samefile(target):
+                warnings.append(
+                    f"Hard link {path} no longer shares {target.name} "
+                    "(re-run export --link hardlink)"
+                )
+    return issues, warnings
+
+
+def _create_link(path: Path, target: Path, mode: str) -> str:
+    """Create a link of the given mode at a path that does not exist.
+
+    Args:
+        path: Link to create
+        target: Canonical file
+        mode: One of LINK_MODES
+
+    Returns:
+        The link mode actually used
+    """
+    if mode == "hardlink":
+        try:
+            os.link(target, path)
+            return "hardlink"
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED:
+                raise
+            mode = "symlink"
+
+    if mode == "symlink":
+        os.symlink(os.path.relpath(target, path.parent), path)
+        return "symlink"
+
+    if _reflink(target, path):
+        return "reflink"
+    shutil.copyfile(target, path)
+    return "copy"
+
+
+def _reflink(source: Path, dest: Path) -> bool:
+    """Clone a file with FICLONE.
+
+    Args:
+        source: File to clone
+        dest: New file
+
+    Returns:
+        True if the clone was made, False if it is unsupported here
+    """
+    if fcntl is None:
+        return False
+    with open(source, "rb") as src, open(dest, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return True
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED:
+                raise
+    dest.unlink()
+    return False
@@ -0,0 +1,283 @@
+"""Advisory project locks, so parallel jobs can share a checkout.
+
+Operations that only read the canonical context (export, check, validate)
+take a shared lock; operations that change it (init, import, pack, manifest
+updates) take an exclusive one. Locks are ``flock`` locks on a file in the
+per-user cache directory (``~/.cache/ideporter/locks``) named after the
+resolved project path, so nothing is ever written into the project. The
+kernel releases them when a job dies, and they only coordinate ideporter
+processes: editors and other tools are not blocked.
+
+Readers and writers both create the lock file (mode 0600) when it is
+missing, so a reader that starts first still holds the writer off. Because
+it lives in the per-user cache, the lock only coordinates jobs run by the
+same user with the same cache directory: jobs run as another user, or in a
+container with its own home, do not see each other's locks.
+
+Locks are reentrant within a thread: a nested lock of the same or a weaker
+mode is free. A shared lock cannot be upgraded, because releasing and
+re-taking a flock is not atomic; write paths take the exclusive lock up
+front. Waiting is bounded by a timeout, and acquisitions, contended
+acquisitions, wait time and timeouts are counted in ``STATS`` (and in the
+``--profile`` counters).
+
+Where ``fcntl`` is unavailable (Windows) or the lock file cannot be created,
+operations run unlocked.
+"""
+
+import functools
+import hashlib
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from ideporter.profiling import PROFILER
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+
+LOCK_SUFFIX = ".lock"
+DEFAULT_TIMEOUT = 30.0
+
+# Polling interval bounds while waiting for a contended lock
+_MIN_POLL = 0.005
+_MAX_POLL = 0.1
+
+_timeout = DEFAULT_TIMEOUT
+_held = threading.local()
+
+
+class LockTimeoutError(Exception):
+    """Raised when a project lock is not acquired within the timeout."""
+
+    pass
+
+
+@dataclass
+class LockStats:
+    """Lock counters for the current process."""
+
+    acquired: int = 0
+    contended: int = 0
+    timeouts: int = 0
+    wait_ns: int = 0
+
+    def reset(self) -> None:
+        """Zero every counter."""
+        self.acquired = self.contended = self.timeouts = self.wait_ns = 0
+
+
+STATS = LockStats()
+_stats_lock = threading.Lock()
+
+
+@dataclass
+class _Held:
+    """A lock held by the current thread."""
+
+    fd: int
+    exclusive: bool
+    depth: int = 1
+
+
+@contextmanager
+def default_timeout(seconds: float) -> Iterator[None]:
+    """Change how long lock acquisitions wait by default, for a block.
+
+    Args:
+        seconds: Timeout in seconds; 0 fails immediately when contended
+
+    Yields:
+        Nothing; the timeout applies inside the block
+    """
+    global _timeout
+    previous, _timeout = _timeout, seconds
+    try:
+        yield
+    finally:
+        _timeout = previous
+
+
+@contextmanager
+def project_lock(
+    project_path: Path, exclusive: bool = False, timeout: float | None = None
+) -> Iterator[None]:
+    """Hold a shared or exclusive advisory lock on a project.
+
+    Args:
+        project_path: Project root
+        exclusive: Take an exclusive (write) lock instead of a shared one
+        timeout: Seconds to wait, or None for the configured default
+
+    Yields:
+        Nothing; the lock is held inside the block
+
+    Raises:
+        LockTimeoutError: If the lock is not acquired in time
+    """
+    if fcntl is None:
+        yield
+        return
+
+    lock_path = lock_file(project_path)
+    key = os.path.abspath(lock_path)
+    held: dict[str, _Held] = _held.__dict__.setdefault("locks", {})
+    wait = _timeout if timeout is None else timeout
+
+    current = held.get(key)
+    if current is not None:
+        if exclusive and not current.exclusive:
+            raise RuntimeError(
+                f"Cannot upgrade a shared lock on {project_path}; take the exclusive lock up front"
+            )
+        current.depth += 1
+        try:
+            yield
+        finally:
+            current.depth -= 1
+        return
+
+    fd = _open(lock_path)
+    if fd is None:
+        yield
+        return
+
+    try:
+        _acquire(fd, exclusive, wait, lock_path)
+        held[key] = _Held(fd, exclusive)
+        try:
+            yield
+        finally:
+            del held[key]
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(fd)
+
+
+def lock_file(project_path: Path) -> Path:
+    """Get the lock file of a project.
+
+    Args:
+        project_path: Project root
+
+    Returns:
+        File in the per-user lock directory, named after the resolved project path
+    """
+    return default_lock_dir() / f"{_lock_name(os.path.abspath(project_path))}{LOCK_SUFFIX}"
+
+
+@functools.lru_cache(maxsize=1024)
+def _lock_name(project_path: str) -> str:
+    """Name a project's lock file, resolving symlinks once per path.
+
+    Args:
+        project_path: Absolute project root
+
+    Returns:
+        Hash of the resolved project path
+    """
+    resolved = os.path.realpath(project_path)
+    return hashlib.sha256(resolved.encode("utf-8")).hexdigest()[:32]
+
+
+def default_lock_dir() -> Path:
+    """Get the per-user lock directory.
+
+    Returns:
+        ``$XDG_CACHE_HOME/ideporter/locks``, or the same under ``~/.cache``
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "ideporter" / "locks"
+
+
+def _open(lock_path: Path) -> int | None:
+    """Open a lock file, creating it and its directory if missing.
+
+    Args:
+        lock_path: Lock file
+
+    Returns:
+        File descriptor, or None if the file cannot be opened or created
+    """
+    flags = os.O_RDWR | os.O_CREAT
+    try:
+        try:
+            return os.open(lock_path, flags, 0o600)
+        except FileNotFoundError:
+            lock_path.parent.mkdir(parents=True, exist_ok=True)
+            return os.open(lock_path, flags, 0o600)
+    except OSError:
+        PROFILER.count("lock.unavailable")
+        return None
+
+
+def _acquire(fd: int, exclusive: bool, timeout: float, lock_path: Path) -> None:
+    """Take a flock, polling with backoff while another process holds it.
+
+    Args:
+        fd: Lock file descriptor
+        exclusive: Exclusive instead of shared
+        timeout: Seconds to wait
+        lock_path: Lock file, for the error message
+
+    Raises:
+        LockTimeoutError: If the lock is not acquired in time
+    """
+    mode = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+    try:
+        fcntl.flock(fd, mode | fcntl.LOCK_NB)
+        _record(contended=False, wait_ns=0)
+        return
+    except BlockingIOError:
+        pass
+
+    start = time.perf_counter_ns()
+    deadline = time.monotonic() + timeout
+    poll = _MIN_POLL
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            with _stats_lock:
+                STATS.timeouts += 1
+            PROFILER.count("lock.timeouts")
+            kind = "exclusive" if exclusive else "shared"
+            raise LockTimeoutError(
+                f"Timed out after {timeout:g}s waiting for a {kind} lock on {lock_path} "
+                "(another ideporter job is using this project)"
+            )
+        time.sleep(min(poll, remaining))
+        poll = min(poll * 2, _MAX_POLL)
+        try:
+            fcntl.flock(fd, mode | fcntl.LOCK_NB)
+            break
+        except BlockingIOError:
+            continue
+
+    wait_ns = time.perf_counter_ns() - start
+    _record(contended=True, wait_ns=wait_ns)
+    if PROFILER.enabled:
+        PROFILER.record("lock.wait", "lock", start, wait_ns)
+
+
+def _record(contended: bool, wait_ns: int) -> None:
+    """Count one acquisition.
+
+    Args:
+        contended: Whether the lock had to be waited for
+        wait_ns: Time spent waiting
+    """
+    with _stats_lock:
+        STATS.acquired += 1
+        if contended:
+            STATS.contended += 1
+            STATS.wait_ns += wait_ns
+    PROFILER.count("lock.acquired")
+    if contended:
+        PROFILER.count("lock.contended")
+        PROFILER.count("lock.wait_us", wait_ns // 1000)
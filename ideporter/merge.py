@@ -0,0 +1,175 @@
+"""Multi-source import: run every detected adapter and merge the results.
+
+Each adapter renders its import in memory, concurrently. Markdown outputs are
+merged paragraph by paragraph: a paragraph is kept the first time it is seen,
+and later copies are dropped when their text hashes the same exactly or after
+collapsing whitespace. Every run of kept paragraphs is preceded by a comment
+naming the sources it was found in, e.g. ``<!-- sources: cursor, vscode -->``.
+Ignore files are merged line by line; any other file is taken from the first
+source that provides it.
+"""
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import yaml
+
+from ideporter.adapters import available_adapters
+from ideporter.sections import split_paragraphs
+from ideporter.sources import FileSource
+from ideporter.utils import content_hash
+
+DEFAULT_WORKERS = 4
+
+_ANNOTATION = re.compile(r"^<!-- sources?: [\w, -]+ -->$")
+
+
+@dataclass
+class MergedImport:
+    """Canonical files merged from several adapters."""
+
+    outputs: dict[Path, str] = field(default_factory=dict)
+    sources: list[str] = field(default_factory=list)
+    duplicates: int = 0
+    errors: dict[str, str] = field(default_factory=dict)
+
+
+def render_import_all(
+    project_path: Path,
+    canonical_dir: Path,
+    source: FileSource | None = None,
+    workers: int = DEFAULT_WORKERS,
+) -> MergedImport:
+    """Import from every detected adapter and merge the results in memory.
+
+    Args:
+        project_path: Path to the project root
+        canonical_dir: Canonical context directory
+        source: Where adapters read files from (defaults to disk)
+        workers: Adapters rendered concurrently
+
+    Returns:
+        Merged outputs, the adapters that contributed, and per-adapter errors
+    """
+    adapters = [
+        adapter_class(project_path, source=source)
+        for adapter_class in available_adapters().values()
+    ]
+    detected = [adapter for adapter in adapters if adapter.detect()]
+
+    merged = MergedImport()
+    renders: list[tuple[str, dict[Path, str]]] = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [
+            (adapter.name, pool.submit(adapter.render_import, canonical_dir))
+            for adapter in detected
+        ]
+        for name, future in futures:
+            try:
+                outputs = future.result()
+            except NotImplementedError:
+                continue
+            except (OSError, ValueError, yaml.YAMLError) as e:
+                merged.errors[name] = f"{type(e).__name__}: {e}"
+                continue
+            if outputs:
+                renders.append((name, outputs))
+                merged.sources.append(name)
+
+    by_file: dict[Path, list[tuple[str, str]]] = {}
+    for name, outputs in renders:
+        for file_path, content in outputs.items():
+            by_file.setdefault(file_path, []).append((name, content))
+
+    for file_path, contents in by_file.items():
+        if len(contents) == 1:
+            merged.outputs[file_path] = contents[0][1]
+        elif file_path.suffix == ".md":
+            merged.outputs[file_path], duplicates = merge_markdown(contents)
+            merged.duplicates += duplicates
+        elif file_path.name == "ignore.txt":
+            merged.outputs[file_path] = merge_lines([content for _, content in contents])
+        else:
+            merged.outputs[file_path] = contents[0][1]
+    return merged
+
+
+def merge_markdown(contents: list[tuple[str, str]]) -> tuple[str, int]:
+    """Merge markdown documents, dropping paragraphs another source already contributed.
+
+    A paragraph repeated within one source (the same code block under two
+    steps, a ``---`` separator) is kept as often as that source has it; only
+    copies matching an earlier source's paragraphs are dropped.
+
+    Runs in time linear in the total size: every paragraph is hashed once
+    exactly and, if that misses, once after collapsing whitespace.
+
+    Args:
+        contents: (source name, markdown) pairs in priority order
+
+    Returns:
+        Merged markdown with source annotations, and the number of paragraphs dropped
+    """
+    paragraphs: list[str] = []
+    found_in: list[list[str]] = []
+    # Normalized key of each exact paragraph hash seen so far
+    keys: dict[str, str] = {}
+    # Paragraph index of the 1st, 2nd, ... occurrence of each normalized key
+    occurrences: dict[str, list[int]] = {}
+    duplicates = 0
+
+    for name, markdown in contents:
+        seen: dict[str, int] = {}
+        for paragraph in split_paragraphs(markdown):
+            if _ANNOTATION.match(paragraph):
+                continue
+
+            exact_key = content_hash(paragraph)
+            key = keys.get(exact_key)
+            if key is None:
+                key = keys[exact_key] = content_hash(" ".join(paragraph.split()))
+
+            # The n-th copy in this source matches the n-th copy merged so far
+            nth = seen.get(key, 0)
+            seen[key] = nth + 1
+            indices = occurrences.setdefault(key, [])
+            if nth < len(indices):
+                duplicates += 1
+                found_in[indices[nth]].append(name)
+                continue
+            indices.append(len(paragraphs))
+            paragraphs.append(paragraph)
+            found_in.append([name])
+
+    blocks: list[str] = []
+    previous: list[str] | None = None
+    for paragraph, names in zip(paragraphs, found_in, strict=True):
+        if names != previous:
+            label = "source" if len(names) == 1 else "sources"
+            blocks.append(f"<!-- {label}: {', '.join(names)} -->")
+            previous = names
+        blocks.append(paragraph)
+    return "\n\n".join(blocks) + "\n", duplicates
+
+
+def merge_lines(contents: list[str]) -> str:
+    """Merge line-based files such as ignore.txt, keeping each line once.
+
+    Args:
+        contents: File contents in priority order
+
+    Returns:
+        Merged content
+    """
+    seen: set[str] = set()
+    lines: list[str] = []
+    for content in contents:
+        for line in content.splitlines():
+            key = line.strip()
+            if key and key in seen:
+                continue
+            seen.add(key)
+            lines.append(line)
+    return "\n".join(lines) + "\n"
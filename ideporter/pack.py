@@ -0,0 +1,328 @@
+"""Compiled single-file canonical pack.
+
+A pack stores the canonical files adapters read in one versioned binary
+file that is loaded with a single ``open`` and ``mmap``. Layout (little-endian)::
+
+    header   magic(8) version(u16) reserved(u16) entry_count(u32)
+    entries  entry_count x [name(32) offset(u64) length(u64)
+                            mtime_ns(i64) source_size(u64) sha256(32)]
+    data     concatenated entry payloads
+
+Entries record the size and mtime of the source file they were compiled
+from; a pack is fresh while every source file still matches. A file modified
+within two seconds of the pack being built could be rewritten without its
+mtime changing (the "racy clean" case), so such files are also compared by
+content hash.
+
+Packs are stored in the per-user cache, named after the canonical directory,
+so compiling one never adds a file to the project.
+"""
+
+import functools
+import hashlib
+import mmap
+import os
+import struct
+from pathlib import Path
+
+from ideporter import fsio
+
+PACK_SUFFIX = ".pack"
+PACK_MAGIC = b"IDECPACK"
+PACK_VERSION = 2
+PACKED_FILES = ("rules.md", "context.md", "ignore.txt", "extensions.json")
+
+# Sources modified this close to the build are verified by content hash
+_RACY_NS = 2_000_000_000
+
+_HEADER = struct.Struct("<8sHHI")
+_ENTRY = struct.Struct("<32sQQqQ32s")
+
+
+class PackError(Exception):
+    """Raised when a pack cannot be built or is malformed."""
+
+
+class PackEntry:
+    """Index record for one pack entry."""
+
+    __slots__ = ("name", "offset", "length", "mtime_ns", "source_size", "digest")
+
+    def __init__(
+        self, name: str, offset: int, length: int, mtime_ns: int, source_size: int, digest: bytes
+    ):
+        self.name = name
+        self.offset = offset
+        self.length = length
+        self.mtime_ns = mtime_ns
+        self.source_size = source_size
+        self.digest = digest
+
+
+class CanonicalPack:
+    """Memory-mapped view of a compiled canonical pack."""
+
+    def __init__(self, path: Path):
+        """Map a pack file and read its index.
+
+        Args:
+            path: Pack file path
+
+        Raises:
+            PackError: If the file is not a pack of the current version
+        """
+        with path.open("rb") as f:
+            built_ns = os.fstat(f.fileno()).st_mtime_ns
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:  # empty file
+                raise PackError(f"Empty pack: {path}") from e
+
+        if len(self._map) < _HEADER.size:
+            raise PackError(f"Truncated pack: {path}")
+        magic, version, _, count = _HEADER.unpack_from(self._map, 0)
+        if magic != PACK_MAGIC:
+            raise PackError(f"Not a canonical pack: {path}")
+        if version != PACK_VERSION:
+            raise PackError(f"Unsupported pack version {version}: {path}")
+
+        self.path = path
+        self.built_ns = built_ns
+        self.entries: dict[str, PackEntry] = {}
+        pos = _HEADER.size
+        for _ in range(count):
+            raw_name, offset, length, mtime_ns, size, digest = _ENTRY.unpack_from(self._map, pos)
+            name = raw_name.rstrip(b"\0").decode("utf-8")
+            self.entries[name] = PackEntry(name, offset, length, mtime_ns, size, digest)
+            pos += _ENTRY.size
+
+    def close(self) -> None:
+        """Unmap the pack."""
+        self._map.close()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries
+
+    def read(self, name: str) -> str | None:
+        """Read an entry as text.
+
+        Args:
+            name: Canonical file name (e.g. ``rules.md``)
+
+        Returns:
+            Entry content, or None if the pack has no such entry
+        """
+        entry = self.entries.get(name)
+        if entry is None:
+            return None
+        return self._map[entry.offset : entry.offset + entry.length].decode("utf-8")
+
+    def content_hash(self, name: str) -> str | None:
+        """Get the SHA-256 of an entry without reading it.
+
+        Args:
+            name: Entry name
+
+        Returns:
+            Hex digest, or None if the pack has no such entry
+        """
+        entry = self.entries.get(name)
+        return entry.digest.hex() if entry is not None else None
+
+    def is_fresh(self, context_dir: Path) -> bool:
+        """Check the pack against the canonical files it was built from.
+
+        Uses one directory scan; only files modified within two seconds of
+        the build are opened, to compare their content hash.
+
+        Args:
+            context_dir: Canonical context directory
+
+        Returns:
+            True if every packed file is unchanged and no new one appeared
+        """
+        try:
+            with os.scandir(context_dir) as it:
+                current = {
+                    entry.name: entry.stat()
+                    for entry in it
+                    if entry.name in PACKED_FILES and entry.is_file()
+                }
+        except OSError:
+            return False
+
+        if set(self.entries) != set(current):
+            return False
+        for name, stat in current.items():
+            entry = self.entries[name]
+            if stat.st_size != entry.source_size or stat.st_mtime_ns != entry.mtime_ns:
+                return False
+            if self.built_ns - entry.mtime_ns < _RACY_NS and not self._same_content(
+                context_dir / name, entry
+            ):
+                return False
+        return True
+
+    def _same_content(self, path: Path, entry: PackEntry) -> bool:
+        """Check a source file against the hash of its packed copy.
+
+        Args:
+            path: Source file
+            entry: Pack entry compiled from it
+
+        Returns:
+            True if the file still has the packed content
+        """
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return False
+        return hashlib.sha256(data).digest() == entry.digest
+
+
+def build_pack(context_dir: Path, output: Path | None = None) -> Path:
+    """Compile a canonical context directory into a pack file.
+
+    Args:
+        context_dir: Canonical context directory
+        output: Pack path (defaults to ``pack_file(context_dir)``)
+
+    Returns:
+        Path of the written pack
+
+    Raises:
+        PackError: If a canonical file is not valid UTF-8
+    """
+    output = output or pack_file(context_dir)
+    payloads: list[tuple[str, bytes, int, int]] = []
+
+    for name in PACKED_FILES:
+        try:
+            with (context_dir / name).open("rb") as f:
+                data = f.read()
+                stat = os.fstat(f.fileno())
+        except FileNotFoundError:
+            continue
+        payloads.append((name, data, stat.st_mtime_ns, stat.st_size))
+
+    for name, data, _, _ in payloads:
+        try:
+            data.decode("utf-8")
+        except UnicodeDecodeError as e:
+            raise PackError(f"{name} is not valid UTF-8: {e}") from e
+
+    offset = _HEADER.size + _ENTRY.size * len(payloads)
+    index = [_HEADER.pack(PACK_MAGIC, PACK_VERSION, 0, len(payloads))]
+    for name, data, mtime_ns, size in payloads:
+        index.append(
+            _ENTRY.pack(
+                name.encode("utf-8"),
+                offset,
+                len(data),
+                mtime_ns,
+                size,
+                hashlib.sha256(data).digest(),
+            )
+        )
+        offset += len(data)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_name(f"{output.name}.tmp")
+    with tmp.open("wb") as f:
+        f.write(b"".join(index))
+        for _, data, _, _ in payloads:
+            f.write(data)
+    os.replace(tmp, output)
+    fsio.forget(output)
+    return output
+
+
+def pack_file(context_dir: Path) -> Path:
+    """Get where the pack of a canonical directory is stored.
+
+    Args:
+        context_dir: Canonical context directory
+
+    Returns:
+        File in the per-user pack directory, named after the resolved directory
+    """
+    return default_pack_dir() / f"{_pack_name(os.path.abspath(context_dir))}{PACK_SUFFIX}"
+
+
+@functools.lru_cache(maxsize=1024)
+def _pack_name(context_dir: str) -> str:
+    """Name a canonical directory's pack, resolving symlinks once per path.
+
+    Args:
+        context_dir: Absolute canonical context directory
+
+    Returns:
+        Hash of the resolved directory
+    """
+    resolved = os.path.realpath(context_dir)
+    return hashlib.sha256(resolved.encode("utf-8")).hexdigest()[:32]
+
+
+def default_pack_dir() -> Path:
+    """Get the per-user pack directory.
+
+    Returns:
+        ``$XDG_CACHE_HOME/ideporter/packs``, or the same under ``~/.cache``
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "ideporter" / "packs"
+
+
+def load_pack(context_dir: Path) -> CanonicalPack | None:
+    """Load a canonical directory's pack if it exists and is fresh.
+
+    Args:
+        context_dir: Canonical context directory
+
+    Returns:
+        The pack, or None if missing, unreadable or stale
+    """
+    try:
+        pack = CanonicalPack(pack_file(context_dir))
+    except (FileNotFoundError, PackError):
+        return None
+
+    if not pack.is_fresh(context_dir):
+        pack.close()
+        return None
+    return pack
+
+
+class PackSource:
+    """File source serving canonical files from a pack and the rest from disk."""
+
+    def __init__(self, pack: CanonicalPack, project_path: Path, context_relpath: str):
+        """Initialize the source.
+
+        Args:
+            pack: Fresh pack for the project's canonical directory
+            project_path: Path to the project root
+            context_relpath: Canonical directory relative to the project root
+        """
+        self.pack = pack
+        self.project_path = project_path
+        self.prefix = context_relpath.rstrip("/") + "/"
+
+    def read_text(self, relpath: str) -> str | None:
+        """Read a file, answering canonical lookups from the pack."""
+        if relpath.startswith(self.prefix):
+            name = relpath[len(self.prefix) :]
+            if name in PACKED_FILES:
+                # A fresh pack also proves absent files are absent
+                return self.pack.read(name)
+
+        try:
+            return (self.project_path / relpath).read_text(encoding="utf-8")
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+    def exists(self, relpath: str) -> bool:
+        """Check whether a file or directory exists."""
+        if relpath.startswith(self.prefix) and relpath[len(self.prefix) :] in PACKED_FILES:
+            return relpath[len(self.prefix) :] in self.pack
+        return (self.project_path / relpath).exists()
@@ -0,0 +1,292 @@
+"""Planned file operations and the engine that applies them.
+
+Adapters render what an import or export should produce without touching the
+filesystem; ``BaseAdapter.plan()`` turns that render into a list of
+``Operation`` objects (the path, the content, whether to write or link it and
+fingerprints of the files it was rendered from). ``apply_plan()`` is the one
+place those operations reach the disk:
+
+- identical operations planned twice (e.g. by two adapters) are applied once,
+  and conflicting ones for the same path are rejected before anything is
+  written
+- operations whose file is already current are skipped
+- writes are applied before links, so link targets exist when links are made
+- independent files are written in parallel, and results are reported in plan
+  order with the same messages as a sequential write
+- inside a ``writebehind.session()``, writes are queued instead and land in
+  the background
+"""
+
+import contextvars
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Literal
+
+from rich.console import Console
+
+from ideporter import fsio, writebehind
+from ideporter.linking import LINK_MODES, is_linked, link_file
+from ideporter.profiling import PROFILER, profiled
+from ideporter.sections import diff_sections, is_markdown
+from ideporter.utils import write_file
+
+console = Console()
+
+WRITE = "write"
+DEFAULT_WORKERS = 4
+
+Outcome = Literal["written", "unchanged", "would_write", "linked", "would_link"]
+
+
+class PlanError(Exception):
+    """Raised when a plan holds conflicting operations for the same path."""
+
+    pass
+
+
+@dataclass(frozen=True)
+class Operation:
+    """One file an import or export intends to produce."""
+
+    path: Path
+    content: str
+    # "write", or one of ideporter.linking.LINK_MODES to link to target instead
+    mode: str = WRITE
+    target: Path | None = None
+    # Content hash of every file read while rendering (None for missing files),
+    # keyed by path relative to the project root
+    sources: Mapping[str, str | None] = field(default_factory=dict, compare=False)
+    adapter: str = field(default="", compare=False)
+
+    @property
+    def size(self) -> int:
+        """Size of the content in bytes."""
+        return len(self.content.encode("utf-8"))
+
+    @property
+    def is_link(self) -> bool:
+        """Whether the operation links to a canonical file instead of writing."""
+        return self.mode != WRITE
+
+
+@dataclass
+class Applied:
+    """Outcome of one operation."""
+
+    operation: Operation
+    outcome: Outcome
+    backup: Path | None = None
+    # Link mode actually used, which may differ from the planned one
+    used: str | None = None
+    # Sections touched and total, for markdown files that were rewritten
+    sections: tuple[int, int] | None = None
+
+    @property
+    def changed(self) -> bool:
+        """Whether the file was (or would be) written or linked."""
+        return self.outcome != "unchanged"
+
+
+def write_operations(
+    outputs: Mapping[Path, str],
+    adapter: str = "",
+    sources: Mapping[str, str | None] | None = None,
+) -> list[Operation]:
+    """Plan writes for rendered outputs.
+
+    Args:
+        outputs: Mapping of file path to content
+        adapter: Adapter that rendered the outputs
+        sources: Fingerprints of the files the outputs were rendered from
+
+    Returns:
+        One write operation per output, in render order
+    """
+    return [
+        Operation(path, content, sources=sources or {}, adapter=adapter)
+        for path, content in outputs.items()
+    ]
+
+
+@profiled("plan.apply")
+def apply_plan(
+    operations: Iterable[Operation],
+    force: bool = False,
+    dry_run: bool = False,
+    workers: int = DEFAULT_WORKERS,
+    report: bool = True,
+) -> list[Applied]:
+    """Apply planned operations, skipping files that are already current.
+
+    Args:
+        operations: Operations to apply
+        force: Skip backups if True
+        dry_run: Only preview operations if True
+        workers: Maximum number of files written at the same time
+        report: Print what was done, as safe_write and safe_link do
+
+    Returns:
+        One result per distinct operation, in plan order
+
+    Raises:
+        PlanError: If two operations disagree about the same path
+        ValueError: If an operation has an unknown mode
+    """
+    planned = dedupe_operations(operations)
+    for operation in planned:
+        if operation.is_link and (operation.mode not in LINK_MODES or operation.target is None):
+            raise ValueError(f"Invalid operation for {operation.path}: mode '{operation.mode}'")
+
+    def execute(operation: Operation) -> Applied:
+        return _execute(operation, force, dry_run, report)
+
+    writes = [op for op in planned if not op.is_link]
+    links = [op for op in planned if op.is_link]
+    results = {applied.operation.path: applied for applied in _run(execute, writes, workers)}
+    # Links go last so that the canonical files they point at are written first
+    writer = writebehind.current()
+    if links and writer is not None and not dry_run:
+        writer.flush()
+    results.update((applied.operation.path, applied) for applied in _run(execute, links, workers))
+
+    applied_plan = [results[operation.path] for operation in planned]
+    PROFILER.count("plan.operations", len(applied_plan))
+    PROFILER.count("plan.skipped", sum(not applied.changed for applied in applied_plan))
+    if report:
+        for applied in applied_plan:
+            _report(applied)
+    return applied_plan
+
+
+def dedupe_operations(operations: Iterable[Operation]) -> list[Operation]:
+    """Drop repeated operations and reject conflicting ones.
+
+    Args:
+        operations: Planned operations
+
+    Returns:
+        Distinct operations, in the order first planned
+
+    Raises:
+        PlanError: If two operations disagree about the same path
+    """
+    by_path: dict[Path, Operation] = {}
+    for operation in operations:
+        existing = by_path.setdefault(operation.path, operation)
+        if existing != operation:
+            planners = " and ".join(sorted({existing.adapter or "?", operation.adapter or "?"}))
+            raise PlanError(f"Conflicting operations for {operation.path} (from {planners})")
+    return list(by_path.values())
+
+
+def _run(
+    execute: Callable[[Operation], Applied], operations: list[Operation], workers: int
+) -> list[Applied]:
+    """Execute operations, in parallel when there are several.
+
+    Args:
+        execute: Function applying one operation
+        operations: Operations on distinct paths
+        workers: Maximum number of worker threads
+
+    Returns:
+        Results in the order of operations
+
+    Raises:
+        Exception: The first error raised by an operation, after all have finished
+    """
+    if workers <= 1 or len(operations) <= 1:
+        return [execute(operation) for operation in operations]
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(operations))) as pool:
+        # Each task runs in a copy of this context, so workers share the
+        # operation's fsio lookup cache
+        futures: list[Future[Applied]] = [
+            pool.submit(contextvars.copy_context().run, execute, operation)
+            for operation in operations
+        ]
+    return [future.result() for future in futures]
+
+
+def _execute(operation: Operation, force: bool, dry_run: bool, report: bool) -> Applied:
+    """Apply one operation without printing.
+
+    Args:
+        operation: Operation to apply
+        force: Skip backups if True
+        dry_run: Only work out what would be done if True
+        report: Whether section counts will be reported
+
+    Returns:
+        Outcome of the operation
+    """
+    if operation.is_link and operation.target is not None:
+        if is_linked(operation.path, operation.target, operation.mode):
+            return Applied(operation, "unchanged")
+        if dry_run:
+            return Applied(operation, "would_link")
+        used, backup = link_file(operation.path, operation.target, operation.mode, force=force)
+        return Applied(operation, "linked", backup=backup, used=used)
+
+    try:
+        current = fsio.read_text(operation.path)
+    except UnicodeDecodeError:
+        current = None
+    if current == operation.content:
+        return Applied(operation, "unchanged")
+
+    sections = None
+    if report and current is not None and is_markdown(operation.path):
+        diff = diff_sections(current, operation.content)
+        sections = (len(diff.touched), len(diff.unchanged) + len(diff.touched))
+
+    if dry_run:
+        return Applied(operation, "would_write", sections=sections)
+    writer = writebehind.current()
+    if writer is not None:
+        # Backups made by the queue are reported when it drains
+        writer.submit(operation.path, operation.content, force=force)
+        return Applied(operation, "written", sections=sections)
+    backup = write_file(operation.path, operation.content, force=force)
+    return Applied(operation, "written", backup=backup, sections=sections)
+
+
+def _report(applied: Applied) -> None:
+    """Print the outcome of one operation.
+
+    Args:
+        applied: Outcome to print
+    """
+    operation = applied.operation
+    path = operation.path
+    if applied.outcome == "unchanged":
+        console.print(f"[dim]⊘ Unchanged {path}[/dim]")
+        return
+
+    if applied.sections is not None:
+        touched, total = applied.sections
+        console.print(f"[dim]{touched} of {total} sections changed[/dim]")
+
+    if applied.outcome == "would_write":
+        console.print(f"[yellow]DRY RUN:[/yellow] Would write to {path}")
+        console.print("[dim]Content preview (first 200 chars):[/dim]")
+        console.print(f"[dim]{operation.content[:200]}...[/dim]")
+        return
+    if applied.outcome == "would_link":
+        console.print(
+            f"[yellow]DRY RUN:[/yellow] Would {operation.mode} {path} → {operation.target}"
+        )
+        return
+
+    if applied.backup is not None:
+        console.print(f"[dim]Created backup: {applied.backup}[/dim]")
+    if applied.outcome == "linked":
+        if applied.used != operation.mode:
+            console.print(
+                f"[yellow]⊘[/yellow] {operation.mode} not supported for {path}, used {applied.used}"
+            )
+        console.print(f"[green]✓[/green] Linked {path} → {operation.target} ({applied.used})")
+    else:
+        console.print(f"[green]✓[/green] Wrote {path}")
@@ -0,0 +1,176 @@
+"""Lightweight phase timers for the global ``--profile`` option.
+
+Hot paths are wrapped with ``profiled``. While profiling is disabled the
+wrapper costs one attribute check per call; when enabled every call records
+a complete trace event, and per-phase call counts and durations are
+aggregated for the end-of-run breakdown.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, ParamSpec, TypeVar
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+@dataclass
+class PhaseStats:
+    """Aggregated timings for one phase."""
+
+    name: str
+    calls: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+
+
+class Profiler:
+    """Collects phase timings and trace events."""
+
+    def __init__(self) -> None:
+        """Initialize a disabled profiler."""
+        self.enabled = False
+        self.stats: dict[str, PhaseStats] = {}
+        self.counters: dict[str, int] = {}
+        self.events: list[dict[str, Any]] = []
+        self._origin_ns = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        """Discard earlier data and start recording."""
+        self.reset()
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stop recording (collected data is kept)."""
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Discard all collected data."""
+        with self._lock:
+            self.stats.clear()
+            self.counters.clear()
+            self.events.clear()
+            self._origin_ns = time.perf_counter_ns()
+
+    def record(self, name: str, category: str, start_ns: int, duration_ns: int) -> None:
+        """Record one completed call.
+
+        Args:
+            name: Phase name
+            category: Trace category
+            start_ns: perf_counter_ns() at call start
+            duration_ns: Call duration in nanoseconds
+        """
+        with self._lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = PhaseStats(name)
+            stats.calls += 1
+            stats.total_ns += duration_ns
+            stats.max_ns = max(stats.max_ns, duration_ns)
+            self.events.append(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": (start_ns - self._origin_ns) / 1000,
+                    "dur": duration_ns / 1000,
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                }
+            )
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Add to a named counter while profiling is enabled.
+
+        Args:
+            name: Counter name
+            value: Amount to add
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def report(self) -> list[PhaseStats]:
+        """Get per-phase statistics, most expensive first.
+
+        Returns:
+            Phase statistics sorted by total time
+        """
+        with self._lock:
+            return sorted(self.stats.values(), key=lambda s: s.total_ns, reverse=True)
+
+    def write_trace(self, path: Path) -> None:
+        """Write collected events in Chrome trace-event format.
+
+        The file can be opened in chrome://tracing or Perfetto.
+
+        Args:
+            path: Output JSON path
+        """
+        with self._lock:
+            trace = {
+                "traceEvents": list(self.events),
+                "displayTimeUnit": "ms",
+                "otherData": {"counters": dict(self.counters)},
+            }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(trace), encoding="utf-8")
+
+
+# Process-wide profiler driven by the CLI's --profile option
+PROFILER = Profiler()
+
+
+def profiled(name: str, category: str = "ideporter") -> Callable[[Callable[P, T]], Callable[P, T]]:
+    """Decorate a function so its calls are timed while profiling is enabled.
+
+    Args:
+        name: Phase name shown in the breakdown and trace
+        category: Trace category
+
+    Returns:
+        Decorator
+    """
+
+    def decorator(func: Callable[P, T]) -> Callable[P, T]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                PROFILER.record(name, category, start, time.perf_counter_ns() - start)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def phase(name: str, category: str = "ideporter") -> Iterator[None]:
+    """Time a block of code while profiling is enabled.
+
+    Args:
+        name: Phase name
+        category: Trace category
+    """
+    if not PROFILER.enabled:
+        yield
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        PROFILER.record(name, category, start, time.perf_counter_ns() - start)
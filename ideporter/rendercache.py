@@ -0,0 +1,255 @@
+"""Shared, content-addressed cache of rendered adapter outputs.
+
+Projects that share their rules render byte-identical IDE files, so batch
+runs keep rendered outputs on disk and reuse them across projects and runs.
+An entry is keyed by the adapter name and version, the ideporter version and
+the hashes of the canonical files (``rules.md``, ``context.md``, ...). Files
+an adapter reads besides those, such as an existing ``.continue/config.json``
+it merges into, are recorded with their hashes when the entry is stored and
+must match on lookup, so an entry is only reused for the exact inputs it was
+rendered from.
+
+Entries are small JSON files under ``<cache dir>/<key[:2]>/<key>.json``. A
+hit refreshes the entry's modification time, and ``prune()`` evicts the least
+recently used entries until the cache fits its size limit.
+"""
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from ideporter import __version__
+from ideporter.adapters.base import BaseAdapter
+from ideporter.pack import PACKED_FILES
+from ideporter.sources import RecordingSource
+from ideporter.utils import content_hash
+
+CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Renders kept per key that differ only in their other inputs
+_MAX_VARIANTS = 8
+
+
+def default_cache_dir() -> Path:
+    """Get the per-user render cache directory.
+
+    Returns:
+        ``$XDG_CACHE_HOME/ideporter/render``, or ``~/.cache/ideporter/render``
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "ideporter" / "render"
+
+
+@dataclass
+class CacheStats:
+    """Render cache counters for one run."""
+
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class RenderCache:
+    """On-disk cache of adapter export renders."""
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Initialize the cache.
+
+        Args:
+            directory: Cache directory (created on first store)
+            max_bytes: Size limit enforced by prune()
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def render_export(self, adapter: BaseAdapter, canonical_dir: Path) -> dict[Path, str]:
+        """Render an adapter's export outputs, reusing a cached render when possible.
+
+        Args:
+            adapter: Adapter to render with
+            canonical_dir: Path to canonical context directory
+
+        Returns:
+            Mapping of output file path to content
+
+        Raises:
+            NotImplementedError: If the adapter cannot render in memory
+        """
+        project_path = adapter.project_path
+        try:
+            context_rel = canonical_dir.relative_to(project_path).as_posix()
+        except ValueError:
+            return adapter.render_export(canonical_dir)
+
+        recorder = RecordingSource(project_path, adapter.source)
+        canonical = {
+            f"{context_rel}/{name}": _digest(recorder.read_text(f"{context_rel}/{name}"))
+            for name in PACKED_FILES
+        }
+        key = content_hash(
+            json.dumps(
+                [CACHE_VERSION, __version__, adapter.name, adapter.version, canonical],
+                sort_keys=True,
+            )
+        )
+        entry_path = self.directory / key[:2] / f"{key}.json"
+
+        variants = self._load(entry_path)
+        for variant in variants:
+            if _matches(variant, recorder):
+                self._touch(entry_path)
+                self._count(hits=1)
+                return {project_path / rel: content for rel, content in variant["outputs"].items()}
+        self._count(misses=1)
+
+        outputs = adapter.with_source(recorder).render_export(canonical_dir)
+
+        try:
+            relative = {path.relative_to(project_path).as_posix(): c for path, c in outputs.items()}
+        except ValueError:
+            return outputs
+        variant = {
+            "inputs": {
+                rel: digest
+                for rel, digest in recorder.fingerprints().items()
+                if rel not in canonical
+            },
+            "probes": dict(recorder.probes),
+            "outputs": relative,
+        }
+        self._store(entry_path, [variant, *variants][:_MAX_VARIANTS])
+        return outputs
+
+    def prune(self) -> int:
+        """Evict least recently used entries until the cache fits its limit.
+
+        Returns:
+            Number of entries evicted
+        """
+        entries: list[tuple[float, int, str]] = []
+        try:
+            shards = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return 0
+        for shard in shards:
+            if not shard.is_dir():
+                continue
+            with os.scandir(shard.path) as files:
+                for entry in files:
+                    if entry.name.endswith(".json"):
+                        st = entry.stat()
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            evicted += 1
+        self._count(evictions=evicted)
+        return evicted
+
+    def _load(self, entry_path: Path) -> list[dict[str, Any]]:
+        """Read an entry's renders.
+
+        Args:
+            entry_path: Entry file
+
+        Returns:
+            Stored renders, or an empty list if the entry is missing or unreadable
+        """
+        try:
+            data = json.loads(entry_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return []
+        variants = data.get("variants") if isinstance(data, dict) else None
+        return variants if isinstance(variants, list) else []
+
+    def _store(self, entry_path: Path, variants: list[dict[str, Any]]) -> None:
+        """Write an entry atomically; failures only cost a future miss.
+
+        Args:
+            entry_path: Entry file
+            variants: Renders to keep, most recent first
+        """
+        data = json.dumps({"version": CACHE_VERSION, "variants": variants})
+        tmp = entry_path.with_name(f"{entry_path.name}.{os.getpid()}.{threading.get_ident()}")
+        try:
+            try:
+                tmp.write_text(data, encoding="utf-8")
+            except FileNotFoundError:
+                tmp.parent.mkdir(parents=True, exist_ok=True)
+                tmp.write_text(data, encoding="utf-8")
+            os.replace(tmp, entry_path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            return
+        self._count(stores=1)
+
+    def _touch(self, entry_path: Path) -> None:
+        """Mark an entry as recently used.
+
+        Args:
+            entry_path: Entry file
+        """
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+
+    def _count(self, **deltas: int) -> None:
+        """Add to the run's counters.
+
+        Args:
+            **deltas: Amount to add per CacheStats field
+        """
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self.stats, name, getattr(self.stats, name) + delta)
+
+
+def _digest(content: str | None) -> str | None:
+    """Hash file content, keeping None for missing files.
+
+    Args:
+        content: File content or None
+
+    Returns:
+        Content hash or None
+    """
+    return None if content is None else content_hash(content)
+
+
+def _matches(variant: dict[str, Any], recorder: RecordingSource) -> bool:
+    """Check whether a stored render's other inputs match this project.
+
+    Args:
+        variant: Stored render
+        recorder: Source for the project being rendered
+
+    Returns:
+        True if every recorded input and probe is unchanged
+    """
+    inputs = variant.get("inputs", {})
+    probes = variant.get("probes", {})
+    return all(
+        _digest(recorder.read_text(rel)) == digest for rel, digest in inputs.items()
+    ) and all(recorder.exists(rel) == found for rel, found in probes.items())
@@ -0,0 +1,322 @@
+"""Section-level model of canonical markdown.
+
+Markdown is split at ATX headings (``#`` to ``######``, outside code fences)
+into sections keyed by their heading path, e.g. ``("AI Project Rules",
+"Testing")``. Every section keeps its raw text, so joining the sections
+reproduces the document byte for byte, and carries a content hash so two
+versions of a document can be compared section by section.
+
+Parsed trees are cached by content hash; re-parsing an unchanged file during
+a batch or a check costs one hash.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ideporter.utils import content_hash
+
+_HEADING = re.compile(r"^ {0,3}(#{1,6})[ \t]+(.*?)(?:[ \t]+#+)?[ \t]*$")
+_FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+
+# Files written as markdown, besides *.md
+_MARKDOWN_NAMES = {".cursorrules"}
+
+_CACHE_SIZE = 256
+_cache: "OrderedDict[str, SectionTree]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Section:
+    """A heading and the text up to the next heading (or a block of them)."""
+
+    key: tuple[str, ...]
+    level: int
+    title: str
+    text: str
+    hash: str
+
+    @property
+    def id(self) -> str:
+        """Heading path as a single string, e.g. ``Rules > Testing``."""
+        return " > ".join(self.key)
+
+
+@dataclass(frozen=True)
+class SectionDiff:
+    """Section keys grouped by how they changed between two documents."""
+
+    added: list[tuple[str, ...]] = field(default_factory=list)
+    removed: list[tuple[str, ...]] = field(default_factory=list)
+    changed: list[tuple[str, ...]] = field(default_factory=list)
+    unchanged: list[tuple[str, ...]] = field(default_factory=list)
+
+    @property
+    def touched(self) -> list[tuple[str, ...]]:
+        """Keys of every section that was added, removed or changed."""
+        return [*self.changed, *self.added, *self.removed]
+
+
+@dataclass(frozen=True)
+class SectionTree:
+    """A parsed markdown document."""
+
+    sections: tuple[Section, ...]
+    hash: str
+
+    @property
+    def text(self) -> str:
+        """The original document."""
+        return "".join(section.text for section in self.sections)
+
+    @property
+    def title(self) -> str | None:
+        """Title of the document: its first heading, when that is an H1."""
+        for section in self.sections:
+            if section.level:
+                return section.title if section.level == 1 else None
+        return None
+
+    def get(self, key: tuple[str, ...]) -> Section | None:
+        """Find a section by heading path.
+
+        Args:
+            key: Heading path
+
+        Returns:
+            The section, or None if absent
+        """
+        for section in self.sections:
+            if section.key == key:
+                return section
+        return None
+
+    def blocks(self) -> list[Section]:
+        """Group sections into top-level blocks.
+
+        Below a single H1 title the blocks are the title's direct children;
+        otherwise they are the top-level headings. Each block spans its
+        subsections. Text before the first block (preamble and title) forms
+        an intro block keyed by ``()``. Joining the block texts reproduces the
+        document, except for an intro that is only whitespace.
+
+        Returns:
+            Blocks in document order
+        """
+        headed = [section for section in self.sections if section.level]
+        if not headed:
+            return [self._block((), "Introduction", 0, list(self.sections))]
+
+        title = self.title
+        rest = headed[1:] if title is not None else headed
+        if title is not None and any(section.level == 1 for section in rest):
+            title, rest = None, headed
+        unit = min((section.level for section in rest), default=7)
+        starts = {id(section) for section in rest if section.level <= unit}
+
+        blocks: list[Section] = []
+        intro: list[Section] = []
+        current: list[Section] = []
+        for section in self.sections:
+            if id(section) in starts:
+                if current:
+                    blocks.append(self._block(current[0].key, current[0].title, unit, current))
+                current = [section]
+            elif current:
+                current.append(section)
+            else:
+                intro.append(section)
+        if current:
+            blocks.append(self._block(current[0].key, current[0].title, unit, current))
+
+        if intro and "".join(section.text for section in intro).strip():
+            blocks.insert(0, self._block((), title or "Introduction", 0, intro))
+        return blocks
+
+    @staticmethod
+    def _block(key: tuple[str, ...], title: str, level: int, parts: list[Section]) -> Section:
+        """Merge consecutive sections into one block.
+
+        Args:
+            key: Block key
+            title: Block title
+            level: Heading level of the block
+            parts: Sections making up the block
+
+        Returns:
+            Block spanning the parts
+        """
+        text = "".join(part.text for part in parts)
+        return Section(key=key, level=level, title=title, text=text, hash=content_hash(text))
+
+
+def parse_sections(markdown: str) -> SectionTree:
+    """Parse markdown into sections, reusing the cached tree for known content.
+
+    Args:
+        markdown: Markdown document
+
+    Returns:
+        Section tree
+    """
+    digest = content_hash(markdown)
+    with _cache_lock:
+        tree = _cache.get(digest)
+        if tree is not None:
+            _cache.move_to_end(digest)
+            return tree
+
+    tree = SectionTree(sections=tuple(_split(markdown)), hash=digest)
+    with _cache_lock:
+        _cache[digest] = tree
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return tree
+
+
+def diff_sections(old: str, new: str) -> SectionDiff:
+    """Compare two markdown documents section by section.
+
+    Args:
+        old: Previous document
+        new: New document
+
+    Returns:
+        Section keys grouped by change type
+    """
+    before = {section.key: section.hash for section in parse_sections(old).sections}
+    after = {section.key: section.hash for section in parse_sections(new).sections}
+
+    diff = SectionDiff()
+    for key, digest in after.items():
+        if key not in before:
+            diff.added.append(key)
+        elif before[key] != digest:
+            diff.changed.append(key)
+        else:
+            diff.unchanged.append(key)
+    diff.removed.extend(key for key in before if key not in after)
+    return diff
+
+
+def is_markdown(file_path: Path) -> bool:
+    """Check whether a file holds markdown that can be compared by section.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        True for markdown files
+    """
+    return file_path.suffix in (".md", ".mdc") or file_path.name in _MARKDOWN_NAMES
+
+
+def strip_title(markdown: str) -> str:
+    """Strip a leading H1 title line, if present.
+
+    Args:
+        markdown: Markdown document
+
+    Returns:
+        Document without its title line, trimmed; unchanged if it has no title
+    """
+    if not markdown.startswith("# "):
+        return markdown
+    sections = parse_sections(markdown).sections
+    _, newline, body = sections[0].text.partition("\n")
+    if not newline:
+        return markdown
+    return (body + "".join(section.text for section in sections[1:])).strip()
+
+
+def split_paragraphs(markdown: str) -> list[str]:
+    """Split markdown into paragraphs at blank lines outside code fences.
+
+    Args:
+        markdown: Markdown document
+
+    Returns:
+        Paragraphs without their surrounding blank lines
+    """
+    paragraphs: list[str] = []
+    lines: list[str] = []
+    fence: str | None = None
+
+    for line in markdown.splitlines():
+        fence_match = _FENCE.match(line)
+        if fence_match:
+            marker = fence_match.group(1)
+            if fence is None:
+                fence = marker
+            elif marker[0] == fence[0] and len(marker) >= len(fence):
+                fence = None
+
+        if fence is None and not fence_match and not line.strip():
+            if lines:
+                paragraphs.append("\n".join(lines))
+                lines = []
+            continue
+        lines.append(line)
+
+    if lines:
+        paragraphs.append("\n".join(lines))
+    return paragraphs
+
+
+def _split(markdown: str) -> list[Section]:
+    """Split markdown into flat sections.
+
+    Args:
+        markdown: Markdown document
+
+    Returns:
+        Sections in document order; text before the first heading is a
+        level-0 section keyed by ``()``
+    """
+    sections: list[Section] = []
+    stack: list[tuple[int, str]] = []
+    seen: dict[tuple[str, ...], int] = {}
+
+    key: tuple[str, ...] = ()
+    level = 0
+    title = ""
+    lines: list[str] = []
+    fence: str | None = None
+
+    def flush() -> None:
+        if lines or level:
+            text = "".join(lines)
+            sections.append(Section(key, level, title, text, content_hash(text)))
+
+    for line in markdown.splitlines(keepends=True):
+        fence_match = _FENCE.match(line)
+        if fence_match:
+            marker = fence_match.group(1)
+            if fence is None:
+                fence = marker
+            elif marker[0] == fence[0] and len(marker) >= len(fence):
+                fence = None
+
+        heading = _HEADING.match(line) if fence is None and not fence_match else None
+        if heading is None:
+            lines.append(line)
+            continue
+
+        flush()
+        level = len(heading.group(1))
+        title = heading.group(2).strip()
+        while stack and stack[-1][0] >= level:
+            stack.pop()
+        stack.append((level, title))
+
+        key = tuple(name for _, name in stack)
+        seen[key] = seen.get(key, 0) + 1
+        if seen[key] > 1:
+            key = (*key[:-1], f"{key[-1]} #{seen[key]}")
+        lines = [line]
+
+    flush()
+    return sections
@@ -0,0 +1,237 @@
+"""Line-delimited JSON protocol over stdin/stdout.
+
+One long-lived process serves a whole fleet. Each input line is a request::
+
+    {"id": 1, "op": "export", "path": "svc-a", "targets": ["cursor"], "flags": {"force": true}}
+
+and produces exactly one output line::
+
+    {"id": 1, "op": "export", "ok": true, "result": {...}}
+
+Operations are ``detect``, ``validate``, ``check``, ``import`` (``targets``
+holds the source IDE), ``export`` and ``convert`` (``targets`` holds source
+then target). Requests are pipelined: they run concurrently on a thread pool,
+but requests for the same project run in arrival order, and responses are
+always written in request order.
+"""
+
+import dataclasses
+import json
+import queue
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, Any
+
+from ideporter import api
+
+DEFAULT_WORKERS = 4
+_FLAGS = {"force", "dry_run", "include_diff", "update_manifest"}
+
+
+def handle_request(request: Any) -> dict[str, Any]:
+    """Execute one protocol request.
+
+    Args:
+        request: Decoded request object
+
+    Returns:
+        Response object (errors are reported, never raised)
+    """
+    if not isinstance(request, dict):
+        return {"id": None, "ok": False, "error": "Request must be a JSON object"}
+
+    response: dict[str, Any] = {"id": request.get("id"), "op": request.get("op")}
+    try:
+        ok, result = _dispatch(request)
+    except (KeyError, TypeError, ValueError) as e:
+        response.update(ok=False, error=str(e))
+        return response
+
+    response.update(ok=ok, result=to_jsonable(result))
+    return response
+
+
+def _dispatch(request: dict[str, Any]) -> tuple[bool, Any]:
+    """Run the API call a request names.
+
+    Args:
+        request: Request object
+
+    Returns:
+        Whether the operation succeeded, and its result
+
+    Raises:
+        ValueError: If the request is malformed or names an unknown adapter
+    """
+    op = request.get("op")
+    path = request.get("path")
+    if not isinstance(path, str):
+        raise ValueError("Request needs a 'path' string")
+    if not Path(path).exists():
+        raise ValueError(f"Path does not exist: {path}")
+
+    targets = request.get("targets") or []
+    if not isinstance(targets, list) or not all(isinstance(t, str) for t in targets):
+        raise ValueError("'targets' must be a list of adapter names")
+
+    flags = request.get("flags") or {}
+    if not isinstance(flags, dict) or set(flags) - _FLAGS:
+        raise ValueError(f"'flags' may only contain {', '.join(sorted(_FLAGS))}")
+    force = bool(flags.get("force", False))
+    dry_run = bool(flags.get("dry_run", False))
+
+    if op == "detect":
+        return True, api.detect(path)
+    if op == "validate":
+        validation = api.validate(path)
+        return validation.valid, validation
+    if op == "check":
+        report = api.check(
+            path, targets=targets or None, include_diff=bool(flags.get("include_diff", True))
+        )
+        return report["in_sync"], report
+    if op == "import":
+        if len(targets) != 1:
+            raise ValueError("'import' needs exactly one source in 'targets'")
+        update = bool(flags.get("update_manifest", True))
+        imported = api.import_(
+            path, targets[0], force=force, dry_run=dry_run, update_manifest=update
+        )
+        return imported.ok, imported
+    if op == "export":
+        if not targets:
+            raise ValueError("'export' needs at least one adapter in 'targets'")
+        update = bool(flags.get("update_manifest", True))
+        exported = api.export(path, targets, force=force, dry_run=dry_run, update_manifest=update)
+        return exported.ok, exported
+    if op == "convert":
+        if len(targets) != 2:
+            raise ValueError("'convert' needs [source, target] in 'targets'")
+        first, second = api.convert(path, targets[0], targets[1], force=force, dry_run=dry_run)
+        ok = first.ok and second is not None and second.ok
+        return ok, {"import": first, "export": second}
+    raise ValueError(f"Unknown op: {op}")
+
+
+def to_jsonable(value: Any) -> Any:
+    """Convert API results into JSON-serializable data.
+
+    Args:
+        value: Dataclasses, paths, mappings, sequences or primitives
+
+    Returns:
+        Equivalent structure of dicts, lists and primitives
+    """
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        data = {f.name: to_jsonable(getattr(value, f.name)) for f in dataclasses.fields(value)}
+        if hasattr(value, "ok"):
+            data["ok"] = value.ok
+        return data
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, dict):
+        return {str(key): to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, list | tuple):
+        return [to_jsonable(item) for item in value]
+    return value
+
+
+def serve(
+    stdin: IO[str],
+    stdout: IO[str],
+    workers: int = DEFAULT_WORKERS,
+    handler: Callable[[Any], dict[str, Any]] = handle_request,
+) -> int:
+    """Serve requests until stdin closes.
+
+    Args:
+        stdin: Stream of request lines
+        stdout: Stream for response lines
+        workers: Requests executed concurrently
+        handler: Request handler
+
+    Returns:
+        Number of requests served
+    """
+    pending: queue.Queue[Future[dict[str, Any]] | None] = queue.Queue()
+
+    def write_responses() -> None:
+        while (future := pending.get()) is not None:
+            stdout.write(json.dumps(future.result()) + "\n")
+            stdout.flush()
+
+    writer = threading.Thread(target=write_responses, name="ideporter-stdio-writer")
+    writer.start()
+
+    served = 0
+    last_for_path: dict[str, Future[dict[str, Any]]] = {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ideporter-stdio") as pool:
+        try:
+            for line in stdin:
+                if not line.strip():
+                    continue
+                served += 1
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError as e:
+                    done: Future[dict[str, Any]] = Future()
+                    done.set_result({"id": None, "ok": False, "error": f"Invalid JSON: {e}"})
+                    pending.put(done)
+                    continue
+
+                key = _project_key(request)
+                previous = last_for_path.get(key) if key else None
+                if previous is not None and previous.done():
+                    previous = None
+                future = pool.submit(_run_after, previous, handler, request)
+                if key:
+                    last_for_path[key] = future
+                pending.put(future)
+        finally:
+            pending.put(None)
+            writer.join()
+
+    return served
+
+
+def _run_after(
+    previous: Future[dict[str, Any]] | None,
+    handler: Callable[[Any], dict[str, Any]],
+    request: Any,
+) -> dict[str, Any]:
+    """Run a request once the previous request for its project has finished.
+
+    The previous request was submitted earlier to the same FIFO pool, so it is
+    already running or ahead in the queue and waiting on it cannot deadlock.
+
+    Args:
+        previous: Earlier request for the same project, if any
+        handler: Request handler
+        request: Decoded request
+
+    Returns:
+        Response object
+    """
+    if previous is not None:
+        previous.result()
+    try:
+        return handler(request)
+    except Exception as e:  # keep serving; one response per request
+        request_id = request.get("id") if isinstance(request, dict) else None
+        return {"id": request_id, "ok": False, "error": f"{type(e).__name__}: {e}"}
+
+
+def _project_key(request: Any) -> str | None:
+    """Identify the project a request touches, for per-project ordering.
+
+    Args:
+        request: Decoded request
+
+    Returns:
+        Resolved project path, or None if the request has no usable path
+    """
+    if isinstance(request, dict) and isinstance(request.get("path"), str):
+        return str(Path(request["path"]).resolve())
+    return None
@@ -0,0 +1,169 @@
+"""Deterministic sharding of fleet runs across CI runners.
+
+Each runner is started with the same project list and its own
+``--shard-index`` out of ``--shard-count``, and takes a stable subset without
+any coordination:
+
+- By default projects are assigned with rendezvous (highest random weight)
+  hashing of their path: every project ranks the shards by
+  ``sha256(key, shard)`` and goes to the top one. Shards stay balanced in
+  count. A project's shard only depends on its own path and the shard count,
+  so adding or removing repos never moves the others, and changing the shard
+  count moves only about ``1/count`` of them.
+- With ``by_size``, projects are weighted by the size of their canonical
+  files to balance wall-clock time. Projects are placed heaviest first on
+  their highest-ranked shard that stays within ``(1 + SLACK)`` of the mean
+  load (bounded-load consistent hashing). Assignments remain deterministic
+  and mostly stable, and a few heavy repos cannot pile up on one runner.
+
+Keys are paths relative to a root (the workspace root, or the current
+directory for ``batch``), so runners that check the fleet out in different
+places agree.
+"""
+
+import hashlib
+import os
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TypeVar
+
+from ideporter.pack import PACKED_FILES
+
+# Allowed overshoot of a shard's load over the mean in size-weighted mode
+SLACK = 0.25
+# Fixed cost per project (process, detection, manifest) in size-weighted mode
+BASE_WEIGHT = 4096
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Shard:
+    """One runner's slice of a fleet."""
+
+    index: int
+    count: int
+
+    def __post_init__(self) -> None:
+        """Check the shard is one of count.
+
+        Raises:
+            ValueError: If the index is outside 0..count-1
+        """
+        if self.count < 1:
+            raise ValueError(f"Shard count must be at least 1, got {self.count}")
+        if not 0 <= self.index < self.count:
+            raise ValueError(
+                f"Shard index must be between 0 and {self.count - 1}, got {self.index}"
+            )
+
+    def __str__(self) -> str:
+        return f"{self.index + 1}/{self.count}"
+
+
+def shard_key(path: Path, root: Path | None = None) -> str:
+    """Get the key a project is sharded by.
+
+    Args:
+        path: Project root
+        root: Directory keys are relative to (defaults to the current directory)
+
+    Returns:
+        POSIX path relative to root, or the absolute path if it lies outside
+    """
+    absolute = os.path.abspath(path)
+    base = os.path.abspath(root if root is not None else os.getcwd())
+    relative = os.path.relpath(absolute, base)
+    if relative == os.pardir or relative.startswith(os.pardir + os.sep):
+        return Path(absolute).as_posix()
+    return Path(relative).as_posix()
+
+
+def canonical_weight(project_path: Path) -> int:
+    """Estimate the work of exporting a project from its canonical file sizes.
+
+    Args:
+        project_path: Project root
+
+    Returns:
+        Total size of the canonical files in bytes, plus a fixed base cost
+    """
+    weight = BASE_WEIGHT
+    context_dir = project_path / "ai" / "context"
+    for name in PACKED_FILES:
+        try:
+            weight += os.stat(context_dir / name).st_size
+        except OSError:
+            pass
+    return weight
+
+
+def assign(keys: Sequence[str], count: int, weights: Sequence[float] | None = None) -> list[int]:
+    """Assign keys to shards.
+
+    Args:
+        keys: Project keys
+        count: Number of shards
+        weights: Relative cost per key for size-weighted assignment, or None
+
+    Returns:
+        Shard index for each key, in the order given
+    """
+    if count == 1:
+        return [0] * len(keys)
+    ranks = [_rank(key, count) for key in keys]
+    if weights is None:
+        return [order[0] for order in ranks]
+
+    capacity = (1 + SLACK) * sum(weights) / count
+    loads = [0.0] * count
+    shards = [0] * len(keys)
+    # Heaviest first, ties broken by key, so every runner places them identically
+    for i in sorted(range(len(keys)), key=lambda i: (-weights[i], keys[i])):
+        choice = next(
+            (shard for shard in ranks[i] if loads[shard] + weights[i] <= capacity),
+            min(range(count), key=lambda shard: (loads[shard], shard)),
+        )
+        loads[choice] += weights[i]
+        shards[i] = choice
+    return shards
+
+
+def select(
+    projects: Sequence[T],
+    shard: Shard,
+    key: Callable[[T], str],
+    weigh: Callable[[T], float] | None = None,
+) -> list[T]:
+    """Pick the projects that belong to one shard.
+
+    Args:
+        projects: The whole fleet, in any order
+        shard: This runner's shard
+        key: Function from project to its shard key
+        weigh: Function from project to its cost, for size-weighted assignment
+
+    Returns:
+        This shard's projects, in the order given
+    """
+    keys = [key(project) for project in projects]
+    weights = [weigh(project) for project in projects] if weigh is not None else None
+    shards = assign(keys, shard.count, weights)
+    return [
+        project for project, index in zip(projects, shards, strict=True) if index == shard.index
+    ]
+
+
+def _rank(key: str, count: int) -> list[int]:
+    """Order the shards by preference for a key (rendezvous hashing).
+
+    Args:
+        key: Project key
+        count: Number of shards
+
+    Returns:
+        Shard indices, most preferred first
+    """
+    scores = [hashlib.sha256(f"{key}\0{shard}".encode()).digest()[:8] for shard in range(count)]
+    return sorted(range(count), key=lambda shard: scores[shard], reverse=True)
@@ -0,0 +1,506 @@
+"""Fleet-wide similarity of canonical contexts with MinHash and LSH.
+
+Comparing every pair of ``rules.md`` files is quadratic, so ``analyze
+similarity`` estimates Jaccard similarity instead:
+
+- each document is reduced to its k-word shingles; words are hashed once per
+  run and shingle hashes are combined from them with NumPy, never as strings
+- a MinHash signature of ``num_perm`` values is the minimum of ``num_perm``
+  multiply-shift hashes ``(a * x + b) >> 32`` over the shingles, computed for
+  the shingles of a whole batch of documents and every permutation at once;
+  the share of equal values between two signatures estimates their Jaccard
+  similarity
+- identical signatures (copies of a template) are collapsed, then the
+  signatures are split into bands and rows sharing a band land in the same
+  bucket; only projects that share a bucket are compared
+- within a bucket a member joins every group whose leader it is similar to
+  (estimated Jaccard at or above the threshold), and groups linked in any
+  band are merged into clusters
+
+Every project also gets a drift score, ``1 - similarity`` to the org template
+when one is given, else to the representative of its cluster.
+
+NumPy is optional: ``pip install 'ide-context-porter[analysis]'``.
+"""
+
+import hashlib
+import math
+import re
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from ideporter import fsio
+from ideporter.canonical import CANONICAL_DIR
+
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import NDArray
+
+DEFAULT_FILES = ("rules.md", "context.md")
+DEFAULT_NUM_PERM = 128
+DEFAULT_SHINGLE_SIZE = 5
+DEFAULT_THRESHOLD = 0.8
+MAX_HASH = (1 << 32) - 1
+SHINGLE_MULTIPLIER = 0x01000193
+# Shingles permuted per pass, bounding the (num_perm x BATCH) working array
+BATCH = 16384
+
+_WORD = re.compile(r"\w+")
+
+
+class SimilarityError(Exception):
+    """Raised when a similarity analysis cannot run."""
+
+
+@dataclass
+class ClusterMember:
+    """A project in a cluster."""
+
+    path: str
+    similarity: float
+
+
+@dataclass
+class Cluster:
+    """Projects whose contexts are near-duplicates of each other."""
+
+    id: int
+    representative: str
+    members: list[ClusterMember] = field(default_factory=list)
+
+    @property
+    def size(self) -> int:
+        """Number of projects in the cluster."""
+        return len(self.members)
+
+
+@dataclass
+class SimilarityReport:
+    """Result of a similarity analysis."""
+
+    projects: int
+    threshold: float
+    num_perm: int
+    bands: int
+    rows: int
+    clusters: list[Cluster]
+    drift: dict[str, float]
+    cluster_of: dict[str, int]
+    empty: list[str]
+    template: str | None = None
+    elapsed_ms: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the report to JSON-serializable data.
+
+        Returns:
+            Report with clusters largest first and drift most drifted first
+        """
+        return {
+            "projects": self.projects,
+            "threshold": self.threshold,
+            "num_perm": self.num_perm,
+            "bands": self.bands,
+            "rows": self.rows,
+            "template": self.template,
+            "clusters": [
+                {
+                    "id": cluster.id,
+                    "size": cluster.size,
+                    "representative": cluster.representative,
+                    "members": [
+                        {"path": member.path, "similarity": member.similarity}
+                        for member in cluster.members
+                    ],
+                }
+                for cluster in self.clusters
+            ],
+            "drift": [
+                {"path": path, "cluster": self.cluster_of[path], "drift": drift}
+                for path, drift in sorted(self.drift.items(), key=lambda item: (-item[1], item[0]))
+            ],
+            "empty": self.empty,
+            "elapsed_ms": self.elapsed_ms,
+        }
+
+
+def shingle_hashes(
+    text: str, size: int = DEFAULT_SHINGLE_SIZE, words: dict[str, int] | None = None
+) -> "NDArray[np.uint64]":
+    """Hash a document's overlapping word shingles.
+
+    Case and whitespace are ignored, so reflowed or recased copies match.
+
+    Args:
+        text: Document
+        size: Words per shingle
+        words: Word hashes to reuse across documents (updated with new words)
+
+    Returns:
+        32-bit shingle hashes, possibly repeated; a document shorter than
+        ``size`` words is one shingle and one without words has none
+    """
+    numpy = _require_numpy()
+    tokens = _WORD.findall(text.lower())
+    if not tokens:
+        none: NDArray[np.uint64] = numpy.zeros(0, dtype=numpy.uint64)
+        return none
+    cache = {} if words is None else words
+    for token in set(tokens).difference(cache):
+        cache[token] = _hash32(token)
+    ids = numpy.fromiter(map(cache.__getitem__, tokens), dtype=numpy.uint64, count=len(tokens))
+
+    count = max(len(ids) - size + 1, 1)
+    hashes: NDArray[np.uint64] = numpy.zeros(count, dtype=numpy.uint64)
+    for offset in range(min(size, len(ids))):
+        # Both factors stay below 2**32, so the product cannot wrap
+        hashes = (hashes * SHINGLE_MULTIPLIER + ids[offset : offset + count]) & MAX_HASH
+    return hashes
+
+
+class MinHasher:
+    """Computes MinHash signatures for one set of permutations."""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, seed: int = 1):
+        """Draw the permutations.
+
+        Args:
+            num_perm: Signature length
+            seed: Seed for the permutations; signatures only compare under the same one
+
+        Raises:
+            SimilarityError: If NumPy is missing or num_perm is not positive
+        """
+        numpy = _require_numpy()
+        if num_perm < 1:
+            raise SimilarityError("num_perm must be at least 1")
+        generator = numpy.random.default_rng(seed)
+        bits = numpy.iinfo(numpy.uint64).max
+        self.a = generator.integers(0, bits, size=(num_perm, 1), dtype=numpy.uint64) | numpy.uint64(
+            1
+        )
+        self.b = generator.integers(0, bits, size=(num_perm, 1), dtype=numpy.uint64)
+        self.num_perm = num_perm
+
+    def signatures(self, documents: list["NDArray[np.uint64]"]) -> "NDArray[np.uint32]":
+        """Compute the signatures of many documents.
+
+        Args:
+            documents: Shingle hashes of each document (see shingle_hashes())
+
+        Returns:
+            One row of ``num_perm`` minimum hash values per document (all
+            ``MAX_HASH`` for a document without shingles)
+        """
+        numpy = _require_numpy()
+        signatures = numpy.full((len(documents), self.num_perm), MAX_HASH, dtype=numpy.uint64)
+        batch: list[int] = []
+        batched = 0
+        for index, hashes in enumerate(documents):
+            if len(hashes) >= BATCH:
+                for start in range(0, len(hashes), BATCH):
+                    chunk = self._permute(hashes[start : start + BATCH]).min(axis=1)
+                    numpy.minimum(signatures[index], chunk, out=signatures[index])
+            elif len(hashes):
+                batch.append(index)
+                batched += len(hashes)
+                if batched >= BATCH:
+                    self._fill(signatures, batch, documents)
+                    batch, batched = [], 0
+        if batch:
+            self._fill(signatures, batch, documents)
+        compact: NDArray[np.uint32] = signatures.astype(numpy.uint32)
+        return compact
+
+    def _fill(
+        self,
+        signatures: "NDArray[np.uint64]",
+        batch: list[int],
+        documents: list["NDArray[np.uint64]"],
+    ) -> None:
+        """Compute the signatures of a batch of documents in one pass.
+
+        Args:
+            signatures: Output rows
+            batch: Indexes of the documents in the batch (none without shingles)
+            documents: Shingle hashes of every document
+        """
+        numpy = _require_numpy()
+        lengths = [len(documents[index]) for index in batch]
+        offsets = numpy.cumsum([0, *lengths[:-1]])
+        permuted = self._permute(numpy.concatenate([documents[index] for index in batch]))
+        signatures[batch] = numpy.minimum.reduceat(permuted, offsets, axis=1).T
+
+    def _permute(self, hashes: "NDArray[np.uint64]") -> "NDArray[np.uint64]":
+        """Apply every permutation to some shingle hashes.
+
+        Args:
+            hashes: 32-bit shingle hashes
+
+        Returns:
+            ``(num_perm, len(hashes))`` permuted 32-bit values
+        """
+        numpy = _require_numpy()
+        # Multiply-shift hashing: the product wraps mod 2**64 and the high bits are kept
+        permuted: NDArray[np.uint64] = (self.a * hashes + self.b) >> numpy.uint64(32)
+        return permuted
+
+
+def lsh_params(num_perm: int, threshold: float) -> tuple[int, int]:
+    """Choose the LSH bands and rows for a similarity threshold.
+
+    Pairs at similarity ``s`` share a bucket with probability
+    ``1 - (1 - s**rows)**bands``, which rises steeply around
+    ``(1 / bands) ** (1 / rows)``. The longest band whose rise is still at or
+    below the threshold is chosen, so near-duplicates are rarely missed and
+    candidates are verified against their signatures afterwards.
+
+    Args:
+        num_perm: Signature length
+        threshold: Estimated Jaccard similarity that makes two projects similar
+
+    Returns:
+        Bands and rows per band, with ``bands * rows <= num_perm``
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+def cluster_signatures(
+    signatures: "NDArray[np.uint32]", threshold: float = DEFAULT_THRESHOLD
+) -> tuple["NDArray[np.intp]", int, int]:
+    """Group signatures into clusters of near-duplicates.
+
+    Args:
+        signatures: One signature per row
+        threshold: Estimated Jaccard similarity that links two rows
+
+    Returns:
+        Cluster label per row (labels are 0..n-1 in order of first row),
+        and the LSH bands and rows used
+    """
+    numpy = _require_numpy()
+    count, num_perm = signatures.shape
+    bands, rows = lsh_params(num_perm, threshold)
+    if count == 0:
+        return numpy.zeros(0, dtype=numpy.intp), bands, rows
+
+    # Copies of the same text are one point; only distinct signatures are compared
+    unique, inverse = numpy.unique(signatures, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    parent = list(range(len(unique)))
+    needed = math.ceil(threshold * num_perm - 1e-9)
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for band in range(bands):
+        keys = unique[:, band * rows : (band + 1) * rows]
+        _, buckets = numpy.unique(keys, axis=0, return_inverse=True)
+        buckets = buckets.reshape(-1)
+        order = numpy.argsort(buckets, kind="stable")
+        bounds = numpy.flatnonzero(numpy.diff(buckets[order])) + 1
+        for members in numpy.split(order, bounds):
+            if len(members) < 2:
+                continue
+            leaders = [int(members[0])]
+            for member in map(int, members[1:]):
+                # Groups already merged in an earlier band need no comparison
+                root = find(member)
+                others = [leader for leader in leaders if find(leader) != root]
+                if not others:
+                    continue
+                matches = (unique[others] == unique[member]).sum(axis=1) >= needed
+                linked = [leader for leader, hit in zip(others, matches, strict=True) if hit]
+                if not linked and len(others) == len(leaders):
+                    leaders.append(member)
+                for leader in linked:
+                    parent[find(leader)] = find(member)
+
+    roots = numpy.array([find(i) for i in range(len(unique))], dtype=numpy.intp)[inverse]
+    _, first, labels = numpy.unique(roots, return_index=True, return_inverse=True)
+    # Relabel so clusters are numbered in order of their first row
+    rank = numpy.empty(len(first), dtype=numpy.intp)
+    rank[numpy.argsort(first, kind="stable")] = numpy.arange(len(first))
+    return rank[labels.reshape(-1)], bands, rows
+
+
+def analyze_documents(
+    documents: Mapping[str, str],
+    template: str | None = None,
+    threshold: float = DEFAULT_THRESHOLD,
+    num_perm: int = DEFAULT_NUM_PERM,
+    shingle_size: int = DEFAULT_SHINGLE_SIZE,
+    seed: int = 1,
+) -> SimilarityReport:
+    """Cluster documents and score their drift.
+
+    Args:
+        documents: Document text by name (usually the project path)
+        template: Org template text to score drift against
+        threshold: Estimated Jaccard similarity that makes two documents similar
+        num_perm: MinHash signature length
+        shingle_size: Words per shingle
+        seed: Permutation seed
+
+    Returns:
+        Report with clusters of similar documents and per-document drift
+
+    Raises:
+        SimilarityError: If NumPy is missing or the parameters are invalid
+    """
+    start = time.perf_counter()
+    numpy = _require_numpy()
+    if not 0 < threshold <= 1:
+        raise SimilarityError("threshold must be between 0 and 1")
+    hasher = MinHasher(num_perm, seed)
+
+    words: dict[str, int] = {}
+    names: list[str] = []
+    empty: list[str] = []
+    hashed: list[NDArray[np.uint64]] = []
+    for name, text in documents.items():
+        hashes = shingle_hashes(text, shingle_size, words)
+        if len(hashes):
+            names.append(name)
+            hashed.append(hashes)
+        else:
+            empty.append(name)
+    signatures = hasher.signatures(hashed)
+
+    labels, bands, rows = cluster_signatures(signatures, threshold)
+    clusters = []
+    cluster_of: dict[str, int] = {}
+    reference = numpy.empty_like(signatures)
+    order = numpy.argsort(labels, kind="stable")
+    for indices in numpy.split(order, numpy.flatnonzero(numpy.diff(labels[order])) + 1):
+        if not len(indices):
+            continue
+        label = int(labels[indices[0]])
+        # The most copied version stands for the cluster
+        if len(indices) == 1:
+            representative = signatures[indices[0]]
+        else:
+            versions, counts = numpy.unique(signatures[indices], axis=0, return_counts=True)
+            representative = versions[int(numpy.argmax(counts))]
+        similarity = (signatures[indices] == representative).mean(axis=1)
+        reference[indices] = representative
+        cluster = Cluster(
+            id=label,
+            representative=names[int(indices[int(numpy.argmax(similarity))])],
+            members=[
+                ClusterMember(names[i], round(float(s), 4))
+                for i, s in zip(indices, similarity, strict=True)
+            ],
+        )
+        cluster.members.sort(key=lambda member: (-member.similarity, member.path))
+        clusters.append(cluster)
+        cluster_of.update(dict.fromkeys((names[i] for i in indices), label))
+
+    if template is not None:
+        hashes = shingle_hashes(template, shingle_size, words)
+        if not len(hashes):
+            raise SimilarityError("Template has no text to compare")
+        reference[:] = hasher.signatures([hashes])[0]
+    drift = 1 - (signatures == reference).mean(axis=1)
+
+    clusters.sort(key=lambda cluster: (-cluster.size, cluster.id))
+    return SimilarityReport(
+        projects=len(documents),
+        threshold=threshold,
+        num_perm=num_perm,
+        bands=bands,
+        rows=rows,
+        clusters=clusters,
+        drift={name: round(float(d), 4) for name, d in zip(names, drift, strict=True)},
+        cluster_of=cluster_of,
+        empty=sorted(empty),
+        elapsed_ms=round((time.perf_counter() - start) * 1000, 2),
+    )
+
+
+def read_documents(
+    project_paths: list[Path], files: tuple[str, ...] = DEFAULT_FILES, workers: int = 16
+) -> dict[str, str]:
+    """Read the canonical files to compare from many projects.
+
+    Args:
+        project_paths: Project roots
+        files: Canonical files to concatenate per project
+        workers: Concurrent readers (helps on network filesystems)
+
+    Returns:
+        Document text by project path; projects without any of the files map to ""
+    """
+
+    def read(project_path: Path) -> str:
+        parts = (fsio.read_text(project_path / CANONICAL_DIR / name) for name in files)
+        return "\n\n".join(part for part in parts if part)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        texts = executor.map(read, project_paths)
+        return {str(path): text for path, text in zip(project_paths, texts, strict=True)}
+
+
+def read_template(path: Path, files: tuple[str, ...] = DEFAULT_FILES) -> str:
+    """Read an org template: a file, or a project whose canonical files are the template.
+
+    Args:
+        path: Template file or project directory
+        files: Canonical files to concatenate for a project
+
+    Returns:
+        Template text
+
+    Raises:
+        SimilarityError: If the template cannot be read
+    """
+    if path.is_dir():
+        text = read_documents([path], files, workers=1)[str(path)]
+    else:
+        text = fsio.read_text(path) or ""
+    if not text:
+        raise SimilarityError(f"Template not found or empty: {path}")
+    return text
+
+
+def _hash32(token: str) -> int:
+    """Hash a shingle to 32 bits.
+
+    Args:
+        token: Shingle
+
+    Returns:
+        Stable hash value
+    """
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest(), "little")
+
+
+def _require_numpy() -> Any:
+    """Import the optional numpy module.
+
+    Returns:
+        The numpy module
+
+    Raises:
+        SimilarityError: If numpy is not installed
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise SimilarityError(
+            "Similarity analysis requires the 'numpy' package "
+            "(pip install 'ide-context-porter[analysis]')"
+        ) from None
+    return numpy
@@ -0,0 +1,152 @@
+"""Read-only file sources for canonical and project files.
+
+Adapters and the canonical context read from the working tree by default. A
+source lets them read the same relative paths from somewhere else (a git ref,
+an archive, an in-memory mapping) without touching the filesystem.
+"""
+
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Protocol
+
+from ideporter import fsio
+from ideporter.utils import content_hash
+
+
+class FileSource(Protocol):
+    """Read-only view of a project tree addressed by POSIX relative paths."""
+
+    def read_text(self, relpath: str) -> str | None:
+        """Read a file as text.
+
+        Args:
+            relpath: POSIX path relative to the project root
+
+        Returns:
+            File contents, or None if the file does not exist
+        """
+        ...
+
+    def exists(self, relpath: str) -> bool:
+        """Check whether a file or directory exists.
+
+        Args:
+            relpath: POSIX path relative to the project root
+
+        Returns:
+            True if the path exists
+        """
+        ...
+
+
+class MappingSource:
+    """File source backed by an in-memory mapping of relative path to content."""
+
+    def __init__(self, files: Mapping[str, str]):
+        """Initialize the source.
+
+        Args:
+            files: Mapping of POSIX relative path to file content
+        """
+        self.files = dict(files)
+
+    def read_text(self, relpath: str) -> str | None:
+        """Read a file as text."""
+        return self.files.get(relpath)
+
+    def exists(self, relpath: str) -> bool:
+        """Check whether a file or directory exists."""
+        if relpath in self.files:
+            return True
+        prefix = relpath.rstrip("/") + "/"
+        return any(path.startswith(prefix) for path in self.files)
+
+
+class OverlaySource:
+    """File source serving some paths from memory and the rest from below.
+
+    Reads fall through to ``fallback`` when given, otherwise to files under
+    ``project_path``.
+    """
+
+    def __init__(
+        self, overlay: Mapping[str, str], project_path: Path, fallback: FileSource | None = None
+    ):
+        """Initialize the source.
+
+        Args:
+            overlay: Mapping of POSIX relative path to content that takes precedence
+            project_path: Path to the project root
+            fallback: Source for paths not in the overlay
+        """
+        self.overlay = dict(overlay)
+        self.project_path = project_path
+        self.fallback = fallback
+
+    def read_text(self, relpath: str) -> str | None:
+        """Read a file as text."""
+        if relpath in self.overlay:
+            return self.overlay[relpath]
+        if self.fallback is not None:
+            return self.fallback.read_text(relpath)
+        try:
+            return (self.project_path / relpath).read_text(encoding="utf-8")
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+    def exists(self, relpath: str) -> bool:
+        """Check whether a file or directory exists."""
+        if relpath in self.overlay:
+            return True
+        if self.fallback is not None:
+            return self.fallback.exists(relpath)
+        return (self.project_path / relpath).exists()
+
+
+class RecordingSource:
+    """File source that remembers every file read through it.
+
+    Reads go to ``fallback`` when given, otherwise to files under
+    ``project_path``, and each path is read at most once.
+    """
+
+    def __init__(self, project_path: Path, fallback: FileSource | None = None):
+        """Initialize the source.
+
+        Args:
+            project_path: Path to the project root
+            fallback: Source to read through instead of the disk
+        """
+        self.project_path = project_path
+        self.fallback = fallback
+        self.reads: dict[str, str | None] = {}
+        self.probes: dict[str, bool] = {}
+
+    def read_text(self, relpath: str) -> str | None:
+        """Read a file as text."""
+        if relpath not in self.reads:
+            if self.fallback is not None:
+                self.reads[relpath] = self.fallback.read_text(relpath)
+            else:
+                self.reads[relpath] = fsio.read_text(self.project_path / relpath)
+        return self.reads[relpath]
+
+    def fingerprints(self) -> dict[str, str | None]:
+        """Hash every file read so far.
+
+        Returns:
+            Content hash per relative path, None for files that did not exist
+        """
+        return {
+            relpath: None if content is None else content_hash(content)
+            for relpath, content in self.reads.items()
+        }
+
+    def exists(self, relpath: str) -> bool:
+        """Check whether a file or directory exists."""
+        if relpath not in self.probes:
+            if self.fallback is not None:
+                self.probes[relpath] = self.fallback.exists(relpath)
+            else:
+                self.probes[relpath] = fsio.exists(self.project_path / relpath)
+        return self.probes[relpath]
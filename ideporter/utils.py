@@ -1,6 +1,8 @@
 """Utility functions for IDE Context Porter."""
 
+import hashlib
 import json
+import os
 import shutil
 from datetime import datetime
 from pathlib import Path
@@ -9,9 +11,53 @@ from typing import Any
 import yaml
 from rich.console import Console
 
+from ideporter import fsio
+from ideporter.profiling import PROFILER, profiled
+
 console = Console()
 
 
+@profiled("utils.create_backup")
+def backup_file(file_path: Path, durable: bool = False) -> Path | None:
+    """Copy a file to a timestamped backup without printing.
+
+    Backups are created exclusively, so two jobs backing up the same file in
+    the same second get distinct names (``.1.bak``, ``.2.bak``, ...) instead
+    of overwriting each other's.
+
+    Args:
+        file_path: Path to the file to backup
+        durable: Flush the backup to disk before returning
+
+    Returns:
+        Path to the backup file, or None if the file does not exist
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    try:
+        source = file_path.open("rb")
+    except FileNotFoundError:
+        return None
+
+    with source:
+        attempt = 0
+        while True:
+            tag = timestamp if attempt == 0 else f"{timestamp}.{attempt}"
+            backup_path = file_path.with_suffix(f"{file_path.suffix}.{tag}.bak")
+            try:
+                backup = backup_path.open("xb")
+                break
+            except FileExistsError:
+                attempt += 1
+        with backup:
+            shutil.copyfileobj(source, backup)
+            if durable:
+                backup.flush()
+                os.fsync(backup.fileno())
+    shutil.copystat(file_path, backup_path)
+    fsio.forget(backup_path)
+    return backup_path
+
+
 def create_backup(file_path: Path) -> Path:
     """Create a timestamped backup of a file.
 
@@ -21,16 +67,89 @@ def create_backup(file_path: Path) -> Path:
     Returns:
         Path to the backup file
     """
-    if not file_path.exists():
+    backup_path = backup_file(file_path)
+    if backup_path is None:
         return file_path
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_path = file_path.with_suffix(f"{file_path.suffix}.{timestamp}.bak")
-    shutil.copy2(file_path, backup_path)
     console.print(f"[dim]Created backup: {backup_path}[/dim]")
     return backup_path
 
 
+@profiled("utils.write_file")
+def write_file(
+    file_path: Path, content: str, force: bool = False, durable: bool = False
+) -> Path | None:
+    """Write content to a file with backup support, without printing.
+
+    Args:
+        file_path: Path to write to
+        content: Content to write
+        force: Skip backup creation if True
+        durable: fsync the file, its backup and their directory before returning
+
+    Returns:
+        Path of the backup that was created, if any
+    """
+    # One lstat answers "does it exist" and "is it a link"
+    st = fsio.lstat(file_path)
+
+    # Create backup if file exists and force is not set
+    backup_path = None if force or st is None else backup_file(file_path, durable=durable)
+
+    # Replace links instead of writing through them into the canonical files
+    if fsio.is_link(st):
+        file_path.unlink()
+
+    # Write the file, creating parent directories only if they are missing
+    try:
+        _write_text(file_path, content, durable)
+    except FileNotFoundError:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        _write_text(file_path, content, durable)
+    if durable:
+        # New names (the file, its backup) are only durable once the directory is
+        fsync_directory(file_path.parent)
+    fsio.forget(file_path)
+    PROFILER.count("bytes_written", len(content))
+    return backup_path
+
+
+def _write_text(file_path: Path, content: str, durable: bool) -> None:
+    """Write text to a file, optionally flushing it to disk.
+
+    Args:
+        file_path: Path to write to
+        content: Content to write
+        durable: fsync the file before returning
+    """
+    if not durable:
+        file_path.write_text(content, encoding="utf-8")
+        return
+    with file_path.open("w", encoding="utf-8") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def fsync_directory(directory: Path) -> None:
+    """Flush a directory's entries to disk.
+
+    Platforms that cannot open directories (Windows) are skipped.
+
+    Args:
+        directory: Directory to flush
+    """
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@profiled("utils.safe_write")
 def safe_write(file_path: Path, content: str, force: bool = False, dry_run: bool = False) -> None:
     """Safely write content to a file with backup and dry-run support.
 
@@ -46,18 +165,13 @@ def safe_write(file_path: Path, content: str, force: bool = False, dry_run: bool
         console.print(f"[dim]{content[:200]}...[/dim]")
         return
 
-    # Create parent directories if needed
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-
-    # Create backup if file exists and force is not set
-    if file_path.exists() and not force:
-        create_backup(file_path)
-
-    # Write the file
-    file_path.write_text(content, encoding="utf-8")
+    backup_path = write_file(file_path, content, force=force)
+    if backup_path is not None:
+        console.print(f"[dim]Created backup: {backup_path}[/dim]")
     console.print(f"[green]✓[/green] Wrote {file_path}")
 
 
+@profiled("utils.safe_read")
 def safe_read(file_path: Path) -> str:
     """Safely read a file with error handling.
 
@@ -70,12 +184,13 @@ def safe_read(file_path: Path) -> str:
     Raises:
         FileNotFoundError: If file doesn't exist
     """
-    if not file_path.exists():
+    content = fsio.read_text(file_path)
+    if content is None:
         raise FileNotFoundError(f"File not found: {file_path}")
-
-    return file_path.read_text(encoding="utf-8")
+    return content
 
 
+@profiled("utils.load_yaml")
 def load_yaml(file_path: Path) -> dict[str, Any]:
     """Load and parse a YAML file.
 
@@ -89,6 +204,19 @@ def load_yaml(file_path: Path) -> dict[str, Any]:
     return yaml.safe_load(content) or {}
 
 
+def dump_yaml(data: dict[str, Any]) -> str:
+    """Serialize data to YAML exactly as save_yaml writes it.
+
+    Args:
+        data: Data to serialize
+
+    Returns:
+        YAML document as string
+    """
+    return yaml.safe_dump(data, default_flow_style=False, sort_keys=False)
+
+
+@profiled("utils.save_yaml")
 def save_yaml(
     file_path: Path, data: dict[str, Any], force: bool = False, dry_run: bool = False
 ) -> None:
@@ -100,7 +228,7 @@ def save_yaml(
         force: Skip backup creation if True
         dry_run: Only preview the operation if True
     """
-    content = yaml.safe_dump(data, default_flow_style=False, sort_keys=False)
+    content = dump_yaml(data)
     safe_write(file_path, content, force=force, dry_run=dry_run)
 
 
@@ -118,6 +246,18 @@ def load_json(file_path: Path) -> dict[str, Any]:
     return result
 
 
+def dump_json(data: dict[str, Any]) -> str:
+    """Serialize data to JSON exactly as save_json writes it.
+
+    Args:
+        data: Data to serialize
+
+    Returns:
+        JSON document as string
+    """
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
 def save_json(
     file_path: Path, data: dict[str, Any], force: bool = False, dry_run: bool = False
 ) -> None:
@@ -129,10 +269,24 @@ def save_json(
         force: Skip backup creation if True
         dry_run: Only preview the operation if True
     """
-    content = json.dumps(data, indent=2, ensure_ascii=False)
+    content = dump_json(data)
     safe_write(file_path, content, force=force, dry_run=dry_run)
 
 
+def content_hash(content: str | bytes) -> str:
+    """Compute a stable content hash.
+
+    Args:
+        content: Text (encoded as UTF-8) or raw bytes
+
+    Returns:
+        Hex-encoded SHA-256 digest
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
 def is_ignored_path(path: Path) -> bool:
     """Check if a path should be ignored for security/safety.
 
@@ -176,8 +330,9 @@ def ensure_directory(path: Path, dry_run: bool = False) -> None:
         dry_run: Only preview the operation if True
     """
     if dry_run:
-        if not path.exists():
+        if not fsio.exists(path):
             console.print(f"[yellow]DRY RUN:[/yellow] Would create directory {path}")
         return
 
     path.mkdir(parents=True, exist_ok=True)
+    fsio.forget(path)
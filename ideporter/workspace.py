@@ -0,0 +1,599 @@
+"""Workspaces: many projects synced from one checked-in manifest.
+
+An ``ideporter.workspace.yaml`` lists project roots, relative to the file and
+optionally as globs, with the adapters each should be exported to::
+
+    targets: [cursor, vscode]        # default for entries without targets
+    projects:
+      - services/*                   # every matching directory with ai/context
+      - path: apps/web
+        targets: [all]
+    exclude:
+      - services/legacy
+    concurrency:
+      render_workers: 4              # threads rendering adapter outputs
+      io_workers: 16                 # concurrent file operations per filesystem
+
+``sync_workspace`` expands the project list once, renders every project on
+the render pool and runs reads and writes through an ``IOScheduler``, so the
+two kinds of work are sized independently. The expansion is cached in
+``.ideporter/workspace-cache.json`` next to the workspace file, together with
+the modification times of every directory it globbed over and which matches
+held a canonical context; the cache is reused until the workspace file
+or the set of registered adapters changes, a globbed directory gains or loses
+entries, or a match gains or loses its ``ai/context``.
+"""
+
+import asyncio
+import fnmatch
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from ideporter.adapters import available_adapters, get_adapter
+from ideporter.async_engine import DEFAULT_PER_DEVICE, IOScheduler
+from ideporter.canonical import CanonicalContext
+from ideporter.layers import LayerError
+from ideporter.locking import LockTimeoutError
+from ideporter.plan import Operation, PlanError, apply_plan, write_operations
+from ideporter.rendercache import CacheStats, RenderCache
+from ideporter.sharding import Shard, canonical_weight, select, shard_key
+from ideporter.utils import content_hash
+
+WORKSPACE_FILE = "ideporter.workspace.yaml"
+CACHE_FILE = Path(".ideporter") / "workspace-cache.json"
+CACHE_VERSION = 1
+DEFAULT_RENDER_WORKERS = min(8, os.cpu_count() or 1)
+
+
+class WorkspaceError(Exception):
+    """Raised when a workspace file is missing or malformed."""
+
+
+@dataclass
+class ProjectEntry:
+    """One project of a workspace."""
+
+    path: Path
+    targets: list[str]
+
+
+@dataclass
+class Workspace:
+    """A parsed workspace file."""
+
+    root: Path
+    entries: list[dict[str, Any]]
+    exclude: list[str] = field(default_factory=list)
+    render_workers: int = DEFAULT_RENDER_WORKERS
+    io_workers: int = DEFAULT_PER_DEVICE
+    fingerprint: str = ""
+
+
+@dataclass
+class ProjectSync:
+    """Outcome and timing of syncing one project."""
+
+    path: Path
+    targets: list[str]
+    written: int = 0
+    unchanged: int = 0
+    render_s: float = 0.0
+    write_s: float = 0.0
+    total_s: float = 0.0
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the project synced without errors."""
+        return self.error is None
+
+
+@dataclass
+class WorkspaceSync:
+    """Outcome of syncing a workspace."""
+
+    projects: list[ProjectSync] = field(default_factory=list)
+    discovered: int = 0
+    cached_discovery: bool = False
+    discovery_s: float = 0.0
+    total_s: float = 0.0
+    cache: CacheStats | None = None
+
+    @property
+    def failed(self) -> list[ProjectSync]:
+        """Projects that failed to sync."""
+        return [project for project in self.projects if not project.ok]
+
+
+def load_workspace(workspace_file: Path) -> Workspace:
+    """Parse a workspace file.
+
+    Args:
+        workspace_file: Path to ideporter.workspace.yaml
+
+    Returns:
+        Parsed workspace
+
+    Raises:
+        WorkspaceError: If the file is missing or malformed
+    """
+    try:
+        raw = workspace_file.read_text(encoding="utf-8")
+        data = yaml.safe_load(raw) or {}
+    except FileNotFoundError:
+        raise WorkspaceError(f"Workspace file not found: {workspace_file}") from None
+    except yaml.YAMLError as e:
+        raise WorkspaceError(f"Invalid workspace file {workspace_file}: {e}") from None
+    if not isinstance(data, dict):
+        raise WorkspaceError(f"Workspace file {workspace_file} must be a mapping")
+
+    default_targets = _targets(data.get("targets", ["all"]), workspace_file)
+    entries: list[dict[str, Any]] = []
+    for item in data.get("projects") or []:
+        if isinstance(item, str):
+            item = {"path": item}
+        if not isinstance(item, dict) or not isinstance(item.get("path"), str):
+            raise WorkspaceError(f"Each project in {workspace_file} needs a 'path' string")
+        targets = item.get("targets")
+        entries.append(
+            {
+                "path": item["path"],
+                "targets": (
+                    default_targets if targets is None else _targets(targets, workspace_file)
+                ),
+            }
+        )
+    if not entries:
+        raise WorkspaceError(f"Workspace file {workspace_file} lists no projects")
+
+    concurrency = data.get("concurrency") or {}
+    try:
+        render_workers = int(concurrency.get("render_workers", DEFAULT_RENDER_WORKERS))
+        io_workers = int(concurrency.get("io_workers", DEFAULT_PER_DEVICE))
+    except (AttributeError, TypeError, ValueError):
+        raise WorkspaceError(f"Invalid concurrency settings in {workspace_file}") from None
+    if render_workers < 1 or io_workers < 1:
+        raise WorkspaceError(f"Worker counts in {workspace_file} must be at least 1")
+
+    return Workspace(
+        root=workspace_file.parent.resolve(),
+        entries=entries,
+        exclude=[str(pattern) for pattern in data.get("exclude") or []],
+        render_workers=render_workers,
+        io_workers=io_workers,
+        # Expanded targets depend on the adapters registered, so a cache built
+        # before a spec adapter was added or removed is not reused
+        fingerprint=content_hash(raw + "\0" + "\0".join(available_adapters())),
+    )
+
+
+def discover_projects(
+    workspace: Workspace, use_cache: bool = True
+) -> tuple[list[ProjectEntry], bool]:
+    """Expand a workspace's project list, reusing the cached expansion if still valid.
+
+    Glob entries match directories that hold a canonical context; plain
+    entries are taken as given. A project listed more than once keeps the
+    targets of its first entry.
+
+    Args:
+        workspace: Parsed workspace
+        use_cache: Read and write the discovery cache
+
+    Returns:
+        Projects in workspace order, and whether they came from the cache
+    """
+    cache_file = workspace.root / CACHE_FILE
+    if use_cache:
+        cached = _read_cache(cache_file, workspace.fingerprint)
+        if cached is not None:
+            return cached, True
+
+    scanned: dict[str, int | None] = {}
+    candidates: dict[str, bool] = {}
+    projects: list[ProjectEntry] = []
+    seen: set[Path] = set()
+    for entry in workspace.entries:
+        for path in _expand(workspace.root, entry["path"], scanned, candidates):
+            relative = Path(os.path.relpath(path, workspace.root)).as_posix()
+            if path in seen or any(fnmatch.fnmatch(relative, p) for p in workspace.exclude):
+                continue
+            seen.add(path)
+            projects.append(ProjectEntry(path=path, targets=entry["targets"]))
+
+    if use_cache:
+        _write_cache(cache_file, workspace.fingerprint, projects, scanned, candidates)
+    return projects, False
+
+
+def sync_workspace(
+    workspace_file: Path,
+    force: bool = False,
+    dry_run: bool = False,
+    use_cache: bool = True,
+    render_workers: int | None = None,
+    io_workers: int | None = None,
+    render_cache: RenderCache | None = None,
+    shard: Shard | None = None,
+    shard_by_size: bool = False,
+) -> WorkspaceSync:
+    """Export every project of a workspace to its targets.
+
+    Args:
+        workspace_file: Path to ideporter.workspace.yaml
+        force: Skip backups if True
+        dry_run: Count what would be written without writing
+        use_cache: Reuse and update the discovery cache
+        render_workers: Override the workspace's render pool size
+        io_workers: Override the workspace's per-filesystem I/O limit
+        render_cache: Reuse renders of identical inputs from this cache
+        shard: Sync only this shard's projects, keyed by path relative to the workspace
+        shard_by_size: Balance shards by canonical file sizes instead of project count
+
+    Returns:
+        Per-project outcomes and timings, in workspace order
+
+    Raises:
+        WorkspaceError: If the workspace file is missing or malformed
+    """
+    start = time.perf_counter()
+    workspace = load_workspace(workspace_file)
+    projects, cached = discover_projects(workspace, use_cache=use_cache)
+    discovered = len(projects)
+    if shard is not None:
+        projects = select(
+            projects,
+            shard,
+            key=lambda entry: shard_key(entry.path, workspace.root),
+            weigh=(lambda entry: canonical_weight(entry.path)) if shard_by_size else None,
+        )
+    discovery_s = time.perf_counter() - start
+
+    results = asyncio.run(
+        _sync_projects(
+            projects,
+            render_workers or workspace.render_workers,
+            io_workers or workspace.io_workers,
+            force,
+            dry_run,
+            render_cache,
+        )
+    )
+    if render_cache is not None:
+        render_cache.prune()
+    return WorkspaceSync(
+        projects=results,
+        discovered=discovered,
+        cached_discovery=cached,
+        discovery_s=discovery_s,
+        total_s=time.perf_counter() - start,
+        cache=render_cache.stats if render_cache is not None else None,
+    )
+
+
+async def _sync_projects(
+    projects: list[ProjectEntry],
+    render_workers: int,
+    io_workers: int,
+    force: bool,
+    dry_run: bool,
+    render_cache: RenderCache | None = None,
+) -> list[ProjectSync]:
+    """Sync projects concurrently on a render pool and an I/O scheduler.
+
+    Args:
+        projects: Projects to sync
+        render_workers: Render pool size
+        io_workers: Concurrent file operations per filesystem
+        force: Skip backups if True
+        dry_run: Count what would be written without writing
+        render_cache: Reuse renders of identical inputs from this cache
+
+    Returns:
+        Results in the order given
+    """
+    with ThreadPoolExecutor(render_workers, thread_name_prefix="ideporter-render") as render_pool:
+        async with IOScheduler(per_device=io_workers) as scheduler:
+            results = await asyncio.gather(
+                *(
+                    _sync_project(project, render_pool, scheduler, force, dry_run, render_cache)
+                    for project in projects
+                )
+            )
+    return list(results)
+
+
+async def _sync_project(
+    project: ProjectEntry,
+    render_pool: ThreadPoolExecutor,
+    scheduler: IOScheduler,
+    force: bool,
+    dry_run: bool,
+    render_cache: RenderCache | None = None,
+) -> ProjectSync:
+    """Render one project on the render pool and write its changed files.
+
+    Args:
+        project: Project to sync
+        render_pool: Pool for CanonicalContext and adapter rendering
+        scheduler: Scheduler for file writes
+        force: Skip backups if True
+        dry_run: Count what would be written without writing
+        render_cache: Reuse renders of identical inputs from this cache
+
+    Returns:
+        Result for the project (errors are reported, not raised)
+    """
+    start = time.perf_counter()
+    result = ProjectSync(path=project.path, targets=project.targets)
+    loop = asyncio.get_running_loop()
+    canonical = CanonicalContext(project.path)
+
+    try:
+        operations = await loop.run_in_executor(
+            render_pool, _render, canonical, project.targets, render_cache
+        )
+        result.render_s = time.perf_counter() - start
+
+        write_start = time.perf_counter()
+        # One writer per scheduler slot, so io_workers bounds the files in flight
+        applied = await scheduler.run(
+            project.path,
+            apply_plan,
+            operations,
+            force=force,
+            dry_run=dry_run,
+            workers=1,
+            report=False,
+        )
+        result.written = sum(operation.changed for operation in applied)
+        result.unchanged = len(applied) - result.written
+
+        if not dry_run and result.written:
+            # Takes the exclusive lock itself, after the shared render lock is released
+            await scheduler.run(
+                canonical.context_dir / "manifest.yaml",
+                canonical.update_manifest,
+                project.targets,
+                force=force,
+                report=False,
+            )
+        result.write_s = time.perf_counter() - write_start
+    except (OSError, ValueError, LayerError, LockTimeoutError, PlanError, yaml.YAMLError) as e:
+        result.error = f"{type(e).__name__}: {e}"
+
+    result.total_s = time.perf_counter() - start
+    return result
+
+
+def _render(
+    canonical: CanonicalContext, targets: list[str], render_cache: RenderCache | None = None
+) -> list[Operation]:
+    """Plan the export of every target of a project under its shared lock.
+
+    Args:
+        canonical: Project's canonical context
+        targets: Adapter names
+        render_cache: Reuse renders of identical inputs from this cache
+
+    Returns:
+        Write operations for every rendered file
+
+    Raises:
+        ValueError: If the canonical context is missing or invalid
+        LockTimeoutError: If a writer holds the project for too long
+    """
+    # Like the export command: other readers may render at the same time, writers wait
+    with canonical.locked():
+        return _plan_targets(canonical, targets, render_cache)
+
+
+def _plan_targets(
+    canonical: CanonicalContext, targets: list[str], render_cache: RenderCache | None
+) -> list[Operation]:
+    """Render every target of a project while the caller holds its lock.
+
+    Args:
+        canonical: Project's canonical context
+        targets: Adapter names
+        render_cache: Reuse renders of identical inputs from this cache
+
+    Returns:
+        Write operations for every rendered file
+
+    Raises:
+        ValueError: If the canonical context is missing or invalid, or a target is unknown
+    """
+    if not canonical.exists():
+        raise ValueError(f"Canonical context not found at {canonical.context_dir}")
+    validation = canonical.validate()
+    if not validation["valid"]:
+        raise ValueError("Canonical context validation failed: " + "; ".join(validation["issues"]))
+
+    source = canonical.file_source()
+    operations: list[Operation] = []
+    for target in targets:
+        adapter = get_adapter(target)(canonical.base_path, source=source)
+        try:
+            if render_cache is not None:
+                outputs = render_cache.render_export(adapter, canonical.context_dir)
+            else:
+                outputs = adapter.render_export(canonical.context_dir)
+        except NotImplementedError:
+            continue
+        operations.extend(write_operations(outputs, adapter=adapter.name))
+    return operations
+
+
+def _targets(value: Any, workspace_file: Path) -> list[str]:
+    """Validate and expand a targets list.
+
+    Args:
+        value: Targets from the workspace file
+        workspace_file: File being parsed, for error messages
+
+    Returns:
+        Adapter names ("all" expanded)
+
+    Raises:
+        WorkspaceError: If the value is not a list of known adapter names
+    """
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list) or not value:
+        raise WorkspaceError(f"'targets' in {workspace_file} must be a list of adapter names")
+
+    names: list[str] = []
+    for target in map(str, value):
+        if target == "all":
+            expanded = list(available_adapters())
+        else:
+            try:
+                get_adapter(target)
+            except ValueError as e:
+                raise WorkspaceError(f"{workspace_file}: {e}") from None
+            expanded = [target]
+        names.extend(name for name in expanded if name not in names)
+    return names
+
+
+def _expand(
+    root: Path, pattern: str, scanned: dict[str, int | None], candidates: dict[str, bool]
+) -> list[Path]:
+    """Expand one project pattern, recording the directories it depends on.
+
+    Args:
+        root: Workspace root
+        pattern: Project path or glob, relative to the root
+        scanned: Updated with globbed directory -> mtime_ns (None if missing)
+        candidates: Updated with matched directory -> whether it has ai/context
+
+    Returns:
+        Matching project directories, sorted
+    """
+    if not any(char in pattern for char in "*?["):
+        return [(root / pattern).resolve()]
+
+    matches: list[Path] = []
+    for path in sorted(root.glob(pattern)):
+        if not path.is_dir():
+            continue
+        has_context = (path / "ai" / "context").is_dir()
+        candidates[str(path)] = has_context
+        if has_context:
+            matches.append(path.resolve())
+
+    # The directories globbed over; new or removed entries change their mtime
+    for directory in _globbed_dirs(root, pattern):
+        _record(directory, scanned)
+    return matches
+
+
+def _globbed_dirs(root: Path, pattern: str) -> list[Path]:
+    """List the directories whose listing a glob depends on.
+
+    Args:
+        root: Workspace root
+        pattern: Glob relative to the root
+
+    Returns:
+        Directories that are listed while expanding the pattern
+    """
+    parts = Path(pattern).parts
+    wildcard = next(i for i, part in enumerate(parts) if any(c in part for c in "*?["))
+    base = root.joinpath(*parts[:wildcard])
+    if "**" in parts:
+        return [base, *(path for path in base.glob("**/*") if path.is_dir())]
+
+    dirs = [base]
+    # Parent directories of every intermediate component match
+    for depth in range(1, len(parts) - wildcard):
+        sub = "/".join(parts[wildcard : wildcard + depth])
+        dirs.extend(path for path in base.glob(sub) if path.is_dir())
+    return dirs
+
+
+def _record(directory: Path, scanned: dict[str, int | None]) -> None:
+    """Record a directory's modification time.
+
+    Args:
+        directory: Directory to record
+        scanned: Mapping to update
+    """
+    try:
+        scanned[str(directory)] = os.stat(directory).st_mtime_ns
+    except OSError:
+        scanned[str(directory)] = None
+
+
+def _read_cache(cache_file: Path, fingerprint: str) -> list[ProjectEntry] | None:
+    """Load cached discovery results if they are still valid.
+
+    Args:
+        cache_file: Cache file
+        fingerprint: Hash of the current workspace file and adapter names
+
+    Returns:
+        Cached projects, or None if the cache is missing or stale
+    """
+    try:
+        data = json.loads(cache_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+        return None
+    if data.get("fingerprint") != fingerprint:
+        return None
+
+    for directory, mtime in data.get("scanned", {}).items():
+        try:
+            current: int | None = os.stat(directory).st_mtime_ns
+        except OSError:
+            current = None
+        if current != mtime:
+            return None
+    for candidate, has_context in data.get("candidates", {}).items():
+        if (Path(candidate) / "ai" / "context").is_dir() != has_context:
+            return None
+
+    return [
+        ProjectEntry(path=Path(project["path"]), targets=list(project["targets"]))
+        for project in data.get("projects", [])
+    ]
+
+
+def _write_cache(
+    cache_file: Path,
+    fingerprint: str,
+    projects: list[ProjectEntry],
+    scanned: dict[str, int | None],
+    candidates: dict[str, bool],
+) -> None:
+    """Store discovery results.
+
+    Args:
+        cache_file: Cache file
+        fingerprint: Hash of the workspace file and adapter names
+        projects: Discovered projects
+        scanned: Directory mtimes the result depends on
+        candidates: Globbed directories and whether they held a canonical context
+    """
+    data = {
+        "version": CACHE_VERSION,
+        "fingerprint": fingerprint,
+        "projects": [{"path": str(p.path), "targets": p.targets} for p in projects],
+        "scanned": scanned,
+        "candidates": candidates,
+    }
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    except OSError:
+        pass  # the cache is an optimization; discovery still succeeded
@@ -0,0 +1,250 @@
+"""Write-behind queue that takes writes and backups off the critical path.
+
+With ``--write-behind``, files an export or import decides to write are
+handed to a ``WriteBehind`` queue instead of being written (and backed up) on
+the calling thread, so rendering the next adapter overlaps with disk I/O:
+
+- each path is assigned to one worker lane, so writes to the same path land
+  in the order they were queued
+- a write queued for a path whose previous write has not started yet
+  replaces it, so only the last content is written (and backed up once)
+- the queue is bounded: callers block while ``max_pending`` writes are
+  outstanding
+- queued content is staged in ``ideporter.fsio``, so reads made while a write
+  is pending see the new content
+
+A queue is opened with ``session()`` around a unit of work and drained when
+the block exits, also when it exits with an error. Nothing is left pending
+when the block returns: every queued file, its backup and their directory
+have been fsynced by then. Write errors are raised from the drain as
+``WriteBehindError``.
+"""
+
+import contextvars
+import queue
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ideporter import fsio
+from ideporter.profiling import PROFILER
+from ideporter.utils import write_file
+
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_PENDING = 64
+
+_enabled = False
+_current: contextvars.ContextVar["WriteBehind | None"] = contextvars.ContextVar(
+    "ideporter_write_behind", default=None
+)
+
+
+class WriteBehindError(Exception):
+    """Raised when queued writes failed."""
+
+    def __init__(self, failures: list[tuple[Path, Exception]]):
+        """Initialize the error.
+
+        Args:
+            failures: Each failed path and its error
+        """
+        self.failures = failures
+        details = "; ".join(f"{path}: {error}" for path, error in failures)
+        super().__init__(f"{len(failures)} queued write(s) failed: {details}")
+
+
+@dataclass
+class WriteBehindStats:
+    """Counters for one queue."""
+
+    queued: int = 0
+    written: int = 0
+    coalesced: int = 0
+    backups: list[Path] = field(default_factory=list)
+
+
+@dataclass
+class _Job:
+    """One pending write."""
+
+    path: Path
+    content: str
+    force: bool
+    context: contextvars.Context
+
+
+class WriteBehind:
+    """Bounded queue of file writes run on background threads."""
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, max_pending: int = DEFAULT_MAX_PENDING):
+        """Start the worker threads.
+
+        Args:
+            workers: Number of worker lanes
+            max_pending: Writes that may be outstanding before submit() blocks
+        """
+        self.stats = WriteBehindStats()
+        self._lanes: list[queue.SimpleQueue[_Job | None]] = [
+            queue.SimpleQueue() for _ in range(workers)
+        ]
+        self._slots = threading.Semaphore(max_pending)
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._queued: dict[Path, _Job] = {}
+        self._outstanding = 0
+        self._failures: list[tuple[Path, Exception]] = []
+        self._threads = [
+            threading.Thread(target=self._drain, args=(lane,), daemon=True, name="write-behind")
+            for lane in self._lanes
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, path: Path, content: str, force: bool = False) -> None:
+        """Queue a write, replacing a queued write to the same path that has not started.
+
+        Args:
+            path: File to write
+            content: Content to write
+            force: Skip the backup if True
+        """
+        fsio.stage(path, content)
+        with self._lock:
+            job = self._queued.get(path)
+            if job is not None:
+                job.content = content
+                # A backup requested by the replaced write is still made
+                job.force = job.force and force
+                self.stats.coalesced += 1
+                PROFILER.count("writebehind.coalesced")
+                return
+
+        self._slots.acquire()
+        job = _Job(path, content, force, contextvars.copy_context())
+        with self._lock:
+            self._queued[path] = job
+            self._outstanding += 1
+            self.stats.queued += 1
+        self._lanes[hash(path) % len(self._lanes)].put(job)
+
+    def flush(self) -> None:
+        """Wait until every queued write has landed and been flushed to disk.
+
+        Raises:
+            WriteBehindError: If any queued write failed since the last flush
+        """
+        with self._idle:
+            while self._outstanding:
+                self._idle.wait()
+            failures, self._failures = self._failures, []
+        if failures:
+            raise WriteBehindError(failures)
+
+    def close(self) -> None:
+        """Flush and stop the worker threads.
+
+        Raises:
+            WriteBehindError: If any queued write failed
+        """
+        try:
+            self.flush()
+        finally:
+            for lane in self._lanes:
+                lane.put(None)
+            for thread in self._threads:
+                thread.join()
+
+    def _drain(self, lane: "queue.SimpleQueue[_Job | None]") -> None:
+        """Run one lane's writes in order.
+
+        Args:
+            lane: Queue of jobs for paths assigned to this lane
+        """
+        while True:
+            job = lane.get()
+            if job is None:
+                return
+            with self._lock:
+                # From here on, writes to this path queue a new job
+                if self._queued.get(job.path) is job:
+                    del self._queued[job.path]
+                content, force = job.content, job.force
+            try:
+                # The submitter's context, so fsio caches see the write
+                backup = job.context.run(write_file, job.path, content, force, durable=True)
+                with self._lock:
+                    self.stats.written += 1
+                    if backup is not None:
+                        self.stats.backups.append(backup)
+            except Exception as e:
+                with self._lock:
+                    self._failures.append((job.path, e))
+            finally:
+                fsio.unstage(job.path, content)
+                self._slots.release()
+                with self._idle:
+                    self._outstanding -= 1
+                    if not self._outstanding:
+                        self._idle.notify_all()
+
+
+@contextmanager
+def default_enabled(enabled: bool) -> Iterator[None]:
+    """Turn write-behind sessions on or off for a block.
+
+    Args:
+        enabled: Whether session() opens a queue
+
+    Yields:
+        Nothing; the setting applies inside the block
+    """
+    global _enabled
+    previous, _enabled = _enabled, enabled
+    try:
+        yield
+    finally:
+        _enabled = previous
+
+
+@contextmanager
+def session() -> Iterator["WriteBehind | None"]:
+    """Queue writes made by ideporter.plan inside a block, draining them at exit.
+
+    Sessions nest: an inner block joins the outer queue. When write-behind
+    is off, the block runs with synchronous writes.
+
+    Yields:
+        The active queue, or None when write-behind is off
+
+    Raises:
+        WriteBehindError: If queued writes failed (and the block itself did not raise)
+    """
+    existing = _current.get()
+    if existing is not None or not _enabled:
+        yield existing
+        return
+
+    writer = WriteBehind()
+    token = _current.set(writer)
+    try:
+        yield writer
+    except BaseException:
+        _current.reset(token)
+        try:
+            writer.close()
+        except WriteBehindError:
+            pass  # the block's own error is reported instead
+        raise
+    _current.reset(token)
+    writer.close()
+
+
+def current() -> WriteBehind | None:
+    """Get the queue writes should go to.
+
+    Returns:
+        The active queue, or None for synchronous writes
+    """
+    return _current.get()
@@ -3,6 +3,17 @@
 import pytest
 
 
+@pytest.fixture(autouse=True)
+def user_dirs(tmp_path_factory, monkeypatch):
+    """Point per-user config and cache directories at a temporary home."""
+    home = tmp_path_factory.mktemp("home")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(home / "cache"))
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(home / "config"))
+    # Adapter specs come only from the temporary home unless a test adds some
+    monkeypatch.delenv("IDEPORTER_ADAPTERS", raising=False)
+    return home
+
+
 @pytest.fixture
 def temp_project(tmp_path):
     """Create a temporary project directory."""
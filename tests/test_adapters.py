@@ -193,6 +193,47 @@ def test_continue_export(temp_project, canonical_context, sample_rules):
     assert "projectPrompts" in config
 
 
+def test_continue_section_prompts_round_trip(temp_project, canonical_context):
+    """Test that Continue export writes one prompt per section and only replaces changed ones."""
+    rules_file = canonical_context.context_dir / "rules.md"
+    rules_file.write_text("# Rules\n\n## Style\n\nUse black.\n\n## Testing\n\nUse pytest.\n")
+    continue_dir = temp_project / ".continue"
+    continue_dir.mkdir()
+    user_prompt = {"name": "Mine", "content": "Keep me"}
+    (continue_dir / "config.json").write_text(json.dumps({"projectPrompts": [user_prompt]}))
+
+    adapter = ContinueAdapter(temp_project)
+    adapter.export_context(canonical_context.context_dir, force=True)
+    prompts = json.loads((continue_dir / "config.json").read_text())["projectPrompts"]
+    assert prompts[0] == user_prompt
+    assert [p["section"] for p in prompts[1:]] == ["", "Rules > Style", "Rules > Testing"]
+
+    rules_file.write_text(rules_file.read_text().replace("pytest", "pytest -q"))
+    adapter.export_context(canonical_context.context_dir, force=True)
+    updated = json.loads((continue_dir / "config.json").read_text())["projectPrompts"]
+    assert updated[:3] == prompts[:3]
+    assert updated[3]["hash"] != prompts[3]["hash"]
+
+    # Importing the section prompts rebuilds rules.md, with user prompts appended
+    rules = adapter.render_import(canonical_context.context_dir)[rules_file]
+    assert rules.startswith(rules_file.read_text())
+    assert "### Mine\n\nKeep me" in rules
+
+
+def test_export_skips_unchanged_files(temp_project, canonical_context, sample_rules):
+    """Test that re-exporting identical content neither rewrites nor backs up files."""
+    (canonical_context.context_dir / "rules.md").write_text(sample_rules)
+    adapter = CursorAdapter(temp_project)
+    adapter.export_context(canonical_context.context_dir, force=False, dry_run=False)
+
+    cursorrules = temp_project / ".cursorrules"
+    mtime = cursorrules.stat().st_mtime_ns
+    adapter.export_context(canonical_context.context_dir, force=False, dry_run=False)
+
+    assert cursorrules.stat().st_mtime_ns == mtime
+    assert not list(temp_project.glob(".cursorrules*.bak"))
+
+
 # Claude Adapter Tests
 
 
@@ -0,0 +1,86 @@
+"""Tests for the programmatic API."""
+
+import pytest
+
+from ideporter import api
+
+
+def test_export_reports_files_without_printing(
+    temp_project, canonical_context, sample_rules, capsys
+):
+    """Test export returns structured results and prints nothing."""
+    (canonical_context.context_dir / "rules.md").write_text(sample_rules)
+    capsys.readouterr()
+
+    result = api.export(temp_project, ["cursor", "vscode"])
+
+    assert result.ok
+    assert capsys.readouterr().out == ""
+    assert [adapter.adapter for adapter in result.adapters] == ["cursor", "vscode"]
+    paths = {file.path.relative_to(temp_project).as_posix() for file in result.written}
+    assert {".cursorrules", ".vscode/AI_RULES.md"} <= paths
+    assert result.bytes_written >= len(sample_rules)
+    assert "cursor" in (canonical_context.context_dir / "manifest.yaml").read_text()
+
+
+def test_export_skips_unchanged_files(temp_project, canonical_context):
+    """Test a second export reports every file as unchanged."""
+    api.export(temp_project, ["cursor"])
+
+    result = api.export(temp_project, ["cursor"])
+
+    assert result.files
+    assert {file.action for file in result.files} == {"unchanged"}
+    assert not list(temp_project.glob("*.bak"))
+
+
+def test_export_dry_run(temp_project, canonical_context):
+    """Test dry runs report would-be writes and leave the tree alone."""
+    result = api.export(temp_project, ["cursor"], dry_run=True)
+
+    assert {file.action for file in result.files} == {"would_write"}
+    assert not (temp_project / ".cursorrules").exists()
+
+
+def test_export_reports_validation_issues(temp_project):
+    """Test missing canonical context is an error, not an exception."""
+    result = api.export(temp_project, ["cursor"])
+
+    assert not result.ok
+    assert "Canonical context not found" in result.errors[0]
+
+
+def test_export_unknown_adapter(temp_project):
+    """Test unknown adapters raise ValueError."""
+    with pytest.raises(ValueError):
+        api.export(temp_project, ["notepad"])
+
+
+def test_import_initializes_canonical(temp_project, sample_rules, capsys):
+    """Test import creates the canonical context and reports adapter errors."""
+    (temp_project / ".cursorrules").write_text(sample_rules)
+
+    result = api.import_(temp_project, "cursor")
+
+    assert result.ok
+    assert capsys.readouterr().out == ""
+    context_dir = temp_project / "ai" / "context"
+    assert (context_dir / "rules.md").read_text() == sample_rules
+    assert (context_dir / "context.md").exists()
+
+    (temp_project / ".continue").mkdir()
+    (temp_project / ".continue" / "config.json").write_text("{not json")
+    broken = api.import_(temp_project, "continue")
+    assert not broken.ok
+    assert broken.adapters[0].error.startswith("JSONDecodeError")
+
+
+def test_convert_and_detect(temp_project, sample_rules):
+    """Test convert chains import and export."""
+    (temp_project / ".cursorrules").write_text(sample_rules)
+
+    imported, exported = api.convert(temp_project, "cursor", "vscode")
+
+    assert imported.ok and exported is not None and exported.ok
+    assert api.detect(temp_project)["vscode"] is True
+    assert api.validate(temp_project).valid
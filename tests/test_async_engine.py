@@ -0,0 +1,218 @@
+"""Tests for the asynchronous execution engine."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from ideporter import plan as plan_module
+from ideporter.adapters.cursor import CursorAdapter
+from ideporter.async_engine import (
+    IOScheduler,
+    async_apply_plan,
+    async_safe_read,
+    async_safe_write,
+    run_batch,
+)
+from ideporter.canonical import CanonicalContext
+from ideporter.locking import default_timeout, project_lock
+from ideporter.plan import Operation, PlanError
+
+
+def test_async_safe_write_and_read(tmp_path):
+    """Test the async file helpers round-trip content and skip current files."""
+    target = tmp_path / "nested" / "file.txt"
+
+    async def roundtrip():
+        async with IOScheduler(per_device=2) as scheduler:
+            await async_safe_write(target, "hello", scheduler=scheduler)
+            await async_safe_write(target, "hello", scheduler=scheduler)
+            return await async_safe_read(target, scheduler=scheduler)
+
+    assert asyncio.run(roundtrip()) == "hello"
+    assert asyncio.run(async_safe_read(target)) == "hello"
+    assert not list(target.parent.glob("*.bak"))
+
+
+def test_async_apply_plan(tmp_path):
+    """Test async plans write before linking and reject conflicts up front."""
+    canonical = tmp_path / "rules.md"
+    link = tmp_path / "link.md"
+    operations = [
+        Operation(link, "rules", mode="symlink", target=canonical),
+        Operation(canonical, "rules"),
+        Operation(canonical, "rules"),
+    ]
+
+    applied = asyncio.run(async_apply_plan(operations, report=False))
+
+    assert [result.outcome for result in applied] == ["written", "linked"]
+    assert link.read_text() == "rules"
+    with pytest.raises(PlanError):
+        asyncio.run(async_apply_plan([Operation(link, "a"), Operation(link, "b")]))
+
+
+def test_scheduler_limits_concurrency_per_device(tmp_path):
+    """Test no more than per_device operations run at once on one filesystem."""
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def work():
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+
+    async def main():
+        async with IOScheduler(per_device=3) as scheduler:
+            await asyncio.gather(*(scheduler.run(tmp_path / f"{i}", work) for i in range(12)))
+
+    asyncio.run(main())
+    assert peak == 3
+
+
+def test_scheduler_device_of_missing_path(tmp_path):
+    """Test paths that do not exist yet map to their ancestor's filesystem."""
+    scheduler = IOScheduler()
+    try:
+        assert scheduler.device(tmp_path / "a" / "b" / "c.txt") == scheduler.device(tmp_path / "x")
+    finally:
+        scheduler.close()
+
+
+def test_async_adapter_render_export(temp_project, canonical_context, sample_rules):
+    """Test async adapter variants match their synchronous counterparts."""
+    (canonical_context.context_dir / "rules.md").write_text(sample_rules)
+    adapter = CursorAdapter(temp_project)
+
+    outputs = asyncio.run(adapter.async_render_export(canonical_context.context_dir))
+
+    assert outputs == adapter.render_export(canonical_context.context_dir)
+
+
+def test_run_batch_exports_projects(tmp_path, sample_rules):
+    """Test a batch exports every project and reports failures separately."""
+    projects = []
+    for name in ("one", "two"):
+        project = tmp_path / name
+        project.mkdir()
+        CanonicalContext(project).initialize()
+        (project / "ai" / "context" / "rules.md").write_text(sample_rules)
+        projects.append(project)
+    missing = tmp_path / "missing"
+    missing.mkdir()
+
+    summary = run_batch([*projects, missing], ["cursor", "vscode"], per_device=4)
+
+    assert [result.ok for result in summary.results] == [True, True, False]
+    assert "Canonical context not found" in summary.results[2].error
+    for project in projects:
+        assert (project / ".cursorrules").read_text() == sample_rules
+        assert (project / ".vscode" / "AI_RULES.md").exists()
+        assert CanonicalContext(project).read_file("manifest.yaml").count("cursor") == 1
+
+
+def test_run_batch_isolates_broken_projects(tmp_path, sample_rules):
+    """Test a project that fails to render is reported without stopping the batch."""
+    broken = tmp_path / "broken"
+    good = tmp_path / "good"
+    for project in (broken, good):
+        project.mkdir()
+        CanonicalContext(project).initialize()
+        (project / "ai" / "context" / "rules.md").write_text(sample_rules)
+    (broken / "ai" / "context" / "rules.md").write_bytes(b"# Rules\n\xff\xfe\n")
+
+    summary = run_batch([broken, good], ["cursor"])
+
+    assert [result.ok for result in summary.results] == [False, True]
+    assert "utf-8" in summary.results[0].error
+    assert (good / ".cursorrules").read_text() == sample_rules
+
+
+def test_run_batch_updates_manifest_once(tmp_path, sample_rules):
+    """Test the manifest is written once per project, not once per target."""
+    project = tmp_path / "project"
+    project.mkdir()
+    CanonicalContext(project).initialize()
+    (project / "ai" / "context" / "rules.md").write_text(sample_rules)
+
+    summary = run_batch([project], ["cursor", "vscode", "claude"])
+
+    assert summary.results[0].ok
+    context_dir = project / "ai" / "context"
+    assert len(list(context_dir.glob("manifest.yaml.*.bak"))) == 1
+    manifest = CanonicalContext(project).read_file("manifest.yaml")
+    assert all(target in manifest for target in ("cursor", "vscode", "claude"))
+
+
+def test_run_batch_skips_current_files(tmp_path, sample_rules):
+    """Test rerunning a batch on unchanged projects writes nothing."""
+    project = tmp_path / "project"
+    project.mkdir()
+    CanonicalContext(project).initialize()
+    (project / "ai" / "context" / "rules.md").write_text(sample_rules)
+    run_batch([project], ["cursor", "vscode"])
+    before = sorted(path.name for path in project.rglob("*"))
+
+    summary = run_batch([project], ["cursor", "vscode"])
+
+    assert summary.results[0].ok
+    assert summary.files == 0
+    assert sorted(path.name for path in project.rglob("*")) == before
+
+
+def test_run_batch_respects_per_device_limit(tmp_path, sample_rules, monkeypatch, capsys):
+    """Test --jobs bounds concurrent writes and files are reported in the result, not printed."""
+    projects = []
+    for name in ("one", "two", "three"):
+        project = tmp_path / name
+        project.mkdir()
+        CanonicalContext(project).initialize()
+        (project / "ai" / "context" / "rules.md").write_text(sample_rules)
+        (project / ".cursorrules").write_text("old rules")
+        projects.append(project)
+    active = []
+    peak = []
+    lock = threading.Lock()
+    original = plan_module.write_file
+
+    def tracked_write(path, content, force=False):
+        with lock:
+            active.append(path)
+            peak.append(len(active))
+        time.sleep(0.01)
+        try:
+            return original(path, content, force=force)
+        finally:
+            with lock:
+                active.remove(path)
+
+    monkeypatch.setattr(plan_module, "write_file", tracked_write)
+    capsys.readouterr()
+
+    summary = run_batch(projects, ["cursor", "vscode", "claude"], per_device=2)
+
+    assert all(result.ok for result in summary.results)
+    assert max(peak) <= 2
+    assert "Wrote" not in capsys.readouterr().out
+    # The overwritten .cursorrules and the manifest
+    assert all(len(result.backups) == 2 for result in summary.results)
+
+
+def test_run_batch_waits_for_writers(tmp_path, sample_rules):
+    """Test a project another job holds the write lock on is not exported."""
+    project = tmp_path / "project"
+    project.mkdir()
+    CanonicalContext(project).initialize()
+    (project / "ai" / "context" / "rules.md").write_text(sample_rules)
+
+    with default_timeout(0.05), project_lock(project, exclusive=True):
+        summary = run_batch([project], ["cursor"])
+
+    assert "waiting for a shared lock" in summary.results[0].error
+    assert not (project / ".cursorrules").exists()
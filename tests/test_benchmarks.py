@@ -0,0 +1,90 @@
+"""Tests for the benchmark fleet generator and regression checks."""
+
+import os
+
+import pytest
+
+from benchmarks.fleet import FleetSpec, generate_fleet, load_fleet, parse_mix, parse_size
+from benchmarks.run import compare, run_in_process
+from benchmarks.syscalls import SyscallCounter, count_command
+
+
+def test_parse_size():
+    """Test human-readable sizes are parsed."""
+    assert parse_size("512") == 512
+    assert parse_size("1KB") == 1024
+    assert parse_size("50mb") == 50 * 1024 * 1024
+    with pytest.raises(ValueError):
+        parse_size("lots")
+
+
+def test_parse_mix():
+    """Test IDE mixes are parsed and validated."""
+    assert parse_mix("cursor=3,vscode") == {"cursor": 3, "vscode": 1}
+    with pytest.raises(ValueError):
+        parse_mix("notepad=1")
+
+
+def test_generate_fleet(tmp_path):
+    """Test the generator lays out projects with the requested mix and sizes."""
+    spec = FleetSpec(projects=4, mix={"cursor": 1, "continue": 1}, rule_sizes=[2048])
+    projects = generate_fleet(tmp_path / "fleet", spec)
+
+    fleet = load_fleet(tmp_path / "fleet")
+    assert list(fleet) == projects
+    assert list(fleet.values()) == ["cursor", "continue", "cursor", "continue"]
+    rules = (projects[0] / ".cursorrules").read_text()
+    assert len(rules) >= 2048
+    assert (projects[1] / ".continue" / "config.json").exists()
+    assert (projects[0] / "ai" / "context" / "rules.md").read_text() == rules
+
+
+def test_run_in_process(tmp_path):
+    """Test every project of a small fleet is timed without failures."""
+    generate_fleet(tmp_path / "fleet", FleetSpec(projects=4))
+
+    result = run_in_process("export", tmp_path / "fleet")
+
+    assert result.failures == 0
+    assert len(result.latencies_ms) == 4
+    assert result.projects_per_second > 0
+
+
+def test_compare_flags_regressions():
+    """Test slowdowns beyond the threshold are reported and noise is ignored."""
+    baseline = {
+        "export": {"p50_ms": 10.0, "p95_ms": 20.0, "projects_per_second": 100.0, "peak_rss_mb": 50}
+    }
+    same = {
+        "export": {"p50_ms": 10.5, "p95_ms": 20.0, "projects_per_second": 95.0, "peak_rss_mb": 52}
+    }
+    slower = {
+        "export": {"p50_ms": 20.0, "p95_ms": 20.0, "projects_per_second": 50.0, "peak_rss_mb": 90}
+    }
+
+    assert compare(same, baseline, 0.25) == []
+    regressions = compare(slower, baseline, 0.25)
+    assert len(regressions) == 3
+    assert regressions[0].startswith("export: p50_ms")
+
+
+def test_syscall_counter_counts_and_restores(tmp_path):
+    """Test the counter sees pathlib calls and restores the originals."""
+    original = os.stat
+    target = tmp_path / "file.txt"
+    with SyscallCounter() as counter:
+        target.write_text("x")
+        target.exists()
+    assert os.stat is original
+    assert counter.counts["open"] == 1
+    assert counter.counts["stat"] == 1
+
+
+def test_export_syscall_budget(tmp_path):
+    """Test exporting a project stays within its syscall budget."""
+    spec = FleetSpec(projects=2, config_entries=10)
+    generate_fleet(tmp_path / "fleet", spec)
+    counts = count_command("export", load_fleet(tmp_path / "fleet"))
+    # One scandir per directory, no stat-before-open, one manifest write
+    assert counts["total"] <= 50
+    assert counts.get("stat", 0) <= 4
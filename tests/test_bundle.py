@@ -0,0 +1,136 @@
+"""Tests for streaming bundle import and export."""
+
+import io
+import tarfile
+import zipfile
+
+import pytest
+from typer.testing import CliRunner
+
+from ideporter.bundle import BundleError, BundleWriter, read_bundle
+from ideporter.cli import app
+
+runner = CliRunner()
+
+
+def _write_tar(path, files):
+    with tarfile.open(path, "w:gz") as archive:
+        for name, content in files.items():
+            data = content.encode("utf-8")
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+
+def test_bundle_writer_roundtrip(tmp_path):
+    """Test files written to a bundle stream back out unchanged."""
+    bundle = tmp_path / "out.tar.xz"
+    with BundleWriter(bundle) as writer:
+        writer.write(".cursorrules", "# Rules\n")
+        writer.write("ai/context/rules.md", "# Rules\n")
+
+    assert writer.files == 2
+    assert read_bundle(bundle) == {".cursorrules": "# Rules\n", "ai/context/rules.md": "# Rules\n"}
+
+
+def test_read_bundle_filters_members(tmp_path):
+    """Test unrelated and unsafe members are skipped."""
+    bundle = tmp_path / "in.tar.gz"
+    _write_tar(
+        bundle,
+        {
+            "./ai/context/rules.md": "# Rules\n",
+            "src/main.py": "print('hi')\n",
+            "../escape/.cursorrules": "nope",
+        },
+    )
+
+    assert read_bundle(bundle) == {"ai/context/rules.md": "# Rules\n"}
+
+
+def test_read_bundle_rejects_oversized_member(tmp_path):
+    """Test size caps bound memory use."""
+    bundle = tmp_path / "in.zip"
+    with zipfile.ZipFile(bundle, "w") as archive:
+        archive.writestr("ai/context/rules.md", "x" * 100)
+
+    with pytest.raises(BundleError, match="too large"):
+        read_bundle(bundle, max_member_size=10)
+
+
+def test_export_all_to_bundle(temp_project, canonical_context, sample_rules):
+    """Test every adapter's output lands in one bundle and nothing on disk."""
+    (canonical_context.context_dir / "rules.md").write_text(sample_rules)
+    bundle = temp_project.parent / "artifacts.tar.gz"
+
+    result = runner.invoke(
+        app, ["export", "--to", "all", "--path", str(temp_project), "--bundle", str(bundle)]
+    )
+
+    assert result.exit_code == 0
+    files = read_bundle(bundle)
+    assert files[".cursorrules"] == sample_rules
+    assert ".vscode/AI_RULES.md" in files
+    assert ".windsurf/config.yaml" in files
+    assert ".continue/config.json" in files
+    assert "ai/context/CLAUDE_IMPORT.md" in files
+    assert not (temp_project / ".cursorrules").exists()
+
+
+def test_export_from_bundle(temp_project, sample_rules):
+    """Test the canonical context can be read from a bundle."""
+    bundle = temp_project.parent / "canonical.zip"
+    with zipfile.ZipFile(bundle, "w") as archive:
+        archive.writestr("ai/context/rules.md", sample_rules)
+
+    result = runner.invoke(
+        app,
+        ["export", "--to", "cursor", "--path", str(temp_project), "--from-bundle", str(bundle)],
+    )
+
+    assert result.exit_code == 0
+    assert (temp_project / ".cursorrules").read_text() == sample_rules
+    assert not (temp_project / "ai").exists()
+
+
+def test_import_from_bundle(temp_project):
+    """Test importing IDE files straight from a zip bundle."""
+    bundle = temp_project.parent / "ide.zip"
+    with zipfile.ZipFile(bundle, "w") as archive:
+        archive.writestr(".vscode/AI_RULES.md", "# Bundled Rules\n")
+
+    result = runner.invoke(
+        app, ["import", "--from", "vscode", "--path", str(temp_project), "--bundle", str(bundle)]
+    )
+
+    assert result.exit_code == 0
+    rules = (temp_project / "ai" / "context" / "rules.md").read_text()
+    assert rules == "# Bundled Rules\n"
+
+
+def test_import_all_from_bundle(temp_project):
+    """Test --from all detects adapters by the bundle's files, not the disk."""
+    bundle = temp_project.parent / "ide.tar.gz"
+    _write_tar(
+        bundle,
+        {".cursorrules": "# Rules\n\n- Be concise\n", ".vscode/AI_RULES.md": "# Rules\n\n- Test\n"},
+    )
+
+    result = runner.invoke(
+        app, ["import", "--from", "all", "--path", str(temp_project), "--bundle", str(bundle)]
+    )
+
+    assert result.exit_code == 0, result.stdout
+    rules = (temp_project / "ai" / "context" / "rules.md").read_text()
+    assert "- Be concise" in rules and "- Test" in rules
+    assert not (temp_project / ".cursorrules").exists()
+
+
+def test_zstd_bundle_roundtrip(tmp_path):
+    """Test .tar.zst bundles when zstandard is installed."""
+    pytest.importorskip("zstandard")
+    bundle = tmp_path / "out.tar.zst"
+    with BundleWriter(bundle) as writer:
+        writer.write(".cursorrules", "# Rules\n")
+
+    assert read_bundle(bundle) == {".cursorrules": "# Rules\n"}
@@ -0,0 +1,58 @@
+"""Tests for read-only sync checks."""
+
+from ideporter.adapters.cursor import CursorAdapter
+from ideporter.check import check_project
+
+
+def test_check_in_sync(temp_project, canonical_context, sample_rules):
+    """Test a freshly exported project is reported in sync."""
+    (canonical_context.context_dir / "rules.md").write_text(sample_rules)
+    CursorAdapter(temp_project).export_context(canonical_context.context_dir, force=True)
+
+    report = check_project(temp_project, targets=["cursor"])
+
+    assert report["in_sync"] is True
+    assert report["checked"] == 2
+    assert report["drift"] == []
+
+
+def test_check_detects_modified_and_missing(temp_project, canonical_context, sample_rules):
+    """Test drift is reported with hashes and a diff."""
+    (canonical_context.context_dir / "rules.md").write_text(sample_rules)
+    (temp_project / ".cursorrules").write_text("# Stale Rules\n")
+
+    report = check_project(temp_project, targets=["cursor"])
+
+    assert report["in_sync"] is False
+    by_path = {entry["path"]: entry for entry in report["drift"]}
+    assert by_path[".cursorrules"]["status"] == "modified"
+    assert "+## Code Style" in by_path[".cursorrules"]["diff"]
+    assert "AI Project Rules > Code Style" in by_path[".cursorrules"]["sections"]
+    assert by_path[".cursorignore"]["status"] == "missing"
+    assert by_path[".cursorignore"]["actual_hash"] is None
+
+
+def test_check_writes_nothing(temp_project, canonical_context):
+    """Test check never creates artifacts or backups."""
+    before = sorted(p.name for p in temp_project.rglob("*"))
+
+    check_project(temp_project, targets=["cursor", "vscode", "windsurf", "continue", "claude"])
+
+    assert sorted(p.name for p in temp_project.rglob("*")) == before
+
+
+def test_check_defaults_to_manifest_targets(temp_project, canonical_context):
+    """Test targets default to adapters recorded in the manifest."""
+    canonical_context.update_manifest("vscode", force=True)
+
+    report = check_project(temp_project)
+
+    assert report["targets"] == ["vscode"]
+
+
+def test_check_without_canonical(temp_project):
+    """Test check reports an error when canonical context is missing."""
+    report = check_project(temp_project, targets=["cursor"])
+
+    assert report["in_sync"] is False
+    assert "not found" in report["errors"][0]
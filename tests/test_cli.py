@@ -5,6 +5,7 @@ import json
 from typer.testing import CliRunner
 
 from ideporter.cli import app
+from ideporter.pack import pack_file
 
 runner = CliRunner()
 
@@ -93,6 +94,56 @@ def test_import_command(temp_project):
     assert (canonical_dir / "rules.md").exists()
 
 
+def test_export_link_command(temp_project, canonical_context, sample_rules):
+    """Test export --link symlinks IDE files and rejects unknown modes."""
+    (canonical_context.context_dir / "rules.md").write_text(sample_rules)
+
+    result = runner.invoke(
+        app, ["export", "--to", "cursor", "--path", str(temp_project), "--link", "symlink"]
+    )
+    assert result.exit_code == 0
+    assert (temp_project / ".cursorrules").is_symlink()
+
+    result = runner.invoke(
+        app, ["export", "--to", "cursor", "--path", str(temp_project), "--link", "junction"]
+    )
+    assert result.exit_code == 1
+
+
+def test_workspace_sync_command(tmp_path):
+    """Test workspace sync exports the listed projects."""
+    project = tmp_path / "svc"
+    project.mkdir()
+    runner.invoke(app, ["init", str(project)])
+    workspace_file = tmp_path / "ideporter.workspace.yaml"
+    workspace_file.write_text("targets: [cursor]\nprojects: ['*']\n")
+
+    result = runner.invoke(app, ["workspace", "sync", "--file", str(workspace_file)])
+
+    assert result.exit_code == 0
+    assert "Synced 1 projects" in result.stdout
+    assert (project / ".cursorrules").exists()
+
+    missing = runner.invoke(app, ["workspace", "sync", "--file", str(tmp_path / "nope.yaml")])
+    assert missing.exit_code == 1
+
+
+def test_import_all_command(temp_project, sample_rules):
+    """Test importing from every detected IDE into one rules.md."""
+    (temp_project / ".cursorrules").write_text(sample_rules)
+    (temp_project / ".vscode").mkdir()
+    (temp_project / ".vscode" / "AI_RULES.md").write_text(sample_rules)
+
+    result = runner.invoke(app, ["import", "--from", "all", "--path", str(temp_project)])
+
+    assert result.exit_code == 0
+    rules = (temp_project / "ai" / "context" / "rules.md").read_text()
+    assert rules.startswith("<!-- sources: cursor, vscode -->")
+    assert rules.count("## Testing") == 1
+    manifest = (temp_project / "ai" / "context" / "manifest.yaml").read_text()
+    assert "cursor" in manifest and "vscode" in manifest
+
+
 def test_import_command_invalid_ide(temp_project):
     """Test import command with invalid IDE."""
     result = runner.invoke(app, ["import", "--from", "invalid", "--path", str(temp_project)])
@@ -236,3 +287,102 @@ def test_force_flag(temp_project):
     # Check no .bak files were created (force skips backups)
     bak_files = list(temp_project.glob("*.bak"))
     assert len(bak_files) == 0
+
+
+def test_check_command(temp_project):
+    """Test check command exits nonzero on drift and zero when in sync."""
+    canonical_dir = temp_project / "ai" / "context"
+    canonical_dir.mkdir(parents=True)
+    (canonical_dir / "rules.md").write_text("# Test Rules")
+
+    result = runner.invoke(app, ["check", str(temp_project), "--to", "cursor", "--json"])
+    assert result.exit_code == 1
+    report = json.loads(result.stdout)
+    assert report["drift"][0]["path"] == ".cursorrules"
+
+    runner.invoke(app, ["export", "--to", "cursor", "--path", str(temp_project)])
+    result = runner.invoke(app, ["check", str(temp_project), "--to", "cursor"])
+    assert result.exit_code == 0
+    assert "in sync" in result.stdout.lower()
+
+
+def test_pack_command(temp_project):
+    """Test pack command compiles the canonical context."""
+    runner.invoke(app, ["init", str(temp_project)])
+
+    result = runner.invoke(app, ["pack", str(temp_project)])
+    assert result.exit_code == 0
+    assert pack_file(temp_project / "ai" / "context").exists()
+
+
+def test_batch_command(tmp_path):
+    """Test batch command exports several projects."""
+    projects = []
+    for name in ("one", "two"):
+        project = tmp_path / name
+        project.mkdir()
+        runner.invoke(app, ["init", str(project)])
+        projects.append(str(project))
+
+    cache = str(tmp_path / "cache")
+    result = runner.invoke(
+        app, ["batch", *projects, "--to", "cursor", "--jobs", "4", "--render-cache", cache]
+    )
+    assert result.exit_code == 0
+    assert "Render cache:" in result.stdout
+    assert (tmp_path / "one" / ".cursorrules").exists()
+    assert (tmp_path / "two" / ".cursorrules").exists()
+
+    result = runner.invoke(app, ["batch", str(tmp_path), "--to", "cursor"])
+    assert result.exit_code == 1
+
+
+def test_profile_option(temp_project, tmp_path):
+    """Test --profile-trace writes a trace for the command run."""
+    trace_file = tmp_path / "trace.json"
+
+    result = runner.invoke(app, ["--profile-trace", str(trace_file), "init", str(temp_project)])
+    assert result.exit_code == 0
+
+    names = {event["name"] for event in json.loads(trace_file.read_text())["traceEvents"]}
+    assert "utils.safe_write" in names
+
+
+def test_serve_stdio_command(temp_project):
+    """Test serve-stdio answers requests read from stdin."""
+    request = json.dumps({"id": 1, "op": "detect", "path": str(temp_project)})
+
+    result = runner.invoke(app, ["serve-stdio"], input=request + "\n")
+    assert result.exit_code == 0
+    assert json.loads(result.stdout)["id"] == 1
+
+
+def test_export_waits_for_lock_timeout(canonical_context):
+    """Test export fails cleanly when another job holds the write lock."""
+    import threading
+
+    from ideporter.locking import project_lock
+
+    ready = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with project_lock(canonical_context.base_path, exclusive=True):
+            ready.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    try:
+        assert ready.wait(5)
+        project = str(canonical_context.base_path)
+        result = runner.invoke(
+            app, ["--lock-timeout", "0.05", "export", "--to", "cursor", "--path", project]
+        )
+    finally:
+        release.set()
+        thread.join()
+
+    assert result.exit_code == 1
+    assert "Timed out" in result.stdout
+    assert not (canonical_context.base_path / ".cursorrules").exists()
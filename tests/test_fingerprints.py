@@ -0,0 +1,181 @@
+"""Tests for the persistent fingerprint cache."""
+
+import json
+import os
+import threading
+import time
+
+from typer.testing import CliRunner
+
+from ideporter import fingerprints
+from ideporter.canonical import CanonicalContext
+from ideporter.check import check_project
+from ideporter.cli import app
+from ideporter.fingerprints import FingerprintCache
+from ideporter.utils import content_hash
+
+runner = CliRunner()
+
+
+def _age(path, seconds=60):
+    """Backdate a file so it is not considered racily modified."""
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_hash_reused_while_signature_unchanged(tmp_path):
+    """Test an unchanged file is hashed once across cache instances."""
+    target = tmp_path / "file.txt"
+    target.write_text("hello")
+    _age(target)
+    db = tmp_path / "cache" / "fingerprints.sqlite3"
+
+    first = FingerprintCache(db)
+    assert first.file_hash(target) == content_hash("hello")
+    first.close()
+
+    second = FingerprintCache(db)
+    assert second.file_hash(target) == content_hash("hello")
+    assert (second.hits, second.misses) == (1, 0)
+
+    target.write_text("changed")
+    _age(target, 30)
+    assert second.file_hash(target) == content_hash("changed")
+    assert second.misses == 1
+    second.close()
+
+
+def test_recent_files_not_stored(tmp_path):
+    """Test files modified just now are not cached."""
+    target = tmp_path / "file.txt"
+    target.write_text("fresh")
+    cache = FingerprintCache(tmp_path / "fingerprints.sqlite3")
+
+    cache.file_hash(target)
+    cache.file_hash(target)
+
+    assert cache.hits == 0
+    assert cache.stats().total == 0
+    cache.close()
+
+
+def test_parsed_values_and_missing_files(tmp_path):
+    """Test parsed values round-trip and missing files are not cached."""
+    target = tmp_path / "ignore.txt"
+    target.write_text("a\nb\n")
+    _age(target)
+    cache = FingerprintCache(tmp_path / "fingerprints.sqlite3")
+
+    assert cache.parsed(target, "lines", str.split) == ["a", "b"]
+    assert cache.parsed(target, "lines", str.split) == ["a", "b"]
+    assert cache.parsed(tmp_path / "missing.txt", "lines", str.split) is None
+    assert cache.hits == 1
+    assert cache.stats().entries == {"lines": 1}
+    cache.close()
+
+
+def test_concurrent_readers(tmp_path):
+    """Test threads share the database through their own connections."""
+    files = []
+    for i in range(8):
+        path = tmp_path / f"file{i}.txt"
+        path.write_text(f"content {i}")
+        _age(path)
+        files.append(path)
+    cache = FingerprintCache(tmp_path / "fingerprints.sqlite3")
+    errors = []
+
+    def work():
+        try:
+            for path in files:
+                assert cache.file_hash(path) == content_hash(path.read_text())
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert cache.hits + cache.misses == 32
+    assert cache.stats().entries == {"hash": 8}
+    cache.close()
+
+
+def test_unusable_database_falls_back(tmp_path):
+    """Test a database that cannot be opened only disables caching."""
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    target = tmp_path / "file.txt"
+    target.write_text("x")
+
+    cache = FingerprintCache(blocker / "fingerprints.sqlite3")
+    assert cache.file_hash(target) == content_hash("x")
+    assert cache.stats().total == 0
+
+
+def test_check_uses_cache(tmp_path, temp_project, canonical_context, sample_rules):
+    """Test check reads hashes of unchanged IDE files from the cache."""
+    (canonical_context.context_dir / "rules.md").write_text(sample_rules)
+    (temp_project / ".cursorrules").write_text(sample_rules)
+    (temp_project / ".cursorignore").write_text(
+        (canonical_context.context_dir / "ignore.txt").read_text()
+    )
+    for path in temp_project.rglob("*"):
+        if path.is_file():
+            _age(path)
+
+    cache = FingerprintCache(tmp_path / "fingerprints.sqlite3")
+    with fingerprints.enabled(cache):
+        assert check_project(temp_project, targets=["cursor"])["in_sync"]
+        assert check_project(temp_project, targets=["cursor"])["in_sync"]
+        (temp_project / ".cursorrules").write_text("drifted")
+        assert not check_project(temp_project, targets=["cursor"])["in_sync"]
+
+    assert cache.hits >= 2
+    assert fingerprints.active() is None
+
+
+def test_ignore_patterns_and_extensions_use_cache(tmp_path, canonical_context):
+    """Test parsed ignore patterns and extensions are stored per file."""
+    context_dir = canonical_context.context_dir
+    (context_dir / "extensions.json").write_text('{"recommendations": ["a.b"]}')
+    for path in context_dir.iterdir():
+        _age(path)
+
+    cache = FingerprintCache(tmp_path / "fingerprints.sqlite3")
+    with fingerprints.enabled(cache):
+        for _ in range(2):
+            canonical = CanonicalContext(canonical_context.base_path)
+            assert "node_modules/" in canonical.get_ignore_patterns()
+            assert canonical.get_extensions() == ["a.b"]
+
+    assert cache.hits == 2
+    assert cache.stats().entries == {"extensions": 1, "ignore": 1}
+    cache.close()
+
+
+def test_cache_commands(tmp_path, monkeypatch, temp_project, canonical_context):
+    """Test cache stats and clear report on the per-user database."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    for path in canonical_context.context_dir.iterdir():
+        _age(path)
+
+    result = runner.invoke(app, ["cache", "stats"])
+    assert result.exit_code == 0
+    assert "No fingerprint cache" in result.stdout
+
+    result = runner.invoke(app, ["--fingerprint-cache", "validate", str(temp_project)])
+    assert result.exit_code == 0
+
+    result = runner.invoke(app, ["cache", "stats", "--json"])
+    assert result.exit_code == 0
+    stats = json.loads(result.stdout)
+    assert stats["entries"] == {"manifest": 1}
+
+    result = runner.invoke(app, ["cache", "clear"])
+    assert result.exit_code == 0
+    assert "Cleared 1 entries" in result.stdout
+    assert json.loads(runner.invoke(app, ["cache", "stats", "--json"]).stdout)["total"] == 0
@@ -0,0 +1,56 @@
+"""Tests for syscall-minimal filesystem access."""
+
+import os
+
+from benchmarks.syscalls import SyscallCounter
+from ideporter import fsio
+from ideporter.utils import write_file
+
+
+def test_operation_lists_each_directory_once(tmp_path):
+    """Test existence checks within an operation share one directory listing."""
+    (tmp_path / "a.md").write_text("a")
+    with fsio.operation(), SyscallCounter() as counter:
+        assert fsio.exists(tmp_path / "a.md")
+        assert not fsio.exists(tmp_path / "b.md")
+        assert fsio.lstat(tmp_path / "c.md") is None
+    assert counter.counts["scandir"] == 1
+    assert counter.counts["stat"] == 0
+    assert counter.counts["lstat"] == 0
+
+
+def test_missing_files_are_not_probed_again(tmp_path):
+    """Test a failed read is remembered for the rest of the operation."""
+    missing = tmp_path / "missing.md"
+    with fsio.operation(), SyscallCounter() as counter:
+        assert fsio.read_text(missing) is None
+        assert fsio.read_text(missing) is None
+        assert not fsio.exists(missing)
+    assert counter.counts["open"] == 1
+    assert fsio.known_missing(missing) is False
+
+
+def test_writes_invalidate_the_cache(tmp_path):
+    """Test a file written inside an operation is visible afterwards."""
+    target = tmp_path / "new" / "rules.md"
+    with fsio.operation():
+        assert not fsio.exists(target)
+        assert fsio.scan(tmp_path / "new") is None
+        write_file(target, "rules", force=True)
+        assert fsio.exists(target)
+        assert fsio.read_text(target) == "rules"
+        assert "rules.md" in (fsio.scan(tmp_path / "new") or {})
+
+
+def test_helpers_work_outside_an_operation(tmp_path):
+    """Test every helper falls back to direct syscalls without an operation."""
+    target = tmp_path / "rules.md"
+    assert fsio.read_text(target) is None
+    assert not fsio.exists(target)
+    target.write_text("x")
+    assert fsio.exists(target)
+    assert fsio.read_text(target) == "x"
+    assert not fsio.is_link(fsio.lstat(target))
+
+    os.link(target, tmp_path / "second.md")
+    assert fsio.is_link(fsio.lstat(target))
@@ -0,0 +1,94 @@
+"""Tests for reading canonical context from git objects."""
+
+import subprocess
+import tarfile
+
+import pytest
+
+from ideporter.canonical import CanonicalContext
+from ideporter.gitsource import GitObjectStore, GitRefSource, export_refs
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def git_project(temp_project, canonical_context, sample_rules):
+    """Create a git repository with a canonical context on two refs."""
+    (canonical_context.context_dir / "rules.md").write_text(sample_rules)
+    _git(temp_project, "init", "-q", "-b", "main")
+    _git(temp_project, "add", "-A")
+    _git(temp_project, "commit", "-q", "-m", "v1")
+    _git(temp_project, "tag", "v1")
+
+    (temp_project / "README.md").write_text("unrelated change\n")
+    _git(temp_project, "add", "-A")
+    _git(temp_project, "commit", "-q", "-m", "v2")
+    _git(temp_project, "tag", "v2")
+
+    (canonical_context.context_dir / "rules.md").write_text("# Working Tree Rules\n")
+    return temp_project
+
+
+def test_canonical_context_from_ref(git_project, sample_rules):
+    """Test CanonicalContext reads from a ref, not the working tree."""
+    with GitObjectStore(git_project) as store:
+        canonical = CanonicalContext(git_project, source=GitRefSource(store, "v1"))
+
+        assert canonical.exists()
+        assert canonical.get_rules() == sample_rules
+        assert "node_modules/" in canonical.get_ignore_patterns()
+        assert canonical.validate()["valid"] is True
+
+
+def test_ref_source_missing_paths(git_project):
+    """Test missing files read as None."""
+    with GitObjectStore(git_project) as store:
+        source = GitRefSource(store, "main")
+
+        assert source.read_text("ai/context/missing.md") is None
+        assert source.read_text("README.md/child") is None
+        assert not source.exists(".cursorrules")
+
+
+def test_export_refs_reuses_identical_renders(git_project, tmp_path, sample_rules):
+    """Test refs sharing canonical content are rendered once."""
+    out = tmp_path / "out"
+
+    summary = export_refs(git_project, ["v1", "v2"], ["cursor", "windsurf"], out)
+
+    assert summary.refs == ["v1", "v2"]
+    assert summary.rendered == 2
+    assert summary.reused == 2
+    assert (out / "v1" / ".cursorrules").read_text() == sample_rules
+    assert (out / "v2" / ".windsurf" / "config.yaml").exists()
+
+
+def test_export_refs_to_archive(git_project, tmp_path):
+    """Test export into a tar archive and skipping unknown refs."""
+    out = tmp_path / "refs.tar.gz"
+
+    summary = export_refs(git_project, ["v1", "nope"], ["vscode"], out)
+
+    assert "nope" in summary.skipped
+    with tarfile.open(out) as archive:
+        assert "v1/.vscode/AI_RULES.md" in archive.getnames()
+
+
+def test_export_refs_with_binary_blob(git_project, tmp_path):
+    """Test a blob that is not UTF-8 is decoded with replacements instead of failing."""
+    (git_project / "ai" / "context" / "rules.md").write_bytes(b"# Rules\n\n- Be \xff nice\n")
+    _git(git_project, "commit", "-q", "-am", "binary")
+
+    summary = export_refs(git_project, ["HEAD"], ["cursor"], tmp_path / "out")
+
+    assert summary.refs == ["HEAD"]
+    assert (
+        tmp_path / "out" / "HEAD" / ".cursorrules"
+    ).read_text() == "# Rules\n\n- Be \ufffd nice\n"
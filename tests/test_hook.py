@@ -0,0 +1,144 @@
+"""Tests for the pre-commit hook fast path."""
+
+import subprocess
+
+import pytest
+from typer.testing import CliRunner
+
+from ideporter.cli import app
+from ideporter.gitsource import blob_id
+from ideporter.hook import check_staged, staged_files
+
+runner = CliRunner()
+
+
+def _git(repo, *args):
+    return subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    ).stdout
+
+
+def _export(project, *targets):
+    args = ["export", "--path", str(project), "--force"]
+    for target in targets:
+        args += ["--to", target]
+    result = runner.invoke(app, args)
+    assert result.exit_code == 0, result.stdout
+
+
+@pytest.fixture
+def repo(temp_project, canonical_context, sample_rules):
+    """Create a committed project exported to Cursor and VS Code."""
+    (canonical_context.context_dir / "rules.md").write_text(sample_rules)
+    _export(temp_project, "cursor", "vscode")
+    _git(temp_project, "init", "-q", "-b", "main")
+    _git(temp_project, "add", "-A")
+    _git(temp_project, "commit", "-q", "-m", "initial")
+    return temp_project
+
+
+def test_nothing_staged(repo):
+    """Test the hook returns at once when no watched path is staged."""
+    (repo / "README.md").write_text("unrelated\n")
+    (repo / "ai" / "context" / "rules.md").write_text("# Unstaged edit\n")
+    _git(repo, "add", "README.md")
+
+    report = check_staged(repo)
+
+    assert report["in_sync"]
+    assert report["staged"] == [] and report["targets"] == []
+
+
+def test_staged_rules_without_export(repo):
+    """Test a staged rules change drifts from the committed artifacts."""
+    (repo / "ai" / "context" / "rules.md").write_text("# New rules\n")
+    _git(repo, "add", "ai/context/rules.md")
+
+    report = check_staged(repo)
+
+    assert not report["in_sync"]
+    assert set(report["targets"]) == {"cursor", "vscode"}
+    assert {(entry["adapter"], entry["path"]) for entry in report["drift"]} == {
+        ("cursor", ".cursorrules"),
+        ("vscode", ".vscode/AI_RULES.md"),
+    }
+
+    # Exporting without staging the result still fails; staging fixes it
+    _export(repo, "cursor", "vscode")
+    assert not check_staged(repo)["in_sync"]
+    _git(repo, "add", "-A")
+    assert check_staged(repo)["in_sync"]
+
+
+def test_staged_artifact_checks_only_its_adapter(repo):
+    """Test a hand-edited artifact only checks the adapter that owns it."""
+    (repo / ".cursorrules").write_text("edited by hand\n")
+    _git(repo, "add", ".cursorrules")
+
+    report = check_staged(repo)
+
+    assert report["targets"] == ["cursor"]
+    assert [entry["status"] for entry in report["drift"]] == ["modified"]
+
+
+def test_staged_deletion_is_missing(repo):
+    """Test deleting a tracked artifact in the index is reported."""
+    _git(repo, "rm", "-q", ".cursorrules")
+
+    report = check_staged(repo)
+
+    assert [(entry["path"], entry["status"]) for entry in report["drift"]] == [
+        (".cursorrules", "missing")
+    ]
+
+
+def test_untracked_artifacts_not_checked(temp_project, canonical_context):
+    """Test artifacts that are not in git are not part of the check."""
+    _export(temp_project, "cursor")
+    (temp_project / ".gitignore").write_text(".cursorrules\n.cursorignore\n")
+    _git(temp_project, "init", "-q", "-b", "main")
+    _git(temp_project, "add", "-A")
+
+    report = check_staged(temp_project)
+
+    assert report["staged"]  # before the first commit everything is staged
+    assert report["targets"] == ["cursor"]
+    assert report["in_sync"] and report["checked"] == 0
+
+
+def test_staged_paths_and_blob_ids(repo):
+    """Test staged paths come with the index blob ids git computes."""
+    (repo / ".cursorrules").write_text("new\n")
+    _git(repo, "add", ".cursorrules")
+
+    (change,) = staged_files(repo, [".cursorrules"])
+
+    assert (change.path, change.status) == (".cursorrules", "M")
+    assert change.oid == _git(repo, "hash-object", ".cursorrules").decode().strip()
+    assert change.oid == blob_id(b"new\n")
+
+
+def test_hook_command(repo):
+    """Test the hook command fails on drift and suggests the export."""
+    result = runner.invoke(app, ["hook", str(repo)])
+    assert result.exit_code == 0
+    assert "No affected" in result.stdout
+
+    (repo / "ai" / "context" / "rules.md").write_text("# New rules\n")
+    _git(repo, "add", "-A")
+    result = runner.invoke(app, ["hook", str(repo)])
+
+    assert result.exit_code == 1
+    assert ".cursorrules (cursor): modified in the index" in result.stdout
+    assert "export --to cursor --to vscode" in result.stdout
+
+
+def test_hook_outside_git(temp_project):
+    """Test the hook reports projects that are not in a git repository."""
+    report = check_staged(temp_project)
+
+    assert not report["in_sync"]
+    assert report["errors"]
@@ -0,0 +1,147 @@
+"""Tests for the batch checkpoint journal."""
+
+import asyncio
+import json
+import os
+import signal
+
+import pytest
+from typer.testing import CliRunner
+
+from ideporter.async_engine import IOScheduler, _handle_signals, export_project, run_batch
+from ideporter.canonical import CanonicalContext
+from ideporter.cli import app
+from ideporter.journal import Journal
+
+runner = CliRunner()
+
+
+def _fleet(root, count):
+    """Create projects with canonical contexts under root."""
+    paths = []
+    for i in range(count):
+        path = root / f"p{i}"
+        path.mkdir(parents=True)
+        CanonicalContext(path).initialize(dry_run=False)
+        (path / "ai" / "context" / "rules.md").write_text(f"# Rules {i}\n")
+        paths.append(path)
+    return paths
+
+
+def test_resume_skips_unchanged_projects(tmp_path):
+    """Test resume skips projects whose inputs and outputs are unchanged."""
+    paths = _fleet(tmp_path, 3)
+    journal_path = tmp_path / "journal.jsonl"
+
+    with Journal(journal_path) as journal:
+        first = run_batch(paths, ["cursor"], force=True, journal=journal)
+    assert not first.skipped
+    records = [json.loads(line) for line in journal_path.read_text().splitlines()]
+    assert {record["status"] for record in records} == {"ok"}
+    assert records[0]["outputs"].keys() >= {".cursorrules"}
+    assert "ai/context/rules.md" in records[0]["inputs"]
+
+    (paths[0] / "ai" / "context" / "rules.md").write_text("# Changed\n")
+    (paths[1] / ".cursorrules").write_text("edited by hand")
+    with Journal(journal_path) as journal:
+        second = run_batch(paths, ["cursor"], force=True, journal=journal, resume=True)
+
+    assert [result.skipped for result in second.results] == [False, False, True]
+    assert (paths[0] / ".cursorrules").read_text() == "# Changed\n"
+    assert (paths[1] / ".cursorrules").read_text() == "# Rules 1\n"
+
+    with Journal(journal_path) as journal:
+        assert not journal.completed(paths[2], ["cursor", "vscode"])
+        assert journal.completed(paths[2], ["cursor"])
+
+
+def test_failed_projects_are_retried(tmp_path):
+    """Test resume exports projects whose last record failed."""
+    (path,) = _fleet(tmp_path, 1)
+    journal_path = tmp_path / "journal.jsonl"
+    (path / "ai" / "context" / "rules.md").unlink()
+
+    with Journal(journal_path) as journal:
+        assert run_batch([path], ["cursor"], journal=journal).failed
+    assert json.loads(journal_path.read_text())["status"] == "failed"
+
+    (path / "ai" / "context" / "rules.md").write_text("# Back\n")
+    with Journal(journal_path) as journal:
+        summary = run_batch([path], ["cursor"], journal=journal, resume=True)
+    assert not summary.skipped and not summary.failed
+
+
+def test_torn_line_ignored(tmp_path):
+    """Test a partial last line from a killed run does not break loading."""
+    (path,) = _fleet(tmp_path, 1)
+    journal_path = tmp_path / "journal.jsonl"
+    with Journal(journal_path) as journal:
+        run_batch([path], ["cursor"], journal=journal)
+    with open(journal_path, "a") as f:
+        f.write('{"v": 1, "project": "/tr')
+
+    assert len(Journal(journal_path)) == 1
+
+
+def test_dry_run_not_journaled(tmp_path):
+    """Test previews leave no completion records."""
+    (path,) = _fleet(tmp_path, 1)
+    journal_path = tmp_path / "journal.jsonl"
+
+    with Journal(journal_path) as journal:
+        run_batch([path], ["cursor"], dry_run=True, journal=journal)
+
+    assert not journal_path.exists()
+
+
+def test_stopped_project_not_started(tmp_path):
+    """Test a project is abandoned once a stop is requested."""
+    (path,) = _fleet(tmp_path, 1)
+    journal = Journal(tmp_path / "journal.jsonl")
+
+    async def run():
+        stop = asyncio.Event()
+        stop.set()
+        async with IOScheduler() as scheduler:
+            return await export_project(path, ["cursor"], scheduler, journal=journal, stop=stop)
+
+    result = asyncio.run(run())
+
+    assert result.interrupted and not result.ok
+    assert not (path / ".cursorrules").exists()
+    assert not len(journal)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="the event loop cannot handle signals on Windows")
+def test_signal_sets_stop_once():
+    """Test the first SIGTERM requests a stop and removes the handlers."""
+
+    async def run():
+        stop = asyncio.Event()
+        restore = _handle_signals(stop)
+        try:
+            os.kill(os.getpid(), signal.SIGTERM)
+            await asyncio.wait_for(stop.wait(), 5)
+            return signal.getsignal(signal.SIGTERM)
+        finally:
+            restore()
+
+    assert asyncio.run(run()) == signal.SIG_DFL
+
+
+def test_batch_resume_cli(tmp_path, monkeypatch):
+    """Test batch --resume reports skipped projects."""
+    monkeypatch.chdir(tmp_path)
+    paths = [path.name for path in _fleet(tmp_path, 2)]
+
+    result = runner.invoke(app, ["batch", *paths, "--to", "cursor", "--journal", "j.jsonl"])
+    assert result.exit_code == 0, result.stdout
+    assert "Journal: j.jsonl" in result.stdout
+
+    result = runner.invoke(app, ["batch", *paths, "--to", "cursor", "--resume"])
+    assert "No journal entries" in result.stdout
+
+    result = runner.invoke(app, ["batch", *paths, "--to", "cursor", "--resume"])
+    assert result.exit_code == 0, result.stdout
+    assert "unchanged since journaled" in result.stdout
+    assert "Exported 0 projects (0 files), 2 skipped" in result.stdout
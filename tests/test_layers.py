@@ -0,0 +1,81 @@
+"""Tests for layered canonical context."""
+
+import json
+
+import pytest
+import yaml
+
+from ideporter.adapters.cursor import CursorAdapter
+from ideporter.adapters.vscode import VSCodeAdapter
+from ideporter.canonical import CanonicalContext
+from ideporter.layers import LayerError, LayerResolver
+
+
+@pytest.fixture
+def org_layer(tmp_path):
+    """Create an org-level layer."""
+    layer = tmp_path / "org" / "ai" / "context"
+    layer.mkdir(parents=True)
+    (layer / "rules.md").write_text("# Org Rules\n\n- Be kind\n")
+    (layer / "ignore.txt").write_text("node_modules/\nsecrets/\n")
+    (layer / "extensions.json").write_text(json.dumps({"recommendations": ["org.lint"]}))
+    return layer
+
+
+def _declare_layers(canonical, *layers):
+    manifest_file = canonical.context_dir / "manifest.yaml"
+    manifest = yaml.safe_load(manifest_file.read_text())
+    manifest["layers"] = [str(layer) for layer in layers]
+    manifest_file.write_text(yaml.safe_dump(manifest))
+
+
+def test_layers_merged_at_export(temp_project, canonical_context, org_layer):
+    """Test layer content is merged ahead of project content."""
+    (canonical_context.context_dir / "rules.md").write_text("# Project Rules\n")
+    _declare_layers(canonical_context, org_layer)
+
+    canonical = CanonicalContext(temp_project)
+    adapter = CursorAdapter(temp_project, source=canonical.file_source())
+    outputs = adapter.render_export(canonical.context_dir)
+
+    rules = outputs[temp_project / ".cursorrules"]
+    assert rules.index("# Org Rules") < rules.index("# Project Rules")
+    ignore = outputs[temp_project / ".cursorignore"].splitlines()
+    assert ignore.count("node_modules/") == 1
+    assert "secrets/" in ignore
+
+    vscode = VSCodeAdapter(temp_project, source=canonical.file_source())
+    extensions = vscode.render_export(canonical.context_dir)[
+        temp_project / ".vscode" / "extensions.json"
+    ]
+    assert json.loads(extensions)["recommendations"] == ["org.lint"]
+
+    # The project's own canonical files are untouched
+    assert (canonical.context_dir / "rules.md").read_text() == "# Project Rules\n"
+
+
+def test_resolver_parses_shared_layer_once(tmp_path, org_layer):
+    """Test identical layer content is parsed once across directories."""
+    copy = tmp_path / "copy"
+    copy.mkdir()
+    for item in org_layer.iterdir():
+        (copy / item.name).write_text(item.read_text())
+
+    resolver = LayerResolver()
+    first = resolver.load(org_layer)
+    assert resolver.load(org_layer) is first
+    assert resolver.load(copy) is first
+    assert resolver.misses == 1
+    assert resolver.hits == 2
+
+
+def test_missing_layer_fails_validation(temp_project, canonical_context, tmp_path):
+    """Test a missing layer is a validation issue."""
+    _declare_layers(canonical_context, tmp_path / "nowhere")
+
+    validation = CanonicalContext(temp_project).validate()
+
+    assert validation["valid"] is False
+    assert any("Layer not found" in issue for issue in validation["issues"])
+    with pytest.raises(LayerError):
+        CanonicalContext(temp_project).file_source()
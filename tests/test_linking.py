@@ -0,0 +1,92 @@
+"""Tests for link-mode exports."""
+
+import os
+
+import pytest
+
+from ideporter import api
+from ideporter.adapters.cursor import CursorAdapter
+from ideporter.adapters.vscode import VSCodeAdapter
+from ideporter.linking import is_linked, link_file, link_issues
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="symlinks need privileges on Windows")
+
+
+def test_symlink_export_reflects_canonical_edits(temp_project, canonical_context, sample_rules):
+    """Test symlinked IDE files show canonical edits without re-exporting."""
+    rules = canonical_context.context_dir / "rules.md"
+    rules.write_text(sample_rules)
+
+    CursorAdapter(temp_project).export_linked(canonical_context.context_dir, "symlink")
+
+    cursorrules = temp_project / ".cursorrules"
+    assert cursorrules.is_symlink()
+    assert os.readlink(cursorrules) == os.path.join("ai", "context", "rules.md")
+    rules.write_text(sample_rules + "\n- New rule\n")
+    assert cursorrules.read_text().endswith("- New rule\n")
+
+
+def test_hardlink_export(temp_project, canonical_context, sample_rules):
+    """Test hard links share the canonical file and re-exporting is a no-op."""
+    (canonical_context.context_dir / "rules.md").write_text(sample_rules)
+    adapter = VSCodeAdapter(temp_project)
+
+    adapter.export_linked(canonical_context.context_dir, "hardlink")
+    adapter.export_linked(canonical_context.context_dir, "hardlink")
+
+    ai_rules = temp_project / ".vscode" / "AI_RULES.md"
+    assert ai_rules.samefile(canonical_context.context_dir / "rules.md")
+    assert not list((temp_project / ".vscode").glob("*.bak"))
+
+
+def test_reflink_export_copies_content(temp_project, canonical_context, sample_rules):
+    """Test reflinks (or their copy fallback) produce an independent file."""
+    rules = canonical_context.context_dir / "rules.md"
+    rules.write_text(sample_rules)
+
+    used, _ = link_file(temp_project / ".cursorrules", rules, "reflink")
+
+    assert used in ("reflink", "copy")
+    assert (temp_project / ".cursorrules").read_text() == sample_rules
+    assert is_linked(temp_project / ".cursorrules", rules, "reflink")
+
+
+def test_link_backs_up_existing_file(temp_project, canonical_context, sample_rules):
+    """Test an existing regular file is backed up before being replaced by a link."""
+    rules = canonical_context.context_dir / "rules.md"
+    rules.write_text(sample_rules)
+    (temp_project / ".cursorrules").write_text("# Old rules\n")
+
+    _, backup = link_file(temp_project / ".cursorrules", rules, "symlink")
+
+    assert backup is not None and backup.read_text() == "# Old rules\n"
+    assert (temp_project / ".cursorrules").is_symlink()
+
+
+def test_writing_replaces_link_instead_of_writing_through(temp_project, canonical_context):
+    """Test a normal export over a symlink leaves the canonical file alone."""
+    rules = canonical_context.context_dir / "rules.md"
+    rules.write_text("# Rules\n")
+    link_file(temp_project / ".cursorrules", rules, "symlink")
+
+    CursorAdapter(temp_project).write_output(temp_project / ".cursorrules", "# Other\n", force=True)
+
+    assert rules.read_text() == "# Rules\n"
+    assert not (temp_project / ".cursorrules").is_symlink()
+
+
+def test_validate_reports_broken_links(temp_project, canonical_context, sample_rules):
+    """Test dangling symlinks fail validation."""
+    rules = canonical_context.context_dir / "rules.md"
+    rules.write_text(sample_rules)
+    context = canonical_context.context_dir / "context.md"
+    link_file(temp_project / ".cursorrules", rules, "symlink")
+    link_file(temp_project / ".vscode" / "AI_CONTEXT.md", context, "symlink")
+    context.unlink()
+
+    issues, _ = link_issues({temp_project / ".cursorrules": rules})
+    assert issues == []
+
+    result = api.validate(temp_project)
+    assert not result.valid
+    assert any("Broken link" in issue and "AI_CONTEXT.md" in issue for issue in result.issues)
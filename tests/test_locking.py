@@ -0,0 +1,133 @@
+"""Tests for advisory project locks."""
+
+import threading
+import time
+
+import pytest
+import yaml
+from typer.testing import CliRunner
+
+from ideporter import locking
+from ideporter.canonical import CanonicalContext
+from ideporter.cli import app
+from ideporter.locking import LockTimeoutError, lock_file, project_lock
+
+
+def _hold(project, exclusive, ready, release):
+    """Hold a lock from another thread until told to release it."""
+    with project_lock(project, exclusive=exclusive):
+        ready.set()
+        release.wait(5)
+
+
+@pytest.fixture
+def holder(temp_project):
+    """Start a thread holding the project lock; yields a function to start it."""
+    ready = threading.Event()
+    release = threading.Event()
+    threads = []
+
+    def start(exclusive):
+        thread = threading.Thread(target=_hold, args=(temp_project, exclusive, ready, release))
+        thread.start()
+        threads.append(thread)
+        assert ready.wait(5)
+        return release
+
+    yield start
+    release.set()
+    for thread in threads:
+        thread.join()
+
+
+def test_shared_locks_coexist(temp_project, holder):
+    """Test readers do not block each other."""
+    with project_lock(temp_project, exclusive=True):
+        pass
+    holder(exclusive=False)
+    with project_lock(temp_project, timeout=0):
+        pass
+
+
+def test_locks_live_outside_the_project(temp_project):
+    """Test locks only touch a private file in the user lock directory."""
+    with project_lock(temp_project):
+        pass
+    assert lock_file(temp_project).stat().st_mode & 0o777 == 0o600
+    assert list(temp_project.iterdir()) == []
+
+
+def test_exclusive_lock_times_out(temp_project, holder):
+    """Test a writer gives up after the timeout while a reader holds the lock."""
+    holder(exclusive=False)
+    timeouts = locking.STATS.timeouts
+    with pytest.raises(LockTimeoutError, match="exclusive lock"):
+        with project_lock(temp_project, exclusive=True, timeout=0.05):
+            pass
+    assert locking.STATS.timeouts == timeouts + 1
+
+
+def test_contended_wait_is_counted(temp_project, holder):
+    """Test waiting for a released lock succeeds and is recorded."""
+    release = holder(exclusive=True)
+    contended = locking.STATS.contended
+    threading.Timer(0.05, release.set).start()
+    with project_lock(temp_project, timeout=5):
+        pass
+    assert locking.STATS.contended == contended + 1
+    assert locking.STATS.wait_ns > 0
+
+
+def test_locks_are_reentrant(temp_project):
+    """Test nested locks of the same or a weaker mode are free and upgrades are refused."""
+    with project_lock(temp_project, exclusive=True):
+        with project_lock(temp_project, exclusive=True, timeout=0):
+            with project_lock(temp_project, timeout=0):
+                pass
+
+    with project_lock(temp_project):
+        with pytest.raises(RuntimeError, match="exclusive lock up front"):
+            with project_lock(temp_project, exclusive=True, timeout=0):
+                pass
+
+
+def test_concurrent_manifest_updates_keep_every_adapter(canonical_context, monkeypatch):
+    """Test parallel manifest updates do not lose each other's changes."""
+    original = CanonicalContext.updated_manifest
+
+    def slow(self, adapter_names):
+        # Widen the read-modify-write window so an unlocked update would be lost
+        manifest = original(self, adapter_names)
+        time.sleep(0.01)
+        return manifest
+
+    monkeypatch.setattr(CanonicalContext, "updated_manifest", slow)
+    names = [f"adapter{i}" for i in range(8)]
+    threads = [
+        threading.Thread(
+            target=CanonicalContext(canonical_context.base_path).update_manifest,
+            args=(name,),
+            kwargs={"force": True},
+        )
+        for name in names
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    manifest = yaml.safe_load((canonical_context.context_dir / "manifest.yaml").read_text())
+    assert set(names) <= set(manifest["adapters_used"])
+
+
+def test_read_only_commands_create_no_files(temp_project, canonical_context, user_dirs):
+    """Test check and validate leave the project untouched and only add the lock file."""
+    before = sorted(temp_project.rglob("*")), sorted(user_dirs.rglob("*"))
+    runner = CliRunner()
+    runner.invoke(app, ["check", str(temp_project)])
+    runner.invoke(app, ["validate", str(temp_project)])
+
+    lock = lock_file(temp_project)
+    created = set(user_dirs.rglob("*")) - set(before[1])
+    assert sorted(temp_project.rglob("*")) == before[0]
+    assert created <= {lock, *lock.parents}
@@ -0,0 +1,85 @@
+"""Tests for multi-source imports."""
+
+import yaml
+
+from ideporter.merge import merge_lines, merge_markdown, render_import_all
+
+
+def test_merge_markdown_drops_exact_and_whitespace_duplicates():
+    """Test duplicate paragraphs are kept once and annotated with their sources."""
+    merged, duplicates = merge_markdown(
+        [
+            ("cursor", "# AI Project Rules\n\n- Use type hints\n- Follow PEP 8\n\nCursor only\n"),
+            ("vscode", "# AI Project Rules\n\n- Use  type hints\n-   Follow PEP 8\n"),
+        ]
+    )
+
+    assert duplicates == 2
+    assert merged == (
+        "<!-- sources: cursor, vscode -->\n\n"
+        "# AI Project Rules\n\n"
+        "- Use type hints\n- Follow PEP 8\n\n"
+        "<!-- source: cursor -->\n\n"
+        "Cursor only\n"
+    )
+
+
+def test_merge_markdown_ignores_earlier_annotations():
+    """Test annotations from an earlier merge are not carried into the next one."""
+    first, _ = merge_markdown([("cursor", "A\n"), ("vscode", "B\n")])
+    again, _ = merge_markdown([("cursor", first), ("vscode", "B\n")])
+
+    assert again == "<!-- source: cursor -->\n\nA\n\n<!-- sources: cursor, vscode -->\n\nB\n"
+
+
+def test_merge_markdown_keeps_code_blocks_whole():
+    """Test blank lines inside code fences do not split paragraphs."""
+    merged, _ = merge_markdown([("cursor", "```\na\n\nb\n```\n"), ("vscode", "b\n")])
+
+    assert "```\na\n\nb\n```" in merged
+    assert merged.endswith("<!-- source: vscode -->\n\nb\n")
+
+
+def test_merge_markdown_keeps_repeats_within_a_source():
+    """Test paragraphs a source repeats are kept; only copies from other sources drop."""
+    cursor = "## Step 1\n\n```bash\nmake test\n```\n\n---\n\n## Step 2\n\n```bash\nmake test\n```\n\n---\n"
+    vscode = "```bash\nmake test\n```\n"
+
+    merged, duplicates = merge_markdown([("cursor", cursor), ("vscode", vscode)])
+
+    assert duplicates == 1
+    assert merged.count("make test") == 2
+    assert merged.count("---") == 2
+    assert merged.endswith("```bash\nmake test\n```\n\n---\n")
+    assert merge_markdown([("cursor", cursor)]) == (
+        "<!-- source: cursor -->\n\n" + cursor,
+        0,
+    )
+
+
+def test_merge_lines():
+    """Test ignore files keep each pattern once."""
+    assert merge_lines(["node_modules/\n*.log\n", "*.log\ndist/\n"]) == (
+        "node_modules/\n*.log\ndist/\n"
+    )
+
+
+def test_render_import_all(temp_project, sample_rules):
+    """Test every detected adapter is imported and the results merged."""
+    (temp_project / ".cursorrules").write_text(sample_rules)
+    (temp_project / ".vscode").mkdir()
+    (temp_project / ".vscode" / "AI_RULES.md").write_text(sample_rules + "\n- Extra rule\n")
+    (temp_project / ".windsurf").mkdir()
+    (temp_project / ".windsurf" / "config.yaml").write_text(yaml.safe_dump({"ai_rules": "["}))
+    (temp_project / ".continue").mkdir()
+    (temp_project / ".continue" / "config.json").write_text("{not json")
+    context_dir = temp_project / "ai" / "context"
+
+    merged = render_import_all(temp_project, context_dir)
+
+    assert merged.sources == ["cursor", "vscode", "windsurf"]
+    assert list(merged.errors) == ["continue"]
+    rules = merged.outputs[context_dir / "rules.md"]
+    assert rules.count("## Code Style") == 1
+    assert "<!-- source: vscode -->\n\n- Extra rule" in rules
+    assert "<!-- source: windsurf -->\n\n[" in rules
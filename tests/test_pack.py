@@ -0,0 +1,121 @@
+"""Tests for compiled canonical packs."""
+
+import json
+import os
+
+import pytest
+
+from ideporter.adapters.cursor import CursorAdapter
+from ideporter.canonical import CanonicalContext
+from ideporter.pack import CanonicalPack, PackError, build_pack, load_pack, pack_file
+
+
+def test_build_and_load_pack(canonical_context, sample_rules):
+    """Test a pack round-trips content and hashes."""
+    context_dir = canonical_context.context_dir
+    (context_dir / "rules.md").write_text(sample_rules)
+    (context_dir / "extensions.json").write_text(json.dumps({"recommendations": ["a.b"]}))
+    (context_dir / "context.md").unlink()
+
+    pack = CanonicalPack(build_pack(context_dir))
+
+    assert pack.read("rules.md") == sample_rules
+    assert pack.read("context.md") is None
+    assert json.loads(pack.read("extensions.json")) == {"recommendations": ["a.b"]}
+    assert pack.content_hash("rules.md") is not None
+    assert pack.is_fresh(context_dir)
+    pack.close()
+
+
+def test_pack_goes_stale_on_edit(canonical_context):
+    """Test editing, adding or removing a canonical file invalidates the pack."""
+    context_dir = canonical_context.context_dir
+    build_pack(context_dir)
+    assert load_pack(context_dir) is not None
+
+    (context_dir / "rules.md").write_text("# Edited Rules With Different Length\n")
+    assert load_pack(context_dir) is None
+
+    build_pack(context_dir)
+    (context_dir / "context.md").unlink()
+    assert load_pack(context_dir) is None
+
+
+def test_canonical_context_prefers_fresh_pack(canonical_context):
+    """Test CanonicalContext serves reads from a fresh pack."""
+    build_pack(canonical_context.context_dir)
+    canonical = CanonicalContext(canonical_context.base_path)
+
+    assert canonical.pack() is not None
+    assert canonical.get_ignore_patterns() == canonical_context.get_ignore_patterns()
+    assert canonical.get_extensions() == []
+    assert canonical.get_rules().startswith("# AI Project Rules")
+
+
+def test_export_reads_through_pack(temp_project, canonical_context, sample_rules):
+    """Test adapters render from the pack when it is fresh."""
+    (canonical_context.context_dir / "rules.md").write_text(sample_rules)
+    build_pack(canonical_context.context_dir)
+    canonical = CanonicalContext(temp_project)
+
+    adapter = CursorAdapter(temp_project, source=canonical.file_source())
+    outputs = adapter.render_export(canonical.context_dir)
+
+    assert outputs[temp_project / ".cursorrules"] == sample_rules
+
+
+def test_invalid_pack_is_ignored(canonical_context):
+    """Test a corrupt pack file falls back to disk reads."""
+    path = pack_file(canonical_context.context_dir)
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"garbage")
+
+    assert load_pack(canonical_context.context_dir) is None
+    assert CanonicalContext(canonical_context.base_path).get_rules()
+
+
+def test_pack_lives_outside_the_project(canonical_context, user_dirs):
+    """Test the pack is written to the user cache, not the canonical directory."""
+    before = sorted(canonical_context.base_path.rglob("*"))
+
+    built = build_pack(canonical_context.context_dir)
+
+    assert built.is_relative_to(user_dirs / "cache")
+    assert sorted(canonical_context.base_path.rglob("*")) == before
+
+
+def test_same_size_rewrite_right_after_build_is_stale(canonical_context):
+    """Test a file rewritten within the racy window is caught by its hash."""
+    context_dir = canonical_context.context_dir
+    rules = context_dir / "rules.md"
+    rules.write_text("# Rules A\n")
+    build_pack(context_dir)
+    stat = rules.stat()
+
+    rules.write_text("# Rules B\n")
+    os.utime(rules, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert load_pack(context_dir) is None
+
+
+def test_old_files_are_not_rehashed(canonical_context, monkeypatch):
+    """Test files older than the racy window are trusted by size and mtime."""
+    context_dir = canonical_context.context_dir
+    for path in context_dir.iterdir():
+        os.utime(path, (1_000_000, 1_000_000))
+    pack = CanonicalPack(build_pack(context_dir))
+
+    def fail(*args):
+        raise AssertionError("old file was re-read")
+
+    monkeypatch.setattr(CanonicalPack, "_same_content", fail)
+    assert pack.is_fresh(context_dir)
+    pack.close()
+
+
+def test_non_utf8_file_is_rejected(canonical_context):
+    """Test a canonical file that is not UTF-8 raises PackError."""
+    (canonical_context.context_dir / "rules.md").write_bytes(b"# Rules \xff\n")
+
+    with pytest.raises(PackError, match="rules.md is not valid UTF-8"):
+        build_pack(canonical_context.context_dir)
@@ -0,0 +1,175 @@
+"""Tests for planned operations and the apply engine."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from ideporter import fsio
+from ideporter.adapters.base import BaseAdapter
+from ideporter.adapters.cursor import CursorAdapter
+from ideporter.adapters.vscode import VSCodeAdapter
+from ideporter.plan import Operation, PlanError, apply_plan, write_operations
+from ideporter.utils import content_hash
+
+
+def test_plan_is_pure(temp_project, canonical_context, sample_rules):
+    """Test planning renders operations without touching IDE files."""
+    (canonical_context.context_dir / "rules.md").write_text(sample_rules)
+
+    operations = CursorAdapter(temp_project).plan(canonical_context.context_dir)
+
+    assert [op.path for op in operations] == [
+        temp_project / ".cursorrules",
+        temp_project / ".cursorignore",
+    ]
+    assert operations[0].content == sample_rules
+    assert operations[0].mode == "write"
+    assert operations[0].adapter == "cursor"
+    assert operations[0].sources["ai/context/rules.md"] == content_hash(sample_rules)
+    assert "ai/context/ignore.txt" in operations[0].sources
+    assert not (temp_project / ".cursorrules").exists()
+    assert not (temp_project / ".cursorignore").exists()
+
+
+def test_plan_import(temp_project, canonical_context):
+    """Test import plans target the canonical directory."""
+    (temp_project / ".cursorrules").write_text("Be concise")
+
+    operations = CursorAdapter(temp_project).plan(canonical_context.context_dir, "import")
+
+    assert [op.path for op in operations] == [canonical_context.context_dir / "rules.md"]
+    assert operations[0].content == "# AI Project Rules\n\nBe concise"
+
+
+def test_apply_skips_current_files(temp_project, capsys):
+    """Test files that already hold the planned content are not rewritten."""
+    target = temp_project / "out.txt"
+    target.write_text("same")
+    mtime = target.stat().st_mtime_ns
+
+    applied = apply_plan([Operation(target, "same")], force=True)
+
+    assert applied[0].outcome == "unchanged"
+    assert not applied[0].changed
+    assert target.stat().st_mtime_ns == mtime
+    assert "Unchanged" in capsys.readouterr().out
+
+
+def test_apply_dedupes_and_rejects_conflicts(temp_project):
+    """Test repeated operations apply once and conflicting ones fail before writing."""
+    target = temp_project / "out.txt"
+    applied = apply_plan(
+        [Operation(target, "a", adapter="one"), Operation(target, "a", adapter="two")],
+        force=True,
+    )
+    assert len(applied) == 1
+    assert target.read_text() == "a"
+
+    other = temp_project / "other.txt"
+    with pytest.raises(PlanError, match="one and two"):
+        apply_plan(
+            [
+                Operation(other, "x", adapter="one"),
+                Operation(target, "b", adapter="one"),
+                Operation(target, "c", adapter="two"),
+            ]
+        )
+    assert not other.exists()
+    assert target.read_text() == "a"
+
+
+def test_apply_parallel_reports_in_plan_order(temp_project, capsys):
+    """Test parallel writes land on disk and are reported in plan order."""
+    outputs = {temp_project / "nested" / f"file{i}.txt": f"content {i}" for i in range(12)}
+
+    with fsio.operation():
+        applied = apply_plan(write_operations(outputs), force=True, workers=4)
+
+    assert [a.operation.path for a in applied] == list(outputs)
+    assert all(a.outcome == "written" for a in applied)
+    for path, content in outputs.items():
+        assert path.read_text() == content
+    printed = capsys.readouterr().out.replace("\n", "")
+    positions = [printed.index(f"file{i}.txt") for i in range(12)]
+    assert positions == sorted(positions)
+
+
+def test_apply_dry_run(temp_project):
+    """Test dry runs report would-be writes without writing."""
+    target = temp_project / "out.txt"
+
+    applied = apply_plan([Operation(target, "new")], dry_run=True)
+
+    assert applied[0].outcome == "would_write"
+    assert not target.exists()
+
+
+@pytest.mark.skipif(os.name == "nt", reason="symlinks need privileges on Windows")
+def test_links_applied_after_writes(temp_project):
+    """Test links are made after the writes that create their targets."""
+    canonical = temp_project / "rules.md"
+    link = temp_project / ".cursorrules"
+
+    applied = apply_plan(
+        [Operation(link, "rules", mode="symlink", target=canonical), Operation(canonical, "rules")],
+        force=True,
+    )
+
+    assert [a.outcome for a in applied] == ["linked", "written"]
+    assert link.is_symlink()
+    assert link.read_text() == "rules"
+
+
+@pytest.mark.skipif(os.name == "nt", reason="symlinks need privileges on Windows")
+def test_plan_linked(temp_project, canonical_context, sample_rules):
+    """Test outputs mirroring a canonical file are planned as links."""
+    (canonical_context.context_dir / "rules.md").write_text(sample_rules)
+    (canonical_context.context_dir / "context.md").write_text("# Context\n")
+
+    operations = VSCodeAdapter(temp_project).plan_linked(canonical_context.context_dir, "symlink")
+
+    modes = {op.path.name: op.mode for op in operations}
+    assert modes["AI_RULES.md"] == "symlink"
+    assert not (temp_project / ".vscode").exists()
+
+
+class LegacyAdapter(BaseAdapter):
+    """Adapter written before plan() existed: it only overrides the write path."""
+
+    @property
+    def name(self) -> str:
+        return "legacy"
+
+    def detect(self) -> bool:
+        return True
+
+    def export_context(
+        self, canonical_dir: Path, force: bool = False, dry_run: bool = False
+    ) -> None:
+        self.write_output(self.project_path / "LEGACY.md", "# Legacy\n", force=force)
+
+
+class RenderOnlyAdapter(BaseAdapter):
+    """Adapter that only renders and relies on the default import/export."""
+
+    @property
+    def name(self) -> str:
+        return "render-only"
+
+    def detect(self) -> bool:
+        return True
+
+    def render_export(self, canonical_dir: Path) -> dict[Path, str]:
+        return {self.project_path / "RENDERED.md": "# Rendered\n"}
+
+
+def test_legacy_adapters_keep_working(temp_project, canonical_context):
+    """Test adapters that override export_context or only render both still export."""
+    LegacyAdapter(temp_project).export_context(canonical_context.context_dir, force=True)
+    RenderOnlyAdapter(temp_project).export_context(canonical_context.context_dir, force=True)
+
+    assert (temp_project / "LEGACY.md").read_text() == "# Legacy\n"
+    assert (temp_project / "RENDERED.md").read_text() == "# Rendered\n"
+    with pytest.raises(NotImplementedError):
+        LegacyAdapter(temp_project).plan(canonical_context.context_dir)
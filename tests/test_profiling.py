@@ -0,0 +1,69 @@
+"""Tests for profiling instrumentation."""
+
+import json
+
+from ideporter.adapters.cursor import CursorAdapter
+from ideporter.profiling import PROFILER, Profiler, phase, profiled
+from ideporter.utils import safe_write
+
+
+def test_disabled_profiler_records_nothing(tmp_path):
+    """Test instrumented calls cost nothing observable when disabled."""
+    PROFILER.reset()
+    safe_write(tmp_path / "file.txt", "content")
+    assert PROFILER.report() == []
+
+
+def test_profiled_records_phases(temp_project, canonical_context, sample_rules):
+    """Test adapter and utility phases are recorded while enabled."""
+    (canonical_context.context_dir / "rules.md").write_text(sample_rules)
+    PROFILER.enable()
+    try:
+        CursorAdapter(temp_project).export_context(canonical_context.context_dir, force=True)
+        with phase("custom"):
+            pass
+    finally:
+        PROFILER.disable()
+
+    stats = {s.name: s for s in PROFILER.report()}
+    assert stats["cursor.export_context"].calls == 1
+    assert stats["cursor.render_export"].calls == 1
+    assert stats["plan.apply"].calls == 1
+    assert stats["utils.write_file"].calls == 2
+    assert "custom" in stats
+    assert PROFILER.counters["bytes_written"] >= len(sample_rules)
+    PROFILER.reset()
+
+
+def test_write_trace(tmp_path):
+    """Test trace output is in Chrome trace-event format."""
+    profiler = Profiler()
+    profiler.enable()
+    profiler.record("phase", "test", profiler._origin_ns, 2000)
+
+    trace_file = tmp_path / "trace.json"
+    profiler.write_trace(trace_file)
+
+    event = json.loads(trace_file.read_text())["traceEvents"][0]
+    assert event["name"] == "phase"
+    assert event["ph"] == "X"
+    assert event["dur"] == 2.0
+
+
+def test_profiled_preserves_exceptions():
+    """Test failing calls are still timed and re-raise."""
+
+    @profiled("fails")
+    def fails():
+        raise RuntimeError("boom")
+
+    PROFILER.enable()
+    try:
+        try:
+            fails()
+        except RuntimeError:
+            pass
+        assert PROFILER.stats["fails"].calls == 1
+    finally:
+        PROFILER.disable()
+        PROFILER.reset()
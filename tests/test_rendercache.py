@@ -0,0 +1,108 @@
+"""Tests for the shared render cache."""
+
+import json
+import os
+
+from ideporter.adapters.continue_adapter import ContinueAdapter
+from ideporter.adapters.cursor import CursorAdapter
+from ideporter.async_engine import run_batch
+from ideporter.canonical import CanonicalContext
+from ideporter.rendercache import RenderCache
+
+
+def _project(root, name, rules="# Rules\n\n## Style\n- Use type hints\n"):
+    """Create a project with an initialized canonical context."""
+    project = root / name
+    project.mkdir()
+    canonical = CanonicalContext(project)
+    canonical.initialize()
+    (canonical.context_dir / "rules.md").write_text(rules)
+    return project
+
+
+def _render(cache, adapter_class, project):
+    """Render an adapter's export through the cache."""
+    return cache.render_export(adapter_class(project), project / "ai" / "context")
+
+
+def test_identical_inputs_reuse_the_render(tmp_path):
+    """Test a second project with the same rules is served from the cache."""
+    cache = RenderCache(tmp_path / "cache")
+    one = _project(tmp_path, "one")
+    two = _project(tmp_path, "two")
+
+    first = _render(cache, CursorAdapter, one)
+    second = _render(cache, CursorAdapter, two)
+
+    assert cache.stats.misses == 1
+    assert cache.stats.hits == 1
+    assert second == CursorAdapter(two).render_export(two / "ai" / "context")
+    assert set(second) == {two / path.relative_to(one) for path in first}
+
+
+def test_changed_rules_or_version_miss(tmp_path, monkeypatch):
+    """Test different canonical content or adapter version is rendered again."""
+    cache = RenderCache(tmp_path / "cache")
+    one = _project(tmp_path, "one")
+    other = _project(tmp_path, "other", rules="# Other rules\n")
+
+    _render(cache, CursorAdapter, one)
+    _render(cache, CursorAdapter, other)
+    monkeypatch.setattr(CursorAdapter, "version", "2")
+    _render(cache, CursorAdapter, one)
+
+    assert cache.stats.hits == 0
+    assert cache.stats.misses == 3
+
+
+def test_existing_target_config_is_part_of_the_key(tmp_path):
+    """Test renders that merge into an existing config only match that config."""
+    cache = RenderCache(tmp_path / "cache")
+    projects = [_project(tmp_path, name) for name in ("one", "two", "three")]
+    configs = [{"customCommands": [{"name": "a"}]}, {"customCommands": [{"name": "b"}]}]
+    for project, config in zip(projects, [configs[0], configs[1], configs[0]], strict=True):
+        (project / ".continue").mkdir()
+        (project / ".continue" / "config.json").write_text(json.dumps(config))
+
+    rendered = [_render(cache, ContinueAdapter, project) for project in projects]
+
+    assert (cache.stats.hits, cache.stats.misses) == (1, 2)
+    for project, outputs in zip(projects, rendered, strict=True):
+        assert outputs == ContinueAdapter(project).render_export(project / "ai" / "context")
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    """Test pruning keeps the most recently used entries within the size limit."""
+    cache = RenderCache(tmp_path / "cache")
+    projects = [_project(tmp_path, f"p{i}", rules=f"# Rules {i}\n") for i in range(3)]
+    for project in projects:
+        _render(cache, CursorAdapter, project)
+
+    entries = sorted((tmp_path / "cache").glob("*/*.json"))
+    for age, entry in enumerate(entries):
+        os.utime(entry, (1000 + age, 1000 + age))
+    _render(cache, CursorAdapter, projects[0])  # a hit refreshes its entry
+    newest = {entry for entry in entries if entry.stat().st_mtime > 2000}
+
+    cache.max_bytes = max(entry.stat().st_size for entry in entries) + 1
+    assert cache.prune() == 2
+    assert set((tmp_path / "cache").glob("*/*.json")) == newest
+    assert cache.stats.evictions == 2
+
+
+def test_batch_reports_cache_stats(tmp_path):
+    """Test batch exports share renders and report hit/miss counts."""
+    projects = [_project(tmp_path, name) for name in ("one", "two", "three")]
+    cache = RenderCache(tmp_path / "cache")
+
+    summary = run_batch(projects, ["cursor"], force=True, render_cache=cache)
+
+    assert not summary.failed
+    assert summary.cache is cache.stats
+    # Concurrent renders may all miss before the first is stored
+    assert summary.cache.hits + summary.cache.misses == 3
+    assert all((project / ".cursorrules").exists() for project in projects)
+
+    rerun = run_batch(projects, ["cursor"], force=True, render_cache=RenderCache(cache.directory))
+    assert rerun.cache is not None
+    assert (rerun.cache.hits, rerun.cache.misses) == (3, 0)
@@ -0,0 +1,92 @@
+"""Tests for the section-level markdown model."""
+
+from ideporter.sections import diff_sections, parse_sections, strip_title
+
+DOCUMENT = """Preamble line
+
+# AI Project Rules
+
+## Style
+
+- Use black
+
+### Naming
+
+- snake_case
+
+## Testing
+
+```python
+# not a heading
+```
+
+## Testing
+"""
+
+
+def test_parse_round_trips_and_keys_by_heading_path():
+    """Test sections reproduce the document and are keyed by heading path."""
+    tree = parse_sections(DOCUMENT)
+
+    assert tree.text == DOCUMENT
+    assert [section.key for section in tree.sections] == [
+        (),
+        ("AI Project Rules",),
+        ("AI Project Rules", "Style"),
+        ("AI Project Rules", "Style", "Naming"),
+        ("AI Project Rules", "Testing"),
+        ("AI Project Rules", "Testing #2"),
+    ]
+    assert "# not a heading" in tree.get(("AI Project Rules", "Testing")).text
+
+
+def test_parse_is_cached_by_content():
+    """Test identical content reuses the parsed tree."""
+    assert parse_sections(DOCUMENT) is parse_sections(str(DOCUMENT))
+
+
+def test_blocks_group_children_of_the_title():
+    """Test blocks are the title's direct children, each spanning its subsections."""
+    tree = parse_sections(DOCUMENT)
+    blocks = tree.blocks()
+
+    assert tree.title == "AI Project Rules"
+    assert [block.id for block in blocks] == [
+        "",
+        "AI Project Rules > Style",
+        "AI Project Rules > Testing",
+        "AI Project Rules > Testing #2",
+    ]
+    assert "snake_case" in blocks[1].text
+    assert "".join(block.text for block in blocks) == DOCUMENT
+
+
+def test_blocks_without_headings():
+    """Test a document without headings is a single block."""
+    blocks = parse_sections("Just text\n").blocks()
+
+    assert len(blocks) == 1
+    assert blocks[0].text == "Just text\n"
+
+
+def test_diff_sections():
+    """Test a one-line edit only marks its own section as changed."""
+    edited = DOCUMENT.replace("snake_case", "camelCase").replace("## Testing\n", "", 1)
+    edited += "\n## Docs\n"
+
+    diff = diff_sections(DOCUMENT, edited)
+
+    assert diff.changed == [
+        ("AI Project Rules", "Style", "Naming"),
+        ("AI Project Rules", "Testing"),
+    ]
+    assert diff.added == [("AI Project Rules", "Docs")]
+    assert diff.removed == [("AI Project Rules", "Testing #2")]
+    assert ("AI Project Rules", "Style") in diff.unchanged
+
+
+def test_strip_title():
+    """Test the leading title line is stripped."""
+    assert strip_title("# Title\n\n## Rule\n\nText\n") == "## Rule\n\nText"
+    assert strip_title("No title\n") == "No title\n"
+    assert strip_title("# Only a title") == "# Only a title"
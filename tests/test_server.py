@@ -0,0 +1,102 @@
+"""Tests for the JSON-lines stdio protocol."""
+
+import io
+import json
+import threading
+import time
+
+from ideporter.server import handle_request, serve
+
+
+def _serve(lines, **kwargs):
+    stdout = io.StringIO()
+    stdin = io.StringIO("".join(json.dumps(line) + "\n" for line in lines))
+    serve(stdin, stdout, **kwargs)
+    return [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+
+def test_serve_export_and_validate(temp_project, canonical_context, sample_rules):
+    """Test requests are executed and answered in order."""
+    (canonical_context.context_dir / "rules.md").write_text(sample_rules)
+    path = str(temp_project)
+
+    responses = _serve(
+        [
+            {"id": 1, "op": "validate", "path": path},
+            {
+                "id": 2,
+                "op": "export",
+                "path": path,
+                "targets": ["cursor"],
+                "flags": {"force": True},
+            },
+            {"id": 3, "op": "check", "path": path, "targets": ["cursor"]},
+            {"id": 4, "op": "detect", "path": path},
+        ]
+    )
+
+    assert [r["id"] for r in responses] == [1, 2, 3, 4]
+    assert all(r["ok"] for r in responses)
+    written = responses[1]["result"]["adapters"][0]["files"]
+    assert written[0]["path"].endswith(".cursorrules")
+    assert responses[3]["result"]["cursor"] is True
+
+
+def test_serve_reports_errors_per_line(temp_project):
+    """Test malformed requests get error responses without stopping the server."""
+    stdout = io.StringIO()
+    stdin = io.StringIO(
+        "not json\n"
+        + json.dumps({"id": "a", "op": "explode", "path": str(temp_project)})
+        + "\n"
+        + json.dumps({"id": "b", "op": "export", "path": str(temp_project), "targets": ["x"]})
+        + "\n"
+        + json.dumps({"id": "c", "op": "detect", "path": str(temp_project)})
+        + "\n"
+    )
+
+    assert serve(stdin, stdout) == 4
+
+    responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert [r["ok"] for r in responses] == [False, False, False, True]
+    assert "Invalid JSON" in responses[0]["error"]
+    assert "Unknown op" in responses[1]["error"]
+    assert "Unknown adapter" in responses[2]["error"]
+
+
+def test_serve_keeps_order_and_serializes_per_project():
+    """Test responses keep request order while same-project requests never overlap."""
+    lock = threading.Lock()
+    active: dict[str, int] = {}
+    overlaps = []
+
+    def handler(request):
+        with lock:
+            active[request["path"]] = active.get(request["path"], 0) + 1
+            if active[request["path"]] > 1:
+                overlaps.append(request["id"])
+        # Later requests finish first, to prove responses are reordered
+        time.sleep(0.05 if request["id"] < 2 else 0.001)
+        with lock:
+            active[request["path"]] -= 1
+        return {"id": request["id"], "ok": True}
+
+    responses = _serve(
+        [{"id": i, "path": f"/p{i % 2}"} for i in range(8)], workers=4, handler=handler
+    )
+
+    assert [r["id"] for r in responses] == list(range(8))
+    assert overlaps == []
+
+
+def test_handle_request_convert(temp_project, sample_rules):
+    """Test convert returns both halves of the operation."""
+    (temp_project / ".cursorrules").write_text(sample_rules)
+
+    response = handle_request(
+        {"id": 7, "op": "convert", "path": str(temp_project), "targets": ["cursor", "vscode"]}
+    )
+
+    assert response["ok"] is True
+    assert response["result"]["import"]["ok"] is True
+    assert (temp_project / ".vscode" / "AI_RULES.md").exists()
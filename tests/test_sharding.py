@@ -0,0 +1,117 @@
+"""Tests for sharding fleet runs across runners."""
+
+import pytest
+from typer.testing import CliRunner
+
+from ideporter.canonical import CanonicalContext
+from ideporter.cli import app
+from ideporter.sharding import Shard, assign, canonical_weight, select, shard_key
+from ideporter.workspace import sync_workspace
+
+runner = CliRunner()
+
+KEYS = [f"services/svc-{i:03d}" for i in range(400)]
+
+
+def test_shards_partition_projects():
+    """Test every project lands in exactly one shard, in its original order."""
+    shards = [select(KEYS, Shard(i, 4), key=str) for i in range(4)]
+
+    assert sorted(key for shard in shards for key in shard) == sorted(KEYS)
+    assert all(shard == sorted(shard) for shard in shards)
+    assert all(70 <= len(shard) <= 130 for shard in shards)
+
+
+def test_assignment_stable_as_fleet_changes():
+    """Test adding projects or a shard moves few existing assignments."""
+    before = dict(zip(KEYS, assign(KEYS, 4), strict=True))
+    grown = KEYS + [f"apps/app-{i}" for i in range(50)]
+    after = dict(zip(grown, assign(grown, 4), strict=True))
+    assert all(after[key] == shard for key, shard in before.items())
+
+    five = dict(zip(KEYS, assign(KEYS, 5), strict=True))
+    moved = sum(five[key] != shard for key, shard in before.items())
+    assert moved < len(KEYS) * 0.35
+
+
+def test_size_weighted_balances_load():
+    """Test size-weighted assignment spreads a few heavy projects out."""
+    weights = [100_000 if i < 8 else 1_000 for i in range(len(KEYS))]
+
+    shards = assign(KEYS, 4, weights)
+
+    loads = [sum(w for w, s in zip(weights, shards, strict=True) if s == i) for i in range(4)]
+    assert max(loads) <= 1.25 * sum(weights) / 4
+    assert assign(list(reversed(KEYS)), 4, list(reversed(weights))) == shards[::-1]
+
+
+def test_invalid_shard():
+    """Test shard indices outside the count are rejected."""
+    with pytest.raises(ValueError, match="between 0 and 2"):
+        Shard(3, 3)
+    with pytest.raises(ValueError, match="at least 1"):
+        Shard(0, 0)
+
+
+def test_keys_relative_to_root(tmp_path):
+    """Test keys do not depend on where the fleet is checked out."""
+    assert shard_key(tmp_path / "a" / "b", tmp_path) == "a/b"
+    assert shard_key(tmp_path / "x", tmp_path / "a") == (tmp_path / "x").as_posix()
+
+
+def test_canonical_weight(temp_project, canonical_context):
+    """Test weight grows with the canonical files."""
+    before = canonical_weight(temp_project)
+    (canonical_context.context_dir / "rules.md").write_text("x" * 10_000)
+
+    assert canonical_weight(temp_project) > before + 9_000
+    assert canonical_weight(temp_project / "missing") == canonical_weight(temp_project / "none")
+
+
+def _fleet(root, count):
+    """Create projects with canonical contexts under root."""
+    paths = []
+    for i in range(count):
+        path = root / f"p{i}"
+        path.mkdir(parents=True)
+        CanonicalContext(path).initialize(dry_run=False)
+        paths.append(path)
+    return paths
+
+
+def test_batch_shards(tmp_path, monkeypatch):
+    """Test batch runners export disjoint shards covering every project."""
+    monkeypatch.chdir(tmp_path)
+    paths = _fleet(tmp_path, 6)
+
+    exported = []
+    for index in range(3):
+        args = ["batch", *map(str, paths), "--to", "cursor"]
+        args += ["--shard-index", str(index), "--shard-count", "3", "--force"]
+        result = runner.invoke(app, args)
+        assert result.exit_code == 0, result.stdout
+        assert f"Shard {index + 1}/3" in result.stdout
+    for path in paths:
+        if (path / ".cursorrules").exists():
+            exported.append(path)
+
+    assert exported == paths
+
+    result = runner.invoke(app, ["batch", str(paths[0]), "--to", "cursor", "--shard-index", "1"])
+    assert result.exit_code == 1
+    assert "between 0 and 0" in result.stdout
+
+
+def test_workspace_sync_shard(tmp_path):
+    """Test a workspace shard syncs only its projects."""
+    _fleet(tmp_path, 6)
+    workspace_file = tmp_path / "ideporter.workspace.yaml"
+    workspace_file.write_text("targets: [cursor]\nprojects: ['p*']\n")
+
+    synced = []
+    for index in range(2):
+        summary = sync_workspace(workspace_file, force=True, shard=Shard(index, 2))
+        assert summary.discovered == 6
+        synced += [project.path.name for project in summary.projects]
+
+    assert sorted(synced) == [f"p{i}" for i in range(6)]
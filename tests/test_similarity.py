@@ -0,0 +1,180 @@
+"""Tests for fleet-wide similarity analysis."""
+
+import json
+import random
+import sys
+
+import pytest
+from typer.testing import CliRunner
+
+from ideporter.cli import app
+from ideporter.similarity import (
+    MinHasher,
+    SimilarityError,
+    analyze_documents,
+    cluster_signatures,
+    lsh_params,
+    read_documents,
+    shingle_hashes,
+)
+
+runner = CliRunner()
+
+VOCABULARY = [f"word{i}" for i in range(1000)]
+
+
+def _text(rng, words=300):
+    return " ".join(rng.choices(VOCABULARY, k=words))
+
+
+def _edit(rng, text, edits):
+    words = text.split()
+    for _ in range(edits):
+        words[rng.randrange(len(words))] = "edited"
+    return " ".join(words)
+
+
+def test_lsh_params():
+    """Test bands and rows put the LSH threshold at or below the target."""
+    bands, rows = lsh_params(128, 0.8)
+    assert bands * rows <= 128
+    assert (1 / bands) ** (1 / rows) <= 0.8
+    # The next longer band would raise it above the target
+    assert (1 / (128 // (rows + 1))) ** (1 / (rows + 1)) > 0.8
+
+
+def test_shingles_ignore_case_and_whitespace():
+    """Test reflowed or recased copies hash to the same shingles."""
+    pytest.importorskip("numpy")
+    first = shingle_hashes("Use type hints\nand   PEP 8 everywhere", size=3)
+    second = shingle_hashes("use TYPE hints and pep 8 everywhere", size=3)
+
+    assert list(first) == list(second)
+    assert len(first) == 5
+    assert len(shingle_hashes("too short", size=3)) == 1
+    assert len(shingle_hashes("  \n", size=3)) == 0
+
+
+def test_signatures_estimate_jaccard():
+    """Test the share of equal signature values tracks the Jaccard similarity."""
+    pytest.importorskip("numpy")
+    rng = random.Random(0)
+    base = _text(rng, 1000)
+    edited = _edit(rng, base, 20)
+    hasher = MinHasher(num_perm=256)
+
+    sigs = hasher.signatures([shingle_hashes(base), shingle_hashes(edited)])
+    first, second = (set(shingle_hashes(text).tolist()) for text in (base, edited))
+    exact = len(first & second) / len(first | second)
+
+    assert abs((sigs[0] == sigs[1]).mean() - exact) < 0.1
+    # Batching documents together gives the same signatures as one at a time
+    assert (hasher.signatures([shingle_hashes(edited)])[0] == sigs[1]).all()
+
+
+def test_clusters_and_drift():
+    """Test near-duplicates cluster together and drift is scored against the template."""
+    pytest.importorskip("numpy")
+    rng = random.Random(1)
+    template = _text(rng)
+    other = _text(rng)
+    documents = {
+        "copy": template,
+        "tweaked": _edit(rng, template, 1),
+        "drifted": _edit(rng, template, 40),
+        "other": other,
+        "other-copy": other.upper(),
+        "blank": "",
+    }
+
+    report = analyze_documents(documents, template=template)
+
+    clusters = {frozenset(member.path for member in cluster.members) for cluster in report.clusters}
+    assert clusters == {
+        frozenset({"copy", "tweaked"}),
+        frozenset({"other", "other-copy"}),
+        frozenset({"drifted"}),
+    }
+    assert report.empty == ["blank"]
+    assert report.drift["copy"] == 0
+    assert report.drift["tweaked"] < report.drift["drifted"] < report.drift["other"]
+    assert report.to_dict()["drift"][0]["path"] in ("other", "other-copy")
+
+
+def test_drift_without_template_uses_cluster():
+    """Test drift falls back to the cluster's most copied version."""
+    pytest.importorskip("numpy")
+    rng = random.Random(2)
+    text = _text(rng)
+    documents = {"a": text, "b": text, "c": _edit(rng, text, 1), "d": _text(rng)}
+
+    report = analyze_documents(documents)
+
+    assert report.drift["a"] == report.drift["b"] == report.drift["d"] == 0
+    assert 0 < report.drift["c"] < 0.2
+
+
+def test_cluster_labels_scale():
+    """Test thousands of projects from a few templates are clustered by template."""
+    np = pytest.importorskip("numpy")
+    rng = random.Random(3)
+    templates = [_text(rng) for _ in range(5)]
+    origin = [rng.randrange(5) for _ in range(2000)]
+    documents = [_edit(rng, templates[i], rng.randrange(3)) for i in origin]
+
+    hasher = MinHasher()
+    labels, _, _ = cluster_signatures(
+        hasher.signatures([shingle_hashes(text) for text in documents])
+    )
+
+    assert len(np.unique(labels)) == 5
+    assert all(
+        len({labels[j] for j in range(len(origin)) if origin[j] == i}) == 1 for i in range(5)
+    )
+
+
+def test_missing_numpy(monkeypatch):
+    """Test a clear error when the analysis extra is not installed."""
+    monkeypatch.setitem(sys.modules, "numpy", None)
+
+    with pytest.raises(SimilarityError, match=r"ide-context-porter\[analysis\]"):
+        analyze_documents({"a": "text"})
+
+
+def test_read_documents(tmp_path):
+    """Test projects are read as their concatenated canonical files."""
+    context = tmp_path / "p" / "ai" / "context"
+    context.mkdir(parents=True)
+    (context / "rules.md").write_text("rules")
+    (context / "context.md").write_text("context")
+
+    documents = read_documents([tmp_path / "p", tmp_path / "missing"])
+
+    assert documents == {str(tmp_path / "p"): "rules\n\ncontext", str(tmp_path / "missing"): ""}
+
+
+def test_analyze_similarity_cli(tmp_path, monkeypatch):
+    """Test analyze similarity reports clusters and drift as JSON."""
+    pytest.importorskip("numpy")
+    monkeypatch.chdir(tmp_path)
+    rng = random.Random(4)
+    template = _text(rng)
+    (tmp_path / "template.md").write_text(template)
+    for name, text in [("a", template), ("b", template), ("c", _text(rng))]:
+        context = tmp_path / name / "ai" / "context"
+        context.mkdir(parents=True)
+        (context / "rules.md").write_text(text)
+
+    result = runner.invoke(
+        app, ["analyze", "similarity", "a", "b", "c", "--template", "template.md", "--json"]
+    )
+
+    assert result.exit_code == 0, result.stdout
+    report = json.loads(result.stdout)
+    assert report["projects"] == 3
+    assert report["clusters"][0]["size"] == 2
+    assert report["drift"][0] == {"path": "c", "cluster": 1, "drift": 1.0}
+
+    result = runner.invoke(app, ["analyze", "similarity"])
+    assert result.exit_code == 1
+    assert "No projects given" in result.stdout
@@ -0,0 +1,220 @@
+"""Tests for declarative adapter specs."""
+
+import json
+
+import pytest
+import yaml
+from typer.testing import CliRunner
+
+from ideporter import adapters, api
+from ideporter.adapters import ADAPTERS, register_spec_adapters
+from ideporter.adapters import spec as spec_module
+from ideporter.adapters.spec import AdapterSpecError, compile_spec, load_spec, parse_spec
+from ideporter.cli import app
+
+runner = CliRunner()
+
+ZED_SPEC = """\
+name: zed
+description: Zed (.rules, .zed/settings.json)
+detect: [.rules, .zed]
+files:
+  - canonical: rules.md
+    path: .rules
+    title: "# AI Project Rules"
+keys:
+  - canonical: context.md
+    path: .zed/settings.json
+    key: assistant.context
+    strip_title: true
+    title: "# Project Context"
+"""
+
+
+@pytest.fixture
+def zed(monkeypatch):
+    """Register the Zed spec adapter for one test."""
+    adapter_class = compile_spec(parse_spec(ZED_SPEC))
+    monkeypatch.setitem(ADAPTERS, "zed", adapter_class)
+    return adapter_class
+
+
+def test_export_files_and_keys(zed, temp_project, canonical_context, sample_rules, sample_context):
+    """Test export copies files and merges keys into existing configs."""
+    (canonical_context.context_dir / "rules.md").write_text(sample_rules)
+    (canonical_context.context_dir / "context.md").write_text(sample_context)
+    (temp_project / ".zed").mkdir()
+    (temp_project / ".zed" / "settings.json").write_text('{"theme": "One Dark"}')
+
+    zed(temp_project).export_context(canonical_context.context_dir, force=True)
+
+    assert (temp_project / ".rules").read_text() == sample_rules
+    settings = json.loads((temp_project / ".zed" / "settings.json").read_text())
+    assert settings["theme"] == "One Dark"
+    assert settings["assistant"]["context"].startswith("## Architecture")
+
+
+def test_import_round_trip(zed, temp_project, canonical_context, sample_context):
+    """Test import restores titles and reads key paths."""
+    (temp_project / ".rules").write_text("- Be concise\n")
+    (temp_project / ".zed").mkdir()
+    (temp_project / ".zed" / "settings.json").write_text(
+        json.dumps({"assistant": {"context": "## Architecture\nTyper CLI."}})
+    )
+
+    outputs = zed(temp_project).render_import(canonical_context.context_dir)
+
+    assert outputs[canonical_context.context_dir / "rules.md"] == (
+        "# AI Project Rules\n\n- Be concise\n"
+    )
+    assert outputs[canonical_context.context_dir / "context.md"] == (
+        "# Project Context\n\n## Architecture\nTyper CLI."
+    )
+
+
+def test_yaml_keys_and_malformed_config(temp_project, canonical_context):
+    """Test YAML key paths and that a malformed config is replaced."""
+    spec = parse_spec(
+        "name: agent\nkeys:\n  - {canonical: rules.md, path: agent.yml, key: prompts.rules}\n"
+    )
+    (canonical_context.context_dir / "rules.md").write_text("# Rules\n")
+    (temp_project / "agent.yml").write_text("prompts: [unclosed")
+
+    outputs = compile_spec(spec)(temp_project).render_export(canonical_context.context_dir)
+
+    assert yaml.safe_load(outputs[temp_project / "agent.yml"]) == {
+        "prompts": {"rules": "# Rules\n"}
+    }
+
+
+def test_detect_and_artifacts(zed, temp_project):
+    """Test detection probes and the artifacts the hook watches."""
+    assert not zed(temp_project).detect()
+    (temp_project / ".zed").mkdir()
+    assert zed(temp_project).detect()
+    assert zed.artifact_paths == (".rules", ".zed/settings.json")
+    assert zed.version == parse_spec(ZED_SPEC).digest[:12]
+
+
+@pytest.mark.parametrize(
+    "content, message",
+    [
+        ("- not a mapping\n", "must be a mapping"),
+        ("name: All Caps\nfiles: []\n", "name must be"),
+        ("name: zed\n", "maps no files"),
+        ("name: zed\nfiles:\n  - {canonical: manifest.yaml, path: x}\n", "canonical must be"),
+        ("name: zed\nfiles:\n  - {canonical: rules.md, path: ../x}\n", "inside the project"),
+        ("name: zed\nkeys:\n  - {canonical: rules.md, path: x.toml, key: a}\n", "format"),
+        ("name: zed\nkeys:\n  - {canonical: rules.md, path: x.json, key: a..b}\n", "dotted path"),
+        ("name: zed\nfiles: []\nextra: 1\n", "unknown fields: extra"),
+    ],
+)
+def test_invalid_specs(content, message):
+    """Test malformed specs are rejected with a reason."""
+    with pytest.raises(AdapterSpecError, match=message):
+        parse_spec(content, origin="bad.yaml")
+
+
+def test_compiled_once_per_content(tmp_path, monkeypatch):
+    """Test specs are cached by content hash, on disk and in process."""
+    monkeypatch.setattr(spec_module, "_COMPILED", {})
+    spec_file = tmp_path / "zed.yaml"
+    spec_file.write_text(ZED_SPEC)
+    cache_dir = tmp_path / "cache"
+
+    first = load_spec(spec_file, cache_dir)
+    (cached,) = cache_dir.iterdir()
+    assert cached.name == f"{first.spec.digest}.json"
+    assert load_spec(spec_file, cache_dir) is first
+
+    spec_file.write_text(ZED_SPEC.replace("zed", "zed2"))
+    second = load_spec(spec_file, cache_dir)
+    assert second is not first and second.spec.name == "zed2"
+
+    # A new process reuses the normalized specs without parsing them again
+    monkeypatch.setattr(spec_module, "_COMPILED", {})
+    monkeypatch.setattr(spec_module, "parse_spec", None)
+    assert load_spec(spec_file, cache_dir).spec == second.spec
+
+
+def test_register_rejects_builtin_names(tmp_path, monkeypatch):
+    """Test specs cannot replace built-in adapters and broken specs are reported."""
+    monkeypatch.setattr(adapters, "ADAPTERS", dict(ADAPTERS))
+    monkeypatch.setattr(adapters, "_spec_errors", [])
+    (tmp_path / "cursor.yaml").write_text(ZED_SPEC.replace("name: zed", "name: cursor"))
+    (tmp_path / "broken.yml").write_text("name: [")
+    (tmp_path / "zed.yaml").write_text(ZED_SPEC)
+
+    errors = register_spec_adapters([tmp_path])
+
+    assert len(errors) == 2
+    assert "already defined" in errors[1]
+    assert adapters.ADAPTERS["zed"].spec.name == "zed"
+    assert adapters.ADAPTERS["cursor"].__name__ == "CursorAdapter"
+
+
+@pytest.fixture
+def fresh_registry(monkeypatch):
+    """Reload spec adapters on next use and drop them after the test."""
+    monkeypatch.setattr(adapters, "_specs_loaded", False)
+    yield
+    monkeypatch.delenv("IDEPORTER_ADAPTERS", raising=False)
+    register_spec_adapters([])
+
+
+def test_cli_uses_spec_adapters(
+    tmp_path, temp_project, canonical_context, monkeypatch, fresh_registry
+):
+    """Test spec adapters load from IDEPORTER_ADAPTERS and work from the CLI."""
+    specs = tmp_path / "specs"
+    specs.mkdir()
+    (specs / "zed.yaml").write_text(ZED_SPEC)
+    monkeypatch.setenv("IDEPORTER_ADAPTERS", str(specs))
+    (canonical_context.context_dir / "rules.md").write_text("# Rules\n")
+
+    result = runner.invoke(app, ["export", "--path", str(temp_project), "--to", "zed"])
+    assert result.exit_code == 0, result.stdout
+    assert (temp_project / ".rules").read_text() == "# Rules\n"
+
+    result = runner.invoke(app, ["detect", str(temp_project), "--json"])
+    assert json.loads(result.stdout)["detections"]["zed"]
+
+
+def test_specs_load_on_first_lookup(temp_project, user_dirs, fresh_registry, monkeypatch):
+    """Test commands that never look up an adapter leave the spec directories alone."""
+    monkeypatch.setattr(spec_module, "_COMPILED", {})
+    spec_dir = user_dirs / "config" / "ideporter" / "adapters"
+    spec_dir.mkdir(parents=True)
+    (spec_dir / "zed.yaml").write_text(ZED_SPEC)
+    cache_dir = user_dirs / "cache" / "ideporter" / "specs"
+
+    result = runner.invoke(app, ["init", str(temp_project)])
+    assert result.exit_code == 0, result.stdout
+    assert "zed" not in ADAPTERS
+    assert not cache_dir.exists()
+
+    result = runner.invoke(app, ["detect", str(temp_project), "--json"])
+    assert "zed" in json.loads(result.stdout)["detections"]
+    assert len(list(cache_dir.iterdir())) == 1
+
+
+def test_broken_specs_are_reported_not_printed(
+    tmp_path, temp_project, canonical_context, monkeypatch, fresh_registry, capsys
+):
+    """Test the API returns skipped specs and only the CLI prints them."""
+    specs = tmp_path / "specs"
+    specs.mkdir()
+    (specs / "broken.yml").write_text("name: [")
+    monkeypatch.setenv("IDEPORTER_ADAPTERS", str(specs))
+    capsys.readouterr()
+
+    result = api.export(temp_project, ["cursor"])
+
+    assert result.ok
+    assert len(result.warnings) == 1
+    assert result.warnings[0].startswith("Skipped adapter spec")
+    assert capsys.readouterr() == ("", "")
+
+    result = runner.invoke(app, ["detect", str(temp_project), "--json"])
+    assert json.loads(result.stdout)["detections"]
+    assert "Skipped adapter spec" in result.stderr
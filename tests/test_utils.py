@@ -178,3 +178,16 @@ def test_is_ignored_path():
     assert not is_ignored_path(Path("/project/src/main.py"))
     assert not is_ignored_path(Path("/project/README.md"))
     assert not is_ignored_path(Path("/project/.vscode/settings.json"))
+
+
+def test_backups_in_the_same_second_get_distinct_names(tmp_path):
+    """Test a second backup never overwrites the first."""
+    file_path = tmp_path / "test.txt"
+    file_path.write_text("first")
+    first = create_backup(file_path)
+    file_path.write_text("second")
+    second = create_backup(file_path)
+
+    assert first != second
+    assert first.read_text() == "first"
+    assert second.read_text() == "second"
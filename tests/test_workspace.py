@@ -0,0 +1,169 @@
+"""Tests for workspace sync."""
+
+import asyncio
+
+import pytest
+
+from ideporter.adapters import ADAPTERS
+from ideporter.adapters.cursor import CursorAdapter
+from ideporter.canonical import CanonicalContext
+from ideporter.locking import default_timeout, project_lock
+from ideporter.workspace import (
+    CACHE_FILE,
+    ProjectEntry,
+    WorkspaceError,
+    _sync_projects,
+    discover_projects,
+    load_workspace,
+    sync_workspace,
+)
+
+
+def make_project(path, rules="# Rules\n\n- Be nice\n"):
+    """Create a project with a canonical context."""
+    path.mkdir(parents=True)
+    CanonicalContext(path).initialize(dry_run=False)
+    (path / "ai" / "context" / "rules.md").write_text(rules)
+    return path
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    """Create a workspace with two globbed services and one explicit app."""
+    make_project(tmp_path / "services" / "a")
+    make_project(tmp_path / "services" / "b")
+    make_project(tmp_path / "services" / "legacy")
+    (tmp_path / "services" / "not-a-project").mkdir()
+    make_project(tmp_path / "apps" / "web")
+    workspace_file = tmp_path / "ideporter.workspace.yaml"
+    workspace_file.write_text(
+        "targets: [cursor]\n"
+        "projects:\n"
+        "  - services/*\n"
+        "  - path: apps/web\n"
+        "    targets: [vscode]\n"
+        "exclude: [services/legacy]\n"
+        "concurrency:\n"
+        "  render_workers: 2\n"
+        "  io_workers: 4\n"
+    )
+    return workspace_file
+
+
+def test_load_workspace(workspace):
+    """Test targets, entries and concurrency are parsed."""
+    parsed = load_workspace(workspace)
+
+    assert parsed.entries[0] == {"path": "services/*", "targets": ["cursor"]}
+    assert parsed.entries[1]["targets"] == ["vscode"]
+    assert (parsed.render_workers, parsed.io_workers) == (2, 4)
+
+
+def test_load_workspace_rejects_unknown_target(tmp_path):
+    """Test unknown adapters are reported."""
+    workspace_file = tmp_path / "ideporter.workspace.yaml"
+    workspace_file.write_text("projects: [x]\ntargets: [emacs]\n")
+
+    with pytest.raises(WorkspaceError, match="Unknown adapter 'emacs'"):
+        load_workspace(workspace_file)
+
+
+def test_discovery_is_cached_until_a_directory_changes(workspace):
+    """Test discovery reuses its cache and notices new projects."""
+    root = workspace.parent
+    projects, cached = discover_projects(load_workspace(workspace))
+    assert not cached
+    assert [p.path.relative_to(root.resolve()).as_posix() for p in projects] == [
+        "services/a",
+        "services/b",
+        "apps/web",
+    ]
+    assert (root / CACHE_FILE).exists()
+
+    again, cached = discover_projects(load_workspace(workspace))
+    assert cached
+    assert again == projects
+
+    make_project(root / "services" / "c")
+    refreshed, cached = discover_projects(load_workspace(workspace))
+    assert not cached
+    assert len(refreshed) == 4
+
+
+def test_sync_workspace(workspace):
+    """Test every project is exported to its targets and re-syncing writes nothing."""
+    root = workspace.parent
+
+    summary = sync_workspace(workspace)
+
+    assert not summary.failed
+    assert (root / "services" / "a" / ".cursorrules").read_text() == "# Rules\n\n- Be nice\n"
+    assert (root / "apps" / "web" / ".vscode" / "AI_RULES.md").exists()
+    assert not (root / "services" / "legacy" / ".cursorrules").exists()
+    assert all(project.written > 0 for project in summary.projects)
+
+    again = sync_workspace(workspace)
+    assert again.cached_discovery
+    assert all(project.written == 0 and project.unchanged > 0 for project in again.projects)
+
+
+def test_sync_workspace_respects_project_locks(workspace):
+    """Test a project another process is writing fails on its own and keeps its manifest."""
+    root = workspace.parent
+    busy = root / "services" / "a"
+    manifest = (busy / "ai" / "context" / "manifest.yaml").read_text()
+
+    with default_timeout(0.05), project_lock(busy, exclusive=True):
+        summary = sync_workspace(workspace)
+
+    (failed,) = summary.failed
+    assert failed.path == busy and "LockTimeoutError" in failed.error
+    assert not (busy / ".cursorrules").exists()
+    assert (busy / "ai" / "context" / "manifest.yaml").read_text() == manifest
+    web_manifest = (root / "apps" / "web" / "ai" / "context" / "manifest.yaml").read_text()
+    assert "vscode" in web_manifest
+
+
+def test_sync_workspace_reports_missing_project(tmp_path):
+    """Test an explicit project without a canonical context fails on its own."""
+    make_project(tmp_path / "ok")
+    (tmp_path / "empty").mkdir()
+    workspace_file = tmp_path / "ideporter.workspace.yaml"
+    workspace_file.write_text("targets: cursor\nprojects: [ok, empty]\n")
+
+    summary = sync_workspace(workspace_file, dry_run=True)
+
+    assert [project.ok for project in summary.projects] == [True, False]
+    assert "Canonical context not found" in summary.failed[0].error
+    assert not (tmp_path / "ok" / ".cursorrules").exists()
+
+
+def test_discovery_cache_follows_registered_adapters(tmp_path, monkeypatch):
+    """Test cached "all" targets are re-expanded when adapters are added or removed."""
+    make_project(tmp_path / "app")
+    workspace_file = tmp_path / "ideporter.workspace.yaml"
+    workspace_file.write_text("targets: [all]\nprojects: [app]\n")
+    discover_projects(load_workspace(workspace_file))
+
+    class ZedAdapter(CursorAdapter):
+        """Extra adapter standing in for a spec adapter."""
+
+    with monkeypatch.context() as patch:
+        patch.setitem(ADAPTERS, "zed", ZedAdapter)
+        (project,), cached = discover_projects(load_workspace(workspace_file))
+        assert not cached and "zed" in project.targets
+
+    (project,), cached = discover_projects(load_workspace(workspace_file))
+    assert not cached and "zed" not in project.targets
+
+
+def test_unknown_target_fails_one_project(tmp_path):
+    """Test a target that is no longer registered fails its project, not the run."""
+    ok = make_project(tmp_path / "ok")
+    gone = make_project(tmp_path / "gone")
+    projects = [ProjectEntry(path=ok, targets=["cursor"]), ProjectEntry(path=gone, targets=["zed"])]
+
+    results = asyncio.run(_sync_projects(projects, 2, 2, force=False, dry_run=False))
+
+    assert [result.ok for result in results] == [True, False]
+    assert "Unknown adapter 'zed'" in results[1].error
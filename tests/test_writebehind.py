@@ -0,0 +1,149 @@
+"""Tests for the write-behind queue."""
+
+import threading
+
+import pytest
+from typer.testing import CliRunner
+
+from ideporter import fsio, utils, writebehind
+from ideporter.cli import app
+from ideporter.plan import Operation, apply_plan
+from ideporter.writebehind import WriteBehind, WriteBehindError
+
+runner = CliRunner()
+
+
+def test_writes_land_in_order_and_coalesce(tmp_path, monkeypatch):
+    """Test queued writes to one path coalesce while the lane is busy."""
+    release = threading.Event()
+    calls = []
+    original = writebehind.write_file
+
+    def slow_write(path, content, force=False, durable=False):
+        calls.append((path.name, content))
+        if path.name == "blocker.txt":
+            release.wait(5)
+        return original(path, content, force=force, durable=durable)
+
+    monkeypatch.setattr(writebehind, "write_file", slow_write)
+    writer = WriteBehind(workers=1)
+    writer.submit(tmp_path / "blocker.txt", "block", force=True)
+    for i in range(5):
+        writer.submit(tmp_path / "out.txt", f"version {i}", force=True)
+
+    # Pending content is visible to readers before it lands
+    assert fsio.read_text(tmp_path / "out.txt") == "version 4"
+    assert fsio.exists(tmp_path / "out.txt")
+
+    release.set()
+    writer.close()
+
+    assert (tmp_path / "out.txt").read_text() == "version 4"
+    assert calls == [("blocker.txt", "block"), ("out.txt", "version 4")]
+    assert writer.stats.coalesced == 4
+    assert writer.stats.written == 2
+
+
+def test_coalesced_write_keeps_backup(tmp_path, monkeypatch):
+    """Test a coalesced write still backs up the original file once."""
+    target = tmp_path / "out.txt"
+    target.write_text("original")
+    release = threading.Event()
+    original = writebehind.write_file
+
+    def slow_write(path, content, force=False, durable=False):
+        if path.name == "blocker.txt":
+            release.wait(5)
+        return original(path, content, force=force, durable=durable)
+
+    monkeypatch.setattr(writebehind, "write_file", slow_write)
+    writer = WriteBehind(workers=1)
+    writer.submit(tmp_path / "blocker.txt", "block", force=True)
+    writer.submit(target, "first")
+    writer.submit(target, "second", force=True)
+    release.set()
+    writer.close()
+
+    assert target.read_text() == "second"
+    assert [backup.read_text() for backup in writer.stats.backups] == ["original"]
+
+
+def test_queued_writes_are_durable(tmp_path, monkeypatch):
+    """Test each queued write fsyncs its backup, the file and the directory."""
+    target = tmp_path / "out.txt"
+    target.write_text("original")
+    synced = []
+    fsync = utils.os.fsync
+    monkeypatch.setattr(utils.os, "fsync", lambda fd: synced.append(fd) or fsync(fd))
+
+    writer = WriteBehind()
+    writer.submit(target, "new")
+    writer.close()
+
+    assert target.read_text() == "new"
+    assert len(synced) == 3
+    synced.clear()
+    utils.write_file(target, "sync", force=True)
+    assert not synced
+
+
+def test_bounded_queue(tmp_path):
+    """Test a queue with one slot still writes every file."""
+    writer = WriteBehind(workers=2, max_pending=1)
+    for i in range(20):
+        writer.submit(tmp_path / f"file{i}.txt", str(i), force=True)
+    writer.close()
+
+    assert sorted(int(p.read_text()) for p in tmp_path.glob("file*.txt")) == list(range(20))
+
+
+def test_failures_raised_on_flush(tmp_path):
+    """Test write errors surface when the queue drains."""
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    writer = WriteBehind()
+    writer.submit(blocker / "out.txt", "x", force=True)
+    writer.submit(tmp_path / "ok.txt", "ok", force=True)
+
+    with pytest.raises(WriteBehindError) as excinfo:
+        writer.close()
+    assert [path for path, _ in excinfo.value.failures] == [blocker / "out.txt"]
+    assert (tmp_path / "ok.txt").read_text() == "ok"
+
+
+def test_session_drains_on_error(tmp_path):
+    """Test a session drains its queue even when the block raises."""
+    target = tmp_path / "out.txt"
+
+    with writebehind.default_enabled(True):
+        with pytest.raises(RuntimeError):
+            with writebehind.session() as writer:
+                assert writer is not None
+                apply_plan([Operation(target, "content")], force=True, report=False)
+                raise RuntimeError("boom")
+
+    assert target.read_text() == "content"
+    assert writebehind.current() is None
+
+
+def test_session_off_by_default(tmp_path):
+    """Test writes are synchronous unless write-behind is enabled."""
+    with writebehind.session() as writer:
+        assert writer is None
+        apply_plan([Operation(tmp_path / "out.txt", "now")], force=True, report=False)
+        assert (tmp_path / "out.txt").read_text() == "now"
+
+
+def test_export_with_write_behind(temp_project, canonical_context, sample_rules):
+    """Test export --to all with --write-behind writes every file and reports backups."""
+    (canonical_context.context_dir / "rules.md").write_text(sample_rules)
+    (temp_project / ".cursorrules").write_text("old rules")
+
+    result = runner.invoke(
+        app, ["--write-behind", "export", "--to", "all", "--path", str(temp_project)]
+    )
+
+    assert result.exit_code == 0, result.stdout
+    assert (temp_project / ".cursorrules").read_text() == sample_rules
+    assert (temp_project / ".vscode" / "AI_RULES.md").read_text() == sample_rules
+    assert "Created backup" in result.stdout